@@ -6,6 +6,7 @@ from fastapi import APIRouter, FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from core.api.routes.listings import router as listings_router
+from core.api.routes.metrics import router as metrics_router
 from core.api.routes.plugins import router as plugins_router
 from core.utils.context import (
     clear_trace_context,
@@ -149,6 +150,9 @@ api_v1_router.include_router(listings_router, prefix="/listings", tags=["listing
 
 app.include_router(api_v1_router)
 
+# Prometheus scrape endpoint - not versioned for monitoring tools
+app.include_router(metrics_router, tags=["metrics"])
+
 
 @app.get("/health", tags=["health"])
 async def health() -> dict[str, str]:
@@ -1,8 +1,8 @@
 """Repository pattern for listings CRUD operations."""
 
-from typing import List, Optional
+from typing import Iterator, List, Mapping, Optional, Tuple
 
-from sqlalchemy import func
+from sqlalchemy import bindparam, func, update
 from sqlalchemy.orm import Session
 
 from core.database.models import ListingModel
@@ -251,6 +251,32 @@ class ListingRepository:
 
         return _model_to_udm(model)
 
+    def bulk_update_fraud_scores(self, scores: Mapping[str, float]) -> int:
+        """Set fraud scores of many listings in one statement.
+
+        Runs a single executemany UPDATE without loading the listings.
+
+        Args:
+            scores: Fraud score by listing_id
+
+        Returns:
+            Number of listings updated (unknown listing IDs are ignored)
+        """
+        if not scores:
+            return 0
+
+        stmt = (
+            update(ListingModel.__table__)
+            .where(ListingModel.__table__.c.listing_id == bindparam("b_listing_id"))
+            .values(fraud_score=bindparam("b_fraud_score"))
+        )
+        result = self.db.execute(
+            stmt, [{"b_listing_id": listing_id, "b_fraud_score": score} for listing_id, score in scores.items()]
+        )
+        self.db.commit()
+
+        return result.rowcount
+
     def delete(self, listing_id: str) -> bool:
         """Delete listing by listing_id.
 
@@ -327,3 +353,27 @@ class ListingRepository:
 
         models = query.offset(skip).limit(limit).all()
         return [_model_to_udm(model) for model in models]
+
+    def iter_labelled(self, label_key: str = "fraud_label", batch_size: int = 500) -> Iterator[Tuple[Listing, bool]]:
+        """Iterate over listings with a fraud label, e.g. for calibration.
+
+        Labels are read from ``extra_metadata[label_key]``; listings without
+        the key are skipped. Rows are streamed ``batch_size`` at a time.
+
+        Args:
+            label_key: Key of the label in extra_metadata
+            batch_size: Number of rows fetched per round trip
+
+        Yields:
+            Tuples of (listing, is_fraud)
+        """
+        query = (
+            self.db.query(ListingModel)
+            .filter(ListingModel.extra_metadata.isnot(None))
+            .order_by(ListingModel.id)
+            .yield_per(batch_size)
+        )
+        for model in query:
+            metadata = model.extra_metadata
+            if isinstance(metadata, dict) and metadata.get(label_key) is not None:
+                yield _model_to_udm(model), bool(metadata[label_key])
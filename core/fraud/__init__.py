@@ -1,6 +1,43 @@
 """Fraud detection components."""
 
+from core.fraud.aggregation import (
+    LogisticStackingAggregator,
+    MaxAggregator,
+    NoisyOrAggregator,
+    ScoreAggregator,
+    WeightedMeanAggregator,
+    create_aggregator,
+    load_aggregator,
+)
 from core.fraud.detection_plugin_wrapper import DetectionPluginWrapper
-from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.fraud.plugin_executor import PluginExecutor
+from core.fraud.replay import EventLogRecorder, load_event_log
+from core.fraud.result_cache import DetectionResultCache
+from core.fraud.risk_scoring_orchestrator import (
+    BatchFraudScores,
+    FraudScore,
+    RiskScoringOrchestrator,
+    ScoreRecord,
+)
+from core.fraud.shadow import ShadowComparison, ShadowDeployment
 
-__all__ = ["DetectionPluginWrapper", "RiskScoringOrchestrator"]
+__all__ = [
+    "BatchFraudScores",
+    "DetectionPluginWrapper",
+    "DetectionResultCache",
+    "EventLogRecorder",
+    "FraudScore",
+    "LogisticStackingAggregator",
+    "MaxAggregator",
+    "NoisyOrAggregator",
+    "PluginExecutor",
+    "RiskScoringOrchestrator",
+    "ScoreAggregator",
+    "ScoreRecord",
+    "ShadowComparison",
+    "ShadowDeployment",
+    "WeightedMeanAggregator",
+    "create_aggregator",
+    "load_aggregator",
+    "load_event_log",
+]
@@ -0,0 +1,365 @@
+"""Vectorized aggregation of detection plugin scores into a fraud score."""
+
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, ClassVar, Dict, Mapping, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+
+# Clamp for probabilities in log loss
+_EPSILON = 1e-12
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    """Numerically stable logistic function"""
+    return np.exp(-np.logaddexp(0.0, -z))
+
+
+class ScoreAggregator(ABC):
+    """Combines plugin scores of many listings in one vectorized pass.
+
+    Inputs are (listings x plugins) matrices: row i holds the results for
+    listing i, column j those of ``plugin_ids[j]``. Cells of plugins that
+    did not report (failed, skipped, not run) are masked out by
+    ``present``; plugins with weight 0 are ignored like missing ones.
+
+    Methods differ only in how scores combine. The confidence is always the
+    weight-averaged confidence of the reporting plugins, and listings
+    without any reporting plugin score 0.0 with confidence 0.0.
+
+    Attributes:
+        method: Name used in aggregation configs
+        monotone: Whether a plugin reporting a higher score (or reporting
+            instead of failing) can never lower the result. Cascade mode
+            only stops early with monotone aggregators.
+    """
+
+    method: ClassVar[str]
+    monotone: bool = True
+
+    def aggregate(
+        self,
+        plugin_ids: Sequence[str],
+        weights: Sequence[float],
+        scores: Any,
+        confidences: Any,
+        present: Any,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Aggregate plugin results of a batch of listings.
+
+        Args:
+            plugin_ids: Plugin ID per column
+            weights: Plugin weight per column
+            scores: Plugin scores (0-1), shape (listings, plugins)
+            confidences: Average signal confidence per result, same shape
+            present: True where the plugin reported, same shape
+
+        Returns:
+            Tuple of (overall_scores, confidences) arrays, one entry per
+            listing, with scores on the 0-100 scale
+        """
+        weights_arr = np.asarray(weights, dtype=float)
+        scores = np.atleast_2d(np.asarray(scores, dtype=float))
+        confidences = np.atleast_2d(np.asarray(confidences, dtype=float))
+        active = np.atleast_2d(np.asarray(present, dtype=bool)) & (weights_arr > 0)
+
+        w = np.where(active, weights_arr, 0.0)
+        total = w.sum(axis=1)
+        reported = total > 0
+        confidence = np.divide((w * confidences).sum(axis=1), total, out=np.zeros(len(total)), where=reported)
+
+        probability = np.clip(self._combine(plugin_ids, weights_arr, np.where(active, scores, 0.0), active), 0.0, 1.0)
+        return np.where(reported, probability * 100.0, 0.0), confidence
+
+    @abstractmethod
+    def _combine(
+        self, plugin_ids: Sequence[str], weights: np.ndarray, scores: np.ndarray, active: np.ndarray
+    ) -> np.ndarray:
+        """Combine scores into a fraud probability (0-1) per listing.
+
+        Args:
+            plugin_ids: Plugin ID per column
+            weights: Plugin weight per column
+            scores: Plugin scores, 0.0 where inactive
+            active: True where the plugin reported with a positive weight
+
+        Returns:
+            Probability per row
+        """
+
+    def get_params(self) -> Dict[str, Any]:
+        """Get the parameters needed to recreate this aggregator"""
+        return {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize to an aggregation config (see create_aggregator())"""
+        return {"method": self.method, **self.get_params()}
+
+    def __repr__(self) -> str:
+        params = ", ".join(f"{key}={value!r}" for key, value in self.get_params().items())
+        return f"{type(self).__name__}({params})"
+
+
+class WeightedMeanAggregator(ScoreAggregator):
+    """Weighted average of plugin scores (the orchestrator's default formula)."""
+
+    method = "weighted_mean"
+
+    def _combine(
+        self, plugin_ids: Sequence[str], weights: np.ndarray, scores: np.ndarray, active: np.ndarray
+    ) -> np.ndarray:
+        w = np.where(active, weights, 0.0)
+        total = w.sum(axis=1)
+        return np.divide((w * scores).sum(axis=1), total, out=np.zeros(len(total)), where=total > 0)
+
+
+class NoisyOrAggregator(ScoreAggregator):
+    """Noisy-OR: the listing is fraud unless every plugin's evidence is a false alarm.
+
+    ``P = 1 - (1 - leak) * prod(1 - strength_j * score_j)``. Independent
+    moderate signals add up instead of averaging out, and one certain
+    plugin is enough for a certain result.
+
+    Attributes:
+        leak: Probability of fraud no plugin accounts for
+        strengths: Plugin ID -> strength (0-1); plugins not listed use their weight
+    """
+
+    method = "noisy_or"
+
+    def __init__(self, leak: float = 0.0, strengths: Optional[Mapping[str, float]] = None):
+        """Initialize the aggregator.
+
+        Args:
+            leak: Probability of fraud no plugin accounts for (0-1)
+            strengths: Plugin ID -> strength (0-1); plugins not listed use their weight
+
+        Raises:
+            ValueError: If leak or a strength is outside 0-1
+        """
+        if not 0.0 <= leak < 1.0:
+            raise ValueError(f"leak must be in [0, 1), got {leak}")
+        strengths = dict(strengths or {})
+        for plugin_id, strength in strengths.items():
+            if not 0.0 <= strength <= 1.0:
+                raise ValueError(f"strength of {plugin_id} must be between 0 and 1, got {strength}")
+        self.leak = leak
+        self.strengths = strengths
+
+    def _combine(
+        self, plugin_ids: Sequence[str], weights: np.ndarray, scores: np.ndarray, active: np.ndarray
+    ) -> np.ndarray:
+        strength = np.clip([self.strengths.get(pid, w) for pid, w in zip(plugin_ids, weights)], 0.0, 1.0)
+        miss = np.where(active, 1.0 - strength * scores, 1.0)
+        return 1.0 - (1.0 - self.leak) * miss.prod(axis=1)
+
+    def get_params(self) -> Dict[str, Any]:
+        return {"leak": self.leak, "strengths": dict(self.strengths)}
+
+
+class MaxAggregator(ScoreAggregator):
+    """Highest score of any reporting plugin."""
+
+    method = "max"
+
+    def _combine(
+        self, plugin_ids: Sequence[str], weights: np.ndarray, scores: np.ndarray, active: np.ndarray
+    ) -> np.ndarray:
+        if scores.shape[1] == 0:
+            return np.zeros(len(scores))
+        return np.where(active, scores, 0.0).max(axis=1)
+
+
+class LogisticStackingAggregator(ScoreAggregator):
+    """Logistic regression over plugin scores with learned coefficients.
+
+    ``P = sigmoid(intercept + sum(coefficient_j * score_j))``, where
+    missing plugins contribute 0. Fit the parameters on labelled listings
+    with fit_logistic_stacking(); weights only decide which plugins are
+    active.
+
+    Attributes:
+        coefficients: Plugin ID -> coefficient; plugins not listed are ignored
+        intercept: Log-odds of fraud when no plugin raises the score
+    """
+
+    method = "logistic"
+
+    def __init__(self, coefficients: Mapping[str, float], intercept: float = 0.0):
+        """Initialize the aggregator.
+
+        Args:
+            coefficients: Plugin ID -> coefficient
+            intercept: Log-odds of fraud when all scores are 0
+        """
+        self.coefficients = {plugin_id: float(value) for plugin_id, value in coefficients.items()}
+        self.intercept = float(intercept)
+
+    @property
+    def monotone(self) -> bool:  # type: ignore[override]
+        return all(value >= 0 for value in self.coefficients.values())
+
+    def _combine(
+        self, plugin_ids: Sequence[str], weights: np.ndarray, scores: np.ndarray, active: np.ndarray
+    ) -> np.ndarray:
+        beta = np.array([self.coefficients.get(plugin_id, 0.0) for plugin_id in plugin_ids], dtype=float)
+        return _sigmoid(self.intercept + scores @ beta)
+
+    def get_params(self) -> Dict[str, Any]:
+        return {"coefficients": dict(self.coefficients), "intercept": self.intercept}
+
+
+AGGREGATORS: Dict[str, Type[ScoreAggregator]] = {
+    cls.method: cls for cls in (WeightedMeanAggregator, NoisyOrAggregator, MaxAggregator, LogisticStackingAggregator)
+}
+
+
+def create_aggregator(config: Mapping[str, Any]) -> ScoreAggregator:
+    """Create an aggregator from its config.
+
+    Args:
+        config: ``{"method": <name>, **params}``, as written by to_dict()
+
+    Returns:
+        Aggregator instance
+
+    Raises:
+        ValueError: If the method is unknown or its parameters are invalid
+    """
+    params = dict(config)
+    method = params.pop("method", None)
+    cls = AGGREGATORS.get(method)
+    if cls is None:
+        raise ValueError(f"Unknown aggregation method '{method}', expected one of {sorted(AGGREGATORS)}")
+    try:
+        return cls(**params)
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for aggregation method '{method}': {e}") from e
+
+
+def load_aggregator(path: Union[str, Path]) -> ScoreAggregator:
+    """Load an aggregator from a JSON config file (e.g. written by calibration).
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        Aggregator instance
+
+    Raises:
+        ValueError: If the config is invalid
+    """
+    with open(path) as f:
+        return create_aggregator(json.load(f))
+
+
+def fit_logistic_stacking(
+    plugin_ids: Sequence[str],
+    scores: Any,
+    present: Any,
+    labels: Any,
+    l2: float = 1.0,
+    max_iter: int = 100,
+    tol: float = 1e-8,
+) -> LogisticStackingAggregator:
+    """Fit logistic stacking coefficients by L2-regularized maximum likelihood.
+
+    Uses Newton's method (iteratively reweighted least squares); the
+    intercept is not regularized.
+
+    Args:
+        plugin_ids: Plugin ID per column
+        scores: Plugin scores (0-1), shape (listings, plugins)
+        present: True where the plugin reported, same shape
+        labels: True for fraudulent listings, one per row
+        l2: Regularization strength
+        max_iter: Maximum number of Newton steps
+        tol: Stop once no parameter changes by more than this
+
+    Returns:
+        Fitted aggregator
+
+    Raises:
+        ValueError: If shapes do not match or labels are all the same
+    """
+    scores = np.asarray(scores, dtype=float)
+    if scores.ndim != 2 or scores.shape[1] != len(plugin_ids):
+        raise ValueError(f"scores must have shape (listings, {len(plugin_ids)}), got {scores.shape}")
+    features = np.where(np.asarray(present, dtype=bool), scores, 0.0)
+    y = np.asarray(labels, dtype=float)
+    if y.shape != (len(features),):
+        raise ValueError(f"Expected {len(features)} labels, got {y.shape[0] if y.ndim else 0}")
+    if y.min(initial=1.0) == y.max(initial=0.0):
+        raise ValueError("Labels must contain both fraudulent and legitimate listings")
+
+    x = np.column_stack([np.ones(len(features)), features])
+    penalty = np.full(x.shape[1], float(l2))
+    penalty[0] = 0.0
+    beta = np.zeros(x.shape[1])
+    for _ in range(max_iter):
+        p = _sigmoid(x @ beta)
+        gradient = x.T @ (p - y) + penalty * beta
+        hessian = (x * (p * (1.0 - p))[:, None]).T @ x + np.diag(penalty)
+        step = np.linalg.lstsq(hessian, gradient, rcond=None)[0]
+        beta -= step
+        if np.abs(step).max() < tol:
+            break
+
+    return LogisticStackingAggregator(
+        coefficients={plugin_id: float(value) for plugin_id, value in zip(plugin_ids, beta[1:])},
+        intercept=float(beta[0]),
+    )
+
+
+def _auc(probabilities: np.ndarray, labels: np.ndarray) -> float:
+    """Area under the ROC curve (Mann-Whitney U with tied ranks averaged)"""
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    if positives == 0 or negatives == 0:
+        return float("nan")
+    values, inverse, counts = np.unique(probabilities, return_inverse=True, return_counts=True)
+    starts = np.cumsum(counts) - counts
+    ranks = (starts + (counts + 1) / 2.0)[inverse]
+    return float((ranks[labels].sum() - positives * (positives + 1) / 2.0) / (positives * negatives))
+
+
+def evaluate_aggregator(
+    aggregator: ScoreAggregator,
+    plugin_ids: Sequence[str],
+    weights: Sequence[float],
+    scores: Any,
+    present: Any,
+    labels: Any,
+    threshold: float = 70.0,
+) -> Dict[str, float]:
+    """Measure how well an aggregator separates labelled listings.
+
+    Args:
+        aggregator: Aggregator to evaluate
+        plugin_ids: Plugin ID per column
+        weights: Plugin weight per column
+        scores: Plugin scores (0-1), shape (listings, plugins)
+        present: True where the plugin reported, same shape
+        labels: True for fraudulent listings, one per row
+        threshold: Score (0-100) from which a listing counts as flagged
+
+    Returns:
+        Dictionary with log_loss, brier, auc, and precision, recall and
+        accuracy of flagging at ``threshold``
+    """
+    scores = np.asarray(scores, dtype=float)
+    y = np.asarray(labels, dtype=bool)
+    overall, _ = aggregator.aggregate(plugin_ids, weights, scores, np.zeros_like(scores), present)
+    p = np.clip(overall / 100.0, _EPSILON, 1.0 - _EPSILON)
+    flagged = overall >= threshold
+    true_positives = int((flagged & y).sum())
+
+    return {
+        "log_loss": float(-np.mean(np.where(y, np.log(p), np.log1p(-p)))) if len(y) else float("nan"),
+        "brier": float(np.mean((p - y) ** 2)) if len(y) else float("nan"),
+        "auc": _auc(p, y),
+        "precision": true_positives / int(flagged.sum()) if flagged.any() else 0.0,
+        "recall": true_positives / int(y.sum()) if y.any() else 0.0,
+        "accuracy": float(np.mean(flagged == y)) if len(y) else float("nan"),
+    }
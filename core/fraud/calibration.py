@@ -0,0 +1,173 @@
+"""Offline calibration of score aggregation on labelled listings."""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from core.fraud.aggregation import (
+    AGGREGATORS,
+    ScoreAggregator,
+    create_aggregator,
+    evaluate_aggregator,
+    fit_logistic_stacking,
+)
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TrainingData:
+    """Plugin scores of labelled listings as (listings x plugins) matrices.
+
+    Attributes:
+        listing_ids: Listing ID per row
+        plugin_ids: Plugin ID per column
+        weights: Plugin weight per column
+        scores: Plugin scores (0-1), 0.0 where the plugin did not report
+        present: True where the plugin reported
+        labels: True for fraudulent listings
+    """
+
+    listing_ids: List[str]
+    plugin_ids: List[str]
+    weights: List[float]
+    scores: np.ndarray
+    present: np.ndarray
+    labels: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.listing_ids)
+
+    def split(self, holdout: float, seed: int = 0) -> Tuple["TrainingData", "TrainingData"]:
+        """Split randomly into a training and a holdout set.
+
+        Args:
+            holdout: Share of rows held out (0-1)
+            seed: Random seed for a reproducible split
+
+        Returns:
+            Tuple of (training, holdout) data
+        """
+        order = np.random.default_rng(seed).permutation(len(self))
+        cut = len(self) - int(round(len(self) * holdout))
+        return self._take(order[:cut]), self._take(order[cut:])
+
+    def _take(self, rows: np.ndarray) -> "TrainingData":
+        return TrainingData(
+            listing_ids=[self.listing_ids[i] for i in rows],
+            plugin_ids=self.plugin_ids,
+            weights=self.weights,
+            scores=self.scores[rows],
+            present=self.present[rows],
+            labels=self.labels[rows],
+        )
+
+
+async def collect_training_data(
+    orchestrator: RiskScoringOrchestrator,
+    labelled: Iterable[Tuple[Dict, bool]],
+    batch_size: int = 256,
+) -> TrainingData:
+    """Score labelled listings with every plugin and collect the plugin scores.
+
+    Args:
+        orchestrator: Orchestrator with the detection plugins to calibrate for
+        labelled: Tuples of (listing data, is_fraud)
+        batch_size: Number of listings per run_batch() call
+
+    Returns:
+        Training data with one row per listing
+
+    Raises:
+        ValueError: If the orchestrator runs in cascade mode (plugins
+            would be missing for listings decided early)
+    """
+    if orchestrator.cascade:
+        raise ValueError("Calibration needs every plugin's score; disable cascade mode")
+
+    weights = orchestrator.get_weights()
+    plugin_ids = list(weights)
+    listing_ids: List[str] = []
+    rows: List[List[Optional[float]]] = []
+    labels: List[bool] = []
+
+    labelled = list(labelled)
+    for start in range(0, len(labelled), batch_size):
+        chunk = labelled[start : start + batch_size]
+        batch = await orchestrator.run_batch([listing for listing, _ in chunk])
+        listing_ids.extend(batch.listing_ids)
+        columns = [batch.plugin_scores.get(plugin_id, [None] * len(chunk)) for plugin_id in plugin_ids]
+        rows.extend([column[n] for column in columns] for n in range(len(chunk)))
+        labels.extend(label for _, label in chunk)
+
+    shape = (len(rows), len(plugin_ids))
+    present = np.array([[value is not None for value in row] for row in rows], dtype=bool).reshape(shape)
+    scores = np.array([[value or 0.0 for value in row] for row in rows], dtype=float).reshape(shape)
+
+    logger.info(f"Collected plugin scores of {len(rows)} labelled listings ({sum(labels)} fraudulent)")
+    return TrainingData(
+        listing_ids=listing_ids,
+        plugin_ids=plugin_ids,
+        weights=[weights[plugin_id] for plugin_id in plugin_ids],
+        scores=scores,
+        present=present,
+        labels=np.array(labels, dtype=bool),
+    )
+
+
+def calibrate(
+    data: TrainingData,
+    method: str = "logistic",
+    l2: float = 1.0,
+    holdout: float = 0.2,
+    threshold: float = RiskScoringOrchestrator.FRAUD_THRESHOLD,
+    seed: int = 0,
+) -> Tuple[ScoreAggregator, Dict[str, Dict[str, float]]]:
+    """Fit aggregation parameters and compare all methods.
+
+    Logistic stacking is fitted on the training share; the other methods
+    have no learned parameters and use their defaults. Every method is
+    evaluated on the holdout share (on all data if it would be empty).
+
+    Args:
+        data: Plugin scores of labelled listings
+        method: Aggregation method to return
+        l2: Regularization strength for logistic stacking
+        holdout: Share of listings held out for evaluation
+        threshold: Score (0-100) from which a listing counts as flagged
+        seed: Random seed of the holdout split
+
+    Returns:
+        Tuple of (aggregator for ``method``, method -> evaluation metrics)
+
+    Raises:
+        ValueError: If the method is unknown or the data cannot be fitted
+    """
+    if method not in AGGREGATORS:
+        raise ValueError(f"Unknown aggregation method '{method}', expected one of {sorted(AGGREGATORS)}")
+    if not 0.0 <= holdout < 1.0:
+        raise ValueError(f"holdout must be in [0, 1), got {holdout}")
+
+    train, test = data.split(holdout, seed)
+    if len(test) == 0:
+        test = data
+
+    aggregators: Dict[str, ScoreAggregator] = {}
+    for name in AGGREGATORS:
+        if name == "logistic":
+            aggregators[name] = fit_logistic_stacking(
+                train.plugin_ids, train.scores, train.present, train.labels, l2=l2
+            )
+        else:
+            aggregators[name] = create_aggregator({"method": name})
+
+    report = {
+        name: evaluate_aggregator(
+            aggregator, test.plugin_ids, test.weights, test.scores, test.present, test.labels, threshold
+        )
+        for name, aggregator in aggregators.items()
+    }
+    return aggregators[method], report
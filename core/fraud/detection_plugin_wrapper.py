@@ -1,7 +1,7 @@
 """Wrapper for detection plugins with configurable weights."""
 
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from core.interfaces.detection_plugin import DetectionPlugin
 
@@ -10,10 +10,10 @@ logger = logging.getLogger(__name__)
 
 class DetectionPluginWrapper(DetectionPlugin):
     """
-    Wrapper for detection plugins that allows weight override.
+    Wrapper for detection plugins that allows weight and execution mode override.
 
-    This wrapper enables the plugin manager to override plugin weights
-    without modifying the plugin code itself.
+    This wrapper enables the plugin manager to override plugin weights and
+    manifest-declared execution modes without modifying the plugin code itself.
     """
 
     def __init__(
@@ -21,6 +21,7 @@ class DetectionPluginWrapper(DetectionPlugin):
         plugin: DetectionPlugin,
         plugin_id: str,
         weight_override: Optional[float] = None,
+        execution_mode: Optional[str] = None,
     ):
         """
         Initialize wrapper.
@@ -29,10 +30,12 @@ class DetectionPluginWrapper(DetectionPlugin):
             plugin: The actual detection plugin instance
             plugin_id: Plugin ID for logging
             weight_override: Optional weight to override plugin's get_weight()
+            execution_mode: Optional mode to override plugin's get_execution_mode()
         """
         self._plugin = plugin
         self._plugin_id = plugin_id
         self._weight_override = weight_override
+        self._execution_mode = execution_mode
 
     def get_metadata(self) -> Dict:
         """Delegate to wrapped plugin."""
@@ -42,6 +45,10 @@ class DetectionPluginWrapper(DetectionPlugin):
         """Delegate to wrapped plugin."""
         return await self._plugin.analyze(listing)
 
+    async def analyze_batch(self, listings: List[Dict]):
+        """Delegate to wrapped plugin."""
+        return await self._plugin.analyze_batch(listings)
+
     def get_weight(self) -> float:
         """
         Get plugin weight.
@@ -53,12 +60,25 @@ class DetectionPluginWrapper(DetectionPlugin):
             Weight value between 0.0 and 1.0
         """
         if self._weight_override is not None:
-            logger.debug(f"Using configured weight {self._weight_override} " f"for plugin {self._plugin_id}")
             return self._weight_override
 
         # Use plugin's default weight
         return self._plugin.get_weight()
 
+    def get_timeout_ms(self) -> Optional[float]:
+        """Delegate to wrapped plugin."""
+        return self._plugin.get_timeout_ms()
+
+    def get_cost_tier(self) -> int:
+        """Delegate to wrapped plugin."""
+        return self._plugin.get_cost_tier()
+
+    def get_execution_mode(self) -> str:
+        """Get execution mode, preferring the manifest's over the plugin's."""
+        if self._execution_mode is not None:
+            return self._execution_mode
+        return self._plugin.get_execution_mode()
+
     def shutdown(self) -> None:
         """Delegate shutdown to wrapped plugin."""
         self._plugin.shutdown()
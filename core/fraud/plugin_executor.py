@@ -0,0 +1,287 @@
+"""Off-loop execution of CPU-bound detection plugins."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+from core.fraud.detection_plugin_wrapper import DetectionPluginWrapper
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult
+
+logger = logging.getLogger(__name__)
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+EXECUTION_MODES = (INLINE, THREAD, PROCESS)
+
+T = TypeVar("T")
+
+# Plugin instance of a process pool worker, loaded once by _init_worker()
+_worker_plugin: Optional[DetectionPlugin] = None
+
+
+def _run_coroutine(func: Callable[..., Awaitable[T]], *args: Any) -> T:
+    """Run an async plugin method to completion on a private event loop"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(func(*args))
+    finally:
+        loop.close()
+
+
+def _init_worker(plugin: DetectionPlugin) -> None:
+    """Process pool initializer: keep the plugin for every later call"""
+    global _worker_plugin
+    _worker_plugin = plugin
+
+
+def _ping() -> int:
+    """No-op task used to start pool workers ahead of the first listing"""
+    return os.getpid()
+
+
+def _analyze_in_worker(listing: Dict) -> DetectionResult:
+    return _run_coroutine(_worker_plugin.analyze, listing)
+
+
+def _analyze_batch_in_worker(listings: List[Dict]) -> List[DetectionResult]:
+    return list(_run_coroutine(_worker_plugin.analyze_batch, listings))
+
+
+def _compact(listing: Dict) -> Dict:
+    """Plain copy of a listing; copy-on-write views ship only their merged fields"""
+    return listing if type(listing) is dict else dict(listing)
+
+
+def _unwrap(plugin: DetectionPlugin) -> DetectionPlugin:
+    """Strip the manager's wrapper; workers only need the plugin itself"""
+    if isinstance(plugin, DetectionPluginWrapper):
+        return plugin.wrapped_plugin
+    return plugin
+
+
+class PluginExecutor:
+    """Runs detection plugins on a thread pool or in worker processes.
+
+    Thread-mode plugins share one thread pool; each call runs the plugin's
+    coroutine on a private event loop, so it must not depend on resources
+    bound to the caller's loop and must be thread-safe.
+
+    Each process-mode plugin gets its own warm pool of worker processes.
+    The plugin instance is handed to every worker once, when the worker
+    starts, instead of being shipped with each call; listings go out as
+    plain dictionaries (copy-on-write views are materialized) and come back
+    as DetectionResults. State a plugin changes in a worker stays there.
+
+    Neither threads nor processes can be interrupted: a call cancelled by
+    the orchestrator's deadline keeps its worker busy until it returns.
+    A pool whose worker died is discarded and started again on next use.
+
+    Attributes:
+        max_threads: Size of the thread pool (None: ThreadPoolExecutor default)
+        max_workers: Worker processes per process-mode plugin
+
+    Example:
+        >>> executor = PluginExecutor(max_workers=4)
+        >>> orchestrator = RiskScoringOrchestrator(plugins, executor=executor)
+        >>> ...
+        >>> executor.shutdown()
+    """
+
+    def __init__(
+        self,
+        max_threads: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        mp_context: Optional[Any] = None,
+    ):
+        """Initialize the executor. Pools are started on first use.
+
+        Args:
+            max_threads: Size of the thread pool (default: ThreadPoolExecutor default)
+            max_workers: Worker processes per process-mode plugin (default: CPU count)
+            mp_context: multiprocessing context (default: platform default)
+
+        Raises:
+            ValueError: If a pool size is not positive
+        """
+        for name, value in (("max_threads", max_threads), ("max_workers", max_workers)):
+            if value is not None and value < 1:
+                raise ValueError(f"{name} must be positive, got {value}")
+
+        self.max_threads = max_threads
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self._ctx = mp_context or multiprocessing.get_context()
+        self._threads: Optional[ThreadPoolExecutor] = None
+        # Plugin ID -> (plugin instance the workers hold, pool)
+        self._pools: Dict[str, Tuple[DetectionPlugin, ProcessPoolExecutor]] = {}
+        self._lock = threading.Lock()
+        self._stats = {"thread_calls": 0, "process_calls": 0, "pools_started": 0, "broken_pools": 0}
+
+    def prepare(self, plugin_id: str, plugin: DetectionPlugin) -> None:
+        """Start the worker pool of a process-mode plugin.
+
+        Workers load the plugin in the background, so the first listings do
+        not pay for process start-up. A pool holding an older instance of the
+        plugin (e.g. before a reload) is replaced.
+
+        Args:
+            plugin_id: Plugin ID
+            plugin: Plugin instance to load in the workers
+        """
+        self._get_pool(plugin_id, plugin, warm=True)
+
+    def retain(self, plugin_ids: Iterable[str]) -> None:
+        """Shut down the pools of all plugins not listed.
+
+        Args:
+            plugin_ids: IDs of process-mode plugins still in use
+        """
+        keep = set(plugin_ids)
+        with self._lock:
+            retired = [(plugin_id, pool) for plugin_id, (_, pool) in self._pools.items() if plugin_id not in keep]
+            for plugin_id, _ in retired:
+                del self._pools[plugin_id]
+        for plugin_id, pool in retired:
+            pool.shutdown(wait=False, cancel_futures=True)
+            logger.info(f"Stopped worker pool of detection plugin {plugin_id}")
+
+    async def analyze(self, plugin_id: str, plugin: DetectionPlugin, mode: str, listing: Dict) -> DetectionResult:
+        """Run analyze() off the event loop.
+
+        Args:
+            plugin_id: Plugin ID
+            plugin: Plugin instance
+            mode: ``thread`` or ``process``
+            listing: Listing data
+
+        Returns:
+            DetectionResult of the plugin
+
+        Raises:
+            ValueError: If mode is not an off-loop mode
+        """
+        if mode == THREAD:
+            return await self._run_in_thread(plugin.analyze, listing)
+        if mode == PROCESS:
+            return await self._run_in_process(plugin_id, plugin, _analyze_in_worker, _compact(listing))
+        raise ValueError(f"Unsupported execution mode '{mode}'")
+
+    async def analyze_batch(
+        self, plugin_id: str, plugin: DetectionPlugin, mode: str, listings: List[Dict]
+    ) -> List[DetectionResult]:
+        """Run analyze_batch() off the event loop as a single call.
+
+        Args:
+            plugin_id: Plugin ID
+            plugin: Plugin instance
+            mode: ``thread`` or ``process``
+            listings: Listings to analyze
+
+        Returns:
+            One DetectionResult per listing, in the same order
+
+        Raises:
+            ValueError: If mode is not an off-loop mode
+        """
+        if mode == THREAD:
+            return await self._run_in_thread(plugin.analyze_batch, listings)
+        if mode == PROCESS:
+            payload = [_compact(listing) for listing in listings]
+            return await self._run_in_process(plugin_id, plugin, _analyze_batch_in_worker, payload)
+        raise ValueError(f"Unsupported execution mode '{mode}'")
+
+    async def _run_in_thread(self, func: Callable[[Any], Awaitable[T]], argument: Any) -> T:
+        loop = asyncio.get_running_loop()
+        self._stats["thread_calls"] += 1
+        return await loop.run_in_executor(self._get_threads(), _run_coroutine, func, argument)
+
+    async def _run_in_process(
+        self, plugin_id: str, plugin: DetectionPlugin, func: Callable[[Any], T], argument: Any
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool(plugin_id, plugin)
+        self._stats["process_calls"] += 1
+        try:
+            return await loop.run_in_executor(pool, func, argument)
+        except BrokenProcessPool:
+            self._discard_pool(plugin_id, pool)
+            raise
+
+    def _get_threads(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            with self._lock:
+                if self._threads is None:
+                    self._threads = ThreadPoolExecutor(
+                        max_workers=self.max_threads,
+                        thread_name_prefix="detection-plugin",
+                    )
+        return self._threads
+
+    def _get_pool(self, plugin_id: str, plugin: DetectionPlugin, warm: bool = False) -> ProcessPoolExecutor:
+        """Get the plugin's pool, starting a new one for new plugin instances"""
+        plugin = _unwrap(plugin)
+        with self._lock:
+            current = self._pools.get(plugin_id)
+            if current is not None and current[0] is plugin:
+                return current[1]
+
+            pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._ctx,
+                initializer=_init_worker,
+                initargs=(plugin,),
+            )
+            self._pools[plugin_id] = (plugin, pool)
+            self._stats["pools_started"] += 1
+
+        if current is not None:
+            current[1].shutdown(wait=False, cancel_futures=True)
+        if warm:
+            for _ in range(self.max_workers):
+                pool.submit(_ping)
+        logger.info(f"Started {self.max_workers} worker processes for detection plugin {plugin_id}")
+        return pool
+
+    def _discard_pool(self, plugin_id: str, pool: ProcessPoolExecutor) -> None:
+        """Drop a pool whose worker died so the next call starts a fresh one"""
+        with self._lock:
+            current = self._pools.get(plugin_id)
+            if current is None or current[1] is not pool:
+                return
+            del self._pools[plugin_id]
+            self._stats["broken_pools"] += 1
+        logger.error(f"Worker process of detection plugin {plugin_id} died, restarting its pool on next use")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all pools.
+
+        Args:
+            wait: Wait for running calls to finish
+        """
+        with self._lock:
+            pools = [pool for _, pool in self._pools.values()]
+            self._pools.clear()
+            threads, self._threads = self._threads, None
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+        if threads is not None:
+            threads.shutdown(wait=wait, cancel_futures=True)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get pool and call counters.
+
+        Returns:
+            Dictionary with process_pools (plugin IDs), workers per pool and call counters
+        """
+        with self._lock:
+            return {
+                "process_pools": sorted(self._pools),
+                "max_workers": self.max_workers,
+                **self._stats,
+            }
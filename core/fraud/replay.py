@@ -0,0 +1,142 @@
+"""Offline replay of captured listing events through live and candidate plugins."""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+from core.fraud.aggregation import ScoreAggregator
+from core.fraud.detection_plugin_wrapper import DetectionPluginWrapper
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult
+
+logger = logging.getLogger(__name__)
+
+
+class EventLogRecorder:
+    """Queue callback appending every event to a JSON Lines file.
+
+    Example:
+        >>> queue.subscribe(Topics.PROCESSED_LISTINGS, EventLogRecorder("events.jsonl"))
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        """Initialize recorder.
+
+        Args:
+            path: Event log to append to (created if missing)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.recorded = 0
+
+    def __call__(self, message: Dict[str, Any]) -> None:
+        line = json.dumps(message, default=str)
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+            self.recorded += 1
+
+
+def load_event_log(path: Union[str, Path], limit: Optional[int] = None) -> List[Dict]:
+    """Read the listings of a captured event log.
+
+    Lines holding processed listing events yield their ``listing_data``;
+    other JSON objects are taken as listings. Blank and malformed lines are
+    skipped.
+
+    Args:
+        path: JSON Lines file, e.g. written by EventLogRecorder
+        limit: Maximum number of listings to read
+
+    Returns:
+        Listings in log order
+    """
+    listings: List[Dict] = []
+    with open(path) as f:
+        for number, line in enumerate(f, start=1):
+            if limit is not None and len(listings) >= limit:
+                break
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed line {number} of {path}: {e}")
+                continue
+            if not isinstance(event, dict):
+                logger.warning(f"Skipping line {number} of {path}: not a JSON object")
+                continue
+            listing = event.get("listing_data", event)
+            if isinstance(listing, dict):
+                listings.append(listing)
+    return listings
+
+
+class _TimedPlugin(DetectionPluginWrapper):
+    """Runs a plugin inline and reports wall-clock time as its processing time"""
+
+    def __init__(self, plugin: DetectionPlugin):
+        super().__init__(plugin, plugin.get_metadata().get("id", "unknown"), execution_mode="inline")
+
+    async def analyze(self, listing: Dict) -> DetectionResult:
+        start = time.perf_counter()
+        result = await self._plugin.analyze(listing)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return result.model_copy(update={"processing_time_ms": elapsed_ms})
+
+    async def analyze_batch(self, listings: List[Dict]) -> List[DetectionResult]:
+        return [await self.analyze(listing) for listing in listings]
+
+
+async def replay(
+    listings: Iterable[Dict],
+    plugins: Sequence[DetectionPlugin],
+    candidates: Mapping[str, DetectionPlugin],
+    aggregator: Optional[ScoreAggregator] = None,
+    min_confidence_threshold: float = 0.5,
+) -> Dict[str, Dict[str, Any]]:
+    """Score listings with the live plugins and every candidate, one listing at a time.
+
+    Each listing is scored by the live plugins first and then by the
+    candidates, so runs never overlap: latencies are wall-clock times of
+    ``analyze()`` without contention, and the same log replays the same
+    way. Plugins run inline regardless of their execution mode.
+
+    Args:
+        listings: Listings to replay, in order
+        plugins: Live detection plugins
+        candidates: Live plugin ID -> candidate plugin to compare with it
+        aggregator: Aggregation used in production (None: weighted average)
+        min_confidence_threshold: Signal confidence threshold used in production
+
+    Returns:
+        Live plugin ID -> shadow statistics (latency distributions of both
+        versions, score and fraud score deltas, risk level changes)
+
+    Raises:
+        ValueError: If a candidate names a plugin that is not live
+    """
+    orchestrator = RiskScoringOrchestrator(
+        detection_plugins=[_TimedPlugin(plugin) for plugin in plugins],
+        min_confidence_threshold=min_confidence_threshold,
+        aggregator=aggregator,
+    )
+    live_ids = orchestrator.get_weights()
+    listings = list(listings)
+    for plugin_id, candidate in candidates.items():
+        if plugin_id not in live_ids:
+            raise ValueError(f"Candidate for unknown live plugin '{plugin_id}'")
+        orchestrator.add_shadow(_TimedPlugin(candidate), plugin_id, max_records=max(len(listings), 1))
+
+    try:
+        for listing in listings:
+            await orchestrator.run_compact(listing)
+            await orchestrator.drain_shadows()
+    finally:
+        orchestrator.shutdown()
+
+    return {plugin_id: deployment.get_statistics() for plugin_id, deployment in orchestrator.get_shadows().items()}
@@ -0,0 +1,238 @@
+"""Content-addressed cache of detection plugin results."""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
+
+from core.interfaces.detection_plugin import DetectionResult
+
+logger = logging.getLogger(__name__)
+
+# Fields that change between scrapes of an unchanged listing
+VOLATILE_FIELDS: FrozenSet[str] = frozenset(
+    {
+        "fraud_score",
+        "risk_level",
+        "scraped_at",
+        "created_at",
+        "updated_at",
+        "processed_at",
+        "timestamp",
+    }
+)
+
+
+def plugin_key(plugin_id: str, version: str, weight: float) -> str:
+    """Cache namespace of a plugin configuration.
+
+    Results are only reused for the same plugin version and weight, so
+    reloading a plugin with a new version or re-weighting it never serves
+    stale entries, in this process or from a shared Redis tier.
+
+    Args:
+        plugin_id: Plugin ID
+        version: Plugin version
+        weight: Configured plugin weight
+
+    Returns:
+        Key prefix for the plugin's results
+    """
+    return f"{plugin_id}:{version}:{weight:g}"
+
+
+class DetectionResultCache:
+    """Two-tier cache of DetectionResults keyed by listing content.
+
+    Listings are fingerprinted with a stable hash of their fraud-relevant
+    fields, so a re-scraped but unchanged listing maps to the same entry.
+    Lookups go to an in-process LRU first and then to an optional Redis
+    tier (shared between workers); Redis hits are promoted to the LRU.
+    Redis errors are logged and treated as misses.
+
+    Attributes:
+        max_entries: Capacity of the in-process LRU
+        ttl_s: Lifetime of in-process entries in seconds
+        redis_ttl_s: Lifetime of Redis entries in seconds
+
+    Example:
+        >>> cache = DetectionResultCache(max_entries=50_000, redis_client=redis.Redis())
+        >>> orchestrator = RiskScoringOrchestrator(plugins, result_cache=cache)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_s: float = 3600.0,
+        redis_client: Optional[Any] = None,
+        redis_ttl_s: float = 86400.0,
+        key_prefix: str = "fraud:result",
+        fingerprint_fields: Optional[Iterable[str]] = None,
+    ):
+        """Initialize the result cache.
+
+        Args:
+            max_entries: Capacity of the in-process LRU
+            ttl_s: Lifetime of in-process entries in seconds
+            redis_client: Optional synchronous Redis client for the shared tier
+            redis_ttl_s: Lifetime of Redis entries in seconds
+            key_prefix: Prefix of Redis keys
+            fingerprint_fields: Listing fields to hash (default: all fields
+                except VOLATILE_FIELDS)
+
+        Raises:
+            ValueError: If capacity or a TTL is not positive
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        if ttl_s <= 0 or redis_ttl_s <= 0:
+            raise ValueError(f"TTLs must be positive, got {ttl_s} and {redis_ttl_s}")
+
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.redis_ttl_s = redis_ttl_s
+        self._redis = redis_client
+        self._key_prefix = key_prefix
+        self._fields = frozenset(fingerprint_fields) if fingerprint_fields is not None else None
+
+        # (plugin key, fingerprint) -> (expires_at, result)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, DetectionResult]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "redis_errors": 0,
+        }
+
+    def fingerprint(self, listing: Dict) -> str:
+        """Stable content hash of a listing's fraud-relevant fields.
+
+        Args:
+            listing: Listing data
+
+        Returns:
+            Hex digest, equal for listings with equal relevant content
+        """
+        if self._fields is None:
+            relevant = {k: v for k, v in listing.items() if k not in VOLATILE_FIELDS}
+        else:
+            relevant = {k: v for k, v in listing.items() if k in self._fields}
+
+        canonical = json.dumps(relevant, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, plugin: str, fingerprint: str) -> Optional[DetectionResult]:
+        """Look up a cached result.
+
+        Args:
+            plugin: Plugin key from plugin_key()
+            fingerprint: Listing fingerprint
+
+        Returns:
+            Cached DetectionResult or None
+        """
+        key = (plugin, fingerprint)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return entry[1]
+                del self._entries[key]
+
+        result = self._redis_get(key)
+        with self._lock:
+            if result is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["redis_hits"] += 1
+            self._store(key, result, now)
+        return result
+
+    def put(self, plugin: str, fingerprint: str, result: DetectionResult) -> None:
+        """Cache a result in every tier.
+
+        Args:
+            plugin: Plugin key from plugin_key()
+            fingerprint: Listing fingerprint
+            result: Result to cache
+        """
+        key = (plugin, fingerprint)
+        with self._lock:
+            self._store(key, result, time.monotonic())
+        self._redis_set(key, result)
+
+    def _store(self, key: Tuple[str, str], result: DetectionResult, now: float) -> None:
+        """Insert into the LRU, evicting the least recently used entries. Caller must hold the lock."""
+        self._entries[key] = (now + self.ttl_s, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _redis_key(self, key: Tuple[str, str]) -> str:
+        return f"{self._key_prefix}:{key[0]}:{key[1]}"
+
+    def _redis_get(self, key: Tuple[str, str]) -> Optional[DetectionResult]:
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.get(self._redis_key(key))
+            return DetectionResult.model_validate_json(payload) if payload else None
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.warning(f"Result cache lookup in Redis failed: {e}")
+            return None
+
+    def _redis_set(self, key: Tuple[str, str], result: DetectionResult) -> None:
+        if self._redis is None:
+            return
+        try:
+            self._redis.setex(self._redis_key(key), int(self.redis_ttl_s), result.model_dump_json())
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.warning(f"Result cache write to Redis failed: {e}")
+
+    def invalidate(self) -> int:
+        """Drop all in-process entries.
+
+        Redis entries are not deleted; they are keyed by plugin version and
+        weight and expire by TTL.
+
+        Returns:
+            Number of entries dropped
+        """
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self._stats["invalidations"] += 1
+        return dropped
+
+    def __len__(self) -> int:
+        """Number of in-process entries"""
+        with self._lock:
+            return len(self._entries)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache counters.
+
+        Returns:
+            Dictionary with entries, hits, misses, hit_rate, evictions and Redis counters
+        """
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["redis_hits"] + self._stats["misses"]
+            hits = self._stats["hits"] + self._stats["redis_hits"]
+            return {
+                "entries": len(self._entries),
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "redis_enabled": self._redis is not None,
+            }
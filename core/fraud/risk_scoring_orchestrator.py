@@ -1,19 +1,39 @@
 """Risk scoring orchestrator for fraud detection."""
 
+import asyncio
 import logging
+import operator
 import time
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from itertools import groupby
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, TypeVar
 
+import numpy as np
 from pydantic import BaseModel, Field
 
+from core.fraud.aggregation import ScoreAggregator
+from core.fraud.detection_plugin_wrapper import DetectionPluginWrapper
+from core.fraud.plugin_executor import EXECUTION_MODES, INLINE, PROCESS, PluginExecutor
+from core.fraud.result_cache import DetectionResultCache, plugin_key
+from core.fraud.shadow import ShadowComparison, ShadowDeployment
 from core.interfaces.detection_plugin import (
     DetectionPlugin,
     DetectionResult,
     RiskSignal,
 )
+from core.plugin_manager import PluginManager
 
 logger = logging.getLogger(__name__)
 
+# Slack for float rounding when proving a risk level settled
+_BOUND_MARGIN = 1e-9
+
+T = TypeVar("T")
+
+
+class _DeadlineExceeded(Exception):
+    """A plugin call was cancelled at its deadline (unlike a TimeoutError raised by the plugin)"""
+
 
 class FraudScore(BaseModel):
     """Final fraud score for a listing.
@@ -39,32 +59,408 @@ class FraudScore(BaseModel):
     metadata: Dict = Field(default_factory=dict)
 
 
+@dataclass(frozen=True, slots=True)
+class ScoreRecord:
+    """Compact fraud score of one listing.
+
+    Internal counterpart of FraudScore built without pydantic validation
+    (all values come from already validated plugin results). Use
+    to_fraud_score() at the API or serialization boundary.
+
+    Attributes:
+        listing_id: ID of the analyzed listing
+        overall_score: Fraud score from 0.0 to 100.0
+        confidence: Overall confidence from 0.0 to 1.0
+        risk_level: safe, suspicious or fraud
+        signals: Signals meeting the confidence threshold
+        plugin_results: Results of the plugins that reported
+        processing_time_ms: Processing time in milliseconds
+        skipped: IDs of plugins skipped for missing their deadline
+        cascade_skipped: IDs of plugins not run because the risk level was settled
+        cached: IDs of plugins whose result came from the result cache
+    """
+
+    listing_id: str
+    overall_score: float
+    confidence: float
+    risk_level: str
+    signals: Tuple[RiskSignal, ...]
+    plugin_results: Tuple[DetectionResult, ...]
+    processing_time_ms: float
+    skipped: Tuple[str, ...] = ()
+    cascade_skipped: Tuple[str, ...] = ()
+    cached: Tuple[str, ...] = ()
+
+    @property
+    def metadata(self) -> Dict:
+        """FraudScore metadata (plugin counts, signal counts, skipped plugins)"""
+        return {
+            "plugins_executed": len(self.plugin_results),
+            "total_signals": len(self.signals),
+            "high_confidence_signals": sum(1 for s in self.signals if s.confidence > 0.8),
+            "plugin_scores": [{"plugin_id": r.plugin_id, "score": r.overall_score} for r in self.plugin_results],
+            "skipped_plugins": list(self.skipped),
+            "cascade_skipped": list(self.cascade_skipped),
+            "cached_plugins": list(self.cached),
+        }
+
+    def to_fraud_score(self) -> FraudScore:
+        """Build the FraudScore model, skipping re-validation.
+
+        Returns:
+            FraudScore with the same values
+        """
+        return FraudScore.model_construct(
+            listing_id=self.listing_id,
+            overall_score=self.overall_score,
+            confidence=self.confidence,
+            risk_level=self.risk_level,
+            signals=list(self.signals),
+            plugin_results=list(self.plugin_results),
+            processing_time_ms=self.processing_time_ms,
+            metadata=self.metadata,
+        )
+
+
+@dataclass
+class BatchFraudScores:
+    """Fraud scores for a batch of listings.
+
+    Holds the per-listing scores together with the same results as plain
+    columns (one entry per listing, in input order), which are cheaper to
+    bulk-store or analyze than thousands of models. FraudScore models are
+    only built when ``scores`` is first accessed.
+
+    Attributes:
+        records: Compact score per listing
+        listing_ids: Listing IDs
+        overall_scores: Fraud scores (0-100)
+        confidences: Overall confidences (0-1)
+        risk_levels: Risk levels
+        plugin_scores: Plugin ID -> plugin score per listing (None if the plugin failed)
+        processing_time_ms: Total processing time of the batch in milliseconds
+    """
+
+    records: List[ScoreRecord] = field(default_factory=list)
+    listing_ids: List[str] = field(default_factory=list)
+    overall_scores: List[float] = field(default_factory=list)
+    confidences: List[float] = field(default_factory=list)
+    risk_levels: List[str] = field(default_factory=list)
+    plugin_scores: Dict[str, List[Optional[float]]] = field(default_factory=dict)
+    processing_time_ms: float = 0.0
+    _scores: Optional[List[FraudScore]] = field(default=None, init=False, repr=False)
+
+    @property
+    def scores(self) -> List[FraudScore]:
+        """FraudScore per listing, built on first access"""
+        if self._scores is None:
+            self._scores = [record.to_fraud_score() for record in self.records]
+        return self._scores
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class _PluginEntry(NamedTuple):
+    """Indexed detection plugin"""
+
+    plugin_id: str
+    plugin: DetectionPlugin
+    weight: float
+    batched: bool  # Overrides analyze_batch()
+    timeout_ms: Optional[float]  # Deadline of one analyze() call
+    tier: int  # Cost tier, cheapest first in cascade mode
+    cache_key: str  # Result cache namespace (id, version, weight)
+    mode: str  # Execution mode: inline, thread or process
+
+
+class _Collected(NamedTuple):
+    """Plugin results of one listing, split up for aggregation"""
+
+    plugin_results: List[DetectionResult]  # Results that arrived
+    signals: List[RiskSignal]  # Signals meeting the confidence threshold
+    positions: List[int]  # Position of each known plugin's result in the input
+    plugin_ids: List[str]  # Known plugins that reported
+    weights: List[float]  # Their weights
+    scores: List[float]  # Their scores (0-1)
+    confidences: List[float]  # Their average signal confidence
+
+
+def _weighted_average(
+    weights: Sequence[float], scores: Sequence[float], confidences: Sequence[float]
+) -> Tuple[float, float]:
+    """Weighted average of plugin scores and confidences.
+
+    Args:
+        weights: Plugin weights
+        scores: Plugin scores (0-1), aligned with weights
+        confidences: Average signal confidence per plugin, aligned with weights
+
+    Returns:
+        Tuple of (overall_score, confidence) where score is 0-100
+    """
+    if not weights:
+        return 0.0, 0.0
+
+    # Normalize weights to sum to 1.0
+    total_weight = sum(weights)
+    if total_weight == 0:
+        return 0.0, 0.0
+
+    normalized_weights = [w / total_weight for w in weights]
+
+    # Compute weighted average score (0-1 scale)
+    weighted_score = sum(map(operator.mul, scores, normalized_weights))
+
+    # Compute weighted average confidence
+    weighted_confidence = sum(map(operator.mul, confidences, normalized_weights))
+
+    # Convert to 0-100 scale
+    return weighted_score * 100.0, weighted_confidence
+
+
+def _has_batch_hook(plugin: DetectionPlugin) -> bool:
+    """Check whether a plugin implements its own analyze_batch()"""
+    if isinstance(plugin, DetectionPluginWrapper):
+        plugin = plugin.wrapped_plugin
+    return type(plugin).analyze_batch is not DetectionPlugin.analyze_batch
+
+
 class RiskScoringOrchestrator:
     """Orchestrator for fraud detection plugins.
 
     Aggregates risk signals from multiple detection plugins and computes
     a final fraud score using weighted averaging.
 
+    Plugin IDs and weights are resolved once into an index that is only
+    rebuilt by register_plugin()/unregister_plugin(), refresh(), or when
+    the PluginManager the plugins come from reports a change (e.g. a new
+    weight). Scoring itself never calls get_metadata() or get_weight().
+
+    Plugins that miss their deadline, or are still running when the
+    scoring SLA expires, are skipped: the listing is scored with the
+    results that arrived and confidence is scaled down by the weight share
+    of the skipped plugins.
+
+    In cascade mode plugins run tier by tier, cheapest (lowest
+    get_cost_tier()) first. Once the partial score is provably outside the
+    suspicious band whatever the remaining plugins report, the remaining
+    tiers are skipped; the risk level is the same as with all plugins.
+
+    With a result cache, plugin results are reused for listings whose
+    fraud-relevant content was scored before by the same plugin version
+    and weight.
+
+    Plugins whose get_execution_mode() (or manifest ``execution.mode``) is
+    ``thread`` or ``process`` run on a PluginExecutor instead of the event
+    loop, so CPU-bound plugins run in parallel with each other and with
+    I/O-bound ones.
+
+    With a ScoreAggregator, plugin scores are combined by its method
+    (noisy-OR, max, logistic stacking, ...) instead of the weighted
+    average; run_batch() then aggregates the whole batch in one vectorized
+    call.
+
+    Shadow deployments (add_shadow()) run a candidate plugin, e.g. a new
+    version awaiting hot reload, on a sample of the listings scored. The
+    candidate runs in the background once the listing is scored and its
+    results are only recorded for comparison, never included in the score.
+
     Attributes:
         detection_plugins: List of registered detection plugins
         min_confidence_threshold: Minimum confidence to include a signal (default: 0.5)
+        plugin_manager: Optional source of detection plugins, followed on every change
+        plugin_timeout_ms: Default deadline of one analyze() call (None: no deadline)
+        scoring_sla_ms: Deadline for scoring one listing with run() (None: wait for all plugins)
+        cascade: Run plugins tier by tier and stop once the risk level is settled
+        result_cache: Optional cache of plugin results by listing content
+        executor: Runs thread- and process-mode plugins (created on demand)
+        aggregator: Combines plugin scores (None: weighted average)
     """
 
+    SUSPICIOUS_THRESHOLD = 30.0
+    FRAUD_THRESHOLD = 70.0
+
     def __init__(
         self,
         detection_plugins: Optional[List[DetectionPlugin]] = None,
         min_confidence_threshold: float = 0.5,
+        plugin_manager: Optional[PluginManager] = None,
+        plugin_timeout_ms: Optional[float] = None,
+        scoring_sla_ms: Optional[float] = None,
+        cascade: bool = False,
+        result_cache: Optional[DetectionResultCache] = None,
+        executor: Optional[PluginExecutor] = None,
+        aggregator: Optional[ScoreAggregator] = None,
     ):
         """Initialize the risk scoring orchestrator.
 
         Args:
             detection_plugins: List of detection plugins to use
             min_confidence_threshold: Minimum confidence for signal inclusion
+            plugin_manager: Load detection plugins (with configured weights) from this
+                manager and reload them whenever its epoch changes. Mutually
+                exclusive with ``detection_plugins``
+            plugin_timeout_ms: Deadline of one analyze() call for plugins whose
+                get_timeout_ms() returns None
+            scoring_sla_ms: Score with whatever results arrived after this long
+            cascade: Run cost tiers cheapest first and skip the rest once the
+                risk level is settled
+            result_cache: Reuse plugin results for unchanged listings
+            executor: Executor for thread- and process-mode plugins. If None,
+                one is created when such a plugin is registered and stopped
+                by shutdown()
+            aggregator: Combine plugin scores with this method instead of the
+                weighted average (e.g. loaded from a calibration config)
+
+        Raises:
+            ValueError: If a deadline is not positive, or both
+                ``detection_plugins`` and ``plugin_manager`` are given
         """
+        if detection_plugins is not None and plugin_manager is not None:
+            raise ValueError("Pass either detection_plugins or plugin_manager, not both")
+        for name, value in (("plugin_timeout_ms", plugin_timeout_ms), ("scoring_sla_ms", scoring_sla_ms)):
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, got {value}")
+
+        self.plugin_timeout_ms = plugin_timeout_ms
+        self.scoring_sla_ms = scoring_sla_ms
+        self.cascade = cascade
+        self.result_cache = result_cache
+        self.executor = executor
+        self._owns_executor = executor is None
+        self.aggregator = aggregator
+        self.plugin_manager = plugin_manager
+        self._epoch: Optional[int] = None
+        if plugin_manager is not None:
+            self._epoch = plugin_manager.epoch
+            detection_plugins = plugin_manager.get_detection_plugins()
+
         self.detection_plugins = detection_plugins or []
         self.min_confidence_threshold = min_confidence_threshold
+
+        self._entries: Tuple[_PluginEntry, ...] = ()
+        self._index: Dict[str, Tuple[DetectionPlugin, float]] = {}
+        self._total_weight = 0.0
+        self._tiers: Tuple[Tuple[_PluginEntry, ...], ...] = ()
+        self._tail_weights: Tuple[float, ...] = ()
+        self._tail_entries: Tuple[Tuple[_PluginEntry, ...], ...] = ()
+        # Live plugin ID -> (deployment, entry running the candidate)
+        self._shadows: Dict[str, Tuple[ShadowDeployment, _PluginEntry]] = {}
+        self._shadow_tasks: Set[asyncio.Future] = set()
+        self.refresh()
         logger.info(f"Initialized RiskScoringOrchestrator with {len(self.detection_plugins)} plugins")
 
+    def refresh(self) -> None:
+        """Rebuild the plugin ID -> (plugin, weight) index.
+
+        Called automatically on registration changes; call it after
+        modifying ``detection_plugins`` directly or changing a plugin's weight.
+        """
+        entries = []
+        index: Dict[str, Tuple[DetectionPlugin, float]] = {}
+        for plugin in self.detection_plugins:
+            entry = self._build_entry(plugin)
+            entries.append(entry)
+            # First registration wins, as with a linear search
+            index.setdefault(entry.plugin_id, (plugin, entry.weight))
+
+        self._entries = tuple(entries)
+        self._index = index
+        self._total_weight = sum(weight for _, weight in index.values())
+
+        # Without cascade all plugins form a single tier
+        if self.cascade:
+            ordered = sorted(entries, key=lambda entry: entry.tier)
+            self._tiers = tuple(tuple(tier) for _, tier in groupby(ordered, key=lambda entry: entry.tier))
+        else:
+            self._tiers = (self._entries,) if entries else ()
+
+        # Weight of the tiers after each tier, as counted by _compute_weighted_score()
+        tier_weights = [sum(index[entry.plugin_id][1] for entry in tier) for tier in self._tiers]
+        self._tail_weights = tuple(sum(tier_weights[n + 1 :]) for n in range(len(tier_weights)))
+        self._tail_entries = tuple(
+            tuple(entry for later in self._tiers[n + 1 :] for entry in later) for n in range(len(self._tiers))
+        )
+
+        self._prepare_executor()
+
+    def _build_entry(self, plugin: DetectionPlugin, plugin_id: Optional[str] = None) -> _PluginEntry:
+        """Resolve a plugin's ID, weight, deadline, tier and execution mode once"""
+        metadata = plugin.get_metadata()
+        if plugin_id is None:
+            plugin_id = metadata.get("id", "unknown")
+        weight = float(plugin.get_weight())
+        timeout_ms = plugin.get_timeout_ms()
+        if timeout_ms is None:
+            timeout_ms = self.plugin_timeout_ms
+        mode = plugin.get_execution_mode()
+        if mode not in EXECUTION_MODES:
+            logger.warning(f"Detection plugin {plugin_id} has unknown execution mode '{mode}', running inline")
+            mode = INLINE
+        return _PluginEntry(
+            plugin_id,
+            plugin,
+            weight,
+            _has_batch_hook(plugin),
+            timeout_ms,
+            plugin.get_cost_tier(),
+            plugin_key(plugin_id, str(metadata.get("version", "")), weight),
+            mode,
+        )
+
+    def _prepare_executor(self) -> None:
+        """Warm up worker pools of process-mode plugins and stop unused ones"""
+        shadow_entries = [entry for _, entry in self._shadows.values()]
+        off_loop = [entry for entry in (*self._entries, *shadow_entries) if entry.mode != INLINE]
+        if off_loop and self.executor is None:
+            self.executor = PluginExecutor()
+        if self.executor is None:
+            return
+
+        process_ids = set()
+        for entry in off_loop:
+            if entry.mode == PROCESS and entry.plugin_id not in process_ids:
+                process_ids.add(entry.plugin_id)
+                self.executor.prepare(entry.plugin_id, entry.plugin)
+        self.executor.retain(process_ids)
+
+    def shutdown(self) -> None:
+        """Stop the worker pools of thread- and process-mode plugins.
+
+        An executor passed to the constructor is left running for its owner.
+        """
+        if self.executor is not None and self._owns_executor:
+            self.executor.shutdown()
+            self.executor = None
+
+    def _get_entries(self) -> Tuple[_PluginEntry, ...]:
+        """Get indexed plugins, reloading them if the plugin manager changed"""
+        manager = self.plugin_manager
+        if manager is not None and self._epoch is not None and manager.epoch != self._epoch:
+            self._epoch = manager.epoch
+            self.detection_plugins = manager.get_detection_plugins()
+            self.refresh()
+            if self.result_cache is not None:
+                # Reloaded code may score differently even under the same version
+                self.result_cache.invalidate()
+            logger.info(f"Reloaded {len(self.detection_plugins)} detection plugins (epoch {self._epoch})")
+        return self._entries
+
+    def _get_tiers(self) -> Tuple[Tuple[_PluginEntry, ...], ...]:
+        """Get plugins grouped into execution tiers"""
+        self._get_entries()
+        return self._tiers
+
+    def get_weights(self) -> Dict[str, float]:
+        """Get the weight of each indexed plugin.
+
+        Returns:
+            Plugin ID -> weight, in registration order
+        """
+        self._get_entries()
+        return {plugin_id: weight for plugin_id, (_, weight) in self._index.items()}
+
     def register_plugin(self, plugin: DetectionPlugin) -> None:
         """Register a detection plugin.
 
@@ -73,6 +469,7 @@ class RiskScoringOrchestrator:
         """
         if plugin not in self.detection_plugins:
             self.detection_plugins.append(plugin)
+            self.refresh()
             metadata = plugin.get_metadata()
             logger.info(f"Registered detection plugin: {metadata.get('id')}")
 
@@ -85,13 +482,82 @@ class RiskScoringOrchestrator:
         Returns:
             True if plugin was removed, False if not found
         """
-        for plugin in self.detection_plugins:
-            metadata = plugin.get_metadata()
-            if metadata.get("id") == plugin_id:
-                self.detection_plugins.remove(plugin)
-                logger.info(f"Unregistered detection plugin: {plugin_id}")
-                return True
-        return False
+        entry = self._index.get(plugin_id)
+        if entry is None or entry[0] not in self.detection_plugins:
+            return False
+
+        self.detection_plugins.remove(entry[0])
+        self.refresh()
+        logger.info(f"Unregistered detection plugin: {plugin_id}")
+        return True
+
+    def add_shadow(
+        self,
+        plugin: DetectionPlugin,
+        plugin_id: Optional[str] = None,
+        sample_rate: float = 1.0,
+        max_records: int = 10_000,
+        max_in_flight: int = 4,
+    ) -> ShadowDeployment:
+        """Shadow a live plugin with a candidate plugin.
+
+        The candidate runs on the sampled listings after they are scored;
+        its results are compared with the live plugin's and recorded in the
+        returned deployment, never included in scores. A candidate already
+        shadowing the same plugin is replaced.
+
+        Args:
+            plugin: Candidate plugin, e.g. a new version of a live plugin
+            plugin_id: ID of the live plugin to compare with (default: the
+                candidate's own ID)
+            sample_rate: Share of listings to shadow (0-1]
+            max_records: Number of recent comparisons kept for statistics
+            max_in_flight: Maximum number of pending shadow runs; sampled
+                listings beyond it are dropped and counted
+
+        Returns:
+            Deployment collecting the comparisons
+
+        Raises:
+            ValueError: If sample_rate, max_records or max_in_flight is out of range
+        """
+        if plugin_id is None:
+            plugin_id = plugin.get_metadata().get("id", "unknown")
+        deployment = ShadowDeployment(
+            plugin, plugin_id, sample_rate=sample_rate, max_records=max_records, max_in_flight=max_in_flight
+        )
+        self._shadows[plugin_id] = (deployment, self._build_entry(plugin, f"shadow:{plugin_id}"))
+        self._prepare_executor()
+        logger.info(
+            f"Shadowing detection plugin {plugin_id} with version {deployment.candidate_version} "
+            f"on {sample_rate:.0%} of listings"
+        )
+        return deployment
+
+    def remove_shadow(self, plugin_id: str) -> Optional[ShadowDeployment]:
+        """Stop shadowing a live plugin.
+
+        Args:
+            plugin_id: ID of the live plugin
+
+        Returns:
+            The removed deployment with its comparisons, or None if there was none
+        """
+        removed = self._shadows.pop(plugin_id, None)
+        if removed is None:
+            return None
+        self._prepare_executor()
+        logger.info(f"Stopped shadowing detection plugin {plugin_id}")
+        return removed[0]
+
+    def get_shadows(self) -> Dict[str, ShadowDeployment]:
+        """Get the shadow deployments by live plugin ID"""
+        return {plugin_id: deployment for plugin_id, (deployment, _) in self._shadows.items()}
+
+    async def drain_shadows(self) -> None:
+        """Wait until all shadow runs started so far are recorded"""
+        while self._shadow_tasks:
+            await asyncio.gather(*list(self._shadow_tasks), return_exceptions=True)
 
     async def run(self, listing: Dict) -> FraudScore:
         """Analyze listing and compute fraud score.
@@ -105,146 +571,737 @@ class RiskScoringOrchestrator:
         Returns:
             FraudScore with overall score and risk signals
         """
+        record = await self.run_compact(listing)
+        return record.to_fraud_score()
+
+    async def run_compact(self, listing: Dict) -> ScoreRecord:
+        """Analyze listing like run(), returning a compact ScoreRecord.
+
+        Cheaper for internal callers that only need the score, risk level
+        or signals; call ScoreRecord.to_fraud_score() when a model is needed.
+
+        Args:
+            listing: Listing data to analyze
+
+        Returns:
+            ScoreRecord with overall score and risk signals
+        """
         start_time = time.time()
         listing_id = listing.get("listing_id", "unknown")
 
         logger.info(f"Starting fraud analysis for listing: {listing_id}")
 
-        # Run all detection plugins concurrently
-        plugin_results: List[DetectionResult] = []
-        all_signals: List[RiskSignal] = []
-
-        # Create tasks for all plugins
-        async def run_plugin_safe(plugin: DetectionPlugin) -> Optional[DetectionResult]:
-            """Run plugin with error handling."""
-            try:
-                metadata = plugin.get_metadata()
-                plugin_id = metadata.get("id", "unknown")
+        tiers = self._get_tiers()
+        deadline = None if self.scoring_sla_ms is None else time.monotonic() + self.scoring_sla_ms / 1000
+        timed_out: Set[str] = set()
+        executed: List[_PluginEntry] = []
+        results: List[Optional[DetectionResult]] = []
+        cascade_skipped: List[str] = []
+        cached: List[str] = []
+        fingerprint = self.result_cache.fingerprint(listing) if self.result_cache is not None else None
 
-                logger.debug(f"Running detection plugin: {plugin_id}")
-                result = await plugin.analyze(listing)
+        # Run tiers cheapest first, stopping once the risk level is settled
+        for n, tier in enumerate(tiers):
+            executed.extend(tier)
+            results.extend(await self._run_tier(tier, listing, listing_id, timed_out, deadline, fingerprint, cached))
 
+            if n + 1 < len(tiers) and self._is_decided(results, n):
+                cascade_skipped = [entry.plugin_id for later in tiers[n + 1 :] for entry in later]
                 logger.debug(
-                    f"Plugin {plugin_id}: score={result.overall_score:.2f}, "
-                    f"signals={len(result.signals)}, time={result.processing_time_ms:.1f}ms"
+                    f"Risk level of {listing_id} settled after tier {n}, skipping {len(cascade_skipped)} plugins"
                 )
-                return result
+                break
 
-            except Exception as e:
-                plugin_id = plugin.get_metadata().get("id", "unknown")
-                logger.error(f"Error running detection plugin {plugin_id}: {e}", exc_info=True)
-                return None
+        skipped = [entry.plugin_id for entry in executed if entry.plugin_id in timed_out]
+
+        # Calculate total processing time
+        processing_time_ms = (time.time() - start_time) * 1000
 
-        # Execute all plugins concurrently
-        import asyncio
+        record = self._aggregate(listing_id, results, processing_time_ms, skipped, cascade_skipped, cached)
+        if self._shadows:
+            self._start_shadows([listing], [record], lambda _: (executed, results))
 
-        results = await asyncio.gather(
-            *[run_plugin_safe(plugin) for plugin in self.detection_plugins],
-            return_exceptions=False,
+        logger.info(
+            f"Fraud analysis complete for {listing_id}: "
+            f"score={record.overall_score:.1f}, risk={record.risk_level}, "
+            f"signals={len(record.signals)}, time={processing_time_ms:.1f}ms"
         )
 
-        # Process results and collect signals
-        for result in results:
+        return record
+
+    async def _run_tier(
+        self,
+        tier: Sequence[_PluginEntry],
+        listing: Dict,
+        listing_id: str,
+        timed_out: Set[str],
+        deadline: Optional[float],
+        fingerprint: Optional[str],
+        cached: List[str],
+    ) -> List[Optional[DetectionResult]]:
+        """Run a tier of plugins on one listing, serving cached results where possible.
+
+        Args:
+            tier: Plugins to run
+            listing: Listing data to analyze
+            listing_id: ID of the listing, for logging
+            timed_out: Collects IDs of plugins that missed a deadline
+            deadline: time.monotonic() value of the scoring SLA, or None
+            fingerprint: Listing fingerprint for the result cache, or None
+            cached: Collects IDs of plugins served from the cache
+
+        Returns:
+            Plugin results aligned with ``tier`` (None for failed or skipped plugins)
+        """
+        cache = self.result_cache
+        if fingerprint is None or cache is None:
+            return await self._run_plugins(tier, listing, listing_id, timed_out, deadline)
+
+        results = [cache.get(entry.cache_key, fingerprint) for entry in tier]
+        misses = [i for i, result in enumerate(results) if result is None]
+        cached.extend(entry.plugin_id for entry, result in zip(tier, results) if result is not None)
+        if not misses:
+            return results
+
+        fresh = await self._run_plugins([tier[i] for i in misses], listing, listing_id, timed_out, deadline)
+        for i, result in zip(misses, fresh):
             if result is not None:
-                plugin_results.append(result)
+                cache.put(tier[i].cache_key, fingerprint, result)
+            results[i] = result
+        return results
 
-                # Collect signals that meet confidence threshold
-                for signal in result.signals:
-                    if signal.confidence >= self.min_confidence_threshold:
-                        all_signals.append(signal)
+    async def _run_plugins(
+        self,
+        tier: Sequence[_PluginEntry],
+        listing: Dict,
+        listing_id: str,
+        timed_out: Set[str],
+        deadline: Optional[float],
+    ) -> List[Optional[DetectionResult]]:
+        """Run plugins concurrently on one listing, abandoning them at the deadline.
 
-        # Compute weighted fraud score
-        overall_score, confidence = self._compute_weighted_score(plugin_results)
+        Args:
+            tier: Plugins to run
+            listing: Listing data to analyze
+            listing_id: ID of the listing, for logging
+            timed_out: Collects IDs of plugins that missed a deadline
+            deadline: time.monotonic() value of the scoring SLA, or None
 
-        # Determine risk level
-        risk_level = self._determine_risk_level(overall_score)
+        Returns:
+            Plugin results aligned with ``tier`` (None for failed or skipped plugins)
+        """
+        if deadline is None or not tier:
+            return await asyncio.gather(
+                *[self._run_plugin_safe(entry, listing, listing_id, timed_out) for entry in tier]
+            )
 
-        # Calculate total processing time
-        processing_time_ms = (time.time() - start_time) * 1000
+        remaining_s = deadline - time.monotonic()
+        if remaining_s <= 0:
+            # Earlier tiers used up the SLA
+            timed_out.update(entry.plugin_id for entry in tier)
+            return [None] * len(tier)
 
-        # Build metadata
-        metadata = {
-            "plugins_executed": len(plugin_results),
-            "total_signals": len(all_signals),
-            "high_confidence_signals": sum(1 for s in all_signals if s.confidence > 0.8),
-            "plugin_scores": [{"plugin_id": r.plugin_id, "score": r.overall_score} for r in plugin_results],
-        }
+        tasks = [asyncio.ensure_future(self._run_plugin_safe(entry, listing, listing_id, timed_out)) for entry in tier]
+        _, pending = await asyncio.wait(tasks, timeout=remaining_s)
 
-        fraud_score = FraudScore(
-            listing_id=listing_id,
-            overall_score=overall_score,
-            confidence=confidence,
-            risk_level=risk_level,
-            signals=all_signals,
-            plugin_results=plugin_results,
-            processing_time_ms=processing_time_ms,
-            metadata=metadata,
+        # Score with what arrived; abandon the rest
+        results: List[Optional[DetectionResult]] = []
+        for entry, task in zip(tier, tasks):
+            if task in pending:
+                task.cancel()
+                timed_out.add(entry.plugin_id)
+                results.append(None)
+            else:
+                results.append(task.result())
+
+        if pending:
+            logger.warning(
+                f"Scoring SLA of {self.scoring_sla_ms:.0f}ms expired for {listing_id}, skipping {len(pending)} plugins"
+            )
+        return results
+
+    async def _run_plugin_safe(
+        self, entry: _PluginEntry, listing: Dict, listing_id: str, timed_out: Set[str]
+    ) -> Optional[DetectionResult]:
+        """Run plugin with error handling."""
+        plugin_id = entry.plugin_id
+        try:
+            logger.debug(f"Running detection plugin: {plugin_id}")
+            result = await self._analyze(entry, listing)
+
+            logger.debug(
+                f"Plugin {plugin_id}: score={result.overall_score:.2f}, "
+                f"signals={len(result.signals)}, time={result.processing_time_ms:.1f}ms"
+            )
+            return result
+
+        except _DeadlineExceeded:
+            logger.warning(
+                f"Detection plugin {plugin_id} exceeded its {entry.timeout_ms:.0f}ms deadline "
+                f"for {listing_id}, skipping"
+            )
+            timed_out.add(plugin_id)
+            return None
+
+        except Exception as e:
+            logger.error(f"Error running detection plugin {plugin_id}: {e}", exc_info=True)
+            return None
+
+    async def run_batch(self, listings: Sequence[Dict], max_concurrency: int = 64) -> BatchFraudScores:
+        """Analyze many listings and compute their fraud scores.
+
+        Plugins that override analyze_batch() receive the whole batch in one
+        call. All other plugins are called per listing, with at most
+        ``max_concurrency`` analyze() calls in flight across all plugins.
+        A plugin failing on the batch is skipped for every listing in it.
+        In cascade mode each tier only receives the listings whose risk
+        level is still open.
+
+        Plugin deadlines apply to each analyze() call; an analyze_batch()
+        call gets the deadline times the number of listings. The scoring
+        SLA is not applied to batches.
+
+        Args:
+            listings: Listing data to analyze
+            max_concurrency: Limit for concurrent per-listing plugin calls
+
+        Returns:
+            BatchFraudScores with one score per listing, in input order.
+            Per-listing processing_time_ms is the batch time divided evenly.
+
+        Raises:
+            ValueError: If max_concurrency is not positive
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be positive, got {max_concurrency}")
+
+        listings = list(listings)
+        if not listings:
+            return BatchFraudScores()
+
+        start_time = time.time()
+        tiers = self._get_tiers()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        logger.info(f"Starting fraud analysis for {len(listings)} listings")
+
+        # Listing index -> IDs of plugins that missed their deadline / were not needed / were cached
+        timed_out: Dict[int, List[str]] = {}
+        cascade_skipped: Dict[int, List[str]] = {}
+        cached: Dict[int, List[str]] = {}
+        cache = self.result_cache
+        fingerprints = [cache.fingerprint(listing) for listing in listings] if cache is not None else None
+
+        async def analyze_one(entry: _PluginEntry, i: int) -> Optional[DetectionResult]:
+            """Run plugin on one listing with error handling."""
+            async with semaphore:
+                try:
+                    return await self._analyze(entry, listings[i])
+                except _DeadlineExceeded:
+                    timed_out.setdefault(i, []).append(entry.plugin_id)
+                    return None
+                except Exception as e:
+                    logger.error(
+                        f"Error running detection plugin {entry.plugin_id} on "
+                        f"{listings[i].get('listing_id', 'unknown')}: {e}",
+                        exc_info=True,
+                    )
+                    return None
+
+        async def analyze_cached(entry: _PluginEntry, active: List[int]) -> List[Optional[DetectionResult]]:
+            """Serve cached results and run plugin on the rest."""
+            if fingerprints is None:
+                return await analyze_all(entry, active)
+
+            results = [cache.get(entry.cache_key, fingerprints[i]) for i in active]
+            misses = [n for n, result in enumerate(results) if result is None]
+            for i, result in zip(active, results):
+                if result is not None:
+                    cached.setdefault(i, []).append(entry.plugin_id)
+            if not misses:
+                return results
+
+            fresh = await analyze_all(entry, [active[n] for n in misses])
+            for n, result in zip(misses, fresh):
+                if result is not None:
+                    cache.put(entry.cache_key, fingerprints[active[n]], result)
+                results[n] = result
+            return results
+
+        async def analyze_all(entry: _PluginEntry, active: List[int]) -> List[Optional[DetectionResult]]:
+            """Run plugin on the listings of the batch that still need it."""
+            if not entry.batched:
+                return await asyncio.gather(*[analyze_one(entry, i) for i in active])
+
+            try:
+                results = list(
+                    await self._within_deadline(
+                        self._analyze_batch(entry, [listings[i] for i in active]), entry.timeout_ms, len(active)
+                    )
+                )
+                if len(results) != len(active):
+                    raise ValueError(f"returned {len(results)} results for {len(active)} listings")
+                return results
+            except _DeadlineExceeded:
+                logger.warning(f"Detection plugin {entry.plugin_id} exceeded its deadline for the batch, skipping")
+                for i in active:
+                    timed_out.setdefault(i, []).append(entry.plugin_id)
+                return [None] * len(active)
+            except Exception as e:
+                logger.error(f"Error running detection plugin {entry.plugin_id} on batch: {e}", exc_info=True)
+                return [None] * len(active)
+
+        # One column per plugin, one row per listing
+        columns: List[Tuple[_PluginEntry, List[Optional[DetectionResult]]]] = [
+            (entry, [None] * len(listings)) for tier in tiers for entry in tier
+        ]
+        column = 0
+        active = list(range(len(listings)))
+
+        for n, tier in enumerate(tiers):
+            tier_results = await asyncio.gather(*[analyze_cached(entry, active) for entry in tier])
+            for results in tier_results:
+                values = columns[column][1]
+                for i, result in zip(active, results):
+                    values[i] = result
+                column += 1
+
+            if n + 1 < len(tiers):
+                undecided = []
+                for i in active:
+                    if self._is_decided([values[i] for _, values in columns[:column]], n):
+                        cascade_skipped[i] = [entry.plugin_id for entry, _ in columns[column:]]
+                    else:
+                        undecided.append(i)
+                active = undecided
+                if not active:
+                    break
+
+        if timed_out:
+            logger.warning(f"Detection plugins missed their deadline for {len(timed_out)} listings")
+
+        batch_time_ms = (time.time() - start_time) * 1000
+        per_listing_ms = batch_time_ms / len(listings)
+
+        batch = BatchFraudScores(
+            plugin_scores={
+                entry.plugin_id: [r.overall_score if r is not None else None for r in values]
+                for entry, values in columns
+            },
         )
+        collected = [self._collect([values[i] for _, values in columns]) for i in range(len(listings))]
+        if self.aggregator is None:
+            aggregated = [_weighted_average(c.weights, c.scores, c.confidences) for c in collected]
+        else:
+            aggregated = self._aggregate_columns([entry.plugin_id for entry, _ in columns], collected)
+        for i, listing in enumerate(listings):
+            record = self._build_record(
+                listing.get("listing_id", "unknown"),
+                collected[i],
+                aggregated[i],
+                per_listing_ms,
+                timed_out.get(i, ()),
+                cascade_skipped.get(i, ()),
+                cached.get(i, ()),
+            )
+            batch.records.append(record)
+            batch.listing_ids.append(record.listing_id)
+            batch.overall_scores.append(record.overall_score)
+            batch.confidences.append(record.confidence)
+            batch.risk_levels.append(record.risk_level)
+
+        batch.processing_time_ms = (time.time() - start_time) * 1000
+        if self._shadows:
+            entries = [entry for entry, _ in columns]
+            self._start_shadows(
+                listings, batch.records, lambda i: (entries, [values[i] for _, values in columns]), max_concurrency
+            )
 
         logger.info(
-            f"Fraud analysis complete for {listing_id}: "
-            f"score={overall_score:.1f}, risk={risk_level}, "
-            f"signals={len(all_signals)}, time={processing_time_ms:.1f}ms"
+            f"Fraud analysis complete for {len(listings)} listings: "
+            f"fraud={batch.risk_levels.count('fraud')}, suspicious={batch.risk_levels.count('suspicious')}, "
+            f"time={batch.processing_time_ms:.1f}ms"
         )
 
-        return fraud_score
+        return batch
 
-    def _compute_weighted_score(self, plugin_results: List[DetectionResult]) -> tuple[float, float]:
-        """Compute weighted average fraud score from plugin results.
+    def _start_shadows(
+        self,
+        listings: Sequence[Dict],
+        records: Sequence[ScoreRecord],
+        live_results: Callable[[int], Tuple[Sequence[_PluginEntry], Sequence[Optional[DetectionResult]]]],
+        max_concurrency: int = 64,
+    ) -> None:
+        """Start shadow runs for the sampled listings in the background.
+
+        A deployment whose shadow runs are all still pending drops the
+        sampled listings instead of queueing another run.
 
         Args:
-            plugin_results: Results from detection plugins
+            listings: Scored listings
+            records: Their scores
+            live_results: Listing index -> (plugins run, their results)
+            max_concurrency: Limit for concurrent candidate calls per shadow run
+        """
+        for deployment, entry in self._shadows.values():
+            sampled = [i for i, record in enumerate(records) if deployment.samples(record.listing_id)]
+            if not sampled:
+                continue
+            if not deployment.begin_run(len(sampled)):
+                logger.debug(f"Shadow runs of {deployment.plugin_id} saturated, dropped {len(sampled)} listings")
+                continue
+            live = [(records[i], *live_results(i)) for i in sampled]
+            task = asyncio.ensure_future(
+                self._run_shadow(deployment, entry, [listings[i] for i in sampled], live, max_concurrency)
+            )
+            self._shadow_tasks.add(task)
+            task.add_done_callback(self._shadow_tasks.discard)
+
+    async def _run_shadow(
+        self,
+        deployment: ShadowDeployment,
+        entry: _PluginEntry,
+        listings: List[Dict],
+        live: List[Tuple[Any, ...]],
+        max_concurrency: int,
+    ) -> None:
+        """Run a candidate on listings and record its comparison with the live results"""
+        try:
+            outcomes = await self._analyze_shadow(entry, listings, max_concurrency)
+            for (record, entries, results), (result, error) in zip(live, outcomes):
+                deployment.record(self._compare_shadow(deployment, record, entries, results, result, error))
+        except Exception as e:
+            logger.error(f"Shadow scoring of detection plugin {deployment.plugin_id} failed: {e}", exc_info=True)
+        finally:
+            deployment.end_run()
+
+    async def _analyze_shadow(
+        self, entry: _PluginEntry, listings: List[Dict], max_concurrency: int
+    ) -> List[Tuple[Optional[DetectionResult], Optional[str]]]:
+        """Run a candidate plugin, returning (result, error) per listing"""
+        if entry.batched and len(listings) > 1:
+            try:
+                results = list(
+                    await self._within_deadline(self._analyze_batch(entry, listings), entry.timeout_ms, len(listings))
+                )
+                if len(results) != len(listings):
+                    raise ValueError(f"returned {len(results)} results for {len(listings)} listings")
+                return [(result, None) for result in results]
+            except _DeadlineExceeded:
+                return [(None, "timeout")] * len(listings)
+            except Exception as e:
+                return [(None, str(e) or type(e).__name__)] * len(listings)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def analyze_one(listing: Dict) -> Tuple[Optional[DetectionResult], Optional[str]]:
+            async with semaphore:
+                try:
+                    return await self._analyze(entry, listing), None
+                except _DeadlineExceeded:
+                    return None, "timeout"
+                except Exception as e:
+                    return None, str(e) or type(e).__name__
+
+        return list(await asyncio.gather(*[analyze_one(listing) for listing in listings]))
+
+    def _compare_shadow(
+        self,
+        deployment: ShadowDeployment,
+        record: ScoreRecord,
+        entries: Sequence[_PluginEntry],
+        results: Sequence[Optional[DetectionResult]],
+        shadow_result: Optional[DetectionResult],
+        error: Optional[str],
+    ) -> ShadowComparison:
+        """Compare a candidate's result with the live plugin's for one listing.
+
+        The counterfactual fraud score puts the candidate's result in place
+        of the live plugin's, with the live plugin's weight.
+        """
+        position: Optional[int] = None
+        live_result: Optional[DetectionResult] = None
+        for n, entry in enumerate(entries):
+            if entry.plugin_id == deployment.plugin_id:
+                position, live_result = n, results[n]
+                break
+
+        shadow_overall: Optional[float] = None
+        shadow_risk_level: Optional[str] = None
+        if position is not None and live_result is not None and shadow_result is not None:
+            counted = shadow_result
+            if counted.plugin_id != deployment.plugin_id:
+                counted = counted.model_copy(update={"plugin_id": deployment.plugin_id})
+            swapped = list(results)
+            swapped[position] = counted
+            shadow_overall, _ = self._score(self._collect(swapped))
+            shadow_risk_level = self._determine_risk_level(shadow_overall)
+
+        return ShadowComparison(
+            listing_id=record.listing_id,
+            live_score=live_result.overall_score if live_result is not None else None,
+            shadow_score=shadow_result.overall_score if shadow_result is not None else None,
+            live_time_ms=live_result.processing_time_ms if live_result is not None else None,
+            shadow_time_ms=shadow_result.processing_time_ms if shadow_result is not None else None,
+            live_overall=record.overall_score,
+            shadow_overall=shadow_overall,
+            live_risk_level=record.risk_level,
+            shadow_risk_level=shadow_risk_level,
+            error=error,
+        )
+
+    def _is_decided(self, results: Sequence[Optional[DetectionResult]], tier: int) -> bool:
+        """Check whether plugins not run yet can still change the risk level.
+
+        Whatever the remaining plugins report (or if they fail), the final
+        score lies between the scores obtained with all of them reporting
+        0.0 and all of them reporting 1.0. If both bounds are below the
+        suspicious threshold, or both at or above the fraud threshold, the
+        risk level is settled. With an aggregator that is not monotone the
+        bounds do not hold and all tiers run.
+
+        Args:
+            results: Results of the plugins run so far (None for failed plugins)
+            tier: Index of the last tier run
 
         Returns:
-            Tuple of (overall_score, confidence) where score is 0-100
+            True if the risk level cannot leave the "safe" or "fraud" band
         """
-        if not plugin_results:
+        if self.aggregator is not None:
+            lower, upper = self._aggregator_bounds(results, self._tail_entries[tier])
+        else:
+            lower, upper = self._weighted_bounds(results, self._tail_weights[tier])
+        return upper < self.SUSPICIOUS_THRESHOLD - _BOUND_MARGIN or lower >= self.FRAUD_THRESHOLD + _BOUND_MARGIN
+
+    def _weighted_bounds(
+        self, results: Sequence[Optional[DetectionResult]], remaining_weight: float
+    ) -> Tuple[float, float]:
+        """Bounds of the weighted average given the weight of the plugins not run yet"""
+        index = self._index
+        known_weight = 0.0
+        weighted_sum = 0.0
+        for result in results:
+            if result is None:
+                continue
+            entry = index.get(result.plugin_id)
+            if entry is not None:
+                known_weight += entry[1]
+                weighted_sum += entry[1] * result.overall_score
+
+        total_weight = known_weight + remaining_weight
+        if total_weight <= 0:
             return 0.0, 0.0
 
-        # Get plugin weights
-        weights = []
-        scores = []
-        confidences = []
+        return weighted_sum / total_weight * 100.0, (weighted_sum + remaining_weight) / total_weight * 100.0
 
-        for result in plugin_results:
-            # Find corresponding plugin to get weight
-            plugin = next(
-                (p for p in self.detection_plugins if p.get_metadata().get("id") == result.plugin_id),
-                None,
-            )
+    def _aggregator_bounds(
+        self, results: Sequence[Optional[DetectionResult]], remaining: Sequence[_PluginEntry]
+    ) -> Tuple[float, float]:
+        """Bounds of the aggregated score with the remaining plugins reporting 0.0 and 1.0"""
+        collected = self._collect(results)
+        if not self.aggregator.monotone or not any(weight > 0 for weight in collected.weights):
+            # No bounds: nothing known yet, or more evidence may lower the score
+            return 0.0, 100.0
+
+        plugin_ids = collected.plugin_ids + [entry.plugin_id for entry in remaining]
+        weights = collected.weights + [self._index[entry.plugin_id][1] for entry in remaining]
+        scores = [collected.scores + [0.0] * len(remaining), collected.scores + [1.0] * len(remaining)]
+        overall, _ = self.aggregator.aggregate(
+            plugin_ids, weights, scores, np.zeros((2, len(plugin_ids))), np.ones((2, len(plugin_ids)), dtype=bool)
+        )
+        return float(overall[0]), float(overall[1])
 
-            if plugin:
-                weight = plugin.get_weight()
-                weights.append(weight)
-                scores.append(result.overall_score)
+    def _aggregate(
+        self,
+        listing_id: str,
+        results: Sequence[Optional[DetectionResult]],
+        processing_time_ms: float,
+        skipped: Sequence[str] = (),
+        cascade_skipped: Sequence[str] = (),
+        cached: Sequence[str] = (),
+    ) -> ScoreRecord:
+        """Aggregate plugin results for one listing.
 
-                # Calculate average confidence from signals
-                if result.signals:
-                    avg_confidence = sum(s.confidence for s in result.signals) / len(result.signals)
-                    confidences.append(avg_confidence)
-                else:
-                    confidences.append(0.0)
+        Args:
+            listing_id: ID of the analyzed listing
+            results: Plugin results (None for failed or skipped plugins)
+            processing_time_ms: Processing time to report
+            skipped: IDs of plugins skipped for missing their deadline
+            cascade_skipped: IDs of plugins not run because the risk level was settled
+            cached: IDs of plugins whose result came from the result cache
 
-        if not weights:
-            return 0.0, 0.0
+        Returns:
+            ScoreRecord for the listing
+        """
+        collected = self._collect(results)
+        return self._build_record(
+            listing_id, collected, self._score(collected), processing_time_ms, skipped, cascade_skipped, cached
+        )
+
+    def _collect(self, results: Sequence[Optional[DetectionResult]]) -> _Collected:
+        """Split plugin results of one listing up in a single pass.
+
+        Collects signals meeting the confidence threshold and, per known
+        plugin, weight, score and average signal confidence.
+
+        Args:
+            results: Plugin results (None for failed or skipped plugins)
+
+        Returns:
+            Collected results
+        """
+        index = self._index
+        threshold = self.min_confidence_threshold
+        collected = _Collected([], [], [], [], [], [], [])
+        all_signals = collected.signals
+
+        for position, result in enumerate(results):
+            if result is None:
+                continue
+            collected.plugin_results.append(result)
+
+            signals = result.signals
+            confidence_sum = 0.0
+            for signal in signals:
+                confidence_sum += signal.confidence
+                if signal.confidence >= threshold:
+                    all_signals.append(signal)
+
+            entry = index.get(result.plugin_id)
+            if entry is not None:
+                collected.positions.append(position)
+                collected.plugin_ids.append(result.plugin_id)
+                collected.weights.append(entry[1])
+                collected.scores.append(result.overall_score)
+                collected.confidences.append(confidence_sum / len(signals) if signals else 0.0)
+
+        return collected
 
-        # Normalize weights to sum to 1.0
-        total_weight = sum(weights)
-        if total_weight == 0:
+    def _score(self, collected: _Collected) -> Tuple[float, float]:
+        """Combine the collected results of one listing into (overall_score, confidence)"""
+        if self.aggregator is None:
+            return _weighted_average(collected.weights, collected.scores, collected.confidences)
+        if not collected.scores:
             return 0.0, 0.0
 
-        normalized_weights = [w / total_weight for w in weights]
+        overall, confidence = self.aggregator.aggregate(
+            collected.plugin_ids,
+            collected.weights,
+            [collected.scores],
+            [collected.confidences],
+            np.ones((1, len(collected.scores)), dtype=bool),
+        )
+        return float(overall[0]), float(confidence[0])
+
+    def _aggregate_columns(
+        self, plugin_ids: Sequence[str], collected: Sequence[_Collected]
+    ) -> List[Tuple[float, float]]:
+        """Aggregate a batch with the aggregator in one vectorized call.
+
+        Args:
+            plugin_ids: ID of the plugin in each column of the batch
+            collected: Collected results per listing, positions being columns
+
+        Returns:
+            (overall_score, confidence) per listing
+        """
+        shape = (len(collected), len(plugin_ids))
+        scores = np.zeros(shape)
+        confidences = np.zeros(shape)
+        present = np.zeros(shape, dtype=bool)
+        for row, listing in enumerate(collected):
+            scores[row, listing.positions] = listing.scores
+            confidences[row, listing.positions] = listing.confidences
+            present[row, listing.positions] = True
+
+        weights = [self._index[plugin_id][1] for plugin_id in plugin_ids]
+        overall, confidence = self.aggregator.aggregate(plugin_ids, weights, scores, confidences, present)
+        return list(zip(overall.tolist(), confidence.tolist()))
+
+    def _build_record(
+        self,
+        listing_id: str,
+        collected: _Collected,
+        aggregated: Tuple[float, float],
+        processing_time_ms: float,
+        skipped: Sequence[str] = (),
+        cascade_skipped: Sequence[str] = (),
+        cached: Sequence[str] = (),
+    ) -> ScoreRecord:
+        """Build the ScoreRecord of one listing from its aggregated score"""
+        overall_score, confidence = aggregated
+
+        # Less evidence than configured: scale confidence by the weight that reported
+        index = self._index
+        if skipped and self._total_weight > 0:
+            missing_weight = sum(index[plugin_id][1] for plugin_id in set(skipped) if plugin_id in index)
+            confidence *= max(0.0, 1.0 - missing_weight / self._total_weight)
+
+        return ScoreRecord(
+            listing_id=listing_id,
+            overall_score=overall_score,
+            confidence=confidence,
+            risk_level=self._determine_risk_level(overall_score),
+            signals=tuple(collected.signals),
+            plugin_results=tuple(collected.plugin_results),
+            processing_time_ms=processing_time_ms,
+            skipped=tuple(skipped),
+            cascade_skipped=tuple(cascade_skipped),
+            cached=tuple(cached),
+        )
 
-        # Compute weighted average score (0-1 scale)
-        weighted_score = sum(score * weight for score, weight in zip(scores, normalized_weights))
+    async def _analyze(self, entry: _PluginEntry, listing: Dict) -> DetectionResult:
+        """Run analyze() within the plugin's deadline, where its execution mode says.
 
-        # Compute weighted average confidence
-        weighted_confidence = sum(conf * weight for conf, weight in zip(confidences, normalized_weights))
+        Raises:
+            _DeadlineExceeded: If the deadline passed (the call is cancelled)
+        """
+        if entry.mode == INLINE:
+            coro = entry.plugin.analyze(listing)
+        else:
+            coro = self.executor.analyze(entry.plugin_id, entry.plugin, entry.mode, listing)
+        return await self._within_deadline(coro, entry.timeout_ms)
+
+    @staticmethod
+    async def _within_deadline(coro: Awaitable[T], timeout_ms: Optional[float], calls: int = 1) -> T:
+        """Await a plugin call, cancelling it after ``timeout_ms`` per listing.
+
+        A TimeoutError raised by the plugin itself (e.g. its own I/O timeout)
+        propagates unchanged and counts as a plugin error.
+
+        Raises:
+            _DeadlineExceeded: If the deadline passed (the call is cancelled)
+        """
+        if timeout_ms is None:
+            return await coro
+        task = asyncio.ensure_future(coro)
+        try:
+            return await asyncio.wait_for(task, timeout_ms * calls / 1000)
+        except asyncio.TimeoutError:
+            if task.cancelled():
+                raise _DeadlineExceeded() from None
+            raise
+
+    async def _analyze_batch(self, entry: _PluginEntry, listings: List[Dict]) -> List[DetectionResult]:
+        """Run analyze_batch() where the plugin's execution mode says"""
+        if entry.mode == INLINE:
+            return await entry.plugin.analyze_batch(listings)
+        return await self.executor.analyze_batch(entry.plugin_id, entry.plugin, entry.mode, listings)
+
+    def _compute_weighted_score(self, plugin_results: List[DetectionResult]) -> tuple[float, float]:
+        """Compute the fraud score from plugin results.
 
-        # Convert to 0-100 scale
-        overall_score = weighted_score * 100.0
+        Uses the weighted average, or the aggregator if one is set.
 
-        return overall_score, weighted_confidence
+        Args:
+            plugin_results: Results from detection plugins
+
+        Returns:
+            Tuple of (overall_score, confidence) where score is 0-100
+        """
+        if not plugin_results:
+            return 0.0, 0.0
+        return self._score(self._collect(plugin_results))
 
     def _determine_risk_level(self, score: float) -> str:
         """Determine risk level from fraud score.
@@ -260,9 +1317,9 @@ class RiskScoringOrchestrator:
         Returns:
             Risk level: 'safe', 'suspicious', or 'fraud'
         """
-        if score < 30.0:
+        if score < self.SUSPICIOUS_THRESHOLD:
             return "safe"
-        elif score < 70.0:
+        elif score < self.FRAUD_THRESHOLD:
             return "suspicious"
         else:
             return "fraud"
@@ -275,6 +1332,11 @@ class RiskScoringOrchestrator:
         """
         return {
             "plugins_registered": len(self.detection_plugins),
-            "plugin_ids": [p.get_metadata().get("id") for p in self.detection_plugins],
+            "plugin_ids": [entry.plugin_id for entry in self._get_entries()],
             "min_confidence_threshold": self.min_confidence_threshold,
+            "cascade": self.cascade,
+            "result_cache": self.result_cache.get_statistics() if self.result_cache is not None else None,
+            "executor": self.executor.get_statistics() if self.executor is not None else None,
+            "aggregation": self.aggregator.method if self.aggregator is not None else "weighted_mean",
+            "shadows": {plugin_id: deployment.get_statistics() for plugin_id, deployment in self.get_shadows().items()},
         }
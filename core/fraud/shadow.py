@@ -0,0 +1,197 @@
+"""Shadow scoring of candidate detection plugins alongside the live ones."""
+
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from core.interfaces.detection_plugin import DetectionPlugin
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Summarize a distribution.
+
+    Args:
+        values: Observed values
+
+    Returns:
+        Dictionary with count, mean, min, p50, p95, p99 and max (zeros if empty)
+    """
+    if not len(values):
+        return {"count": 0, "mean": 0.0, "min": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    array = np.asarray(values, dtype=float)
+    p50, p95, p99 = np.percentile(array, [50, 95, 99])
+    return {
+        "count": len(array),
+        "mean": float(array.mean()),
+        "min": float(array.min()),
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "max": float(array.max()),
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class ShadowComparison:
+    """Live and candidate result for one listing.
+
+    Attributes:
+        listing_id: ID of the scored listing
+        live_score: Score of the live plugin (None if it did not report)
+        shadow_score: Score of the candidate (None if it failed)
+        live_time_ms: Processing time reported by the live plugin
+        shadow_time_ms: Processing time reported by the candidate
+        live_overall: Fraud score (0-100) with the live plugin
+        shadow_overall: Fraud score with the candidate in its place
+            (None unless both reported)
+        live_risk_level: Risk level with the live plugin
+        shadow_risk_level: Risk level with the candidate in its place
+        error: Why the candidate did not report, if it failed
+    """
+
+    listing_id: str
+    live_score: Optional[float]
+    shadow_score: Optional[float]
+    live_time_ms: Optional[float]
+    shadow_time_ms: Optional[float]
+    live_overall: float
+    shadow_overall: Optional[float]
+    live_risk_level: str
+    shadow_risk_level: Optional[str]
+    error: Optional[str] = None
+
+    @property
+    def score_delta(self) -> Optional[float]:
+        """Candidate minus live plugin score (0-1 scale)"""
+        if self.live_score is None or self.shadow_score is None:
+            return None
+        return self.shadow_score - self.live_score
+
+    @property
+    def overall_delta(self) -> Optional[float]:
+        """Fraud score change (0-100 scale) if the candidate were live"""
+        if self.shadow_overall is None:
+            return None
+        return self.shadow_overall - self.live_overall
+
+
+class ShadowDeployment:
+    """A candidate plugin scored alongside a live one without affecting scores.
+
+    Listings are sampled by a hash of their ID, so the same listings are
+    shadowed on every run and every replica. Only the latest
+    ``max_records`` comparisons are kept; counters cover all of them.
+    At most ``max_in_flight`` shadow runs are pending at a time; sampled
+    listings arriving while all are taken are dropped and counted, so a
+    slow or hanging candidate cannot pile up work next to live scoring.
+
+    Attributes:
+        plugin: Candidate plugin
+        plugin_id: ID of the live plugin the candidate is compared with
+        sample_rate: Share of listings scored by the candidate (0-1]
+        max_in_flight: Maximum number of pending shadow runs
+    """
+
+    def __init__(
+        self,
+        plugin: DetectionPlugin,
+        plugin_id: str,
+        sample_rate: float = 1.0,
+        max_records: int = 10_000,
+        max_in_flight: int = 4,
+    ):
+        """Initialize the deployment.
+
+        Args:
+            plugin: Candidate plugin
+            plugin_id: ID of the live plugin to compare with
+            sample_rate: Share of listings to shadow (0-1]
+            max_records: Number of recent comparisons kept for statistics
+            max_in_flight: Maximum number of pending shadow runs
+
+        Raises:
+            ValueError: If sample_rate, max_records or max_in_flight is out of range
+        """
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+        if max_records < 1:
+            raise ValueError(f"max_records must be positive, got {max_records}")
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be positive, got {max_in_flight}")
+
+        self.plugin = plugin
+        self.plugin_id = plugin_id
+        self.sample_rate = sample_rate
+        self.max_in_flight = max_in_flight
+        self.candidate_version = str(plugin.get_metadata().get("version", ""))
+        self._threshold = int(sample_rate * 2**32)
+        self._records: Deque[ShadowComparison] = deque(maxlen=max_records)
+        self.sampled = 0
+        self.errors = 0
+        self.dropped = 0
+        self.in_flight = 0
+
+    def samples(self, listing_id: str) -> bool:
+        """Check whether a listing is shadowed (deterministic per listing ID)"""
+        return zlib.crc32(f"{self.plugin_id}:{listing_id}".encode()) < self._threshold
+
+    def begin_run(self, listings: int) -> bool:
+        """Reserve a slot for a shadow run of ``listings`` listings.
+
+        Returns:
+            False (counting the listings as dropped) if all slots are taken
+        """
+        if self.in_flight >= self.max_in_flight:
+            self.dropped += listings
+            return False
+        self.in_flight += 1
+        return True
+
+    def end_run(self) -> None:
+        """Release the slot of a finished shadow run"""
+        self.in_flight -= 1
+
+    def record(self, comparison: ShadowComparison) -> None:
+        """Store the comparison for one shadowed listing"""
+        self._records.append(comparison)
+        self.sampled += 1
+        if comparison.error is not None:
+            self.errors += 1
+
+    def comparisons(self) -> List[ShadowComparison]:
+        """Get the recent comparisons, oldest first"""
+        return list(self._records)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get latency distributions and score drift of the candidate.
+
+        Returns:
+            Dictionary with sample counts, live and candidate latency
+            summaries, plugin score and fraud score delta summaries, and the
+            number of listings whose risk level the candidate would change
+        """
+        records = list(self._records)
+        score_deltas = [r.score_delta for r in records if r.score_delta is not None]
+        overall_deltas = [r.overall_delta for r in records if r.overall_delta is not None]
+        return {
+            "plugin_id": self.plugin_id,
+            "candidate_version": self.candidate_version,
+            "sample_rate": self.sample_rate,
+            "sampled": self.sampled,
+            "errors": self.errors,
+            "dropped": self.dropped,
+            "in_flight": self.in_flight,
+            "latency_ms": {
+                "live": summarize([r.live_time_ms for r in records if r.live_time_ms is not None]),
+                "shadow": summarize([r.shadow_time_ms for r in records if r.shadow_time_ms is not None]),
+            },
+            "score_delta": summarize(score_deltas),
+            "mean_abs_score_delta": float(np.mean(np.abs(score_deltas))) if score_deltas else 0.0,
+            "overall_delta": summarize(overall_deltas),
+            "risk_level_changes": sum(
+                1 for r in records if r.shadow_risk_level is not None and r.shadow_risk_level != r.live_risk_level
+            ),
+        }
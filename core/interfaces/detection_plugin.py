@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -66,6 +67,23 @@ class DetectionPlugin(ABC):
         """
         pass
 
+    async def analyze_batch(self, listings: List[Dict]) -> List[DetectionResult]:
+        """Analyze several listings in one call.
+
+        Optional hook for plugins that can vectorize their work (price
+        z-scores, ML model inference). The orchestrator only uses it when
+        overridden; other plugins are called per listing with bounded
+        concurrency. The default implementation runs analyze() for each
+        listing concurrently.
+
+        Args:
+            listings: Listings to analyze
+
+        Returns:
+            One DetectionResult per listing, in the same order
+        """
+        return list(await asyncio.gather(*[self.analyze(listing) for listing in listings]))
+
     @abstractmethod
     def get_weight(self) -> float:
         """Get plugin weight for score aggregation.
@@ -75,6 +93,36 @@ class DetectionPlugin(ABC):
         """
         return 0.1
 
+    def get_timeout_ms(self) -> Optional[float]:
+        """Optional deadline of a single analyze() call in milliseconds.
+
+        Plugins exceeding it are skipped for the listing and reported in
+        ``FraudScore.metadata["skipped_plugins"]``. None uses the
+        orchestrator default.
+        """
+        return None
+
+    def get_cost_tier(self) -> int:
+        """Relative cost of analyze(), 0 being the cheapest.
+
+        A cascading orchestrator runs lower tiers first and skips higher
+        ones (image analysis, ML models) once the risk level is settled.
+        """
+        return 0
+
+    def get_execution_mode(self) -> str:
+        """Where analyze() runs: ``inline``, ``thread`` or ``process``.
+
+        ``inline`` awaits analyze() on the event loop. CPU-bound plugins
+        (regex matching, model inference) block the loop there; ``thread``
+        moves them to a thread pool (parallel only if the work releases the
+        GIL) and ``process`` to a pool of worker processes, each holding its
+        own copy of the plugin. Process-mode plugins must be picklable and
+        receive listings as plain dictionaries. The manifest's
+        ``execution.mode`` takes precedence.
+        """
+        return "inline"
+
     def shutdown(self) -> None:
         """Optional graceful shutdown hook for cleanup before reload.
 
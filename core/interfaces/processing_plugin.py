@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict
+from typing import Dict, List, Optional
 
 
 class ProcessingPlugin(ABC):
@@ -21,6 +21,62 @@ class ProcessingPlugin(ABC):
     def get_priority(self) -> int:
         return 10
 
+    def process_batch(self, listings: List[Dict]) -> List[Dict]:
+        """
+        Optional vectorized hook for batch consumption mode.
+
+        Override this to process many listings in one call (shared lookups,
+        vectorized math). Must return one result per input listing, in the
+        same order. If it raises, the orchestrator falls back to calling
+        process() per listing so one bad listing cannot fail the batch.
+
+        Default implementation calls process() for each listing.
+        """
+        return [self.process(listing) for listing in listings]
+
+    async def process_async(self, listing: Dict) -> Dict:
+        """
+        Optional native coroutine used by AsyncProcessingOrchestrator.
+
+        Override this for I/O-bound plugins (geocoding, HTTP lookups) so they
+        can be awaited on the event loop. Plugins that do not override it are
+        run with process() on a thread pool executor instead.
+
+        Default implementation calls process().
+        """
+        return self.process(listing)
+
+    def get_reads(self) -> Optional[List[str]]:
+        """
+        Optional declaration of the top-level listing fields this plugin reads.
+
+        Used together with get_writes() to run independent plugins
+        concurrently when the orchestrator has ``enable_parallel`` set.
+        Declarations can also be made in the manifest as ``reads:<field>``
+        capabilities. None means undeclared: the plugin is assumed to read
+        every field and is never reordered around other plugins.
+        """
+        return None
+
+    def get_writes(self) -> Optional[List[str]]:
+        """
+        Optional declaration of the top-level listing fields this plugin writes.
+
+        See get_reads(). When declared, only these fields are taken from the
+        plugin output while merging results of concurrently executed plugins.
+        None means undeclared (the plugin may change any field).
+        """
+        return None
+
+    def get_timeout_ms(self) -> Optional[float]:
+        """
+        Optional time budget of a single process() call in milliseconds.
+
+        Calls exceeding it are abandoned and count as failures towards the
+        plugin's circuit breaker. None uses the orchestrator default.
+        """
+        return None
+
     def shutdown(self) -> None:
         """
         Optional graceful shutdown hook for cleanup before reload.
@@ -6,7 +6,7 @@ Supports multiple backends: Redis, RabbitMQ, Kafka, AWS SQS, etc.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 
 class QueuePlugin(ABC):
@@ -54,6 +54,48 @@ class QueuePlugin(ABC):
         """
         pass
 
+    def publish_batch(self, topic: str, messages: List[Dict[str, Any]], **kwargs: Any) -> List[str]:
+        """
+        Publish several messages to a topic in one call.
+
+        Backends override this to amortize locking or network round trips.
+        The default implementation publishes messages one by one.
+
+        Args:
+            topic: Topic/queue name
+            messages: Message payloads, published in order
+            **kwargs: Backend-specific options applied to every message
+
+        Returns:
+            Message IDs, aligned with ``messages``
+
+        Raises:
+            PublishError: If messages cannot be published
+        """
+        return [self.publish(topic, message, **kwargs) for message in messages]
+
+    def publish_delayed(self, topic: str, message: Dict[str, Any], delay_ms: float, **kwargs: Any) -> str:
+        """
+        Publish a message that becomes visible to consumers after a delay.
+
+        Used for retries with backoff. Backends override this with a real
+        scheduler (timer wheel, sorted set); the default implementation
+        publishes immediately.
+
+        Args:
+            topic: Topic/queue name
+            message: Message payload (will be JSON serialized)
+            delay_ms: Delay before delivery in milliseconds
+            **kwargs: Backend-specific options
+
+        Returns:
+            Message ID or acknowledgment token
+
+        Raises:
+            PublishError: If message cannot be published
+        """
+        return self.publish(topic, message, **kwargs)
+
     @abstractmethod
     def subscribe(self, topic: str, callback: Callable[[Dict[str, Any]], None], **kwargs: Any) -> str:
         """
@@ -72,6 +114,56 @@ class QueuePlugin(ABC):
         """
         pass
 
+    def subscribe_batch(
+        self,
+        topic: str,
+        callback: Callable[[List[Dict[str, Any]]], None],
+        batch_size: int = 100,
+        max_wait_ms: float = 50.0,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Subscribe to a topic and receive messages in batches.
+
+        The callback receives up to ``batch_size`` messages, or whatever
+        arrived within ``max_wait_ms`` of the first message of the batch.
+        The default implementation delivers single-message batches.
+
+        Args:
+            topic: Topic/queue name to subscribe to
+            callback: Function to call for each batch of messages
+            batch_size: Maximum number of messages per batch
+            max_wait_ms: Maximum time to wait for a batch to fill up
+            **kwargs: Backend-specific options (e.g., consumer_group)
+
+        Returns:
+            Subscription ID
+
+        Raises:
+            SubscriptionError: If subscription fails
+        """
+        return self.subscribe(topic, lambda message: callback([message]), **kwargs)
+
+    def get(self, topic: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Take the next message of a topic, blocking until one is available.
+
+        Pull-style alternative to subscribe(). The message is pending until
+        it is passed to acknowledge() or reject().
+
+        Args:
+            topic: Topic/queue name
+            timeout: Maximum time to wait in seconds (None waits indefinitely)
+
+        Returns:
+            Message envelope with at least ``message_id`` and ``payload``,
+            or None if no message arrived in time
+
+        Raises:
+            NotImplementedError: If the backend only supports subscriptions
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support blocking get()")
+
     @abstractmethod
     def unsubscribe(self, subscription_id: str) -> None:
         """
@@ -116,6 +208,22 @@ class QueuePlugin(ABC):
         """
         pass
 
+    def get_lag(self, topic: str) -> int:
+        """
+        Get the number of messages published to a topic but not yet consumed.
+
+        Used for backpressure between pipeline stages. The default
+        implementation falls back to get_queue_size(); backends that keep
+        consumed messages around (e.g. streams) should override it.
+
+        Args:
+            topic: Topic/queue name
+
+        Returns:
+            Number of messages waiting for consumers
+        """
+        return self.get_queue_size(topic)
+
     @abstractmethod
     def purge_queue(self, topic: str) -> int:
         """
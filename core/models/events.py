@@ -152,6 +152,9 @@ class ProcessedListingEvent(BaseModel):
     processing_duration_ms: float = 0.0
     plugins_applied: List[str] = Field(default_factory=list)
 
+    # Fields changed by each processing stage (debugging, off by default)
+    stage_diffs: Optional[List[Dict[str, Any]]] = None
+
     # Quality metrics
     data_quality_score: Optional[float] = None
     completeness_score: Optional[float] = None
@@ -245,6 +248,7 @@ class Topics:
     """Standard topic names for queue routing"""
 
     RAW_LISTINGS = "listings.raw"
+    RETRY_LISTINGS = "listings.raw.retry"
     NORMALIZED_LISTINGS = "listings.normalized"
     PROCESSED_LISTINGS = "listings.processed"
     FRAUD_DETECTED = "fraud.detected"
@@ -256,6 +260,7 @@ class Topics:
         """Get all topic names"""
         return [
             cls.RAW_LISTINGS,
+            cls.RETRY_LISTINGS,
             cls.NORMALIZED_LISTINGS,
             cls.PROCESSED_LISTINGS,
             cls.FRAUD_DETECTED,
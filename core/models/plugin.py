@@ -28,6 +28,11 @@ class PluginMetadata(BaseModel):
         default=None,
         description="Plugin weight for detection scoring (0.0-1.0). If None, uses plugin's get_weight() method",
     )
+    execution_mode: Optional[str] = Field(
+        default=None,
+        description="Where a detection plugin runs: inline | thread | process. "
+        "If None, uses plugin's get_execution_mode() method",
+    )
 
 
 class PluginRegistrationRequest(BaseModel):
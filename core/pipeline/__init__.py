@@ -1,5 +1,22 @@
 """Pipeline orchestration module"""
 
+from core.pipeline.async_orchestrator import AsyncProcessingOrchestrator
 from core.pipeline.orchestrator import ProcessingOrchestrator
+from core.pipeline.plugin_chain import PluginChain, compile_plugin_chain
+from core.pipeline.retry import RetryPolicy, retry_topic
+from core.pipeline.scoring_service import FraudScoringService
+from core.pipeline.supervisor import ProcessingSupervisor, publish_sharded, shard_for, shard_topic
 
-__all__ = ["ProcessingOrchestrator"]
+__all__ = [
+    "AsyncProcessingOrchestrator",
+    "FraudScoringService",
+    "ProcessingOrchestrator",
+    "ProcessingSupervisor",
+    "PluginChain",
+    "RetryPolicy",
+    "compile_plugin_chain",
+    "publish_sharded",
+    "retry_topic",
+    "shard_for",
+    "shard_topic",
+]
@@ -0,0 +1,402 @@
+"""
+Async Processing Pipeline Orchestrator
+
+Runs the processing pipeline on a single asyncio event loop with a bounded
+number of in-flight events, and chains fraud scoring inline so processed
+events carry real fraud scores.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Any, Awaitable, Dict, List, Optional, cast
+
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.interfaces.queue_plugin import QueuePlugin
+from core.models.events import EventStatus, ProcessedListingEvent, RawListingEvent, Topics
+from core.pipeline.circuit_breaker import PluginTimeoutError
+from core.pipeline.listing_view import ListingData, ListingView, diff
+from core.pipeline.metrics import registry
+from core.pipeline.orchestrator import ProcessingOrchestrator, merge_stage_output, stage_label
+from core.pipeline.plugin_chain import PluginChain
+from core.pipeline.retry import RetryPolicy
+from core.plugin_manager import PluginManager
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncProcessingOrchestrator(ProcessingOrchestrator):
+    """
+    Processing orchestrator driven by an asyncio event loop.
+
+    Workflow:
+    1. Queue worker threads hand raw events over to the event loop
+    2. Plugins implementing process_async() are awaited on the loop,
+       synchronous plugins are offloaded to a thread pool executor
+    3. The processed listing is scored by RiskScoringOrchestrator inline
+    4. The processed event is published to the next stage
+
+    At most ``max_in_flight`` events are processed concurrently. When the
+    window is full, the queue worker thread blocks, which stops consumption
+    until an event completes.
+
+    Example:
+        >>> orchestrator = AsyncProcessingOrchestrator(
+        ...     plugin_manager=manager,
+        ...     queue=queue,
+        ...     risk_orchestrator=RiskScoringOrchestrator(manager.get_detection_plugins()),
+        ...     max_in_flight=64,
+        ... )
+        >>> orchestrator.start()  # Runs its own event loop thread
+    """
+
+    def __init__(
+        self,
+        plugin_manager: PluginManager,
+        queue: QueuePlugin,
+        risk_orchestrator: Optional[RiskScoringOrchestrator] = None,
+        max_in_flight: int = 32,
+        max_retries: int = 3,
+        enable_parallel: bool = False,
+        max_workers: Optional[int] = None,
+        input_topic: str = Topics.RAW_LISTINGS,
+        max_downstream_lag: Optional[int] = None,
+        resume_downstream_lag: Optional[int] = None,
+        copy_on_write: bool = False,
+        record_stage_diffs: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        plugin_timeout_ms: Optional[float] = None,
+        breaker_failure_threshold: Optional[int] = 5,
+        breaker_reset_timeout_s: float = 30.0,
+    ):
+        """
+        Initialize async processing orchestrator.
+
+        Args:
+            plugin_manager: Plugin manager instance
+            queue: Message queue instance
+            risk_orchestrator: Fraud scoring orchestrator run on every processed listing
+            max_in_flight: Maximum number of events processed concurrently
+            max_retries: Maximum retry attempts for failed processing
+            enable_parallel: Run independent plugins of a DAG stage concurrently
+            max_workers: Thread pool size for synchronous plugins
+            input_topic: Topic raw events are consumed from (retried on ``<input_topic>.retry``)
+            max_downstream_lag: Unconsumed processed events at which consumption pauses
+            resume_downstream_lag: Lag at which consumption resumes
+            copy_on_write: Pass plugins a copy-on-write ListingView (a MutableMapping,
+                not a dict) instead of a plain dict
+            record_stage_diffs: Attach the fields each stage changed to processed events
+            retry_policy: Backoff between retries of failed events
+            plugin_timeout_ms: Time budget of plugins not declaring their own
+            breaker_failure_threshold: Consecutive plugin failures after which the
+                plugin is skipped (None disables circuit breakers)
+            breaker_reset_timeout_s: Time a skipped plugin waits before it is probed again
+        """
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be positive, got {max_in_flight}")
+
+        super().__init__(
+            plugin_manager=plugin_manager,
+            queue=queue,
+            max_retries=max_retries,
+            enable_parallel=enable_parallel,
+            max_workers=max_workers,
+            input_topic=input_topic,
+            max_downstream_lag=max_downstream_lag,
+            resume_downstream_lag=resume_downstream_lag,
+            copy_on_write=copy_on_write,
+            record_stage_diffs=record_stage_diffs,
+            retry_policy=retry_policy,
+            plugin_timeout_ms=plugin_timeout_ms,
+            breaker_failure_threshold=breaker_failure_threshold,
+            breaker_reset_timeout_s=breaker_reset_timeout_s,
+        )
+        self.risk_orchestrator = risk_orchestrator
+        self.max_in_flight = max_in_flight
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._stats["events_scored"] = 0
+        self._stats["scoring_failures"] = 0
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start consuming events from queue.
+
+        Args:
+            loop: Running event loop to process events on. If omitted, the
+                orchestrator starts and owns a dedicated event loop thread.
+        """
+        if self._running:
+            logger.warning("Orchestrator already running")
+            return
+
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=loop.run_forever, daemon=True, name="async-pipeline-loop")
+            self._loop_thread.start()
+
+        self._loop = loop
+        self._running = True
+        if self._backpressure is not None:
+            self._backpressure.reset()
+        registry.register(self.input_topic, self._metrics)
+        # Batches keep up to max_in_flight events in progress per queue thread
+        self._subscription_id = self.queue.subscribe_batch(
+            self.input_topic, self._track_ingest(self._submit_raw_batch), batch_size=self.max_in_flight
+        )
+        self._subscribe_retry_lane(self._submit_raw_listing)
+
+        logger.info(f"Async processing orchestrator started (max_in_flight={self.max_in_flight})")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop consuming events and wait for in-flight events to finish.
+
+        Args:
+            timeout: Maximum time to wait for in-flight events in seconds
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        if self._backpressure is not None:
+            self._backpressure.release()
+        self._notify_ingest()
+
+        if self._subscription_id:
+            self.queue.unsubscribe(self._subscription_id)
+            self._subscription_id = None
+        self._unsubscribe_retry_lane()
+
+        # Drain the in-flight window
+        deadline = time.time() + timeout
+        acquired = 0
+        while acquired < self.max_in_flight and self._in_flight.acquire(timeout=max(0.0, deadline - time.time())):
+            acquired += 1
+        for _ in range(acquired):
+            self._in_flight.release()
+        if acquired < self.max_in_flight:
+            logger.warning(f"Stopped with {self.max_in_flight - acquired} events still in flight")
+
+        if self._loop_thread is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=timeout)
+            self._loop.close()
+            self._loop_thread = None
+        self._loop = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        registry.unregister(self.input_topic)
+        logger.info("Async processing orchestrator stopped")
+
+    def _submit_raw_listing(self, message: Dict[str, Any]) -> None:
+        """
+        Queue callback: process a raw event on the event loop.
+
+        Returns only once the event is processed, so the queue acknowledges
+        it afterwards and an event still in flight at a crash or shutdown
+        stays unacknowledged.
+        """
+        self._submit_raw_batch([message])
+
+    def _submit_raw_batch(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Queue batch callback: process raw events concurrently on the event loop.
+
+        Blocks the calling queue thread while the in-flight window is full
+        or the downstream topic is saturated, and until every event of the
+        batch is processed (the queue acknowledges the batch on return).
+        """
+        futures: List["Future[Optional[ProcessedListingEvent]]"] = []
+        try:
+            for message in messages:
+                futures.append(self._schedule(message))
+        finally:
+            wait(futures)
+        for future in futures:
+            future.result()
+
+    def _schedule(self, message: Dict[str, Any]) -> "Future[Optional[ProcessedListingEvent]]":
+        """Start processing a raw event on the event loop within the in-flight window"""
+        self._wait_for_downstream()
+        self._in_flight.acquire()
+        loop = self._loop
+        if loop is None or not self._running:
+            self._in_flight.release()
+            raise RuntimeError("Orchestrator is not running")
+
+        future = asyncio.run_coroutine_threadsafe(self.process_message(message), loop)
+        future.add_done_callback(lambda _: self._in_flight.release())
+        return future
+
+    async def process_message(self, message: Dict[str, Any]) -> Optional[ProcessedListingEvent]:
+        """
+        Process a raw listing event end to end.
+
+        Args:
+            message: Raw listing event from queue
+
+        Returns:
+            Published processed event, or None if processing failed
+        """
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+
+        try:
+            event = RawListingEvent.from_dict(message)
+            event.metadata.status = EventStatus.PROCESSING
+
+            result = await self._execute_pipeline_async(event)
+            await self._score(result)
+
+            processing_time = (time.time() - start_time) * 1000
+            processed_event = self._build_processed_event(event, result, processing_time)
+
+            await loop.run_in_executor(
+                self._get_executor(), self.queue.publish, Topics.PROCESSED_LISTINGS, processed_event.to_dict()
+            )
+
+            self._stats["events_processed"] += 1
+            self._stats["total_processing_time_ms"] += processing_time
+            self._metrics.record_event(processing_time)
+
+            logger.info(f"Completed processing event {event.metadata.event_id} in {processing_time:.2f}ms")
+            return processed_event
+
+        except Exception as e:
+            logger.error(f"Failed to process event: {e}", exc_info=True)
+            await loop.run_in_executor(self._get_executor(), self._handle_processing_failure, message, str(e))
+            return None
+
+    async def _execute_pipeline_async(self, event: RawListingEvent) -> Dict[str, Any]:
+        """
+        Execute all processing plugins on the event loop.
+
+        Args:
+            event: Raw listing event
+
+        Returns:
+            Dictionary with processed data and metadata
+        """
+        chain = self._get_plugin_chain()
+
+        current_data = self._wrap_listing(event.raw_data)
+        plugins_applied: List[str] = []
+        timings: Dict[str, float] = {}
+        stage_diffs: List[Dict[str, Any]] = []
+
+        stages = chain.stages if self.enable_parallel else tuple((index,) for index in range(len(chain)))
+
+        for stage in stages:
+            # Plugins may write in place, so diffs need a snapshot (overlay-only for views)
+            before = current_data.copy() if self.record_stage_diffs else current_data
+            if len(stage) == 1:
+                output = await self._run_plugin_async(chain, stage[0], current_data)
+                if output is not None:
+                    current_data, duration = self._wrap_listing(output[0]), output[1]
+                    self._record_plugin_run(chain.names[stage[0]], duration, plugins_applied, timings)
+            else:
+                stage_start = time.time()
+                outputs = await asyncio.gather(
+                    *(self._run_plugin_async(chain, index, current_data.copy()) for index in stage)
+                )
+                merged = current_data.copy()
+                for index, output in zip(stage, outputs):
+                    if output is None:
+                        continue
+                    data, duration = output
+                    merged = merge_stage_output(merged, data, chain.writes[index])
+                    self._record_plugin_run(chain.names[index], duration, plugins_applied, timings)
+                current_data = merged
+                self._metrics.record_stage(stage_label(chain, stage), (time.time() - stage_start) * 1000)
+
+            if self.record_stage_diffs:
+                stage_diffs.append({"stage": stage_label(chain, stage), **diff(before, current_data)})
+
+        result: Dict[str, Any] = {
+            "listing_data": current_data,
+            "stages": list(plugins_applied),
+            "plugins": plugins_applied,
+            "timings": timings,
+        }
+        if self.record_stage_diffs:
+            result["stage_diffs"] = stage_diffs
+        return result
+
+    async def _run_plugin_async(self, chain: PluginChain, index: int, data: ListingData) -> Optional[tuple]:
+        """
+        Run one plugin without blocking the event loop.
+
+        Returns:
+            Tuple of (output, duration_ms), or None if the plugin failed
+        """
+        plugin = chain.plugins[index]
+        plugin_name = chain.names[index]
+        if not self._allow_plugin(plugin_name):
+            return None
+
+        timeout_ms = self._plugin_timeout(chain, index)
+        if timeout_ms is not None:
+            # A cancelled or abandoned call must not leave partial writes behind
+            data = data.copy()
+        # Views stand in for the listing dict when copy-on-write is enabled
+        listing = cast(Dict[str, Any], data)
+
+        try:
+            start = time.time()
+            call: Awaitable[Dict[str, Any]]
+            if chain.asynchronous[index]:
+                call = plugin.process_async(listing)
+            else:
+                loop = asyncio.get_running_loop()
+                call = loop.run_in_executor(self._get_executor(), plugin.process, listing)
+
+            if timeout_ms is None:
+                output = await call
+            else:
+                # Cancels process_async() coroutines; executor calls are abandoned
+                output = await asyncio.wait_for(call, timeout_ms / 1000)
+            return output, (time.time() - start) * 1000
+
+        except asyncio.TimeoutError:
+            self._record_plugin_failure(plugin_name, PluginTimeoutError(plugin_name, timeout_ms))
+            return None
+        except Exception as e:
+            self._record_plugin_failure(plugin_name, e)
+            return None
+
+    async def _score(self, result: Dict[str, Any]) -> None:
+        """Run fraud scoring on the processed listing and store it in the result"""
+        if self.risk_orchestrator is None:
+            return
+
+        listing = result["listing_data"]
+        if isinstance(listing, ListingView):
+            # Scoring plugins and the result cache expect a plain dict
+            listing = result["listing_data"] = listing.materialize()
+
+        try:
+            fraud_score = await self.risk_orchestrator.run_compact(listing)
+        except Exception as e:
+            # Scoring problems must not drop the processed listing
+            logger.error(f"Fraud scoring failed: {e}", exc_info=True)
+            self._stats["scoring_failures"] += 1
+            return
+
+        result["fraud_score"] = fraud_score.overall_score
+        result["fraud_signals"] = [signal.signal_type for signal in fraud_score.signals]
+        result["risk_level"] = fraud_score.risk_level
+        self._stats["events_scored"] += 1
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get orchestrator statistics"""
+        stats = super().get_statistics()
+        stats["max_in_flight"] = self.max_in_flight
+        return stats
@@ -0,0 +1,134 @@
+"""
+Backpressure Between Pipeline Stages
+
+Pauses consumption of a stage while the topic it publishes to has too much
+unconsumed lag, so a slow downstream stage throttles its producers instead
+of letting queues grow without bound.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from core.interfaces.queue_plugin import QueuePlugin
+
+logger = logging.getLogger(__name__)
+
+
+class BackpressureController:
+    """
+    Lag-based flow control with high/low watermarks.
+
+    Consumers call acquire() before taking on an event. While the downstream
+    lag is at or above ``high_watermark`` the call blocks, which pauses the
+    queue consumer thread; it resumes once the lag drains to
+    ``low_watermark``. Between checks the last measured lag is reused for
+    ``check_interval`` seconds to keep lag queries off the hot path.
+
+    Example:
+        >>> controller = BackpressureController(queue, Topics.PROCESSED_LISTINGS, high_watermark=10000)
+        >>> controller.acquire()  # Blocks while downstream is saturated
+    """
+
+    def __init__(
+        self,
+        queue: QueuePlugin,
+        topic: str,
+        high_watermark: int,
+        low_watermark: Optional[int] = None,
+        check_interval: float = 0.1,
+        poll_interval: float = 0.05,
+    ):
+        """
+        Initialize backpressure controller.
+
+        Args:
+            queue: Queue the downstream topic lives in
+            topic: Downstream topic whose lag is watched
+            high_watermark: Lag at which consumption pauses
+            low_watermark: Lag at which consumption resumes (default: half of high)
+            check_interval: Minimum time between lag checks while flowing in seconds
+            poll_interval: Time between lag checks while paused in seconds
+        """
+        if high_watermark < 1:
+            raise ValueError(f"high_watermark must be positive, got {high_watermark}")
+        if low_watermark is None:
+            low_watermark = high_watermark // 2
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError(f"low_watermark must be in [0, {high_watermark}), got {low_watermark}")
+
+        self.queue = queue
+        self.topic = topic
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self.check_interval = check_interval
+        self.poll_interval = poll_interval
+
+        self._released = threading.Event()
+        self._last_check = 0.0
+        self._lag = 0
+        self._throttled = False
+        self._stats = {
+            "throttle_count": 0,
+            "throttle_time_ms": 0.0,
+        }
+
+    def acquire(self) -> None:
+        """Block while the downstream lag is above the high watermark"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+
+        self._lag = self._measure_lag()
+        self._last_check = now
+        if self._lag < self.high_watermark:
+            return
+
+        self._throttled = True
+        self._stats["throttle_count"] += 1
+        logger.warning(f"Downstream lag on {self.topic} is {self._lag}, pausing consumption")
+
+        start = time.monotonic()
+        while not self._released.wait(self.poll_interval):
+            self._lag = self._measure_lag()
+            if self._lag <= self.low_watermark:
+                break
+
+        throttled_ms = (time.monotonic() - start) * 1000
+        self._stats["throttle_time_ms"] += throttled_ms
+        self._throttled = False
+        self._last_check = time.monotonic()
+        logger.info(f"Downstream lag on {self.topic} drained to {self._lag}, resumed after {throttled_ms:.0f}ms")
+
+    def release(self) -> None:
+        """Wake up blocked consumers and stop throttling (used on shutdown)"""
+        self._released.set()
+
+    def reset(self) -> None:
+        """Re-arm the controller after release()"""
+        self._released.clear()
+        self._last_check = 0.0
+
+    def _measure_lag(self) -> int:
+        """Query downstream lag, treating failures as no lag"""
+        try:
+            return self.queue.get_lag(self.topic)
+        except Exception as e:
+            logger.error(f"Failed to measure lag on {self.topic}: {e}")
+            return 0
+
+    def is_throttled(self) -> bool:
+        """Check if consumption is currently paused"""
+        return self._throttled
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get backpressure status"""
+        return {
+            "topic": self.topic,
+            "lag": self._lag,
+            "high_watermark": self.high_watermark,
+            "low_watermark": self.low_watermark,
+            "throttled": self._throttled,
+            **self._stats,
+        }
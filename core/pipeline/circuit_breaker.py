@@ -0,0 +1,165 @@
+"""
+Plugin Circuit Breaker
+
+Stops calling a processing plugin after consecutive failures (exceptions
+or exceeded time budgets) and probes it again after a cool-down, so one
+hanging or crashing plugin cannot drag down the whole pipeline.
+"""
+
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BreakerState(str, Enum):
+    """Circuit breaker states"""
+
+    CLOSED = "closed"  # Plugin is called normally
+    OPEN = "open"  # Plugin is skipped
+    HALF_OPEN = "half_open"  # A limited number of probe calls is let through
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    CLOSED -> OPEN after ``failure_threshold`` consecutive failures.
+    OPEN -> HALF_OPEN once ``reset_timeout_s`` has passed; up to
+    ``half_open_max_calls`` probe calls are then let through. A successful
+    probe closes the breaker, a failed one opens it for another cool-down.
+
+    Example:
+        >>> breaker = CircuitBreaker("geocoder", failure_threshold=3)
+        >>> if breaker.allow():
+        ...     try:
+        ...         call_plugin()
+        ...         breaker.record_success()
+        ...     except Exception:
+        ...         breaker.record_failure()
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            name: Name of the protected plugin
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout_s: Time the breaker stays open before probing
+            half_open_max_calls: Concurrent probe calls allowed while half-open
+        """
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be positive, got {failure_threshold}")
+        if half_open_max_calls < 1:
+            raise ValueError(f"half_open_max_calls must be positive, got {half_open_max_calls}")
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = BreakerState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        self._stats = {"failures": 0, "rejected": 0, "times_opened": 0}
+
+    @property
+    def state(self) -> BreakerState:
+        """Current state, moving OPEN to HALF_OPEN once the cool-down has passed"""
+        with self._lock:
+            self._check_cooldown()
+            return self._state
+
+    def _check_cooldown(self) -> None:
+        if self._state is BreakerState.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout_s:
+            self._state = BreakerState.HALF_OPEN
+            self._probes = 0
+            logger.info(f"Circuit breaker for {self.name} half-open, probing")
+
+    def allow(self) -> bool:
+        """
+        Check whether the plugin may be called now.
+
+        Returns:
+            False if the call should be skipped
+        """
+        with self._lock:
+            self._check_cooldown()
+            if self._state is BreakerState.CLOSED:
+                return True
+            if self._state is BreakerState.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        with self._lock:
+            self._consecutive_failures = 0
+            if self._state is not BreakerState.CLOSED:
+                self._state = BreakerState.CLOSED
+                logger.info(f"Circuit breaker for {self.name} closed")
+
+    def record_failure(self) -> bool:
+        """
+        Record a failed call.
+
+        Returns:
+            True if this failure changed the breaker state (first failure of
+            a streak or opening the breaker), i.e. worth logging in detail
+        """
+        with self._lock:
+            self._stats["failures"] += 1
+            self._consecutive_failures += 1
+
+            if self._state is BreakerState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state is not BreakerState.OPEN:
+                    self._open()
+                    return True
+                return False
+
+            return self._consecutive_failures == 1
+
+    def _open(self) -> None:
+        self._state = BreakerState.OPEN
+        self._opened_at = time.monotonic()
+        self._stats["times_opened"] += 1
+        logger.warning(
+            f"Circuit breaker for {self.name} opened after {self._consecutive_failures} consecutive failures, "
+            f"skipping plugin for {self.reset_timeout_s:.0f}s"
+        )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get breaker state and counters"""
+        with self._lock:
+            self._check_cooldown()
+            status: Dict[str, Any] = {
+                "state": self._state.value,
+                "consecutive_failures": self._consecutive_failures,
+                **self._stats,
+            }
+            if self._state is BreakerState.OPEN:
+                status["retry_in_s"] = max(0.0, self.reset_timeout_s - (time.monotonic() - self._opened_at))
+            return status
+
+
+class PluginTimeoutError(TimeoutError):
+    """Raised when a plugin exceeds its time budget"""
+
+    def __init__(self, plugin_name: str, timeout_ms: float, message: Optional[str] = None):
+        self.plugin_name = plugin_name
+        self.timeout_ms = timeout_ms
+        super().__init__(message or f"Plugin {plugin_name} exceeded its {timeout_ms:.0f}ms budget")
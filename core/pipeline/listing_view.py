@@ -0,0 +1,200 @@
+"""
+Copy-on-write Listing View
+
+Opt-in listing payload passed through the processing chain. The source
+listing is shared read-only between all stages; every plugin only records
+the fields it sets or deletes, and the final listing is materialized once
+when the processed event is built (or before it is scored).
+"""
+
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+
+class _Deleted:
+    """Marker for a field deleted in the overlay"""
+
+    def __repr__(self) -> str:
+        return "<deleted>"
+
+
+DELETED = _Deleted()
+
+
+class ListingView(MutableMapping):
+    """
+    Copy-on-write mapping over a read-only base listing.
+
+    Writes and deletions go to a small overlay; the base is never modified.
+    ``copy()`` only copies the overlay, so handing each plugin its own view
+    costs O(fields changed) instead of O(listing size).
+
+    Copy-on-write is shallow, like ``dict.copy()``: replacing a field is
+    tracked, mutating a nested dict or list in place is not (and changes
+    the shared base).
+
+    Example:
+        >>> view = ListingView({"price": 100, "html": "<large page>"})
+        >>> view["price_normalized"] = 1.0
+        >>> view.changes()
+        {'set': {'price_normalized': 1.0}, 'deleted': []}
+        >>> view.materialize()
+        {'price': 100, 'html': '<large page>', 'price_normalized': 1.0}
+    """
+
+    __slots__ = ("_base", "_overlay", "_size")
+
+    def __init__(self, base: Mapping, overlay: Optional[Dict[str, Any]] = None):
+        """
+        Initialize view.
+
+        Args:
+            base: Source listing, never modified through the view
+            overlay: Initial field changes (values or DELETED)
+        """
+        self._base = base
+        self._overlay: Dict[str, Any] = overlay if overlay is not None else {}
+        self._size: Optional[int] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._overlay:
+            value = self._overlay[key]
+            if value is DELETED:
+                raise KeyError(key)
+            return value
+        return self._base[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._overlay[key] = value
+        self._size = None
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._overlay[key] = DELETED
+        self._size = None
+
+    def __contains__(self, key: Any) -> bool:
+        if key in self._overlay:
+            return self._overlay[key] is not DELETED
+        return key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        overlay = self._overlay
+        for key in self._base:
+            if overlay.get(key, None) is not DELETED:
+                yield key
+        for key, value in overlay.items():
+            if value is not DELETED and key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        if self._size is None:
+            self._size = sum(1 for _ in self)
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"ListingView({self.materialize()!r})"
+
+    @property
+    def base(self) -> Mapping:
+        """Shared read-only source listing"""
+        return self._base
+
+    def copy(self) -> "ListingView":
+        """Create an independent view sharing the same base"""
+        return ListingView(self._base, dict(self._overlay))
+
+    def overlay_keys(self) -> List[str]:
+        """Get the fields set or deleted through this view"""
+        return list(self._overlay)
+
+    def changes(self) -> Dict[str, Any]:
+        """
+        Get the fields changed relative to the base.
+
+        Returns:
+            Dictionary with ``set`` (field values) and ``deleted`` (field names)
+        """
+        return _delta(self._base, self._overlay)
+
+    def materialize(self) -> Dict[str, Any]:
+        """Build the listing as a plain dictionary"""
+        if not self._overlay:
+            return dict(self._base)
+
+        listing = dict(self._base)
+        for key, value in self._overlay.items():
+            if value is DELETED:
+                listing.pop(key, None)
+            else:
+                listing[key] = value
+        return listing
+
+
+# Listing passed between processing stages: a plain dict, or a view when
+# copy-on-write is enabled
+ListingData = Union[Dict[str, Any], ListingView]
+
+
+def _same(old: Any, new: Any) -> bool:
+    # Identity first: unchanged fields are usually the very same object
+    return old is new or old == new
+
+
+def _delta(base: Mapping, overlay: Dict[str, Any]) -> Dict[str, Any]:
+    changed: Dict[str, Any] = {}
+    deleted: List[str] = []
+    for key, value in overlay.items():
+        if value is DELETED:
+            if key in base:
+                deleted.append(key)
+        elif key not in base or not _same(base[key], value):
+            changed[key] = value
+    return {"set": changed, "deleted": deleted}
+
+
+def as_view(listing: Mapping) -> ListingView:
+    """Wrap a plugin result in a view, reusing it if it already is one"""
+    if isinstance(listing, ListingView):
+        return listing
+    return ListingView(listing)
+
+
+def materialize(listing: Mapping) -> Dict[str, Any]:
+    """Turn a view (or any mapping) into a plain dictionary"""
+    if isinstance(listing, ListingView):
+        return listing.materialize()
+    return dict(listing)
+
+
+def diff(before: Mapping, after: Mapping) -> Dict[str, Any]:
+    """
+    Compute the fields a stage changed.
+
+    Cheap when both sides are views over the same base (only the overlays
+    are compared); otherwise falls back to comparing every field.
+
+    Args:
+        before: Listing before the stage
+        after: Listing after the stage
+
+    Returns:
+        Dictionary with ``set`` (new field values) and ``deleted`` (field names)
+    """
+    if isinstance(before, ListingView) and isinstance(after, ListingView) and before.base is after.base:
+        changed: Dict[str, Any] = {}
+        deleted: List[str] = []
+        for key in set(before.overlay_keys()) | set(after.overlay_keys()):
+            old = before.get(key, DELETED)
+            new = after.get(key, DELETED)
+            if new is DELETED:
+                if old is not DELETED:
+                    deleted.append(key)
+            elif not _same(old, new):
+                changed[key] = new
+        return {"set": changed, "deleted": sorted(deleted)}
+
+    changed = {key: value for key, value in after.items() if key not in before or not _same(before[key], value)}
+    deleted = sorted(key for key in before if key not in after)
+    return {"set": changed, "deleted": deleted}
@@ -0,0 +1,388 @@
+"""
+Pipeline Latency Metrics
+
+Fixed-memory latency histograms per plugin and per stage, plugin error
+counters, an opt-in profiler capturing call stacks of the slowest events,
+and Prometheus text rendering of all of it.
+"""
+
+import cProfile
+import heapq
+import io
+import itertools
+import logging
+import math
+import pstats
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (50, 95, 99)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram with fixed memory (HDR-style).
+
+    Every power of two between ``min_value`` and ``max_value`` is split into
+    ``sub_buckets`` equal-ratio buckets, so percentiles have a bounded
+    relative error (about 4.4% with the default 16 sub-buckets) regardless
+    of how many values are recorded. Values outside the range are clamped
+    into the first and last bucket.
+    """
+
+    def __init__(self, min_value: float = 0.001, max_value: float = 60_000.0, sub_buckets: int = 16):
+        """
+        Initialize histogram.
+
+        Args:
+            min_value: Smallest distinguishable value in milliseconds
+            max_value: Largest distinguishable value in milliseconds
+            sub_buckets: Buckets per power of two
+        """
+        if not 0 < min_value < max_value:
+            raise ValueError(f"Invalid histogram range [{min_value}, {max_value}]")
+
+        self.min_value = min_value
+        self.max_value = max_value
+        self.sub_buckets = sub_buckets
+
+        self._log_min = math.log2(min_value)
+        self._counts = [0] * (int(math.ceil(math.log2(max_value / min_value) * sub_buckets)) + 2)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def _index(self, value: float) -> int:
+        if value <= self.min_value:
+            return 0
+        index = int((math.log2(value) - self._log_min) * self.sub_buckets) + 1
+        return min(index, len(self._counts) - 1)
+
+    def _upper_bound(self, index: int) -> float:
+        return self.min_value * 2 ** (index / self.sub_buckets)
+
+    def record(self, value: float, count: int = 1) -> None:
+        """Record ``count`` occurrences of a value in milliseconds"""
+        index = self._index(value)
+        with self._lock:
+            self._counts[index] += count
+            self.count += count
+            self.sum += value * count
+            if value > self.max:
+                self.max = value
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get the value below which ``percent`` of recorded values fall.
+
+        Returns:
+            Upper bound of the matching bucket, capped at the largest recorded value
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = max(1, math.ceil(percent / 100.0 * self.count))
+            cumulative = 0
+            for index, bucket_count in enumerate(self._counts):
+                cumulative += bucket_count
+                if cumulative >= target:
+                    if index == len(self._counts) - 1:
+                        # Overflow bucket has no upper bound
+                        return self.max
+                    return min(self._upper_bound(index), self.max)
+            return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the values of another histogram with the same layout"""
+        if len(other._counts) != len(self._counts) or other.min_value != self.min_value:
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+
+        with other._lock:
+            counts = list(other._counts)
+            count, total, maximum = other.count, other.sum, other.max
+        with self._lock:
+            for index, bucket_count in enumerate(counts):
+                self._counts[index] += bucket_count
+            self.count += count
+            self.sum += total
+            self.max = max(self.max, maximum)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get count, mean, max and p50/p95/p99"""
+        snapshot: Dict[str, float] = {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+        }
+        for quantile in QUANTILES:
+            snapshot[f"p{quantile}"] = self.percentile(quantile)
+        return snapshot
+
+
+class SlowEventProfiler:
+    """
+    Opt-in profiler keeping cProfile stacks of the slowest N events.
+
+    Sampled events run under cProfile; the formatted profile is only kept
+    (and only rendered) when the event ranks among the ``top_n`` slowest
+    seen so far. One event is profiled at a time; events arriving while a
+    profile is running are executed without profiling.
+    """
+
+    def __init__(self, top_n: int = 10, sample_rate: float = 1.0, max_functions: int = 20):
+        """
+        Initialize profiler.
+
+        Args:
+            top_n: Number of slowest events to keep
+            sample_rate: Fraction of events that are profiled (0.0-1.0)
+            max_functions: Number of functions listed per profile
+        """
+        if top_n < 1:
+            raise ValueError(f"top_n must be positive, got {top_n}")
+        if not 0.0 < sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+
+        self.top_n = top_n
+        self.sample_rate = sample_rate
+        self.max_functions = max_functions
+
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._profiling = threading.Lock()
+
+    def run(self, event_id: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call ``func``, profiling it if the event is sampled.
+
+        Args:
+            event_id: ID of the event being processed
+            func: Function to call
+
+        Returns:
+            Result of ``func``
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return func(*args, **kwargs)
+
+        # Only one cProfile profiler may be active per interpreter (enforced
+        # since Python 3.12), so concurrent events run unprofiled.
+        if not self._profiling.acquire(blocking=False):
+            return func(*args, **kwargs)
+
+        try:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except Exception as e:
+                logger.debug(f"Could not start profiler for event {event_id}: {e}")
+                return func(*args, **kwargs)
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration_ms = (time.perf_counter() - start) * 1000
+                try:
+                    profiler.disable()
+                    self._consider(event_id, duration_ms, profiler)
+                except Exception as e:
+                    logger.warning(f"Failed to record profile of event {event_id}: {e}")
+        finally:
+            self._profiling.release()
+
+    def _consider(self, event_id: str, duration_ms: float, profiler: cProfile.Profile) -> None:
+        """Keep the profile if the event is among the slowest"""
+        with self._lock:
+            if len(self._slowest) >= self.top_n and duration_ms <= self._slowest[0][0]:
+                return
+
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(self.max_functions)
+        entry = (
+            duration_ms,
+            next(self._sequence),
+            {"event_id": event_id, "duration_ms": duration_ms, "profile": stream.getvalue()},
+        )
+
+        with self._lock:
+            if len(self._slowest) < self.top_n:
+                heapq.heappush(self._slowest, entry)
+            elif duration_ms > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def get_slowest(self) -> List[Dict[str, Any]]:
+        """Get profiles of the slowest events, slowest first"""
+        with self._lock:
+            return [record for _, _, record in sorted(self._slowest, reverse=True)]
+
+    def clear(self) -> None:
+        """Drop collected profiles"""
+        with self._lock:
+            self._slowest.clear()
+
+
+class PipelineMetrics:
+    """
+    Latency histograms and error counters of one processing pipeline.
+
+    Tracks end-to-end event latency, latency per plugin and per DAG stage,
+    and failures per plugin.
+    """
+
+    def __init__(self) -> None:
+        self.event_latency = LatencyHistogram()
+        self.plugin_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.stage_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self.plugin_errors: Dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record_event(self, duration_ms: float, count: int = 1) -> None:
+        """Record end-to-end processing time of events"""
+        self.event_latency.record(duration_ms, count)
+
+    def record_plugin(self, plugin_name: str, duration_ms: float, count: int = 1) -> None:
+        """Record successful plugin executions"""
+        self._histogram(self.plugin_latency, plugin_name).record(duration_ms, count)
+
+    def record_stage(self, stage_name: str, duration_ms: float) -> None:
+        """Record execution time of a DAG stage"""
+        self._histogram(self.stage_latency, stage_name).record(duration_ms)
+
+    def record_plugin_error(self, plugin_name: str) -> None:
+        """Count a plugin failure"""
+        with self._lock:
+            self.plugin_errors[plugin_name] += 1
+
+    def _histogram(self, histograms: Dict[str, LatencyHistogram], name: str) -> LatencyHistogram:
+        histogram = histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = histograms[name]
+        return histogram
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get percentiles of all histograms and error counts"""
+        return {
+            "event": self.event_latency.snapshot(),
+            "plugins": {name: h.snapshot() for name, h in list(self.plugin_latency.items())},
+            "stages": {name: h.snapshot() for name, h in list(self.stage_latency.items())},
+            "plugin_errors": dict(self.plugin_errors),
+        }
+
+    def render_prometheus(self, labels: Optional[Dict[str, str]] = None, prefix: str = "pipeline") -> str:
+        """
+        Render metrics in Prometheus text exposition format.
+
+        Args:
+            labels: Labels added to every sample
+            prefix: Metric name prefix
+
+        Returns:
+            Prometheus text format
+        """
+        return render_prometheus([(labels or {}, self)], prefix)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels.items()
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def render_prometheus(sources: List[Tuple[Dict[str, str], PipelineMetrics]], prefix: str = "pipeline") -> str:
+    """
+    Render metrics of several pipelines in Prometheus text exposition format.
+
+    Histograms are exposed as summaries with p50/p95/p99 quantiles. Each
+    metric family is declared once, with one series per pipeline.
+
+    Args:
+        sources: Pairs of (labels, metrics) per pipeline
+        prefix: Metric name prefix
+
+    Returns:
+        Prometheus text format
+    """
+    lines: List[str] = []
+
+    def summary(name: str, help_text: str, series: List[Tuple[Dict[str, str], LatencyHistogram]]) -> None:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} summary")
+        for labels, histogram in series:
+            for quantile in QUANTILES:
+                quantile_labels = {**labels, "quantile": str(quantile / 100)}
+                lines.append(f"{prefix}_{name}{_format_labels(quantile_labels)} {histogram.percentile(quantile):.6g}")
+            lines.append(f"{prefix}_{name}_sum{_format_labels(labels)} {histogram.sum:.6g}")
+            lines.append(f"{prefix}_{name}_count{_format_labels(labels)} {histogram.count}")
+
+    summary(
+        "event_latency_ms",
+        "End-to-end event processing time in milliseconds",
+        [(labels, metrics.event_latency) for labels, metrics in sources],
+    )
+    summary(
+        "plugin_latency_ms",
+        "Processing plugin execution time in milliseconds",
+        [
+            ({**labels, "plugin": name}, histogram)
+            for labels, metrics in sources
+            for name, histogram in sorted(metrics.plugin_latency.items())
+        ],
+    )
+    summary(
+        "stage_latency_ms",
+        "Parallel stage execution time in milliseconds",
+        [
+            ({**labels, "stage": name}, histogram)
+            for labels, metrics in sources
+            for name, histogram in sorted(metrics.stage_latency.items())
+        ],
+    )
+
+    lines.append(f"# HELP {prefix}_plugin_errors_total Processing plugin failures")
+    lines.append(f"# TYPE {prefix}_plugin_errors_total counter")
+    for labels, metrics in sources:
+        for name, count in sorted(metrics.plugin_errors.items()):
+            lines.append(f"{prefix}_plugin_errors_total{_format_labels({**labels, 'plugin': name})} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsRegistry:
+    """Running pipelines whose metrics are exposed on the /metrics endpoint"""
+
+    def __init__(self) -> None:
+        self._sources: Dict[str, PipelineMetrics] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, metrics: PipelineMetrics) -> None:
+        """Expose pipeline metrics under a ``pipeline`` label value"""
+        with self._lock:
+            self._sources[name] = metrics
+
+    def unregister(self, name: str) -> None:
+        """Stop exposing pipeline metrics"""
+        with self._lock:
+            self._sources.pop(name, None)
+
+    def render_prometheus(self) -> str:
+        """Render all registered pipelines in Prometheus text format"""
+        with self._lock:
+            sources = sorted(self._sources.items())
+        return render_prometheus([({"pipeline": name}, metrics) for name, metrics in sources])
+
+
+# Global registry used by the API
+registry = MetricsRegistry()
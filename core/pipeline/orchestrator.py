@@ -6,8 +6,11 @@ Manages the flow of events through the processing pipeline.
 """
 
 import logging
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 from core.interfaces.processing_plugin import ProcessingPlugin
 from core.interfaces.queue_plugin import QueuePlugin
@@ -20,11 +23,56 @@ from core.models.events import (
     RawListingEvent,
     Topics,
 )
+from core.pipeline.backpressure import BackpressureController
+from core.pipeline.circuit_breaker import BreakerState, CircuitBreaker, PluginTimeoutError
+from core.pipeline.listing_view import ListingData, ListingView, as_view, diff, materialize
+from core.pipeline.metrics import PipelineMetrics, SlowEventProfiler, registry
+from core.pipeline.plugin_chain import PluginChain, compile_plugin_chain
+from core.pipeline.retry import RetryPolicy, retry_topic
 from core.plugin_manager import PluginManager
 
 logger = logging.getLogger(__name__)
 
 
+def merge_stage_output(merged: ListingData, output: Dict[str, Any], writes: Optional[FrozenSet[str]]) -> ListingData:
+    """
+    Merge one plugin's output of a parallel stage into the stage result.
+
+    Only the fields the plugin declared as written are taken over; a
+    declared field missing from the output is treated as deleted.
+
+    Args:
+        merged: Stage result so far (modified in place)
+        output: Plugin output
+        writes: Declared write fields, None if undeclared
+
+    Returns:
+        Updated stage result
+    """
+    if writes is None:
+        # Only shares a stage with plugins that touch no fields
+        return as_view(output) if isinstance(merged, ListingView) else dict(output)
+
+    for field in writes:
+        if field in output:
+            merged[field] = output[field]
+        else:
+            merged.pop(field, None)
+    return merged
+
+
+def stage_label(chain: PluginChain, stage: Tuple[int, ...]) -> str:
+    """Label of a DAG stage, e.g. ``geocoder+price_normalizer``"""
+    return "+".join(chain.names[index] for index in stage)
+
+
+def _timed_call(func: Callable[[Any], Any], argument: Any) -> Tuple[Any, float]:
+    """Call a plugin method and measure its duration in milliseconds"""
+    start = time.time()
+    result = func(argument)
+    return result, (time.time() - start) * 1000
+
+
 class ProcessingOrchestrator:
     """
     Orchestrates the processing pipeline for listings.
@@ -37,6 +85,10 @@ class ProcessingOrchestrator:
 
     Features:
     - Priority-based plugin execution
+    - Cached plugin chain, recompiled only when the plugin set changes
+    - Optional concurrent execution of independent plugins (enable_parallel)
+    - Per-plugin time budgets and circuit breakers
+    - Delayed retries with exponential backoff on a lower-priority retry lane
     - Error handling and dead letter queue
     - Progress tracking and observability
     - Graceful shutdown
@@ -48,6 +100,21 @@ class ProcessingOrchestrator:
         queue: QueuePlugin,
         max_retries: int = 3,
         enable_parallel: bool = False,
+        batch_size: int = 1,
+        batch_timeout_ms: float = 50.0,
+        max_workers: Optional[int] = None,
+        input_topic: str = Topics.RAW_LISTINGS,
+        max_downstream_lag: Optional[int] = None,
+        resume_downstream_lag: Optional[int] = None,
+        profile_slowest: int = 0,
+        profile_sample_rate: float = 1.0,
+        copy_on_write: bool = False,
+        record_stage_diffs: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_max_defer_ms: float = 1000.0,
+        plugin_timeout_ms: Optional[float] = None,
+        breaker_failure_threshold: Optional[int] = 5,
+        breaker_reset_timeout_s: float = 30.0,
     ):
         """
         Initialize processing orchestrator.
@@ -57,19 +124,76 @@ class ProcessingOrchestrator:
             queue: Message queue instance
             max_retries: Maximum retry attempts for failed processing
             enable_parallel: Enable parallel execution of independent plugins
+            batch_size: Number of raw events consumed per batch (1 disables batch mode)
+            batch_timeout_ms: Maximum time to wait for a batch to fill up
+            max_workers: Thread pool size for parallel stages (default: executor default)
+            input_topic: Topic raw events are consumed from; failed events are
+                retried on its retry lane (``<input_topic>.retry``)
+            max_downstream_lag: Unconsumed processed events at which consumption
+                pauses (None disables backpressure)
+            resume_downstream_lag: Lag at which consumption resumes (default: half
+                of max_downstream_lag)
+            profile_slowest: Keep cProfile stacks of this many slowest events (0 disables profiling)
+            profile_sample_rate: Fraction of events profiled when profiling is enabled
+            copy_on_write: Pass plugins a copy-on-write ListingView (a MutableMapping,
+                not a dict) instead of a plain dict
+            record_stage_diffs: Attach the fields each stage changed to processed events
+            retry_policy: Backoff between retries (default: RetryPolicy())
+            retry_max_defer_ms: Longest time a due retry waits for fresh
+                traffic on the input topic to drain
+            plugin_timeout_ms: Time budget of plugins not declaring their own via
+                get_timeout_ms() (None: unlimited)
+            breaker_failure_threshold: Consecutive plugin failures after which the
+                plugin is skipped (None disables circuit breakers)
+            breaker_reset_timeout_s: Time a skipped plugin waits before it is probed again
         """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
         self.plugin_manager = plugin_manager
         self.queue = queue
         self.max_retries = max_retries
         self.enable_parallel = enable_parallel
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
+        self.max_workers = max_workers
+        self.input_topic = input_topic
+        self.copy_on_write = copy_on_write
+        self.record_stage_diffs = record_stage_diffs
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.retry_topic = retry_topic(input_topic)
+        self.retry_max_defer_ms = retry_max_defer_ms
+        self.plugin_timeout_ms = plugin_timeout_ms
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_timeout_s = breaker_reset_timeout_s
 
         self._running = False
         self._subscription_id: Optional[str] = None
+        self._retry_subscription_id: Optional[str] = None
+        # Signalled whenever the input consumer finishes events (wakes deferred retries)
+        self._ingest_progress = threading.Condition()
+        self._ingested = 0
+        self._chain: Optional[PluginChain] = None
+        self._chain_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._plugin_time_ms: Dict[str, float] = defaultdict(float)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._metrics = PipelineMetrics()
+        self._profiler: Optional[SlowEventProfiler] = None
+        if profile_slowest > 0:
+            self._profiler = SlowEventProfiler(top_n=profile_slowest, sample_rate=profile_sample_rate)
+        self._backpressure: Optional[BackpressureController] = None
+        if max_downstream_lag is not None:
+            self._backpressure = BackpressureController(
+                queue, Topics.PROCESSED_LISTINGS, max_downstream_lag, resume_downstream_lag
+            )
         self._stats = {
             "events_processed": 0,
             "events_failed": 0,
+            "events_retried": 0,
             "total_processing_time_ms": 0.0,
             "plugins_executed": 0,
+            "plugins_skipped": 0,
         }
 
     def start(self) -> None:
@@ -79,9 +203,23 @@ class ProcessingOrchestrator:
             return
 
         self._running = True
+        if self._backpressure is not None:
+            self._backpressure.reset()
+        registry.register(self.input_topic, self._metrics)
 
         # Subscribe to raw listings topic
-        self._subscription_id = self.queue.subscribe(Topics.RAW_LISTINGS, self._process_raw_listing)
+        if self.batch_size > 1:
+            self._subscription_id = self.queue.subscribe_batch(
+                self.input_topic,
+                self._track_ingest(self._process_raw_batch),
+                batch_size=self.batch_size,
+                max_wait_ms=self.batch_timeout_ms,
+            )
+        else:
+            self._subscription_id = self.queue.subscribe(
+                self.input_topic, self._track_ingest(self._process_raw_listing)
+            )
+        self._subscribe_retry_lane(self._process_raw_listing)
 
         logger.info("Processing orchestrator started")
 
@@ -91,13 +229,77 @@ class ProcessingOrchestrator:
             return
 
         self._running = False
+        if self._backpressure is not None:
+            self._backpressure.release()
+        self._notify_ingest()
 
         if self._subscription_id:
             self.queue.unsubscribe(self._subscription_id)
             self._subscription_id = None
+        self._unsubscribe_retry_lane()
 
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        registry.unregister(self.input_topic)
         logger.info("Processing orchestrator stopped")
 
+    def _subscribe_retry_lane(self, handler: Callable[[Dict[str, Any]], None]) -> None:
+        """Consume the retry lane, yielding to fresh traffic on the input topic"""
+
+        def consume_retry(message: Dict[str, Any]) -> None:
+            self._yield_to_ingest()
+            handler(message)
+
+        self._retry_subscription_id = self.queue.subscribe(self.retry_topic, consume_retry)
+
+    def _unsubscribe_retry_lane(self) -> None:
+        """Stop consuming the retry lane"""
+        if self._retry_subscription_id:
+            self.queue.unsubscribe(self._retry_subscription_id)
+            self._retry_subscription_id = None
+
+    def _track_ingest(self, handler: Callable[[Any], None]) -> Callable[[Any], None]:
+        """Wrap an input topic callback to signal progress to deferred retries"""
+
+        def consume(messages: Any) -> None:
+            try:
+                handler(messages)
+            finally:
+                self._notify_ingest()
+
+        return consume
+
+    def _notify_ingest(self) -> None:
+        """Wake retries waiting for the input topic to drain"""
+        with self._ingest_progress:
+            self._ingested += 1
+            self._ingest_progress.notify_all()
+
+    def _yield_to_ingest(self) -> None:
+        """
+        Hold a due retry while raw events are waiting on the input topic.
+
+        Retries only run when fresh traffic is drained, so they never starve
+        new ingest; ``retry_max_defer_ms`` bounds the wait so retries are not
+        starved either under sustained load. The lag is only re-checked when
+        the input consumer finishes an event, not polled.
+        """
+        deadline = time.monotonic() + self.retry_max_defer_ms / 1000
+        while self._running:
+            with self._ingest_progress:
+                seen = self._ingested
+            if self.queue.get_lag(self.input_topic) <= 0:
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            with self._ingest_progress:
+                # Skip the wait if the consumer made progress while the lag was measured
+                if self._ingested == seen:
+                    self._ingest_progress.wait(remaining)
+
     def _process_raw_listing(self, message: Dict[str, Any]) -> None:
         """
         Process a raw listing event.
@@ -105,6 +307,7 @@ class ProcessingOrchestrator:
         Args:
             message: Raw listing event from queue
         """
+        self._wait_for_downstream()
         start_time = time.time()
 
         try:
@@ -117,30 +320,16 @@ class ProcessingOrchestrator:
             event.metadata.status = EventStatus.PROCESSING
 
             # Execute processing pipeline
-            result = self._execute_pipeline(event)
+            if self._profiler is not None:
+                result = self._profiler.run(event.metadata.event_id, self._execute_pipeline, event)
+            else:
+                result = self._execute_pipeline(event)
 
             # Calculate processing time
             processing_time = (time.time() - start_time) * 1000
 
             # Create processed event
-            processed_event = ProcessedListingEvent(
-                metadata=EventMetadata(
-                    event_type=EventType.PROCESSED_LISTING,
-                    source_plugin_id=event.metadata.source_plugin_id,
-                    source_platform=event.metadata.source_platform,
-                    trace_id=event.metadata.trace_id,
-                    request_id=event.metadata.request_id,
-                    parent_event_id=event.metadata.event_id,
-                    status=EventStatus.COMPLETED,
-                ),
-                listing_data=result["listing_data"],
-                fraud_score=result.get("fraud_score", 0.0),
-                fraud_signals=result.get("fraud_signals", []),
-                risk_level=result.get("risk_level", "unknown"),
-                processing_stages=result.get("stages", []),
-                processing_duration_ms=processing_time,
-                plugins_applied=result.get("plugins", []),
-            )
+            processed_event = self._build_processed_event(event, result, processing_time)
 
             # Publish to processed listings topic
             self.queue.publish(Topics.PROCESSED_LISTINGS, processed_event.to_dict())
@@ -148,6 +337,7 @@ class ProcessingOrchestrator:
             # Update statistics
             self._stats["events_processed"] += 1
             self._stats["total_processing_time_ms"] += processing_time
+            self._metrics.record_event(processing_time)
 
             logger.info(f"Completed processing event {event.metadata.event_id} " f"in {processing_time:.2f}ms")
 
@@ -155,81 +345,523 @@ class ProcessingOrchestrator:
             logger.error(f"Failed to process event: {e}", exc_info=True)
             self._handle_processing_failure(message, str(e))
 
+    def _process_raw_batch(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Process a batch of raw listing events.
+
+        Each plugin runs once over the whole batch and results are published
+        with a single bulk call. Failures stay isolated per event: an event
+        that cannot be parsed or serialized goes through the regular retry
+        path while the rest of the batch proceeds.
+
+        Args:
+            messages: Raw listing events from queue
+        """
+        self._wait_for_downstream()
+        start_time = time.time()
+
+        events: List[RawListingEvent] = []
+        sources: List[Dict[str, Any]] = []
+        for message in messages:
+            try:
+                event = RawListingEvent.from_dict(message)
+                event.metadata.status = EventStatus.PROCESSING
+                events.append(event)
+                sources.append(message)
+            except Exception as e:
+                logger.error(f"Failed to parse event: {e}")
+                self._handle_processing_failure(message, str(e))
+
+        if not events:
+            return
+
+        logger.info(f"Processing batch of {len(events)} events")
+
+        try:
+            results = self._execute_pipeline_batch(events)
+        except Exception as e:
+            logger.error(f"Failed to process batch: {e}", exc_info=True)
+            for message in sources:
+                self._handle_processing_failure(message, str(e))
+            return
+
+        # Batch wall time is shared evenly between its events
+        processing_time = (time.time() - start_time) * 1000
+        per_event_time = processing_time / len(events)
+
+        processed: List[Dict[str, Any]] = []
+        published: List[Dict[str, Any]] = []
+        for event, message, result in zip(events, sources, results):
+            try:
+                processed.append(self._build_processed_event(event, result, per_event_time).to_dict())
+                published.append(message)
+            except Exception as e:
+                logger.error(f"Failed to build processed event {event.metadata.event_id}: {e}")
+                self._handle_processing_failure(message, str(e))
+
+        if not processed:
+            return
+
+        try:
+            self.queue.publish_batch(Topics.PROCESSED_LISTINGS, processed)
+        except Exception as e:
+            logger.error(f"Failed to publish batch of {len(processed)} events: {e}")
+            for message in published:
+                self._handle_processing_failure(message, str(e))
+            return
+
+        # Update statistics
+        self._stats["events_processed"] += len(processed)
+        self._stats["total_processing_time_ms"] += per_event_time * len(processed)
+        self._metrics.record_event(per_event_time, len(processed))
+
+        logger.info(f"Completed processing batch of {len(processed)} events in {processing_time:.2f}ms")
+
+    def _wait_for_downstream(self) -> None:
+        """Block the consumer while the processed listings topic is saturated"""
+        if self._backpressure is not None:
+            self._backpressure.acquire()
+
+    def _build_processed_event(
+        self, event: RawListingEvent, result: Dict[str, Any], processing_time: float
+    ) -> ProcessedListingEvent:
+        """
+        Build the processed event published to the next stage.
+
+        Args:
+            event: Source raw listing event
+            result: Pipeline result from _execute_pipeline
+            processing_time: Processing duration in milliseconds
+
+        Returns:
+            Processed listing event
+        """
+        return ProcessedListingEvent(
+            metadata=EventMetadata(
+                event_type=EventType.PROCESSED_LISTING,
+                source_plugin_id=event.metadata.source_plugin_id,
+                source_platform=event.metadata.source_platform,
+                trace_id=event.metadata.trace_id,
+                request_id=event.metadata.request_id,
+                parent_event_id=event.metadata.event_id,
+                status=EventStatus.COMPLETED,
+            ),
+            listing_data=materialize(result["listing_data"]),
+            fraud_score=result.get("fraud_score", 0.0),
+            fraud_signals=result.get("fraud_signals", []),
+            risk_level=result.get("risk_level", "unknown"),
+            processing_stages=result.get("stages", []),
+            stage_diffs=result.get("stage_diffs"),
+            processing_duration_ms=processing_time,
+            plugins_applied=result.get("plugins", []),
+        )
+
     def _execute_pipeline(self, event: RawListingEvent) -> Dict[str, Any]:
         """
         Execute all processing plugins in priority order.
 
+        With ``enable_parallel`` set, plugins run stage by stage following the
+        chain's DAG, and independent plugins of a stage run concurrently.
+
         Args:
             event: Raw listing event
 
         Returns:
             Dictionary with processed data and metadata
         """
-        # Get all processing plugins
-        plugins = self._get_processing_plugins()
+        chain = self._get_plugin_chain()
 
-        if not plugins:
+        if not chain.plugins:
             logger.warning("No processing plugins available")
             return {
                 "listing_data": event.raw_data,
                 "stages": [],
                 "plugins": [],
+                "timings": {},
             }
 
-        # Sort by priority (lower number = higher priority)
-        plugins.sort(key=lambda p: p.get_priority())
-
         # Initialize with raw data
-        current_data = event.raw_data
-        stages = []
-        plugins_applied = []
+        current_data = self._wrap_listing(event.raw_data)
+        plugins_applied: List[str] = []
+        timings: Dict[str, float] = {}
+        stage_diffs: List[Dict[str, Any]] = []
+
+        # Execute each stage (chain is already sorted by priority)
+        stages = chain.stages if self.enable_parallel else tuple((index,) for index in range(len(chain)))
+        for stage in stages:
+            # Plugins may write in place, so diffs need a snapshot (overlay-only for views)
+            before = current_data.copy() if self.record_stage_diffs else current_data
+            if len(stage) == 1:
+                current_data = self._run_plugin(chain, stage[0], current_data, plugins_applied, timings)
+            else:
+                stage_start = time.time()
+                current_data = self._run_parallel_stage(chain, stage, current_data, plugins_applied, timings)
+                self._metrics.record_stage(stage_label(chain, stage), (time.time() - stage_start) * 1000)
+
+            if self.record_stage_diffs:
+                stage_diffs.append({"stage": stage_label(chain, stage), **diff(before, current_data)})
 
-        # Execute each plugin
-        for plugin in plugins:
+        result: Dict[str, Any] = {
+            "listing_data": current_data,
+            "stages": list(plugins_applied),
+            "plugins": plugins_applied,
+            "timings": timings,
+        }
+        if self.record_stage_diffs:
+            result["stage_diffs"] = stage_diffs
+        return result
+
+    def _run_plugin(
+        self,
+        chain: PluginChain,
+        index: int,
+        data: ListingData,
+        plugins_applied: List[str],
+        timings: Dict[str, float],
+    ) -> ListingData:
+        """
+        Run a single plugin of the chain.
+
+        Returns:
+            Plugin output, or the unchanged input if the plugin failed
+        """
+        plugin = chain.plugins[index]
+        plugin_name = chain.names[index]
+        if not self._allow_plugin(plugin_name):
+            return data
+
+        try:
+            logger.debug(f"Executing plugin: {plugin_name}")
+
+            # Process data
+            result, duration = self._call_with_budget(
+                plugin_name, plugin.process, data, self._plugin_timeout(chain, index)
+            )
+
+            self._record_plugin_run(plugin_name, duration, plugins_applied, timings)
+
+            logger.debug(f"Plugin {plugin_name} completed in {duration:.2f}ms")
+            return self._wrap_listing(result)
+
+        except Exception as e:
+            self._record_plugin_failure(plugin_name, e)
+            # Continue with other plugins
+            return data
+
+    def _run_parallel_stage(
+        self,
+        chain: PluginChain,
+        stage: Tuple[int, ...],
+        data: ListingData,
+        plugins_applied: List[str],
+        timings: Dict[str, float],
+    ) -> ListingData:
+        """
+        Run independent plugins of one DAG stage concurrently.
+
+        Every plugin gets its own shallow copy of the listing. Their outputs
+        are merged in priority order, taking only the fields each plugin
+        declared as written.
+
+        Returns:
+            Merged listing data
+        """
+        executor = self._get_executor()
+        stage_start = time.time()
+
+        futures = [
+            (index, executor.submit(_timed_call, chain.plugins[index].process, data.copy()))
+            for index in stage
+            if self._allow_plugin(chain.names[index])
+        ]
+
+        merged = data.copy()
+        for index, future in futures:
+            plugin_name = chain.names[index]
             try:
-                plugin_name = plugin.get_metadata()["name"]
-                logger.debug(f"Executing plugin: {plugin_name}")
+                # Budgets of a stage's plugins run concurrently, all from the stage start
+                output, duration = self._await_plugin(
+                    future, plugin_name, self._plugin_timeout(chain, index), stage_start
+                )
+            except Exception as e:
+                self._record_plugin_failure(plugin_name, e)
+                continue
+
+            merged = merge_stage_output(merged, output, chain.writes[index])
+            self._record_plugin_run(plugin_name, duration, plugins_applied, timings)
+
+        stage_duration = (time.time() - stage_start) * 1000
+        logger.debug(f"Stage {stage_label(chain, stage)} completed in {stage_duration:.2f}ms")
+
+        return merged
+
+    def _record_plugin_run(
+        self,
+        plugin_name: str,
+        duration: float,
+        plugins_applied: List[str],
+        timings: Dict[str, float],
+    ) -> None:
+        """Record a successful plugin execution"""
+        breaker = self._breakers.get(plugin_name)
+        if breaker is not None:
+            breaker.record_success()
+
+        plugins_applied.append(plugin_name)
+        timings[plugin_name] = duration
+
+        self._stats["plugins_executed"] = int(self._stats["plugins_executed"]) + 1
+        self._plugin_time_ms[plugin_name] += duration
+        self._metrics.record_plugin(plugin_name, duration)
+
+    def _get_breaker(self, plugin_name: str) -> Optional[CircuitBreaker]:
+        """Get the circuit breaker of a plugin, None if breakers are disabled"""
+        if self.breaker_failure_threshold is None:
+            return None
+        breaker = self._breakers.get(plugin_name)
+        if breaker is None:
+            with self._chain_lock:
+                breaker = self._breakers.get(plugin_name)
+                if breaker is None:
+                    breaker = CircuitBreaker(
+                        plugin_name,
+                        failure_threshold=self.breaker_failure_threshold,
+                        reset_timeout_s=self.breaker_reset_timeout_s,
+                    )
+                    self._breakers[plugin_name] = breaker
+        return breaker
+
+    def _allow_plugin(self, plugin_name: str) -> bool:
+        """Check the plugin's circuit breaker, counting skipped calls"""
+        breaker = self._get_breaker(plugin_name)
+        if breaker is None or breaker.allow():
+            return True
+        self._stats["plugins_skipped"] = int(self._stats["plugins_skipped"]) + 1
+        logger.debug(f"Skipping plugin {plugin_name}: circuit breaker open")
+        return False
+
+    def _record_plugin_failure(self, plugin_name: str, error: Exception) -> None:
+        """
+        Record a plugin failure.
+
+        The stack trace is only logged when the failure changes the breaker
+        state (first failure of a streak, breaker opening); repeated failures
+        of a known-bad plugin log a single line.
+        """
+        self._metrics.record_plugin_error(plugin_name)
+
+        breaker = self._breakers.get(plugin_name)
+        if breaker is not None and not breaker.record_failure():
+            logger.warning(f"Plugin {plugin_name} failed again: {error}")
+            return
+        logger.error(f"Plugin {plugin_name} failed: {error}", exc_info=not isinstance(error, PluginTimeoutError))
+
+    def _plugin_timeout(self, chain: PluginChain, index: int) -> Optional[float]:
+        """Time budget of a plugin in milliseconds, None if unlimited"""
+        timeout = chain.timeouts[index] if chain.timeouts else None
+        return timeout if timeout is not None else self.plugin_timeout_ms
+
+    def _call_with_budget(
+        self, plugin_name: str, func: Callable[[Any], Any], argument: Any, timeout_ms: Optional[float]
+    ) -> Tuple[Any, float]:
+        """
+        Call a plugin method, enforcing its time budget.
 
-                # Process data
-                start = time.time()
-                current_data = plugin.process(current_data)
-                duration = (time.time() - start) * 1000
+        Budgeted calls run on the thread pool so the caller can stop waiting.
+        The plugin gets its own copy of the listing(s), so a call abandoned
+        after its budget cannot modify the listing afterwards.
 
-                # Record stage
-                stages.append(plugin_name)
-                plugins_applied.append(plugin_name)
+        Returns:
+            Tuple of (result, duration_ms)
+
+        Raises:
+            PluginTimeoutError: If the call exceeded its budget
+        """
+        if timeout_ms is None:
+            return _timed_call(func, argument)
+
+        argument = [listing.copy() for listing in argument] if isinstance(argument, list) else argument.copy()
+        future = self._get_executor().submit(_timed_call, func, argument)
+        return self._await_plugin(future, plugin_name, timeout_ms, time.time())
+
+    def _await_plugin(
+        self, future: Future, plugin_name: str, timeout_ms: Optional[float], started: float
+    ) -> Tuple[Any, float]:
+        """
+        Wait for a plugin call submitted to the thread pool.
+
+        Python threads cannot be interrupted: on timeout a call that has not
+        started yet is cancelled, a running one is abandoned and its result
+        discarded. The circuit breaker stops new calls to a plugin that
+        keeps exceeding its budget.
+
+        Raises:
+            PluginTimeoutError: If the call did not finish within ``timeout_ms`` of ``started``
+        """
+        if timeout_ms is None:
+            return future.result()
+
+        try:
+            return future.result(timeout=max(0.0, started + timeout_ms / 1000 - time.time()))
+        except TimeoutError:
+            if future.done():
+                raise
+            future.cancel()
+            raise PluginTimeoutError(plugin_name, timeout_ms) from None
+
+    def _wrap_listing(self, listing: Dict[str, Any]) -> ListingData:
+        """Wrap a listing in a copy-on-write view when enabled"""
+        return as_view(listing) if self.copy_on_write else listing
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for parallel stages"""
+        if self._executor is None:
+            with self._chain_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="pipeline-stage",
+                    )
+        return self._executor
+
+    def _execute_pipeline_batch(self, events: List[RawListingEvent]) -> List[Dict[str, Any]]:
+        """
+        Execute all processing plugins over a batch of events.
+
+        Args:
+            events: Raw listing events
+
+        Returns:
+            Pipeline results aligned with ``events``
+        """
+        chain = self._get_plugin_chain()
+
+        current_data = [self._wrap_listing(event.raw_data) for event in events]
+        plugins_applied: List[List[str]] = [[] for _ in events]
+        stage_diffs: List[List[Dict[str, Any]]] = [[] for _ in events]
+
+        if not chain.plugins:
+            logger.warning("No processing plugins available")
 
-                self._stats["plugins_executed"] = int(self._stats["plugins_executed"]) + 1
+        for index, plugin_name in enumerate(chain.names):
+            before = [data.copy() for data in current_data] if self.record_stage_diffs else current_data
+            start = time.time()
+            outputs = self._run_plugin_batch(chain, index, current_data)
+            duration = (time.time() - start) * 1000
+
+            succeeded = 0
+            for i, output in enumerate(outputs):
+                if output is None:
+                    continue
+                listing = self._wrap_listing(output)
+                if self.record_stage_diffs:
+                    stage_diffs[i].append({"stage": plugin_name, **diff(before[i], listing)})
+                current_data[i] = listing
+                plugins_applied[i].append(plugin_name)
+                succeeded += 1
+
+            self._stats["plugins_executed"] = int(self._stats["plugins_executed"]) + succeeded
+            self._plugin_time_ms[plugin_name] += duration
+            if succeeded:
+                # Batch time is shared evenly between the listings it processed
+                self._metrics.record_plugin(plugin_name, duration / len(outputs), succeeded)
+
+            logger.debug(f"Plugin {plugin_name} processed {succeeded}/{len(outputs)} listings in {duration:.2f}ms")
+
+        results: List[Dict[str, Any]] = [
+            {
+                "listing_data": data,
+                "stages": list(applied),
+                "plugins": applied,
+            }
+            for data, applied in zip(current_data, plugins_applied)
+        ]
+        if self.record_stage_diffs:
+            for result, diffs in zip(results, stage_diffs):
+                result["stage_diffs"] = diffs
+        return results
+
+    def _run_plugin_batch(
+        self,
+        chain: PluginChain,
+        index: int,
+        listings: List[ListingData],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run one plugin over a batch of listings.
 
-                logger.debug(f"Plugin {plugin_name} completed in {duration:.2f}ms")
+        Plugins that implement process_batch() get the whole batch at once.
+        If that call fails (or the plugin has no batch hook), listings are
+        processed one by one and a failure only affects its own listing.
 
+        Returns:
+            Plugin outputs aligned with ``listings``; None where the plugin failed
+        """
+        plugin = chain.plugins[index]
+        plugin_name = chain.names[index]
+        timeout_ms = self._plugin_timeout(chain, index)
+        if chain.vectorized[index]:
+            if not self._allow_plugin(plugin_name):
+                return [None] * len(listings)
+            try:
+                # The budget applies per listing
+                budget = timeout_ms * len(listings) if timeout_ms is not None else None
+                batch_outputs, _ = self._call_with_budget(plugin_name, plugin.process_batch, listings, budget)
+                if len(batch_outputs) != len(listings):
+                    raise ValueError(
+                        f"process_batch returned {len(batch_outputs)} results for {len(listings)} listings"
+                    )
+                breaker = self._breakers.get(plugin_name)
+                if breaker is not None:
+                    breaker.record_success()
+                return list(batch_outputs)
             except Exception as e:
-                logger.error(f"Plugin {plugin_name} failed: {e}", exc_info=True)
-                # Continue with other plugins
+                self._record_plugin_failure(plugin_name, e)
+                logger.warning(f"Plugin {plugin_name} batch failed, falling back to per-listing processing")
+
+        outputs: List[Optional[Dict[str, Any]]] = []
+        for listing in listings:
+            # The breaker may open (or admit only probes) within this batch
+            if not self._allow_plugin(plugin_name):
+                outputs.append(None)
                 continue
+            try:
+                output, _ = self._call_with_budget(plugin_name, plugin.process, listing, timeout_ms)
+                breaker = self._breakers.get(plugin_name)
+                if breaker is not None:
+                    breaker.record_success()
+                outputs.append(output)
+            except Exception as e:
+                self._record_plugin_failure(plugin_name, e)
+                outputs.append(None)
+        return outputs
 
-        return {
-            "listing_data": current_data,
-            "stages": stages,
-            "plugins": plugins_applied,
-        }
+    def _get_plugin_chain(self) -> PluginChain:
+        """
+        Get the compiled processing plugin chain.
+
+        The fast path is a single epoch comparison; the chain is only
+        recompiled (and swapped in as a whole) after the plugin manager
+        reports a change.
+
+        Returns:
+            Current plugin chain
+        """
+        chain = self._chain
+        if chain is not None and not chain.is_stale(self.plugin_manager):
+            return chain
+
+        with self._chain_lock:
+            chain = self._chain
+            if chain is None or chain.is_stale(self.plugin_manager):
+                chain = compile_plugin_chain(self.plugin_manager)
+                self._chain = chain
+                logger.info(f"Compiled processing chain (epoch {chain.epoch}): {list(chain.names)}")
+            return chain
 
     def _get_processing_plugins(self) -> List[ProcessingPlugin]:
-        """Get all enabled processing plugins"""
-        all_plugins = self.plugin_manager.list()
-        processing_plugins: List[ProcessingPlugin] = []
-
-        for plugin_meta in all_plugins:
-            if plugin_meta.type == "processing" and plugin_meta.enabled:
-                try:
-                    # Get plugin instance
-                    plugin = self.plugin_manager.get_instance(plugin_meta.id)
-                    if isinstance(plugin, ProcessingPlugin):
-                        processing_plugins.append(plugin)
-                except Exception as e:
-                    logger.error(f"Failed to load plugin {plugin_meta.id}: {e}")
-
-        return processing_plugins
+        """Get all enabled processing plugins in priority order"""
+        return list(self._get_plugin_chain().plugins)
 
     def _handle_processing_failure(self, message: Dict[str, Any], error: str) -> None:
         """
@@ -244,15 +876,17 @@ class ProcessingOrchestrator:
 
             # Check retry count
             if event.metadata.retry_count < self.max_retries:
-                # Increment retry count and requeue
+                # Increment retry count and schedule on the retry lane with backoff
                 event.metadata.retry_count += 1
                 event.metadata.status = EventStatus.RETRY
 
-                self.queue.publish(Topics.RAW_LISTINGS, event.to_dict())
+                delay = self.retry_policy.delay_ms(event.metadata.retry_count)
+                self.queue.publish_delayed(self.retry_topic, event.to_dict(), delay)
+                self._stats["events_retried"] += 1
 
                 logger.info(
-                    f"Requeued event {event.metadata.event_id} "
-                    f"(retry {event.metadata.retry_count}/{self.max_retries})"
+                    f"Scheduled retry {event.metadata.retry_count}/{self.max_retries} "
+                    f"of event {event.metadata.event_id} in {delay:.0f}ms"
                 )
             else:
                 # Max retries exceeded, send to failed events
@@ -283,7 +917,11 @@ class ProcessingOrchestrator:
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get orchestrator statistics"""
-        stats = dict(self._stats)
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["plugin_time_ms"] = dict(self._plugin_time_ms)
+        stats["latency"] = self._metrics.snapshot()
+        if self._profiler is not None:
+            stats["slowest_events"] = self._profiler.get_slowest()
 
         if stats["events_processed"] > 0:
             stats["avg_processing_time_ms"] = stats["total_processing_time_ms"] / stats["events_processed"]
@@ -302,9 +940,20 @@ class ProcessingOrchestrator:
 
         status = "healthy" if self._running and queue_health["status"] == "healthy" else "unhealthy"
 
-        return {
+        health = {
             "status": status,
             "running": self._running,
             "queue_health": queue_health,
             "statistics": self.get_statistics(),
         }
+        if self._backpressure is not None:
+            health["backpressure"] = self._backpressure.get_status()
+
+        if self._breakers:
+            breakers = {name: breaker.get_status() for name, breaker in sorted(self._breakers.items())}
+            health["circuit_breakers"] = breakers
+            if status == "healthy" and any(b["state"] != BreakerState.CLOSED.value for b in breakers.values()):
+                # Still processing, but without the skipped plugins
+                health["status"] = "degraded"
+
+        return health
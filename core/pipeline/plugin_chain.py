@@ -0,0 +1,196 @@
+"""
+Compiled Processing Plugin Chain
+
+Immutable, priority-sorted snapshot of the enabled processing plugins.
+Built once per PluginManager epoch and swapped atomically by the
+orchestrator, so the per-event hot path never touches the manager lock.
+
+The chain also carries the execution DAG derived from the listing fields
+each plugin reads and writes: plugins are grouped into stages whose
+members do not touch each other's fields and may run concurrently.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import FrozenSet, List, Optional, Tuple
+
+from core.interfaces.processing_plugin import ProcessingPlugin
+from core.models.plugin import PluginMetadata
+from core.plugin_manager import PluginManager
+
+logger = logging.getLogger(__name__)
+
+# None stands for "undeclared", i.e. every field
+FieldSet = Optional[FrozenSet[str]]
+
+
+@dataclass(frozen=True)
+class PluginChain:
+    """
+    Immutable processing plugin chain.
+
+    Attributes:
+        epoch: PluginManager epoch the chain was compiled against
+        plugins: Processing plugins sorted by priority (lower number first)
+        names: Display names of the plugins, aligned with ``plugins``
+        vectorized: Whether each plugin overrides process_batch()
+        asynchronous: Whether each plugin overrides process_async()
+        reads: Declared read fields per plugin (None if undeclared)
+        writes: Declared write fields per plugin (None if undeclared)
+        stages: DAG levels as tuples of plugin indices; plugins within a
+            stage are independent, stages run in order
+        timeouts: Declared time budget per plugin in milliseconds (None if undeclared)
+    """
+
+    epoch: int
+    plugins: Tuple[ProcessingPlugin, ...] = ()
+    names: Tuple[str, ...] = ()
+    vectorized: Tuple[bool, ...] = ()
+    asynchronous: Tuple[bool, ...] = ()
+    reads: Tuple[FieldSet, ...] = ()
+    writes: Tuple[FieldSet, ...] = ()
+    stages: Tuple[Tuple[int, ...], ...] = ()
+    timeouts: Tuple[Optional[float], ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.plugins)
+
+    def is_stale(self, plugin_manager: PluginManager) -> bool:
+        """Check whether the manager changed since this chain was compiled"""
+        return self.epoch != plugin_manager.epoch
+
+
+def _overlaps(a: FieldSet, b: FieldSet) -> bool:
+    """Check whether two field sets can share a field"""
+    if a is None and b is None:
+        return True
+    if a is None:
+        return bool(b)
+    if b is None:
+        return bool(a)
+    return not a.isdisjoint(b)
+
+
+def _field_access(plugin: ProcessingPlugin, metadata: PluginMetadata) -> Tuple[FieldSet, FieldSet]:
+    """
+    Resolve declared read/write fields of a plugin.
+
+    Declarations on the plugin class take precedence over ``reads:<field>``
+    and ``writes:<field>`` manifest capabilities. Either way, a side without
+    any declaration is None (reads or writes every field).
+    """
+    reads = plugin.get_reads()
+    writes = plugin.get_writes()
+    if reads is not None or writes is not None:
+        return (
+            frozenset(reads) if reads is not None else None,
+            frozenset(writes) if writes is not None else None,
+        )
+
+    declared_reads = [c.split(":", 1)[1] for c in metadata.capabilities if c.startswith("reads:")]
+    declared_writes = [c.split(":", 1)[1] for c in metadata.capabilities if c.startswith("writes:")]
+    return (
+        frozenset(declared_reads) if declared_reads else None,
+        frozenset(declared_writes) if declared_writes else None,
+    )
+
+
+def _timeout(plugin: ProcessingPlugin, metadata: PluginMetadata) -> Optional[float]:
+    """
+    Resolve the declared time budget of a plugin.
+
+    get_timeout_ms() on the plugin class takes precedence over a
+    ``timeout_ms:<milliseconds>`` manifest capability.
+    """
+    timeout = plugin.get_timeout_ms()
+    if timeout is not None:
+        return float(timeout)
+
+    for capability in metadata.capabilities:
+        if capability.startswith("timeout_ms:"):
+            try:
+                return float(capability.split(":", 1)[1])
+            except ValueError:
+                logger.warning(f"Ignoring invalid capability {capability} of plugin {metadata.id}")
+    return None
+
+
+def build_stages(reads: Tuple[FieldSet, ...], writes: Tuple[FieldSet, ...]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Group priority-ordered plugins into DAG levels.
+
+    Plugin ``j`` depends on an earlier plugin ``i`` when one writes a field
+    the other reads or writes. Each plugin is placed one level after its
+    latest dependency, so priority order is preserved between dependent
+    plugins while independent ones share a level.
+
+    Args:
+        reads: Declared read fields per plugin
+        writes: Declared write fields per plugin
+
+    Returns:
+        Tuple of stages, each a tuple of plugin indices in priority order
+    """
+    levels: List[int] = []
+    for j in range(len(reads)):
+        level = 0
+        for i in range(j):
+            if _overlaps(writes[i], reads[j]) or _overlaps(writes[i], writes[j]) or _overlaps(reads[i], writes[j]):
+                level = max(level, levels[i] + 1)
+        levels.append(level)
+
+    stages: List[List[int]] = [[] for _ in range(max(levels) + 1)] if levels else []
+    for index, level in enumerate(levels):
+        stages[level].append(index)
+
+    return tuple(tuple(stage) for stage in stages)
+
+
+def compile_plugin_chain(plugin_manager: PluginManager) -> PluginChain:
+    """
+    Build a priority-sorted chain of enabled processing plugins.
+
+    The epoch is read before the plugins are collected, so a concurrent
+    change made while compiling leaves the chain stale and it is rebuilt
+    on the next lookup rather than silently missed.
+
+    Args:
+        plugin_manager: Plugin manager to read plugins from
+
+    Returns:
+        Compiled plugin chain
+    """
+    epoch = plugin_manager.epoch
+    entries = []
+
+    for plugin_meta in plugin_manager.get_by_type("processing", enabled_only=True):
+        try:
+            plugin = plugin_manager.get_instance(plugin_meta.id)
+            if isinstance(plugin, ProcessingPlugin):
+                entries.append((plugin, plugin_meta))
+        except Exception as e:
+            logger.error(f"Failed to load plugin {plugin_meta.id}: {e}")
+
+    # Sort by priority (lower number = higher priority)
+    entries.sort(key=lambda entry: entry[0].get_priority())
+
+    plugins = tuple(plugin for plugin, _ in entries)
+    names = tuple(p.get_metadata()["name"] for p in plugins)
+    vectorized = tuple(type(p).process_batch is not ProcessingPlugin.process_batch for p in plugins)
+    asynchronous = tuple(type(p).process_async is not ProcessingPlugin.process_async for p in plugins)
+
+    access = [_field_access(plugin, meta) for plugin, meta in entries]
+    reads = tuple(r for r, _ in access)
+    writes = tuple(w for _, w in access)
+
+    return PluginChain(
+        epoch=epoch,
+        plugins=plugins,
+        names=names,
+        vectorized=vectorized,
+        asynchronous=asynchronous,
+        reads=reads,
+        writes=writes,
+        stages=build_stages(reads, writes),
+        timeouts=tuple(_timeout(plugin, meta) for plugin, meta in entries),
+    )
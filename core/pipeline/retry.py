@@ -0,0 +1,81 @@
+"""
+Retry Policy
+
+Exponential backoff with jitter for events that failed processing. Failed
+events are republished with a delay to a separate retry lane so a failing
+dependency does not cause retry storms competing with fresh traffic.
+"""
+
+import random
+
+
+def retry_topic(topic: str) -> str:
+    """Retry lane of an input topic, e.g. ``listings.raw.retry``"""
+    return f"{topic}.retry"
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with jitter.
+
+    The n-th retry is delayed by ``base_delay_ms * multiplier ** (n - 1)``,
+    capped at ``max_delay_ms``. Jitter then removes a random share of up to
+    ``jitter`` of the delay, so events that failed together do not retry
+    together (``jitter=1.0`` is "full jitter", ``0.0`` disables it).
+
+    Example:
+        >>> policy = RetryPolicy(base_delay_ms=500, max_delay_ms=30_000, jitter=0.0)
+        >>> [policy.delay_ms(attempt) for attempt in (1, 2, 3)]
+        [500.0, 1000.0, 2000.0]
+    """
+
+    def __init__(
+        self,
+        base_delay_ms: float = 500.0,
+        max_delay_ms: float = 60_000.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+    ):
+        """
+        Initialize retry policy.
+
+        Args:
+            base_delay_ms: Delay of the first retry in milliseconds
+            max_delay_ms: Upper bound of any retry delay
+            multiplier: Growth factor between consecutive retries
+            jitter: Maximum share of the delay removed at random (0.0-1.0)
+        """
+        if base_delay_ms < 0:
+            raise ValueError(f"base_delay_ms must not be negative, got {base_delay_ms}")
+        if max_delay_ms < base_delay_ms:
+            raise ValueError(f"max_delay_ms ({max_delay_ms}) must be at least base_delay_ms ({base_delay_ms})")
+        if multiplier < 1.0:
+            raise ValueError(f"multiplier must be at least 1.0, got {multiplier}")
+        if not 0.0 <= jitter <= 1.0:
+            raise ValueError(f"jitter must be in [0, 1], got {jitter}")
+
+        self.base_delay_ms = base_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self.multiplier = multiplier
+        self.jitter = jitter
+
+    def delay_ms(self, attempt: int) -> float:
+        """
+        Get the delay before a retry.
+
+        Args:
+            attempt: Retry number, starting at 1
+
+        Returns:
+            Delay in milliseconds
+        """
+        delay = self.base_delay_ms
+        for _ in range(1, attempt):
+            delay *= self.multiplier
+            if delay >= self.max_delay_ms:
+                break
+        delay = min(delay, self.max_delay_ms)
+
+        if self.jitter:
+            delay -= delay * self.jitter * random.random()
+        return delay
@@ -0,0 +1,407 @@
+"""
+Fraud Scoring Service
+
+Consumes processed listings from the queue, scores them in micro-batches
+with RiskScoringOrchestrator, publishes fraud events for high scores and
+writes the scores back to the database.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from core.database.repository import ListingRepository
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator, ScoreRecord
+from core.interfaces.queue_plugin import QueuePlugin
+from core.models.events import (
+    EventMetadata,
+    EventStatus,
+    EventType,
+    FraudDetectedEvent,
+    ProcessedListingEvent,
+    ProcessingFailedEvent,
+    Topics,
+)
+from core.pipeline.metrics import PipelineMetrics, registry
+
+logger = logging.getLogger(__name__)
+
+
+class FraudScoringService:
+    """
+    Queue-driven fraud scoring stage.
+
+    Workflow:
+    1. Queue worker threads hand micro-batches of processed listing events
+       over to the event loop
+    2. Each batch is scored with RiskScoringOrchestrator.run_batch()
+    3. FraudDetectedEvents for scores at or above ``alert_threshold`` are
+       published with one bulk call
+    4. Scores are written back with one bulk UPDATE per batch
+
+    At most ``max_in_flight`` batches are scored concurrently. A queue
+    worker thread waits for its batch to complete before the batch is
+    acknowledged, and blocks while the window is full, which stops
+    consumption until a batch completes. Latency histograms are kept in the same format
+    as the processing orchestrators' and exposed on /metrics under the
+    input topic.
+
+    Example:
+        >>> service = FraudScoringService(
+        ...     risk_orchestrator=RiskScoringOrchestrator(plugin_manager=manager),
+        ...     queue=queue,
+        ...     session_factory=SessionLocal,
+        ... )
+        >>> service.start()  # Runs its own event loop thread
+    """
+
+    def __init__(
+        self,
+        risk_orchestrator: RiskScoringOrchestrator,
+        queue: QueuePlugin,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: int = 32,
+        batch_timeout_ms: float = 50.0,
+        max_in_flight: int = 4,
+        max_concurrency: int = 64,
+        alert_threshold: float = RiskScoringOrchestrator.FRAUD_THRESHOLD,
+        input_topic: str = Topics.PROCESSED_LISTINGS,
+    ):
+        """
+        Initialize fraud scoring service.
+
+        Args:
+            risk_orchestrator: Orchestrator scoring the listings
+            queue: Message queue instance
+            session_factory: Creates database sessions for writing scores back
+                (None: scores are not persisted)
+            batch_size: Maximum number of events scored together
+            batch_timeout_ms: Maximum time to wait for a batch to fill up
+            max_in_flight: Maximum number of batches scored concurrently
+            max_concurrency: Limit for concurrent plugin calls within a batch
+            alert_threshold: Fraud score (0-100) from which a FraudDetectedEvent is published
+            input_topic: Topic processed listing events are consumed from
+        """
+        for name, value in (("batch_size", batch_size), ("max_in_flight", max_in_flight)):
+            if value < 1:
+                raise ValueError(f"{name} must be positive, got {value}")
+        if not 0.0 <= alert_threshold <= 100.0:
+            raise ValueError(f"alert_threshold must be between 0 and 100, got {alert_threshold}")
+
+        self.risk_orchestrator = risk_orchestrator
+        self.queue = queue
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.batch_timeout_ms = batch_timeout_ms
+        self.max_in_flight = max_in_flight
+        self.max_concurrency = max_concurrency
+        self.alert_threshold = alert_threshold
+        self.input_topic = input_topic
+
+        self._running = False
+        self._subscription_id: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._metrics = PipelineMetrics()
+        self._stats = {
+            "events_processed": 0,
+            "events_failed": 0,
+            "batches_processed": 0,
+            "total_processing_time_ms": 0.0,
+            "fraud_events_published": 0,
+            "scores_persisted": 0,
+            "persist_failures": 0,
+        }
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """
+        Start consuming events from queue.
+
+        Args:
+            loop: Running event loop to score events on. If omitted, the
+                service starts and owns a dedicated event loop thread.
+        """
+        if self._running:
+            logger.warning("Fraud scoring service already running")
+            return
+
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self._loop_thread = threading.Thread(target=loop.run_forever, daemon=True, name="fraud-scoring-loop")
+            self._loop_thread.start()
+
+        self._loop = loop
+        self._running = True
+        registry.register(self.input_topic, self._metrics)
+        self._subscription_id = self.queue.subscribe_batch(
+            self.input_topic,
+            self._submit_batch,
+            batch_size=self.batch_size,
+            max_wait_ms=self.batch_timeout_ms,
+        )
+
+        logger.info(f"Fraud scoring service started (batch_size={self.batch_size}, max_in_flight={self.max_in_flight})")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop consuming events and wait for in-flight batches to finish.
+
+        Args:
+            timeout: Maximum time to wait for in-flight batches in seconds
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        if self._subscription_id:
+            self.queue.unsubscribe(self._subscription_id)
+            self._subscription_id = None
+
+        # Drain the in-flight window
+        deadline = time.time() + timeout
+        acquired = 0
+        while acquired < self.max_in_flight and self._in_flight.acquire(timeout=max(0.0, deadline - time.time())):
+            acquired += 1
+        for _ in range(acquired):
+            self._in_flight.release()
+        if acquired < self.max_in_flight:
+            logger.warning(f"Stopped with {self.max_in_flight - acquired} batches still in flight")
+
+        if self._loop_thread is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join(timeout=timeout)
+            self._loop.close()
+            self._loop_thread = None
+        self._loop = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        registry.unregister(self.input_topic)
+        logger.info("Fraud scoring service stopped")
+
+    def _submit_batch(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Queue callback: score a batch on the event loop.
+
+        Blocks the calling queue thread while the in-flight window is full,
+        and until the batch is scored, alerted and written back (the queue
+        acknowledges the batch on return).
+        """
+        self._in_flight.acquire()
+        loop = self._loop
+        if loop is None or not self._running:
+            self._in_flight.release()
+            raise RuntimeError("Fraud scoring service is not running")
+
+        future = asyncio.run_coroutine_threadsafe(self.process_batch(messages), loop)
+        future.add_done_callback(lambda _: self._in_flight.release())
+        future.result()
+
+    async def process_batch(self, messages: List[Dict[str, Any]]) -> List[ScoreRecord]:
+        """
+        Score a batch of processed listing events end to end.
+
+        Events that cannot be parsed are reported on the failed topic; the
+        rest of the batch proceeds. Failing to persist scores is logged and
+        does not fail the events.
+
+        Args:
+            messages: Processed listing events from queue
+
+        Returns:
+            Score records of the events that were scored, in input order
+        """
+        loop = asyncio.get_running_loop()
+        start_time = time.time()
+
+        events: List[ProcessedListingEvent] = []
+        for message in messages:
+            try:
+                events.append(ProcessedListingEvent.from_dict(message))
+            except Exception as e:
+                logger.error(f"Failed to parse processed listing event: {e}")
+                await loop.run_in_executor(self._get_executor(), self._handle_failure, message, str(e))
+
+        if not events:
+            return []
+
+        try:
+            batch = await self.risk_orchestrator.run_batch(
+                [event.listing_data for event in events], max_concurrency=self.max_concurrency
+            )
+        except Exception as e:
+            logger.error(f"Failed to score batch of {len(events)} events: {e}", exc_info=True)
+            for event in events:
+                await loop.run_in_executor(self._get_executor(), self._handle_failure, event.to_dict(), str(e))
+            return []
+        scored_at = time.time()
+        self._metrics.record_stage("score", (scored_at - start_time) * 1000)
+
+        for record in batch.records:
+            for result in record.plugin_results:
+                self._metrics.record_plugin(result.plugin_id, result.processing_time_ms)
+
+        alerts = [
+            self._build_fraud_event(event, record).to_dict()
+            for event, record in zip(events, batch.records)
+            if record.overall_score >= self.alert_threshold
+        ]
+        await asyncio.gather(
+            loop.run_in_executor(self._get_executor(), self._publish_alerts, alerts),
+            loop.run_in_executor(self._get_executor(), self._persist_scores, events, batch.records),
+        )
+        self._metrics.record_stage("publish", (time.time() - scored_at) * 1000)
+
+        # Batch wall time is shared evenly between its events
+        processing_time = (time.time() - start_time) * 1000
+        per_event_time = processing_time / len(events)
+        self._stats["events_processed"] += len(events)
+        self._stats["batches_processed"] += 1
+        self._stats["total_processing_time_ms"] += processing_time
+        self._metrics.record_event(per_event_time, len(events))
+
+        logger.info(
+            f"Scored batch of {len(events)} events in {processing_time:.2f}ms " f"({len(alerts)} above alert threshold)"
+        )
+        return batch.records
+
+    def _build_fraud_event(self, event: ProcessedListingEvent, record: ScoreRecord) -> FraudDetectedEvent:
+        """
+        Build the fraud event published for a high score.
+
+        Args:
+            event: Scored processed listing event
+            record: Its score
+
+        Returns:
+            Fraud detected event
+        """
+        source = event.listing_data.get("source")
+        return FraudDetectedEvent(
+            metadata=EventMetadata(
+                event_type=EventType.FRAUD_DETECTED,
+                source_plugin_id=event.metadata.source_plugin_id,
+                source_platform=event.metadata.source_platform,
+                trace_id=event.metadata.trace_id,
+                request_id=event.metadata.request_id,
+                parent_event_id=event.metadata.event_id,
+                status=EventStatus.COMPLETED,
+            ),
+            listing_id=record.listing_id,
+            listing_url=source.get("url") if isinstance(source, dict) else None,
+            fraud_score=record.overall_score,
+            risk_level=record.risk_level,
+            fraud_signals=[signal.signal_type for signal in record.signals],
+            detected_by=[
+                result.plugin_id
+                for result in record.plugin_results
+                if result.overall_score * 100.0 >= RiskScoringOrchestrator.SUSPICIOUS_THRESHOLD
+            ],
+            confidence=min(record.confidence, 1.0),
+            action="flagged" if record.risk_level == "fraud" else "review_required",
+        )
+
+    def _publish_alerts(self, alerts: List[Dict[str, Any]]) -> None:
+        """Publish fraud events with a single bulk call"""
+        if not alerts:
+            return
+        try:
+            self.queue.publish_batch(Topics.FRAUD_DETECTED, alerts)
+            self._stats["fraud_events_published"] += len(alerts)
+        except Exception as e:
+            logger.error(f"Failed to publish {len(alerts)} fraud events: {e}", exc_info=True)
+
+    def _persist_scores(self, events: List[ProcessedListingEvent], records: List[ScoreRecord]) -> None:
+        """Write fraud scores back with one bulk UPDATE, skipping listings without an ID"""
+        if self.session_factory is None:
+            return
+
+        scores: Dict[str, float] = {}
+        for event, record in zip(events, records):
+            # Records of listings without an ID carry a placeholder ID
+            if event.listing_data.get("listing_id"):
+                scores[record.listing_id] = record.overall_score
+            else:
+                logger.warning("Not persisting fraud score of a listing without an ID")
+        if not scores:
+            return
+
+        session = None
+        try:
+            session = self.session_factory()
+            updated = ListingRepository(session).bulk_update_fraud_scores(scores)
+            self._stats["scores_persisted"] += updated
+        except Exception as e:
+            if session is not None:
+                session.rollback()
+            self._stats["persist_failures"] += 1
+            logger.error(f"Failed to persist {len(scores)} fraud scores: {e}", exc_info=True)
+        finally:
+            if session is not None:
+                session.close()
+
+    def _handle_failure(self, message: Dict[str, Any], error: str) -> None:
+        """
+        Report an event that could not be scored on the failed topic.
+
+        Args:
+            message: Original message that failed
+            error: Error message
+        """
+        self._stats["events_failed"] += 1
+        metadata = message.get("metadata") if isinstance(message.get("metadata"), dict) else {}
+        try:
+            failed_event = ProcessingFailedEvent(
+                metadata=EventMetadata(
+                    event_type=EventType.PROCESSING_FAILED,
+                    source_plugin_id=metadata.get("source_plugin_id", "unknown"),
+                    source_platform=metadata.get("source_platform", "unknown"),
+                    trace_id=metadata.get("trace_id"),
+                    parent_event_id=metadata.get("event_id"),
+                    status=EventStatus.FAILED,
+                ),
+                error_type="ScoringError",
+                error_message=error,
+                failed_stage="fraud_scoring",
+                original_event=message,
+            )
+            self.queue.publish(Topics.PROCESSING_FAILED, failed_event.to_dict())
+        except Exception as e:
+            logger.error(f"Failed to handle scoring failure: {e}")
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool used for queue and database calls"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_in_flight * 2,
+                        thread_name_prefix="fraud-scoring",
+                    )
+        return self._executor
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get service statistics"""
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["latency"] = self._metrics.snapshot()
+        stats["batch_size"] = self.batch_size
+        stats["max_in_flight"] = self.max_in_flight
+        if stats["events_processed"] > 0:
+            stats["avg_processing_time_ms"] = stats["total_processing_time_ms"] / stats["events_processed"]
+        else:
+            stats["avg_processing_time_ms"] = 0.0
+        return stats
+
+    def is_running(self) -> bool:
+        """Check if the service is running"""
+        return self._running
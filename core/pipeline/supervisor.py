@@ -0,0 +1,339 @@
+"""
+Multi-process Processing Supervisor
+
+Runs N worker processes, each with its own PluginManager and
+ProcessingOrchestrator, so CPU-bound processing plugins are not limited by
+the GIL. Work is spread across workers either by Redis consumer group
+membership (every worker is a consumer of the same group) or by hashing
+events onto per-worker shard topics.
+
+The supervisor collects statistics pushed by the workers, merges them, and
+restarts workers that die. With Redis, a restarted worker reuses its
+consumer name and first replays the messages its predecessor left
+unacknowledged (the batch it was processing when it died), so a crash
+does not lose messages.
+"""
+
+import logging
+import multiprocessing
+import threading
+import time
+import zlib
+from queue import Empty
+from typing import Any, Callable, Dict, List, Optional
+
+from core.interfaces.queue_plugin import QueuePlugin
+from core.models.events import Topics
+from core.pipeline.orchestrator import ProcessingOrchestrator
+
+logger = logging.getLogger(__name__)
+
+# Builds the orchestrator of a worker: factory(worker_index, num_workers).
+# Must be picklable (a module-level function or class instance) and create
+# the PluginManager, queue and orchestrator inside the worker process.
+WorkerFactory = Callable[[int, int], ProcessingOrchestrator]
+
+SHARD_KEYS = ("source_platform", "listing_id")
+
+
+def shard_topic(topic: str, shard: int) -> str:
+    """Get the topic name of a shard, e.g. ``listings.raw.3``"""
+    return f"{topic}.{shard}"
+
+
+def shard_for(message: Dict[str, Any], num_shards: int, key: str = "listing_id") -> int:
+    """
+    Pick the shard of a raw listing event.
+
+    The hash is stable across processes and restarts, so all events of the
+    same listing (or platform) are handled by the same worker in order.
+
+    Args:
+        message: Raw listing event dictionary
+        num_shards: Number of shards
+        key: ``listing_id`` (original/external id, falling back to event id)
+            or ``source_platform``
+
+    Returns:
+        Shard index in ``[0, num_shards)``
+    """
+    if num_shards < 1:
+        raise ValueError(f"num_shards must be positive, got {num_shards}")
+    if key not in SHARD_KEYS:
+        raise ValueError(f"Unknown shard key: {key}")
+
+    metadata = message.get("metadata") or {}
+    if key == "source_platform":
+        value = metadata.get("source_platform")
+    else:
+        value = message.get("original_id") or message.get("external_id") or metadata.get("event_id")
+
+    return zlib.crc32(str(value).encode("utf-8")) % num_shards
+
+
+def publish_sharded(
+    queue: QueuePlugin,
+    message: Dict[str, Any],
+    num_shards: int,
+    topic: str = Topics.RAW_LISTINGS,
+    key: str = "listing_id",
+) -> str:
+    """
+    Publish a raw listing event to its shard topic.
+
+    Args:
+        queue: Queue to publish to
+        message: Raw listing event dictionary
+        num_shards: Number of shards (workers)
+        topic: Base topic name
+        key: Shard key, see shard_for()
+
+    Returns:
+        Message ID
+    """
+    return queue.publish(shard_topic(topic, shard_for(message, num_shards, key)), message)
+
+
+def merge_statistics(worker_stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge orchestrator statistics from several workers.
+
+    Numeric counters and per-plugin timings are summed, the average
+    processing time is recomputed from the merged totals.
+
+    Args:
+        worker_stats: get_statistics() results of the workers
+
+    Returns:
+        Merged statistics
+    """
+    merged: Dict[str, Any] = {
+        "events_processed": 0,
+        "events_failed": 0,
+        "total_processing_time_ms": 0.0,
+        "plugins_executed": 0,
+        "plugin_time_ms": {},
+    }
+
+    for stats in worker_stats:
+        for name, value in stats.items():
+            if name == "avg_processing_time_ms":
+                continue
+            if name == "plugin_time_ms":
+                for plugin, duration in value.items():
+                    merged["plugin_time_ms"][plugin] = merged["plugin_time_ms"].get(plugin, 0.0) + duration
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[name] = merged.get(name, 0) + value
+
+    if merged["events_processed"] > 0:
+        merged["avg_processing_time_ms"] = merged["total_processing_time_ms"] / merged["events_processed"]
+    else:
+        merged["avg_processing_time_ms"] = 0.0
+
+    return merged
+
+
+def _worker_main(
+    factory: WorkerFactory,
+    index: int,
+    num_workers: int,
+    stats_queue: Any,
+    stop_event: Any,
+    stats_interval: float,
+) -> None:
+    """Worker process entry point"""
+    orchestrator = factory(index, num_workers)
+    orchestrator.start()
+    logger.info(f"Processing worker {index}/{num_workers} started")
+
+    try:
+        # Sleep rather than wait on the event: a worker that dies while
+        # blocked in Event.wait() would make the supervisor's set() hang
+        while not stop_event.is_set():
+            time.sleep(stats_interval)
+            stats_queue.put((index, orchestrator.get_statistics()))
+    finally:
+        orchestrator.stop()
+        stats_queue.put((index, orchestrator.get_statistics()))
+        logger.info(f"Processing worker {index}/{num_workers} stopped")
+
+
+class ProcessingSupervisor:
+    """
+    Supervises a pool of processing worker processes.
+
+    Example:
+        >>> def make_worker(index, num_workers):
+        ...     manager = PluginManager()
+        ...     manager.load_plugins("plugins")
+        ...     queue = RedisQueuePlugin(consumer_group="processing", consumer_name=f"processing-{index}")
+        ...     queue.connect()
+        ...     return ProcessingOrchestrator(plugin_manager=manager, queue=queue)
+        >>> supervisor = ProcessingSupervisor(make_worker, num_workers=4)
+        >>> supervisor.start()
+    """
+
+    def __init__(
+        self,
+        worker_factory: WorkerFactory,
+        num_workers: Optional[int] = None,
+        stats_interval: float = 1.0,
+        monitor_interval: float = 0.5,
+        restart_delay: float = 1.0,
+        mp_context: Optional[Any] = None,
+    ):
+        """
+        Initialize processing supervisor.
+
+        Args:
+            worker_factory: Picklable callable building a worker's orchestrator
+            num_workers: Number of worker processes (default: CPU count)
+            stats_interval: How often workers report statistics in seconds
+            monitor_interval: How often worker liveness is checked in seconds
+            restart_delay: Delay before restarting a crashed worker in seconds
+            mp_context: multiprocessing context (default: platform default)
+        """
+        num_workers = num_workers or multiprocessing.cpu_count()
+        if num_workers < 1:
+            raise ValueError(f"num_workers must be positive, got {num_workers}")
+
+        self.worker_factory = worker_factory
+        self.num_workers = num_workers
+        self.stats_interval = stats_interval
+        self.monitor_interval = monitor_interval
+        self.restart_delay = restart_delay
+
+        self._ctx = mp_context or multiprocessing.get_context()
+        self._stats_queue = self._ctx.Queue()
+        self._stop_event = self._ctx.Event()
+        self._processes: Dict[int, Any] = {}
+        self._worker_stats: Dict[int, Dict[str, Any]] = {}
+        # Statistics of worker incarnations that died and were replaced
+        self._retired_stats: List[Dict[str, Any]] = []
+        self._restarts = 0
+        self._lock = threading.Lock()
+        self._monitor: Optional[threading.Thread] = None
+        self._running = False
+
+    def start(self) -> None:
+        """Start worker processes and the monitor thread"""
+        if self._running:
+            logger.warning("Supervisor already running")
+            return
+
+        self._running = True
+        self._stop_event.clear()
+
+        for index in range(self.num_workers):
+            self._spawn(index)
+
+        self._monitor = threading.Thread(target=self._monitor_loop, daemon=True, name="processing-supervisor")
+        self._monitor.start()
+
+        logger.info(f"Processing supervisor started with {self.num_workers} workers")
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Stop all workers gracefully.
+
+        Args:
+            timeout: Maximum time to wait for each worker in seconds
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self._stop_event.set()
+
+        if self._monitor is not None:
+            self._monitor.join(timeout=timeout)
+            self._monitor = None
+
+        for index, process in self._processes.items():
+            process.join(timeout=timeout)
+            if process.is_alive():
+                logger.warning(f"Worker {index} did not stop in time, terminating")
+                process.terminate()
+                process.join()
+
+        self._drain_stats()
+        logger.info("Processing supervisor stopped")
+
+    def _spawn(self, index: int) -> None:
+        """Start the worker process for a slot"""
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                self.worker_factory,
+                index,
+                self.num_workers,
+                self._stats_queue,
+                self._stop_event,
+                self.stats_interval,
+            ),
+            daemon=True,
+            name=f"processing-worker-{index}",
+        )
+        process.start()
+        self._processes[index] = process
+
+    def _monitor_loop(self) -> None:
+        """Collect statistics and restart dead workers"""
+        while not self._stop_event.wait(self.monitor_interval):
+            self._drain_stats()
+
+            for index, process in list(self._processes.items()):
+                if process.is_alive() or self._stop_event.is_set():
+                    continue
+
+                logger.error(f"Worker {index} exited with code {process.exitcode}, restarting")
+                with self._lock:
+                    last_stats = self._worker_stats.pop(index, None)
+                    if last_stats is not None:
+                        self._retired_stats.append(last_stats)
+                    self._restarts += 1
+
+                time.sleep(self.restart_delay)
+                if not self._stop_event.is_set():
+                    self._spawn(index)
+
+    def _drain_stats(self) -> None:
+        """Read pending statistics reports from workers"""
+        while True:
+            try:
+                index, stats = self._stats_queue.get_nowait()
+            except (Empty, EOFError, OSError):
+                return
+            with self._lock:
+                self._worker_stats[index] = stats
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get statistics merged across workers"""
+        self._drain_stats()
+
+        with self._lock:
+            per_worker = dict(self._worker_stats)
+            stats = merge_statistics(list(per_worker.values()) + self._retired_stats)
+            stats["restarts"] = self._restarts
+
+        stats["workers"] = self.num_workers
+        stats["workers_alive"] = sum(1 for p in self._processes.values() if p.is_alive())
+        stats["per_worker"] = per_worker
+        return stats
+
+    def is_running(self) -> bool:
+        """Check if supervisor is running"""
+        return self._running
+
+    def health_check(self) -> Dict[str, Any]:
+        """Perform health check"""
+        stats = self.get_statistics()
+
+        if not self._running or stats["workers_alive"] == 0:
+            status = "unhealthy"
+        elif stats["workers_alive"] < self.num_workers:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        return {"status": status, "running": self._running, "statistics": stats}
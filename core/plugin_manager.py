@@ -27,6 +27,27 @@ class PluginManager:
         self._modules: Dict[str, Any] = {}  # Store imported modules for reload
         self._dependency_graph = DependencyGraph()  # Manage plugin dependencies
         self._lock = RLock()
+        self._epoch = 0  # Bumped on every change that affects plugin chains
+
+    @property
+    def epoch(self) -> int:
+        """
+        Monotonic change counter for the set of active plugins.
+
+        Incremented whenever a plugin is registered, enabled, disabled,
+        re-weighted, reloaded, loaded or removed. Consumers that cache
+        derived state (e.g. compiled plugin chains) compare the epoch they
+        built against with the current one to detect staleness without
+        taking the manager lock.
+
+        Returns:
+            Current epoch value
+        """
+        return self._epoch
+
+    def _bump_epoch(self) -> None:
+        """Mark cached plugin views as stale. Caller must hold the lock."""
+        self._epoch += 1
 
     def register(self, metadata: PluginMetadata) -> PluginMetadata:
         """
@@ -44,8 +65,10 @@ class PluginManager:
                 existing = self._plugins[metadata.id]
                 for field, value in metadata.dict().items():
                     setattr(existing, field, value)
+                self._bump_epoch()
                 return existing
             self._plugins[metadata.id] = metadata
+            self._bump_epoch()
             return metadata
 
     def register_from_manifest(self, manifest_path: Path) -> PluginMetadata:
@@ -118,6 +141,7 @@ class PluginManager:
             author=author,
             capabilities=manifest_data.get("capabilities", []),
             dependencies=plugin_deps,
+            execution_mode=(manifest_data.get("execution") or {}).get("mode"),
         )
 
         return self.register(metadata)
@@ -208,6 +232,7 @@ class PluginManager:
                         plugin=instance,
                         plugin_id=metadata.id,
                         weight_override=metadata.weight,
+                        execution_mode=metadata.execution_mode,
                     )
                     instances.append(wrapped)
                 else:
@@ -221,6 +246,7 @@ class PluginManager:
             if not plugin:
                 return False
             plugin.enabled = True
+            self._bump_epoch()
             return True
 
     def disable(self, plugin_id: str) -> bool:
@@ -229,6 +255,7 @@ class PluginManager:
             if not plugin:
                 return False
             plugin.enabled = False
+            self._bump_epoch()
             return True
 
     def set_weight(self, plugin_id: str, weight: float) -> bool:
@@ -257,6 +284,7 @@ class PluginManager:
             if not plugin:
                 return False
             plugin.weight = weight
+            self._bump_epoch()
             logger.info(f"Set weight {weight} for plugin {plugin_id}")
             return True
 
@@ -289,6 +317,8 @@ class PluginManager:
             removed = self._plugins.pop(plugin_id, None) is not None
             if removed and self._dependency_graph.has_plugin(plugin_id):
                 self._dependency_graph.remove_plugin(plugin_id)
+            if removed:
+                self._bump_epoch()
             return removed
 
     def build_dependency_graph(self) -> None:
@@ -458,6 +488,7 @@ class PluginManager:
                 # Step 5: Replace old instance with new one
                 self._instances[plugin_id] = new_instance
                 self._modules[plugin_id] = reloaded_module
+                self._bump_epoch()
 
                 logger.info(f"Hot reload completed successfully for {plugin_id}")
 
@@ -668,6 +699,7 @@ class PluginManager:
                     with self._lock:
                         self._instances[metadata.id] = plugin_instance
                         self._modules[metadata.id] = module
+                        self._bump_epoch()
 
                     loaded.append(metadata)
 
@@ -4,9 +4,11 @@ Queue module for message queue abstractions.
 Provides unified interface for different message queue backends.
 """
 
+from core.queue.capacity import OverflowPolicy, QueueFullError, TopicCapacity
 from core.queue.in_memory_queue import InMemoryQueuePlugin
+from core.queue.segment_log_queue import SegmentLogQueuePlugin
 
-__all__ = ["InMemoryQueuePlugin"]
+__all__ = ["InMemoryQueuePlugin", "OverflowPolicy", "QueueFullError", "SegmentLogQueuePlugin", "TopicCapacity"]
 
 # Redis queue is optional (requires redis package)
 try:
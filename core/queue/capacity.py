@@ -0,0 +1,162 @@
+"""
+Queue Capacity Limits
+
+Per-topic memory limits for the in-memory queue, the policies applied
+when a topic is full, and the spill files overflowing messages go to.
+"""
+
+import json
+import os
+import sys
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Union
+
+# Shared encoder: json.dumps() builds a new one per call when given options
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+def dump_message(message: Dict[str, Any]) -> bytes:
+    """Encode a message as one JSON line; values JSON cannot encode are stored as strings"""
+    return _encode(message).encode() + b"\n"
+
+
+class OverflowPolicy(str, Enum):
+    """What a publisher to a full topic gets"""
+
+    BLOCK = "block"  # Wait until consumers make room
+    DROP_OLDEST = "drop_oldest"  # Evict the oldest messages, read or not
+    SPILL = "spill"  # Keep new messages in a spill file until there is room
+
+
+class QueueFullError(TimeoutError):
+    """Raised when a blocked publisher times out waiting for room in a topic"""
+
+
+class TopicCapacity:
+    """
+    Memory limits of a topic.
+
+    A topic is full when the messages it holds in memory reach
+    ``max_messages`` or their approximate size reaches ``max_bytes``.
+    Messages count until every consumer group has received them; a message
+    larger than the whole limit is still accepted into an empty topic.
+    Delayed messages (publish_delayed) that fall due while a ``BLOCK`` topic
+    is full are held back and offered again shortly after, instead of
+    blocking the timer or exceeding the limit.
+
+    Example:
+        >>> capacity = TopicCapacity(max_messages=10_000, max_bytes=64 * 1024 * 1024, overflow="spill")
+        >>> capacity.fits(messages=10_000, size=1024)
+        True
+    """
+
+    def __init__(
+        self,
+        max_messages: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        overflow: Union[OverflowPolicy, str] = OverflowPolicy.BLOCK,
+        block_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize capacity limits.
+
+        Args:
+            max_messages: Maximum number of messages held in memory (None: unlimited)
+            max_bytes: Maximum approximate size of messages held in memory (None: unlimited)
+            overflow: Policy applied when the topic is full
+            block_timeout: With ``BLOCK``, how long a publisher waits before
+                QueueFullError is raised in seconds (None: indefinitely)
+        """
+        if max_messages is not None and max_messages < 1:
+            raise ValueError(f"max_messages must be positive, got {max_messages}")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+        if block_timeout is not None and block_timeout < 0:
+            raise ValueError(f"block_timeout must not be negative, got {block_timeout}")
+
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.overflow = OverflowPolicy(overflow)
+        self.block_timeout = block_timeout
+
+    def fits(self, messages: int, size: int) -> bool:
+        """Check whether a topic may hold ``messages`` messages of ``size`` bytes in total"""
+        return (self.max_messages is None or messages <= self.max_messages) and (
+            self.max_bytes is None or size <= self.max_bytes
+        )
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a JSON-like value in bytes.
+
+    Objects referenced more than once are counted every time.
+    """
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(approximate_size(k) + approximate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class SpillFile:
+    """
+    Append-only file of JSON-encoded messages, read back oldest first.
+
+    The file offset of every unread message is kept in memory, so messages
+    can also be read ahead of the head without consuming them. The file is
+    truncated whenever all messages have been read. Not thread-safe.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "w+b")
+        self._positions: Deque[int] = deque()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def append(self, messages: List[Dict[str, Any]]) -> None:
+        """Write messages to the end of the file"""
+        self._file.seek(0, os.SEEK_END)
+        position = self._file.tell()
+        lines = []
+        for message in messages:
+            line = dump_message(message)
+            self._positions.append(position)
+            position += len(line)
+            lines.append(line)
+        self._file.write(b"".join(lines))
+
+    def read(self, index: int) -> Dict[str, Any]:
+        """Read the ``index``-th unread message without consuming it"""
+        self._file.flush()
+        self._file.seek(self._positions[index])
+        return json.loads(self._file.readline())
+
+    def popleft(self) -> Dict[str, Any]:
+        """Read and consume the oldest message"""
+        message = self.read(0)
+        self.discard(1)
+        return message
+
+    def discard(self, count: int) -> None:
+        """Consume the ``count`` oldest messages without reading them"""
+        for _ in range(min(count, len(self._positions))):
+            self._positions.popleft()
+        if not self._positions:
+            self._file.seek(0)
+            self._file.truncate()
+
+    def clear(self) -> None:
+        """Consume all messages"""
+        self.discard(len(self._positions))
+
+    def close(self, remove: bool = True) -> None:
+        """Close the file, deleting it unless ``remove`` is False"""
+        self._file.close()
+        if remove:
+            self.path.unlink(missing_ok=True)
@@ -0,0 +1,85 @@
+"""
+Sharded Counters
+
+Statistics counters that threads increment without taking a shared lock.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+
+class ShardedCounters:
+    """
+    Named counters with one shard per thread, summed when read.
+
+    Each thread only ever writes its own shard, so increments need no lock
+    and never contend. Reads add up all shards; they may miss increments
+    still in flight, but never lose them. Shards of threads that have
+    exited are folded into a single total when new threads register.
+
+    Example:
+        >>> stats = ShardedCounters(["messages_published", "errors"])
+        >>> stats.add("messages_published")
+        >>> stats.snapshot()
+        {'messages_published': 1, 'errors': 0}
+    """
+
+    def __init__(self, names: Iterable[str]):
+        """
+        Initialize counters.
+
+        Args:
+            names: Counter names, all starting at zero
+        """
+        self._names = tuple(names)
+        self._local = threading.local()
+        # Guards registration of shards, not increments
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, Dict[str, int]]] = []
+        self._retired = dict.fromkeys(self._names, 0)
+
+    def _shard(self) -> Dict[str, int]:
+        """Get the calling thread's shard, registering it on first use"""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = dict.fromkeys(self._names, 0)
+            with self._lock:
+                live = []
+                for thread, counts in self._shards:
+                    if thread.is_alive():
+                        live.append((thread, counts))
+                    else:
+                        for name, value in counts.items():
+                            self._retired[name] += value
+                live.append((threading.current_thread(), shard))
+                self._shards = live
+            self._local.shard = shard
+        return shard
+
+    def add(self, name: str, amount: int = 1) -> None:
+        """
+        Add to a counter.
+
+        Args:
+            name: Counter name given at construction
+            amount: Increment (negative to decrement)
+        """
+        self._shard()[name] += amount
+
+    def __getitem__(self, name: str) -> int:
+        return self.snapshot()[name]
+
+    def snapshot(self) -> Dict[str, int]:
+        """
+        Get the current totals.
+
+        Returns:
+            Counter name -> sum over all shards
+        """
+        with self._lock:
+            totals = dict(self._retired)
+            shards = [counts for _, counts in self._shards]
+        for counts in shards:
+            for name in self._names:
+                totals[name] += counts[name]
+        return totals
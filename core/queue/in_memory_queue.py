@@ -6,16 +6,300 @@ Not suitable for production use - messages are not persisted.
 """
 
 import logging
+import tempfile
 import threading
 import time
 import uuid
 from collections import defaultdict, deque
-from typing import Any, Callable, Dict, List
+from itertools import islice
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Deque, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 from core.interfaces.queue_plugin import QueuePlugin
+from core.queue.capacity import (
+    OverflowPolicy,
+    QueueFullError,
+    SpillFile,
+    TopicCapacity,
+    approximate_size,
+    dump_message,
+)
+from core.queue.counters import ShardedCounters
+from core.queue.timer_wheel import TimerWheel
 
 logger = logging.getLogger(__name__)
 
+# Consumer group of subscriptions and get() calls that do not name one
+DEFAULT_GROUP = "default"
+
+# Number of independently locked shards of the pending-ack table
+PENDING_ACK_STRIPES = 16
+
+# Topics without a byte limit measure one in this many messages
+SIZE_SAMPLE_INTERVAL = 64
+
+# Delay before a due message is offered again to a full BLOCK topic, in milliseconds
+DELAYED_FULL_RETRY_MS = 100.0
+
+
+class _ConsumerGroup:
+    """Read position of one consumer group in a topic log"""
+
+    __slots__ = ("name", "cursor", "redeliver", "ready")
+
+    def __init__(self, name: str, cursor: int, lock: threading.Lock):
+        self.name = name
+        # Offset of the next message to deliver
+        self.cursor = cursor
+        # Rejected messages to deliver again, ahead of new ones
+        self.redeliver: Deque[Dict[str, Any]] = deque()
+        # Shares the topic lock; publishers notify one waiter per message
+        self.ready = threading.Condition(lock)
+
+
+class _TopicLog:
+    """
+    Messages of a topic, stored once and read by every consumer group.
+
+    ``entries[i]`` has offset ``base + i``. Messages that did not fit the
+    topic's capacity follow the entries in ``spill``. Entries every group
+    has read are dropped from the head; without groups, all entries are
+    kept until the first consumer arrives. All fields are guarded by
+    ``lock``; a deleted log is never written again.
+
+    With a byte limit, ``sizes[i]`` is the approximate size of
+    ``entries[i]``. Otherwise only a sample of messages is measured and
+    the topic's size is estimated from their average.
+    """
+
+    __slots__ = (
+        "entries",
+        "sizes",
+        "tracked_bytes",
+        "average_size",
+        "appended",
+        "base",
+        "groups",
+        "lock",
+        "space",
+        "deleted",
+        "capacity",
+        "spill",
+    )
+
+    def __init__(self, capacity: Optional[TopicCapacity] = None, spill: Optional[SpillFile] = None) -> None:
+        self.entries: Deque[Dict[str, Any]] = deque()
+        self.sizes: Optional[Deque[int]] = deque() if capacity is not None and capacity.max_bytes is not None else None
+        self.tracked_bytes = 0
+        self.average_size = 0.0
+        self.appended = 0
+        self.base = 0
+        self.groups: Dict[str, _ConsumerGroup] = {}
+        self.lock = threading.Lock()
+        # Publishers blocked on a full topic wait here
+        self.space = threading.Condition(self.lock)
+        self.deleted = False
+        self.capacity = capacity
+        self.spill = spill
+
+    @property
+    def memory_tail(self) -> int:
+        """Offset after the last message held in memory"""
+        return self.base + len(self.entries)
+
+    @property
+    def tail(self) -> int:
+        """Offset the next published message gets"""
+        return self.memory_tail + (len(self.spill) if self.spill is not None else 0)
+
+    @property
+    def bytes(self) -> int:
+        """Approximate size of the messages held in memory"""
+        if self.sizes is not None:
+            return self.tracked_bytes
+        return int(len(self.entries) * self.average_size)
+
+    def backlog(self, group: _ConsumerGroup) -> int:
+        """Number of messages the group has yet to receive"""
+        return self.tail - group.cursor + len(group.redeliver)
+
+    def fits(self, count: int, size: int) -> bool:
+        """Check whether ``count`` more messages of ``size`` bytes fit in memory"""
+        if self.capacity is None or not self.entries:
+            return True
+        return self.capacity.fits(len(self.entries) + count, self.bytes + size)
+
+    def _push(self, envelope: Dict[str, Any], size: Optional[int]) -> None:
+        self.entries.append(envelope)
+        if self.sizes is not None:
+            self.sizes.append(size if size is not None else approximate_size(envelope))
+            self.tracked_bytes += self.sizes[-1]
+
+    def _pop(self) -> None:
+        self.entries.popleft()
+        if self.sizes is not None:
+            self.tracked_bytes -= self.sizes.popleft()
+
+    def extend(self, envelopes: List[Dict[str, Any]], sizes: Optional[List[int]] = None) -> int:
+        """
+        Append messages; with a spill file, those that do not fit go there.
+
+        Args:
+            envelopes: Messages to append
+            sizes: Their approximate sizes, if the topic has a byte limit
+
+        Returns:
+            Number of messages spilled
+        """
+        if self.sizes is not None and sizes is None:
+            sizes = [approximate_size(envelope) for envelope in envelopes]
+        if self.sizes is None:
+            # Measure one message of each SIZE_SAMPLE_INTERVAL appended
+            if self.appended // SIZE_SAMPLE_INTERVAL != (self.appended + len(envelopes)) // SIZE_SAMPLE_INTERVAL:
+                size = approximate_size(envelopes[-1])
+                self.average_size = 0.9 * self.average_size + 0.1 * size if self.average_size else size
+            self.appended += len(envelopes)
+
+        if self.spill is None:
+            self.entries.extend(envelopes)
+            if self.sizes is not None:
+                self.sizes.extend(sizes)
+                self.tracked_bytes += sum(sizes)
+            return 0
+
+        # Once spilling, newer messages queue behind the spilled ones
+        index = 0
+        if not self.spill:
+            while index < len(envelopes):
+                size = sizes[index] if sizes is not None else 0
+                if not self.fits(1, size):
+                    break
+                self._push(envelopes[index], size)
+                index += 1
+        if index < len(envelopes):
+            self.spill.append(envelopes[index:])
+        return len(envelopes) - index
+
+    def evict(self) -> int:
+        """
+        Drop the oldest messages until the topic is within its capacity.
+
+        Returns:
+            Number of messages dropped, read by all groups or not
+        """
+        dropped = 0
+        while len(self.entries) > 1 and not self.capacity.fits(len(self.entries), self.bytes):
+            self._pop()
+            self.base += 1
+            dropped += 1
+        for group in self.groups.values():
+            group.cursor = max(group.cursor, self.base)
+        return dropped
+
+    def take(self, group: _ConsumerGroup, limit: int) -> List[Dict[str, Any]]:
+        """Advance the group past up to ``limit`` messages and return them"""
+        batch: List[Dict[str, Any]] = []
+        while group.redeliver and len(batch) < limit:
+            batch.append(group.redeliver.popleft())
+
+        count = min(limit - len(batch), self.tail - group.cursor)
+        if count > 0:
+            start = group.cursor - self.base
+            in_memory = max(0, min(count, self.memory_tail - group.cursor))
+            batch.extend(islice(self.entries, start, start + in_memory))
+            # A group ahead of the others reads spilled messages from disk
+            for index in range(group.cursor + in_memory - self.memory_tail, group.cursor + count - self.memory_tail):
+                batch.append(self.spill.read(index))
+            group.cursor += count
+            self.trim()
+        return batch
+
+    def trim(self) -> None:
+        """Drop entries every group has read and refill memory from the spill file"""
+        if not self.groups:
+            return
+        low = min(group.cursor for group in self.groups.values())
+        if low <= self.base:
+            return
+        memory_tail = self.memory_tail
+        for _ in range(min(low, memory_tail) - self.base):
+            self._pop()
+        if low > memory_tail:
+            self.spill.discard(low - memory_tail)
+        self.base = low
+
+        while self.spill and self.fits(1, 0):
+            self._push(self.spill.popleft(), None)
+        if self.capacity is not None:
+            self.space.notify_all()
+
+    def clear(self) -> int:
+        """Drop all messages; returns how many were dropped"""
+        count = self.tail - self.base
+        self.base = self.tail
+        self.entries.clear()
+        if self.sizes is not None:
+            self.sizes.clear()
+            self.tracked_bytes = 0
+        if self.spill is not None:
+            self.spill.clear()
+        self.space.notify_all()
+        return count
+
+
+class _PendingAcks:
+    """
+    Deliveries awaiting acknowledgment, keyed by message ID and consumer group.
+
+    The table is split into stripes by message ID, each with its own lock,
+    so consumers acknowledging different messages rarely contend.
+    """
+
+    def __init__(self, stripes: int = PENDING_ACK_STRIPES):
+        self._stripes: List[Tuple[threading.Lock, Dict[str, Dict[str, Dict[str, Any]]]]] = [
+            (threading.Lock(), {}) for _ in range(stripes)
+        ]
+
+    def _stripe(self, message_id: str) -> Tuple[threading.Lock, Dict[str, Dict[str, Dict[str, Any]]]]:
+        return self._stripes[hash(message_id) % len(self._stripes)]
+
+    def add(self, envelope: Dict[str, Any], group: str) -> None:
+        """Record the delivery of a message to a group"""
+        lock, table = self._stripe(envelope["message_id"])
+        with lock:
+            table.setdefault(envelope["message_id"], {})[group] = envelope
+
+    def pop(self, message_id: str, group: Optional[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Remove a delivery.
+
+        Args:
+            message_id: ID of the delivered message
+            group: Consumer group it was delivered to (None: the oldest delivery)
+
+        Returns:
+            Tuple of (group, envelope), or None if no such delivery is pending
+        """
+        lock, table = self._stripe(message_id)
+        with lock:
+            deliveries = table.get(message_id)
+            if not deliveries:
+                return None
+            if group is None:
+                group = next(iter(deliveries))
+            envelope = deliveries.pop(group, None)
+            if not deliveries:
+                del table[message_id]
+        return (group, envelope) if envelope is not None else None
+
+    def __len__(self) -> int:
+        count = 0
+        for lock, table in self._stripes:
+            with lock:
+                count += sum(len(deliveries) for deliveries in table.values())
+        return count
+
 
 class InMemoryQueuePlugin(QueuePlugin):
     """
@@ -24,32 +308,100 @@ class InMemoryQueuePlugin(QueuePlugin):
     Features:
     - Thread-safe operations
     - Basic pub/sub functionality
+    - Consumer groups: every group receives every message (fan-out), and
+      the subscriptions and workers within a group share its messages
+      (competing consumers)
+    - Worker pools per subscription
+    - Publishers wake waiting consumers directly (no polling)
+    - Blocking get() for pull-style consumers
     - Message acknowledgment
+    - Delayed delivery via a timer wheel
     - Dead letter queue for failed messages
+    - Per-topic memory limits with block, drop-oldest or spill-to-disk
+      overflow, and a bounded dead letter queue
+
+    Each topic stores a message once, in a log that consumer groups read
+    through their own cursors. Subscriptions that do not name a group join
+    the topic's default group, so plain subscribers compete for messages.
+    A group created later starts at the oldest message still held.
+
+    Each topic has its own lock, so producers and consumers of different
+    topics never contend. The pending-ack table is lock-striped and
+    statistics are per-thread counters summed when read; the queue-wide
+    lock only guards the topic and subscription registries.
+
+    Topics are unbounded unless given a TopicCapacity, either for all
+    topics here or per topic in create_topic(). A full topic blocks its
+    publishers, evicts its oldest messages or spills new ones to a file in
+    ``spill_dir`` until consumers catch up.
 
     Limitations:
     - No persistence (data lost on restart)
     - No distributed support
     - Limited scalability
+
+    Example:
+        >>> queue = InMemoryQueuePlugin(
+        ...     capacity=TopicCapacity(max_bytes=256 * 1024 * 1024, overflow="spill"),
+        ...     spill_dir="/var/tmp/antifraud-queue",
+        ...     max_dead_letter=10_000,
+        ... )
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        capacity: Optional[TopicCapacity] = None,
+        spill_dir: Optional[Union[str, Path]] = None,
+        max_dead_letter: Optional[int] = None,
+        dead_letter_file: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Initialize in-memory queue.
+
+        Args:
+            capacity: Default limits of every topic (None: unbounded)
+            spill_dir: Directory of the spill files of topics with the
+                ``SPILL`` policy (default: a temporary directory)
+            max_dead_letter: Maximum number of messages in the dead letter
+                queue; older ones are moved out (None: unbounded)
+            dead_letter_file: JSON lines file dead letters moved out of the
+                queue are appended to (default: they are dropped)
+        """
+        if max_dead_letter is not None and max_dead_letter < 1:
+            raise ValueError(f"max_dead_letter must be positive, got {max_dead_letter}")
+
         self._connected = False
-        self._queues: Dict[str, deque] = defaultdict(deque)
+        self._topics: Dict[str, _TopicLog] = {}
         self._subscribers: Dict[str, List[tuple]] = defaultdict(list)
-        self._pending_acks: Dict[str, Dict[str, Any]] = {}
+        # Subscription ID -> (topic, consumer group)
+        self._subscriptions: Dict[str, Tuple[str, str]] = {}
+        self._pending_acks = _PendingAcks()
+        self._capacity = capacity
+        self._spill_dir = Path(spill_dir) if spill_dir is not None else None
         self._dead_letter: deque = deque()
+        self._dead_letter_lock = threading.Lock()
+        self._max_dead_letter = max_dead_letter
+        self._dead_letter_path = Path(dead_letter_file) if dead_letter_file is not None else None
+        self._dead_letter_file: Optional[BinaryIO] = None
+        # Guards the topic and subscription registries (not message traffic)
         self._lock = threading.RLock()
-        self._stats = {
-            "messages_published": 0,
-            "messages_consumed": 0,
-            "messages_acked": 0,
-            "messages_rejected": 0,
-            "active_subscriptions": 0,
-            "errors": 0,
-        }
-        self._worker_threads: Dict[str, threading.Thread] = {}
+        self._stats = ShardedCounters(
+            [
+                "messages_published",
+                "messages_consumed",
+                "messages_acked",
+                "messages_rejected",
+                "active_subscriptions",
+                "errors",
+                "messages_dropped",
+                "messages_spilled",
+                "dead_letters_spilled",
+                "dead_letters_dropped",
+            ]
+        )
+        self._worker_threads: Dict[str, List[threading.Thread]] = {}
         self._stop_flags: Dict[str, threading.Event] = {}
+        self._timer_wheel: Optional[TimerWheel] = None
 
     def connect(self) -> None:
         """Establish connection (no-op for in-memory)"""
@@ -65,17 +417,147 @@ class InMemoryQueuePlugin(QueuePlugin):
         if not self._connected:
             return
 
-        # Stop all worker threads
-        for topic, stop_flag in self._stop_flags.items():
-            stop_flag.set()
+        # Stop all worker threads and blocked get() calls
+        with self._lock:
+            self._connected = False
+            for stop_flag in self._stop_flags.values():
+                stop_flag.set()
+            logs = list(self._topics.values())
+        for log in logs:
+            with log.lock:
+                log.space.notify_all()
+                for group in log.groups.values():
+                    group.ready.notify_all()
 
         # Wait for threads to finish
-        for thread in self._worker_threads.values():
-            thread.join(timeout=5.0)
+        for workers in self._worker_threads.values():
+            for thread in workers:
+                thread.join(timeout=5.0)
+
+        # Delayed messages are not persisted
+        if self._timer_wheel is not None:
+            dropped = self._timer_wheel.stop()
+            self._timer_wheel = None
+            if dropped:
+                logger.warning(f"Dropped {dropped} delayed messages on disconnect")
+
+        with self._dead_letter_lock:
+            if self._dead_letter_file is not None:
+                self._dead_letter_file.close()
+                self._dead_letter_file = None
 
-        self._connected = False
         logger.info("In-memory queue disconnected")
 
+    def _log(self, topic: str) -> _TopicLog:
+        """Get the log of a topic, creating it if needed"""
+        log = self._topics.get(topic)
+        if log is None:
+            with self._lock:
+                log = self._topics.get(topic)
+                if log is None:
+                    log = self._topics[topic] = self._new_log(topic)
+        return log
+
+    def _new_log(self, topic: str, capacity: Optional[TopicCapacity] = None) -> _TopicLog:
+        """Build the log of a new topic (caller holds the registry lock)"""
+        capacity = capacity or self._capacity
+        spill = None
+        if capacity is not None and capacity.overflow is OverflowPolicy.SPILL:
+            if self._spill_dir is None:
+                self._spill_dir = Path(tempfile.mkdtemp(prefix="queue-spill-"))
+            # Unique name: a recreated topic must not share the file of the deleted one
+            spill = SpillFile(self._spill_dir / f"{quote(topic, safe='')}.{uuid.uuid4().hex[:8]}.spill")
+        return _TopicLog(capacity, spill)
+
+    def _group(self, log: _TopicLog, name: str) -> _ConsumerGroup:
+        """Get a consumer group of a topic, creating it if needed (caller holds the topic lock)"""
+        group = log.groups.get(name)
+        if group is None:
+            group = log.groups[name] = _ConsumerGroup(name, log.base, log.lock)
+        return group
+
+    def _append(self, topic: str, envelopes: List[Dict[str, Any]], block: bool = True) -> bool:
+        """
+        Append messages to a topic log and wake consumers.
+
+        Args:
+            topic: Topic name
+            envelopes: Messages to append
+            block: Wait for room in a full topic with the BLOCK policy; if
+                False, such a topic rejects the messages instead
+
+        Returns:
+            False if the messages were rejected because the topic is full
+        """
+        sizes: Optional[List[int]] = None
+        while True:
+            log = self._log(topic)
+            # Measured outside the lock, and only where a byte limit needs it
+            if sizes is None and log.sizes is not None:
+                sizes = [approximate_size(envelope) for envelope in envelopes]
+            with log.lock:
+                # Retry on the replacement if the topic was deleted meanwhile
+                size = sum(sizes) if sizes is not None else 0
+                if block:
+                    if log.deleted or not self._wait_for_room(topic, log, len(envelopes), size):
+                        continue
+                elif log.deleted:
+                    continue
+                elif (
+                    log.capacity is not None
+                    and log.capacity.overflow is OverflowPolicy.BLOCK
+                    and not log.fits(len(envelopes), size)
+                ):
+                    return False
+                self._store(topic, log, envelopes)
+                spilled = log.extend(envelopes, sizes)
+                if spilled:
+                    self._stats.add("messages_spilled", spilled)
+                if log.capacity is not None and log.capacity.overflow is OverflowPolicy.DROP_OLDEST:
+                    dropped = log.evict()
+                    if dropped:
+                        self._stats.add("messages_dropped", dropped)
+                        logger.warning(f"Topic {topic} is full, dropped {dropped} oldest messages")
+                for group in log.groups.values():
+                    group.ready.notify(len(envelopes))
+                return True
+
+    def _wait_for_room(self, topic: str, log: _TopicLog, count: int, size: int) -> bool:
+        """
+        Block a publisher until messages fit a topic with the BLOCK policy (caller holds the topic lock).
+
+        Returns:
+            False if the topic was deleted meanwhile
+
+        Raises:
+            QueueFullError: If the topic's block_timeout passes first
+            ConnectionError: If the queue is disconnected meanwhile
+        """
+        if log.capacity is None or log.capacity.overflow is not OverflowPolicy.BLOCK:
+            return True
+
+        timeout = log.capacity.block_timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not log.fits(count, size):
+            if log.deleted:
+                return False
+            if not self._connected:
+                raise ConnectionError("Not connected to queue")
+            if deadline is None:
+                log.space.wait()
+            else:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise QueueFullError(f"Topic {topic} is full ({len(log.entries)} messages, {log.bytes} bytes)")
+                log.space.wait(remaining)
+        return not log.deleted
+
+    def _store(self, topic: str, log: _TopicLog, envelopes: List[Dict[str, Any]]) -> None:
+        """Hook for durable subclasses: messages about to be appended (caller holds the topic lock)"""
+
+    def _settled(self, group: str, envelope: Dict[str, Any]) -> None:
+        """Hook for durable subclasses: a delivery was acknowledged or dead-lettered"""
+
     def publish(self, topic: str, message: Dict[str, Any], **kwargs: Any) -> str:
         """Publish a message to a queue"""
         if not self._connected:
@@ -90,43 +572,240 @@ class InMemoryQueuePlugin(QueuePlugin):
             "metadata": kwargs,
         }
 
-        with self._lock:
-            self._queues[topic].append(envelope)
-            self._stats["messages_published"] += 1
+        self._append(topic, [envelope])
+        self._stats.add("messages_published")
 
         logger.debug(f"Published message {message_id} to topic {topic}")
         return message_id
 
-    def subscribe(self, topic: str, callback: Callable[[Dict[str, Any]], None], **kwargs: Any) -> str:
-        """Subscribe to a topic with a callback"""
+    def publish_batch(self, topic: str, messages: List[Dict[str, Any]], **kwargs: Any) -> List[str]:
+        """Publish several messages under a single lock acquisition"""
+        if not self._connected:
+            raise ConnectionError("Not connected to queue")
+
+        now = time.time()
+        envelopes: List[Dict[str, Any]] = [
+            {
+                "message_id": str(uuid.uuid4()),
+                "topic": topic,
+                "payload": message,
+                "timestamp": now,
+                "metadata": kwargs,
+            }
+            for message in messages
+        ]
+
+        self._append(topic, envelopes)
+        self._stats.add("messages_published", len(envelopes))
+
+        logger.debug(f"Published {len(envelopes)} messages to topic {topic}")
+        return [envelope["message_id"] for envelope in envelopes]
+
+    def publish_delayed(self, topic: str, message: Dict[str, Any], delay_ms: float, **kwargs: Any) -> str:
+        """Publish a message that is appended to the queue after a delay"""
         if not self._connected:
             raise ConnectionError("Not connected to queue")
+        if delay_ms <= 0:
+            return self.publish(topic, message, **kwargs)
+
+        message_id = str(uuid.uuid4())
+        envelope = {
+            "message_id": message_id,
+            "topic": topic,
+            "payload": message,
+            "timestamp": time.time(),
+            "metadata": kwargs,
+        }
+
+        with self._lock:
+            if self._timer_wheel is None:
+                self._timer_wheel = TimerWheel()
+            self._timer_wheel.schedule(delay_ms, lambda: self._deliver_delayed(envelope))
+        self._stats.add("messages_published")
+
+        logger.debug(f"Scheduled message {message_id} to topic {topic} in {delay_ms:.0f}ms")
+        return message_id
+
+    def _deliver_delayed(self, envelope: Dict[str, Any]) -> None:
+        """Timer callback: make a delayed message visible"""
+        # Never block the timer thread: a full BLOCK topic gets the message offered again later
+        # (DROP_OLDEST and SPILL topics apply their policy as for any publish)
+        if self._append(envelope["topic"], [envelope], block=False):
+            return
+
+        with self._lock:
+            if self._timer_wheel is None:
+                # Disconnected meanwhile; pending timers are dropped
+                return
+            self._timer_wheel.schedule(DELAYED_FULL_RETRY_MS, lambda: self._deliver_delayed(envelope))
+        logger.debug(f"Topic {envelope['topic']} is full, delaying message {envelope['message_id']}")
+
+    def subscribe(
+        self,
+        topic: str,
+        callback: Callable[[Dict[str, Any]], None],
+        consumer_group: Optional[str] = None,
+        workers: int = 1,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Subscribe to a topic with a callback.
+
+        Args:
+            topic: Topic to subscribe to
+            callback: Function to call for each message
+            consumer_group: Group sharing the messages with this subscription
+                (default: the topic's default group); every group receives
+                every message
+            workers: Number of threads calling ``callback`` concurrently;
+                with more than one, messages may complete out of order
+            **kwargs: Ignored backend-specific options
+
+        Returns:
+            Subscription ID
+
+        Raises:
+            ConnectionError: If not connected
+            ValueError: If workers is not positive
+        """
+        if not self._connected:
+            raise ConnectionError("Not connected to queue")
+
+        subscription_id = self._register(topic, callback, consumer_group, workers, kwargs)
+        self._start_workers(topic, subscription_id, workers, self._worker_loop, (callback,))
+
+        logger.info(f"Subscribed to topic {topic} with ID {subscription_id}")
+        return subscription_id
+
+    def subscribe_batch(
+        self,
+        topic: str,
+        callback: Callable[[List[Dict[str, Any]]], None],
+        batch_size: int = 100,
+        max_wait_ms: float = 50.0,
+        consumer_group: Optional[str] = None,
+        workers: int = 1,
+        **kwargs: Any,
+    ) -> str:
+        """Subscribe to a topic with a callback receiving batches of messages (see subscribe())"""
+        if not self._connected:
+            raise ConnectionError("Not connected to queue")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        subscription_id = self._register(topic, callback, consumer_group, workers, kwargs)
+        self._start_workers(
+            topic,
+            subscription_id,
+            workers,
+            self._batch_worker_loop,
+            (callback, batch_size, max_wait_ms / 1000.0),
+        )
+
+        logger.info(f"Subscribed to topic {topic} with ID {subscription_id} (batch_size={batch_size})")
+        return subscription_id
+
+    def _register(
+        self,
+        topic: str,
+        callback: Callable[..., None],
+        consumer_group: Optional[str],
+        workers: int,
+        kwargs: Dict[str, Any],
+    ) -> str:
+        """Record a subscription and join its consumer group"""
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}")
 
         subscription_id = str(uuid.uuid4())
+        group = consumer_group or DEFAULT_GROUP
 
+        self.create_consumer_group(topic, group)
         with self._lock:
             self._subscribers[topic].append((subscription_id, callback, kwargs))
-            self._stats["active_subscriptions"] += 1
+            self._subscriptions[subscription_id] = (topic, group)
+        self._stats.add("active_subscriptions")
+        return subscription_id
 
-        # Start worker thread for this subscription
+    def _start_workers(
+        self, topic: str, subscription_id: str, count: int, target: Callable[..., None], args: tuple
+    ) -> None:
+        """Start the worker threads of a subscription"""
         stop_flag = threading.Event()
         self._stop_flags[subscription_id] = stop_flag
 
-        worker = threading.Thread(
-            target=self._worker_loop,
-            args=(topic, subscription_id, callback, stop_flag),
-            daemon=True,
-            name=f"worker-{topic}-{subscription_id[:8]}",
-        )
-        self._worker_threads[subscription_id] = worker
-        worker.start()
+        group = self._subscriptions[subscription_id][1]
+        workers = [
+            threading.Thread(
+                target=target,
+                args=(topic, group, subscription_id, *args, stop_flag),
+                daemon=True,
+                name=f"worker-{topic}-{subscription_id[:8]}-{index}",
+            )
+            for index in range(count)
+        ]
+        self._worker_threads[subscription_id] = workers
+        for worker in workers:
+            worker.start()
 
-        logger.info(f"Subscribed to topic {topic} with ID {subscription_id}")
-        return subscription_id
+    def _take(self, log: _TopicLog, group: _ConsumerGroup, limit: int) -> List[Dict[str, Any]]:
+        """Take up to ``limit`` messages for a group and hold them for acknowledgment (caller holds the topic lock)"""
+        batch = log.take(group, limit)
+        for envelope in batch:
+            self._pending_acks.add(envelope, group.name)
+        return batch
+
+    def _wait_for(
+        self,
+        topic: str,
+        group_name: str,
+        limit: int,
+        stop_flag: Optional[threading.Event] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Block until a consumer group has messages, then take up to ``limit`` of them.
+
+        Returns:
+            Taken envelopes; empty on timeout, stop or disconnect
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            log = self._log(topic)
+            with log.lock:
+                # Leaves the loop to look the log up again if delete_topic() replaced it
+                while not log.deleted:
+                    group = self._group(log, group_name)
+                    if log.backlog(group):
+                        return self._take(log, group, limit)
+                    if not self._connected or (stop_flag is not None and stop_flag.is_set()):
+                        return []
+                    if deadline is None:
+                        group.ready.wait()
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return []
+                        group.ready.wait(remaining)
+
+    def get(
+        self, topic: str, timeout: Optional[float] = None, consumer_group: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Block until a message is available to the consumer group (default group if None) and take it"""
+        if not self._connected:
+            raise ConnectionError("Not connected to queue")
+
+        taken = self._wait_for(topic, consumer_group or DEFAULT_GROUP, 1, timeout=timeout)
+        if not taken:
+            return None
+
+        self._stats.add("messages_consumed")
+        return taken[0]
 
     def _worker_loop(
         self,
         topic: str,
+        group: str,
         subscription_id: str,
         callback: Callable[[Dict[str, Any]], None],
         stop_flag: threading.Event,
@@ -136,129 +815,326 @@ class InMemoryQueuePlugin(QueuePlugin):
 
         while not stop_flag.is_set():
             try:
-                # Try to get a message
-                envelope = None
-                with self._lock:
-                    if self._queues[topic]:
-                        envelope = self._queues[topic].popleft()
-
-                if envelope:
-                    message_id = envelope["message_id"]
-                    payload = envelope["payload"]
-
-                    # Store for acknowledgment
-                    self._pending_acks[message_id] = envelope
-
-                    try:
-                        # Process message
-                        callback(payload)
-                        self._stats["messages_consumed"] += 1
-
-                        # Auto-acknowledge if not explicitly rejected
-                        if message_id in self._pending_acks:
-                            self.acknowledge(message_id)
-                    except Exception as e:
-                        logger.error(f"Error processing message {message_id}: {e}")
-                        self._stats["errors"] += 1
-                        self.reject(message_id, requeue=False)
-                else:
-                    # No messages, sleep briefly
-                    time.sleep(0.1)
+                # Sleep until a publisher notifies the group
+                taken = self._wait_for(topic, group, 1, stop_flag)
+                if not taken:
+                    continue
+
+                envelope = taken[0]
+                message_id = envelope["message_id"]
+
+                try:
+                    # Process message
+                    callback(envelope["payload"])
+                    self._stats.add("messages_consumed")
+
+                    # Auto-acknowledge if not explicitly rejected
+                    self._acknowledge(message_id, group)
+                except Exception as e:
+                    logger.error(f"Error processing message {message_id}: {e}")
+                    self._stats.add("errors")
+                    self._reject(message_id, group, requeue=False)
 
             except Exception as e:
                 logger.error(f"Worker error: {e}")
-                self._stats["errors"] += 1
-                time.sleep(1.0)
+                self._stats.add("errors")
+                stop_flag.wait(1.0)
 
         logger.info(f"Worker stopped for subscription {subscription_id}")
 
+    def _fill(
+        self,
+        topic: str,
+        group_name: str,
+        batch: List[Dict[str, Any]],
+        limit: int,
+        deadline: float,
+        stop_flag: threading.Event,
+    ) -> None:
+        """Add messages published before the deadline to a batch, until it holds ``limit``"""
+        while len(batch) < limit and not stop_flag.is_set():
+            log = self._log(topic)
+            with log.lock:
+                if log.deleted:
+                    continue
+                group = self._group(log, group_name)
+                batch.extend(self._take(log, group, limit - len(batch)))
+                remaining = deadline - time.monotonic()
+                if len(batch) >= limit or remaining <= 0:
+                    return
+                group.ready.wait(remaining)
+
+    def _batch_worker_loop(
+        self,
+        topic: str,
+        group: str,
+        subscription_id: str,
+        callback: Callable[[List[Dict[str, Any]]], None],
+        batch_size: int,
+        max_wait: float,
+        stop_flag: threading.Event,
+    ) -> None:
+        """Worker thread that delivers messages in batches"""
+        logger.info(f"Batch worker started for subscription {subscription_id}")
+
+        while not stop_flag.is_set():
+            try:
+                batch = self._wait_for(topic, group, batch_size, stop_flag)
+                if not batch:
+                    continue
+
+                # Give the batch a short window to fill up
+                if len(batch) < batch_size:
+                    self._fill(topic, group, batch, batch_size, time.monotonic() + max_wait, stop_flag)
+
+                message_ids = [envelope["message_id"] for envelope in batch]
+
+                try:
+                    callback([envelope["payload"] for envelope in batch])
+                    self._stats.add("messages_consumed", len(batch))
+
+                    # Auto-acknowledge messages that were not explicitly rejected
+                    for message_id in message_ids:
+                        self._acknowledge(message_id, group)
+                except Exception as e:
+                    logger.error(f"Error processing batch of {len(batch)} messages: {e}")
+                    self._stats.add("errors")
+                    for message_id in message_ids:
+                        self._reject(message_id, group, requeue=False)
+
+            except Exception as e:
+                logger.error(f"Worker error: {e}")
+                self._stats.add("errors")
+                stop_flag.wait(1.0)
+
+        logger.info(f"Batch worker stopped for subscription {subscription_id}")
+
     def unsubscribe(self, subscription_id: str) -> None:
-        """Unsubscribe from a topic"""
-        # Stop worker thread
-        if subscription_id in self._stop_flags:
-            self._stop_flags[subscription_id].set()
+        """Unsubscribe from a topic (the consumer group keeps its position)"""
+        if subscription_id not in self._subscriptions:
+            return
+
+        # Stop worker threads
+        topic, group = self._subscriptions[subscription_id]
+        self._stop_flags[subscription_id].set()
+        log = self._topics.get(topic)
+        if log is not None:
+            with log.lock:
+                if group in log.groups:
+                    log.groups[group].ready.notify_all()
 
-        if subscription_id in self._worker_threads:
-            self._worker_threads[subscription_id].join(timeout=5.0)
-            del self._worker_threads[subscription_id]
-            del self._stop_flags[subscription_id]
+        for worker in self._worker_threads.pop(subscription_id, []):
+            worker.join(timeout=5.0)
+        del self._stop_flags[subscription_id]
 
         # Remove from subscribers
         with self._lock:
+            del self._subscriptions[subscription_id]
             for topic, subs in self._subscribers.items():
                 self._subscribers[topic] = [(sid, cb, kw) for sid, cb, kw in subs if sid != subscription_id]
-            self._stats["active_subscriptions"] -= 1
+        self._stats.add("active_subscriptions", -1)
 
         logger.info(f"Unsubscribed {subscription_id}")
 
+    def _acknowledge(self, message_id: str, group: Optional[str]) -> None:
+        """Acknowledge a delivery to a consumer group"""
+        delivery = self._pending_acks.pop(message_id, group)
+        if delivery is not None:
+            self._stats.add("messages_acked")
+            self._settled(*delivery)
+            logger.debug(f"Acknowledged message {message_id}")
+
+    def _reject(self, message_id: str, group: Optional[str], requeue: bool) -> None:
+        """Reject a delivery to a consumer group"""
+        delivery = self._pending_acks.pop(message_id, group)
+        if delivery is None:
+            return
+        group, envelope = delivery
+        self._stats.add("messages_rejected")
+
+        if requeue:
+            # Deliver to the same group again
+            log = self._topics.get(envelope["topic"])
+            if log is not None:
+                with log.lock:
+                    consumer_group = log.groups.get(group)
+                    if consumer_group is not None and not log.deleted:
+                        consumer_group.redeliver.append(envelope)
+                        consumer_group.ready.notify()
+                        logger.debug(f"Requeued message {message_id}")
+                        return
+
+        # Move to dead letter queue
+        with self._dead_letter_lock:
+            self._dead_letter.append(envelope)
+            if self._max_dead_letter is not None and len(self._dead_letter) > self._max_dead_letter:
+                self._evict_dead_letter(self._dead_letter.popleft())
+        self._settled(group, envelope)
+        logger.debug(f"Moved message {message_id} to dead letter queue")
+
+    def _evict_dead_letter(self, envelope: Dict[str, Any]) -> None:
+        """Move the oldest dead letter out of a full queue (caller holds the dead letter lock)"""
+        if self._dead_letter_path is None:
+            self._stats.add("dead_letters_dropped")
+            logger.warning(f"Dead letter queue is full, dropped message {envelope['message_id']}")
+            return
+
+        try:
+            if self._dead_letter_file is None:
+                self._dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+                self._dead_letter_file = open(self._dead_letter_path, "ab")
+            self._dead_letter_file.write(dump_message(envelope))
+            self._dead_letter_file.flush()
+            self._stats.add("dead_letters_spilled")
+        except OSError as e:
+            logger.error(f"Failed to spill dead letter {envelope['message_id']} to {self._dead_letter_path}: {e}")
+            self._stats.add("dead_letters_dropped")
+
     def acknowledge(self, message_id: str) -> None:
         """Acknowledge successful processing"""
-        with self._lock:
-            if message_id in self._pending_acks:
-                del self._pending_acks[message_id]
-                self._stats["messages_acked"] += 1
-                logger.debug(f"Acknowledged message {message_id}")
+        self._acknowledge(message_id, None)
 
     def reject(self, message_id: str, requeue: bool = True) -> None:
         """Reject a message"""
-        with self._lock:
-            if message_id in self._pending_acks:
-                envelope = self._pending_acks.pop(message_id)
-                self._stats["messages_rejected"] += 1
-
-                if requeue:
-                    # Put back at the end of the queue
-                    topic = envelope["topic"]
-                    self._queues[topic].append(envelope)
-                    logger.debug(f"Requeued message {message_id}")
-                else:
-                    # Move to dead letter queue
-                    self._dead_letter.append(envelope)
-                    logger.debug(f"Moved message {message_id} to dead letter queue")
+        self._reject(message_id, None, requeue)
 
     def get_queue_size(self, topic: str) -> int:
-        """Get number of pending messages"""
+        """Get number of messages the slowest consumer group has yet to receive"""
+        log = self._topics.get(topic)
+        if log is None:
+            return 0
+        with log.lock:
+            if not log.groups:
+                return log.tail - log.base
+            return max(log.backlog(group) for group in log.groups.values())
+
+    def create_consumer_group(self, topic: str, group: str) -> None:
+        """
+        Create a consumer group ahead of its subscriptions.
+
+        The group holds on to every message published from now on, plus
+        the messages still held for other groups, until it receives them.
+
+        Args:
+            topic: Topic name (created if missing)
+            group: Consumer group name
+        """
+        while True:
+            log = self._log(topic)
+            with log.lock:
+                if not log.deleted:
+                    self._group(log, group)
+                    return
+
+    def get_consumer_groups(self, topic: str) -> Dict[str, Dict[str, int]]:
+        """
+        Get the consumer groups of a topic.
+
+        Args:
+            topic: Topic name
+
+        Returns:
+            Group name -> lag (messages not yet received), subscriptions
+            and worker threads
+        """
+        log = self._topics.get(topic)
+        if log is None:
+            return {}
+        with log.lock:
+            groups = {
+                name: {"lag": log.backlog(group), "subscriptions": 0, "workers": 0}
+                for name, group in log.groups.items()
+            }
         with self._lock:
-            return len(self._queues[topic])
+            for subscription_id, (sub_topic, group) in self._subscriptions.items():
+                if sub_topic == topic and group in groups:
+                    groups[group]["subscriptions"] += 1
+                    groups[group]["workers"] += len(self._worker_threads.get(subscription_id, []))
+            return groups
 
     def purge_queue(self, topic: str) -> int:
         """Delete all messages from a queue"""
-        with self._lock:
-            count = len(self._queues[topic])
-            self._queues[topic].clear()
-            logger.info(f"Purged {count} messages from topic {topic}")
-            return count
+        log = self._topics.get(topic)
+        if log is None:
+            return 0
+        with log.lock:
+            count = self._purge(topic, log)
+        logger.info(f"Purged {count} messages from topic {topic}")
+        return count
 
-    def create_topic(self, topic: str, **kwargs: Any) -> None:
-        """Create a new topic (no-op for in-memory)"""
+    def _purge(self, topic: str, log: _TopicLog) -> int:
+        """Drop all messages of a topic (caller holds the topic lock)"""
+        count = log.clear() + sum(len(group.redeliver) for group in log.groups.values())
+        for group in log.groups.values():
+            group.cursor = log.base
+            group.redeliver.clear()
+        return count
+
+    def create_topic(self, topic: str, capacity: Optional[TopicCapacity] = None, **kwargs: Any) -> None:
+        """
+        Create a new topic.
+
+        Args:
+            topic: Topic name
+            capacity: Limits of this topic (default: the queue's default capacity)
+            **kwargs: Ignored backend-specific options
+        """
         with self._lock:
-            if topic not in self._queues:
-                self._queues[topic] = deque()
+            if topic not in self._topics:
+                self._topics[topic] = self._new_log(topic, capacity)
                 logger.info(f"Created topic {topic}")
+            elif capacity is not None:
+                logger.warning(f"Topic {topic} already exists, capacity unchanged")
 
     def delete_topic(self, topic: str) -> None:
-        """Delete a topic"""
+        """Delete a topic with its messages and consumer groups"""
         with self._lock:
-            if topic in self._queues:
-                del self._queues[topic]
+            log = self._topics.pop(topic, None)
             if topic in self._subscribers:
                 del self._subscribers[topic]
-            logger.info(f"Deleted topic {topic}")
+        if log is not None:
+            with log.lock:
+                # Waiting workers and publishers move to a fresh log
+                log.deleted = True
+                log.space.notify_all()
+                for group in log.groups.values():
+                    group.ready.notify_all()
+                if log.spill is not None:
+                    log.spill.close()
+        logger.info(f"Deleted topic {topic}")
 
     def list_topics(self) -> List[str]:
         """List all topics"""
         with self._lock:
-            return list(self._queues.keys())
+            return list(self._topics.keys())
 
     def get_statistics(self) -> Dict[str, Any]:
         """Get queue statistics"""
         with self._lock:
-            return {
-                **self._stats,
-                "dead_letter_size": len(self._dead_letter),
-                "pending_acks": len(self._pending_acks),
-                "total_queues": len(self._queues),
-            }
+            logs = list(self._topics.items())
+            timer_wheel = self._timer_wheel
+
+        memory_bytes: Dict[str, int] = {}
+        memory_messages = spilled_messages = 0
+        for topic, log in logs:
+            with log.lock:
+                memory_bytes[topic] = log.bytes
+                memory_messages += len(log.entries)
+                spilled_messages += len(log.spill) if log.spill is not None else 0
+
+        return {
+            **self._stats.snapshot(),
+            "dead_letter_size": len(self._dead_letter),
+            "pending_acks": len(self._pending_acks),
+            "delayed_messages": len(timer_wheel) if timer_wheel is not None else 0,
+            "total_queues": len(logs),
+            "consumer_groups": sum(len(log.groups) for _, log in logs),
+            # Approximate size of the messages held per topic, see approximate_size()
+            "memory_messages": memory_messages,
+            "memory_bytes": sum(memory_bytes.values()),
+            "memory_bytes_by_topic": memory_bytes,
+            "spilled_messages": spilled_messages,
+        }
 
     def is_connected(self) -> bool:
         """Check if connected"""
@@ -273,19 +1149,19 @@ class InMemoryQueuePlugin(QueuePlugin):
             "latency_ms": 0.0,  # No network latency for in-memory
             "details": {
                 "connected": self._connected,
-                "active_workers": len(self._worker_threads),
+                "active_workers": sum(len(workers) for workers in self._worker_threads.values()),
                 "statistics": self.get_statistics(),
             },
         }
 
     def get_dead_letter_messages(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get messages from dead letter queue"""
-        with self._lock:
+        with self._dead_letter_lock:
             return list(self._dead_letter)[-limit:]
 
     def clear_dead_letter_queue(self) -> int:
         """Clear dead letter queue"""
-        with self._lock:
+        with self._dead_letter_lock:
             count = len(self._dead_letter)
             self._dead_letter.clear()
             logger.info(f"Cleared {count} messages from dead letter queue")
@@ -7,14 +7,39 @@ Supports persistence, distributed processing, and consumer groups.
 
 import json
 import logging
+import threading
 import time
 import uuid
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from core.interfaces.queue_plugin import QueuePlugin
 
 logger = logging.getLogger(__name__)
 
+DELAY_MOVE_BATCH = 100
+
+# Atomically move due members of a delay set to the stream. Members are
+# "<id>:<payload>" so identical payloads scheduled twice stay distinct.
+_MOVE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, member in ipairs(due) do
+    local payload = string.sub(member, string.find(member, ':', 1, true) + 1)
+    if ARGV[3] == '' then
+        redis.call('XADD', KEYS[2], '*', 'payload', payload, 'timestamp', ARGV[4])
+    else
+        redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[3], '*', 'payload', payload, 'timestamp', ARGV[4])
+    end
+    redis.call('ZREM', KEYS[1], member)
+end
+return #due
+"""
+
+
+def delayed_key(topic: str) -> str:
+    """Sorted set holding delayed messages of a topic, scored by due time"""
+    return f"{topic}:delayed"
+
+
 try:
     import redis
     from redis.exceptions import RedisError
@@ -33,6 +58,7 @@ class RedisQueuePlugin(QueuePlugin):
     - Persistent message storage
     - Consumer groups for load balancing
     - Acknowledgment and retry mechanism
+    - Delayed delivery via a sorted set per topic
     - Dead letter queue support
     - High throughput and low latency
 
@@ -51,6 +77,8 @@ class RedisQueuePlugin(QueuePlugin):
         consumer_name: Optional[str] = None,
         max_pending: int = 1000,
         block_ms: int = 1000,
+        max_stream_length: Optional[int] = None,
+        delay_poll_ms: int = 100,
     ):
         """
         Initialize Redis queue plugin.
@@ -64,6 +92,9 @@ class RedisQueuePlugin(QueuePlugin):
             consumer_name: Consumer name (auto-generated if None)
             max_pending: Maximum pending messages before blocking
             block_ms: Block duration when waiting for messages
+            max_stream_length: Approximate stream length above which old entries
+                are trimmed (None disables trimming; rely on backpressure instead)
+            delay_poll_ms: Interval at which due delayed messages are moved to their stream
         """
         if not REDIS_AVAILABLE:
             raise ImportError("redis package is required for RedisQueuePlugin")
@@ -76,11 +107,19 @@ class RedisQueuePlugin(QueuePlugin):
         self.consumer_name = consumer_name or f"consumer-{uuid.uuid4().hex[:8]}"
         self.max_pending = max_pending
         self.block_ms = block_ms
+        self.max_stream_length = max_stream_length
+        self.delay_poll_ms = delay_poll_ms
 
         self._client: Optional[redis.Redis] = None
         self._subscriptions: Dict[str, bool] = {}
+        # Stream of each message taken with get() until it is acked or rejected
+        self._taken: Dict[str, str] = {}
+        self._delayed_topics: Set[str] = set()
+        self._delay_mover: Optional[threading.Thread] = None
+        self._delay_lock = threading.Lock()
         self._stats = {
             "messages_published": 0,
+            "messages_delayed": 0,
             "messages_consumed": 0,
             "messages_acked": 0,
             "messages_rejected": 0,
@@ -116,6 +155,12 @@ class RedisQueuePlugin(QueuePlugin):
             for subscription_id in list(self._subscriptions.keys()):
                 self._subscriptions[subscription_id] = False
 
+            # Delayed messages stay in Redis; any connected instance moves them
+            mover = self._delay_mover
+            self._delay_mover = None
+            if mover is not None:
+                mover.join(timeout=5.0)
+
             self._client.close()
             self._client = None
             logger.info("Disconnected from Redis")
@@ -130,10 +175,12 @@ class RedisQueuePlugin(QueuePlugin):
             payload = json.dumps(message)
 
             # Add to stream
+            maxlen = kwargs.get("maxlen", self.max_stream_length)
             message_id = self._client.xadd(
                 topic,
                 {"payload": payload, "timestamp": time.time()},
-                maxlen=kwargs.get("maxlen", 10000),  # Limit stream size
+                maxlen=maxlen,
+                approximate=True,
             )
 
             self._stats["messages_published"] += 1
@@ -146,6 +193,95 @@ class RedisQueuePlugin(QueuePlugin):
             self._stats["errors"] += 1
             raise
 
+    def publish_batch(self, topic: str, messages: List[Dict[str, Any]], **kwargs: Any) -> List[str]:
+        """Publish several messages to a Redis Stream in one pipelined round trip"""
+        if not self._client:
+            raise ConnectionError("Not connected to Redis")
+
+        try:
+            maxlen = kwargs.get("maxlen", self.max_stream_length)
+            timestamp = time.time()
+
+            pipe = self._client.pipeline(transaction=False)
+            for message in messages:
+                pipe.xadd(
+                    topic, {"payload": json.dumps(message), "timestamp": timestamp}, maxlen=maxlen, approximate=True
+                )
+            message_ids = pipe.execute()
+
+            self._stats["messages_published"] += len(message_ids)
+            logger.debug(f"Published {len(message_ids)} messages to topic {topic}")
+
+            return message_ids
+
+        except RedisError as e:
+            logger.error(f"Failed to publish batch: {e}")
+            self._stats["errors"] += 1
+            raise
+
+    def publish_delayed(self, topic: str, message: Dict[str, Any], delay_ms: float, **kwargs: Any) -> str:
+        """
+        Publish a message to a topic after a delay.
+
+        The message waits in a sorted set scored by its due time until a
+        mover thread (running in every connected instance that published
+        delayed messages or subscribes to the topic) appends it to the stream.
+        """
+        if not self._client:
+            raise ConnectionError("Not connected to Redis")
+        if delay_ms <= 0:
+            return self.publish(topic, message, **kwargs)
+
+        try:
+            message_id = f"delayed-{uuid.uuid4().hex}"
+            due_ms = time.time() * 1000 + delay_ms
+            self._client.zadd(delayed_key(topic), {f"{message_id}:{json.dumps(message)}": due_ms})
+
+            self._stats["messages_delayed"] += 1
+            self._watch_delayed(topic)
+            logger.debug(f"Scheduled message {message_id} to topic {topic} in {delay_ms:.0f}ms")
+
+            return message_id
+
+        except RedisError as e:
+            logger.error(f"Failed to publish delayed message: {e}")
+            self._stats["errors"] += 1
+            raise
+
+    def _watch_delayed(self, topic: str) -> None:
+        """Move due delayed messages of a topic to its stream from now on"""
+        with self._delay_lock:
+            self._delayed_topics.add(topic)
+            if self._delay_mover is None:
+                self._delay_mover = threading.Thread(
+                    target=self._delay_mover_loop, daemon=True, name="redis-delay-mover"
+                )
+                self._delay_mover.start()
+
+    def _delay_mover_loop(self) -> None:
+        """Periodically move due delayed messages to their streams"""
+        move_due = self._client.register_script(_MOVE_DUE_SCRIPT)
+        while self._delay_mover is threading.current_thread() and self._client is not None:
+            backlog = False
+            try:
+                for topic in list(self._delayed_topics):
+                    # A full batch means more messages may already be due
+                    backlog |= self._move_due(move_due, topic) >= DELAY_MOVE_BATCH
+            except RedisError as e:
+                logger.error(f"Delayed message mover error: {e}")
+                self._stats["errors"] += 1
+            if not backlog:
+                time.sleep(self.delay_poll_ms / 1000)
+
+    def _move_due(self, move_due: Any, topic: str, limit: int = DELAY_MOVE_BATCH) -> int:
+        """Move up to ``limit`` due messages of a topic; returns the number moved"""
+        now = time.time()
+        maxlen = "" if self.max_stream_length is None else str(self.max_stream_length)
+        moved = move_due(keys=[delayed_key(topic), topic], args=[now * 1000, limit, maxlen, now])
+        if moved:
+            logger.debug(f"Moved {moved} delayed messages to topic {topic}")
+        return moved
+
     def subscribe(self, topic: str, callback: Callable[[Dict[str, Any]], None], **kwargs: Any) -> str:
         """Subscribe to Redis Stream with consumer group"""
         if not self._client:
@@ -166,6 +302,7 @@ class RedisQueuePlugin(QueuePlugin):
             # Start consuming in background
             self._subscriptions[subscription_id] = True
             self._stats["active_subscriptions"] += 1
+            self._watch_delayed(topic)
 
             # Note: In production, this should be handled by a separate worker process
             # For now, we'll use a simple polling approach
@@ -193,16 +330,11 @@ class RedisQueuePlugin(QueuePlugin):
         callback: Callable[[Dict[str, Any]], None],
     ) -> None:
         """Consumer loop for processing messages"""
+        cursor = "0"
         while self._subscriptions.get(subscription_id, False):
             try:
                 # Read messages from stream
-                messages = self._client.xreadgroup(
-                    self.consumer_group,
-                    self.consumer_name,
-                    {topic: ">"},
-                    count=10,
-                    block=self.block_ms,
-                )
+                messages, cursor = self._read_group(topic, cursor, 10, self.block_ms)
 
                 if not messages:
                     continue
@@ -217,13 +349,178 @@ class RedisQueuePlugin(QueuePlugin):
                             callback(payload)
 
                             # Acknowledge
-                            self.acknowledge(message_id)
+                            self._acknowledge(stream_name, message_id)
                             self._stats["messages_consumed"] += 1
 
                         except Exception as e:
                             logger.error(f"Error processing message {message_id}: {e}")
                             self._stats["errors"] += 1
-                            self.reject(message_id, requeue=False)
+                            self._reject(stream_name, message_id, requeue=False)
+
+            except RedisError as e:
+                logger.error(f"Consumer error: {e}")
+                self._stats["errors"] += 1
+                time.sleep(1.0)
+
+    def _read_group(self, topic: str, cursor: str, count: int, block_ms: int) -> Tuple[List[Any], str]:
+        """
+        Read the next stream entries for this consumer.
+
+        Reading starts from cursor "0", which replays entries delivered to
+        this consumer name earlier but never acknowledged (e.g. by a worker
+        that crashed and was restarted under the same name). Once the
+        backlog is drained the cursor switches to ">" for new entries.
+
+        Returns:
+            Tuple of (xreadgroup result, cursor for the next read)
+        """
+        if cursor == ">":
+            messages = self._client.xreadgroup(
+                self.consumer_group,
+                self.consumer_name,
+                {topic: ">"},
+                count=count,
+                block=block_ms,
+            )
+            return messages or [], ">"
+
+        messages = self._client.xreadgroup(self.consumer_group, self.consumer_name, {topic: cursor}, count=count)
+        entries = [message_id for _, stream_messages in messages or [] for message_id, _ in stream_messages]
+        if not entries:
+            return [], ">"
+
+        logger.info(f"Replaying {len(entries)} pending messages on {topic} for {self.consumer_name}")
+        return messages, entries[-1]
+
+    def get(self, topic: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Read the next stream entry for this consumer, blocking until one arrives"""
+        if not self._client:
+            raise ConnectionError("Not connected to Redis")
+
+        try:
+            try:
+                self._client.xgroup_create(topic, self.consumer_group, id="0", mkstream=True)
+                logger.info(f"Created consumer group {self.consumer_group} for topic {topic}")
+            except RedisError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._watch_delayed(topic)
+
+            # BLOCK 0 waits indefinitely; no BLOCK returns immediately
+            if timeout is None:
+                block: Optional[int] = 0
+            elif timeout <= 0:
+                block = None
+            else:
+                block = max(1, int(timeout * 1000))
+
+            messages = self._client.xreadgroup(
+                self.consumer_group, self.consumer_name, {topic: ">"}, count=1, block=block
+            )
+        except RedisError as e:
+            logger.error(f"Failed to read from {topic}: {e}")
+            self._stats["errors"] += 1
+            raise
+
+        for _, stream_messages in messages or []:
+            for message_id, fields in stream_messages:
+                self._taken[message_id] = topic
+                self._stats["messages_consumed"] += 1
+                return {
+                    "message_id": message_id,
+                    "topic": topic,
+                    "payload": json.loads(fields["payload"]),
+                    "timestamp": float(fields.get("timestamp", 0.0)),
+                }
+        return None
+
+    def subscribe_batch(
+        self,
+        topic: str,
+        callback: Callable[[List[Dict[str, Any]]], None],
+        batch_size: int = 100,
+        max_wait_ms: float = 50.0,
+        **kwargs: Any,
+    ) -> str:
+        """Subscribe to Redis Stream and deliver messages in batches"""
+        if not self._client:
+            raise ConnectionError("Not connected to Redis")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        subscription_id = str(uuid.uuid4())
+
+        try:
+            try:
+                self._client.xgroup_create(topic, self.consumer_group, id="0", mkstream=True)
+                logger.info(f"Created consumer group {self.consumer_group} for topic {topic}")
+            except RedisError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+            self._subscriptions[subscription_id] = True
+            self._stats["active_subscriptions"] += 1
+            self._watch_delayed(topic)
+
+            thread = threading.Thread(
+                target=self._consume_batch_loop,
+                args=(topic, subscription_id, callback, batch_size, max(1, int(max_wait_ms))),
+                daemon=True,
+            )
+            thread.start()
+
+            logger.info(f"Subscribed to topic {topic} with ID {subscription_id} (batch_size={batch_size})")
+            return subscription_id
+
+        except RedisError as e:
+            logger.error(f"Failed to subscribe: {e}")
+            self._stats["errors"] += 1
+            raise
+
+    def _consume_batch_loop(
+        self,
+        topic: str,
+        subscription_id: str,
+        callback: Callable[[List[Dict[str, Any]]], None],
+        batch_size: int,
+        block_ms: int,
+    ) -> None:
+        """Consumer loop delivering up to batch_size messages per callback"""
+        cursor = "0"
+        while self._subscriptions.get(subscription_id, False):
+            try:
+                messages, cursor = self._read_group(topic, cursor, batch_size, block_ms)
+
+                if not messages:
+                    continue
+
+                entries: List[Tuple[str, str]] = []
+                payloads = []
+                for stream_name, stream_messages in messages:
+                    for message_id, fields in stream_messages:
+                        try:
+                            payloads.append(json.loads(fields["payload"]))
+                            entries.append((stream_name, message_id))
+                        except Exception as e:
+                            logger.error(f"Error decoding message {message_id}: {e}")
+                            self._stats["errors"] += 1
+                            self._reject(stream_name, message_id, requeue=False)
+
+                if not payloads:
+                    continue
+
+                try:
+                    callback(payloads)
+
+                    for stream_name, message_id in entries:
+                        self._acknowledge(stream_name, message_id)
+                    self._stats["messages_consumed"] += len(payloads)
+
+                except Exception as e:
+                    logger.error(f"Error processing batch of {len(payloads)} messages: {e}")
+                    self._stats["errors"] += 1
+                    for stream_name, message_id in entries:
+                        self._reject(stream_name, message_id, requeue=False)
 
             except RedisError as e:
                 logger.error(f"Consumer error: {e}")
@@ -239,14 +536,30 @@ class RedisQueuePlugin(QueuePlugin):
             logger.info(f"Unsubscribed {subscription_id}")
 
     def acknowledge(self, message_id: str) -> None:
-        """Acknowledge message processing"""
+        """Acknowledge a message taken with get()"""
         if not self._client:
             return
 
-        try:
-            # Extract topic from message_id format: "topic-123-456"
-            topic = message_id.split("-")[0] if "-" in message_id else message_id
+        topic = self._taken.pop(message_id, None)
+        if topic is None:
+            logger.warning(f"Cannot acknowledge message {message_id}: not taken with get()")
+            return
+        self._acknowledge(topic, message_id)
+
+    def reject(self, message_id: str, requeue: bool = True) -> None:
+        """Reject a message taken with get()"""
+        if not self._client:
+            return
 
+        topic = self._taken.pop(message_id, None)
+        if topic is None:
+            logger.warning(f"Cannot reject message {message_id}: not taken with get()")
+            return
+        self._reject(topic, message_id, requeue)
+
+    def _acknowledge(self, topic: str, message_id: str) -> None:
+        """Acknowledge an entry of a stream"""
+        try:
             self._client.xack(topic, self.consumer_group, message_id)
             self._stats["messages_acked"] += 1
             logger.debug(f"Acknowledged message {message_id}")
@@ -255,15 +568,11 @@ class RedisQueuePlugin(QueuePlugin):
             logger.error(f"Failed to acknowledge message: {e}")
             self._stats["errors"] += 1
 
-    def reject(self, message_id: str, requeue: bool = True) -> None:
-        """Reject message"""
-        if not self._client:
-            return
-
+    def _reject(self, topic: str, message_id: str, requeue: bool) -> None:
+        """Reject an entry of a stream"""
         try:
             if not requeue:
                 # Move to dead letter queue
-                topic = message_id.split("-")[0] if "-" in message_id else message_id
                 dlq_topic = f"{topic}:dlq"
 
                 # Get message details
@@ -293,6 +602,33 @@ class RedisQueuePlugin(QueuePlugin):
         except RedisError:
             return 0
 
+    def get_lag(self, topic: str) -> int:
+        """
+        Get the number of entries not yet consumed by the slowest group.
+
+        Uses the group lag reported by Redis >= 7 (entries never delivered)
+        plus entries delivered but not acknowledged. Without consumer groups
+        the whole stream counts as lag.
+        """
+        if not self._client:
+            return 0
+
+        try:
+            groups = self._client.xinfo_groups(topic)
+            if not groups:
+                return self._client.xlen(topic)
+
+            lags = []
+            for group in groups:
+                lag = group.get("lag")
+                if lag is None:
+                    # Redis < 7 does not report undelivered entries
+                    lag = self._client.xlen(topic) if group.get("last-delivered-id") == "0-0" else 0
+                lags.append(lag + group.get("pending", 0))
+            return max(lags)
+        except RedisError:
+            return 0
+
     def purge_queue(self, topic: str) -> int:
         """Delete all messages from stream"""
         if not self._client:
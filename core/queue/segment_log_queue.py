@@ -0,0 +1,439 @@
+"""
+Segment Log Queue Plugin
+
+Durable single-node queue: the in-memory queue with every message appended
+to memory-mapped, fixed-size segment files on local disk. Suited to edge
+collectors that must not lose messages on restart but do not warrant a
+Redis deployment.
+"""
+
+import heapq
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+from urllib.parse import quote, unquote
+
+from core.queue.capacity import TopicCapacity
+from core.queue.in_memory_queue import (
+    InMemoryQueuePlugin,
+    _ConsumerGroup,
+    _PendingAcks,
+    _TopicLog,
+)
+
+logger = logging.getLogger(__name__)
+
+# Record header: payload length, CRC32 of the payload. A zero length marks
+# the end of the written part of a segment (files start zero-filled).
+RECORD_HEADER = struct.Struct("<II")
+SEGMENT_SUFFIX = ".seg"
+OFFSETS_FILE = "offsets.json"
+
+# Shared encoder: json.dumps() builds a new one per call when given options
+_encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+
+
+class _Segment:
+    """A memory-mapped segment file holding consecutive records"""
+
+    __slots__ = ("path", "base", "file", "map", "position", "count")
+
+    def __init__(self, path: Path, base: int, size: int):
+        self.path = path
+        # Offset of the first record
+        self.base = base
+        exists = path.exists()
+        self.file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self.file.truncate(size)
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        # Write position and number of records
+        self.position = 0
+        self.count = 0
+
+    @property
+    def end(self) -> int:
+        """Offset the next record in this segment gets"""
+        return self.base + self.count
+
+    def append(self, records: List[bytes]) -> int:
+        """
+        Write records in order until the segment is full.
+
+        Args:
+            records: Encoded messages
+
+        Returns:
+            Number of records written
+        """
+        frames = []
+        end = self.position
+        for data in records:
+            size = RECORD_HEADER.size + len(data)
+            if end + size > len(self.map):
+                break
+            frames.append(RECORD_HEADER.pack(len(data), zlib.crc32(data)))
+            frames.append(data)
+            end += size
+        # One copy into the mapping for the whole batch
+        self.map[self.position : end] = b"".join(frames)
+        self.position = end
+        self.count += len(frames) // 2
+        return len(frames) // 2
+
+    def recover(self) -> List[Dict[str, Any]]:
+        """
+        Read back the records of an existing segment.
+
+        Records are decoded straight from the mapping. Reading stops at the
+        first empty or corrupt record (a write torn by a crash), which is
+        cleared so later appends overwrite it.
+        """
+        envelopes = []
+        with memoryview(self.map) as view:
+            position = 0
+            while position + RECORD_HEADER.size <= len(view):
+                length, crc = RECORD_HEADER.unpack_from(view, position)
+                start = position + RECORD_HEADER.size
+                end = start + length
+                if length == 0 or end > len(view) or zlib.crc32(view[start:end]) != crc:
+                    break
+                envelopes.append(json.loads(str(view[start:end], "utf-8")))
+                position = end
+
+        header = self.map[position : position + RECORD_HEADER.size]
+        if header.strip(b"\0"):
+            logger.warning(f"Discarding torn record at byte {position} of {self.path}")
+            self.map[position:] = bytes(len(self.map) - position)
+
+        self.position = position
+        self.count = len(envelopes)
+        return envelopes
+
+    def flush(self) -> None:
+        """Write dirty pages to disk"""
+        self.map.flush()
+
+    def close(self) -> None:
+        self.map.flush()
+        self.map.close()
+        self.file.close()
+
+
+class _TopicStore:
+    """Segments and consumer offsets of one topic, guarded by the topic lock"""
+
+    __slots__ = ("directory", "segments", "floor", "outstanding", "heaps", "unsaved")
+
+    def __init__(self, directory: Path, floor: int = 0):
+        self.directory = directory
+        self.segments: List[_Segment] = []
+        # Records below the floor were purged
+        self.floor = floor
+        # Consumer group -> offsets delivered but not yet acknowledged
+        self.outstanding: Dict[str, Set[int]] = {}
+        # Consumer group -> min-heap over outstanding offsets (lazily pruned)
+        self.heaps: Dict[str, List[int]] = {}
+        # Settled deliveries since offsets were last saved
+        self.unsaved = 0
+
+    def committed(self, group: _ConsumerGroup) -> int:
+        """Offset below which the group has settled every message"""
+        outstanding = self.outstanding.get(group.name, ())
+        heap = self.heaps.get(group.name, [])
+        while heap and heap[0] not in outstanding:
+            heapq.heappop(heap)
+        return heap[0] if heap else group.cursor
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+
+class SegmentLogQueuePlugin(InMemoryQueuePlugin):
+    """
+    Durable queue on memory-mapped segment files.
+
+    Every published message is appended to the active segment of its topic
+    (``<data_dir>/<topic>/<first offset>.seg``) before consumers can see
+    it; a new segment is started when the active one is full. Consumer
+    groups commit the offset below which they have acknowledged (or
+    dead-lettered) everything to ``offsets.json``, every
+    ``commit_interval`` settled deliveries and on flush() or disconnect.
+    Segments every group has moved past are deleted.
+
+    On connect() the topics are restored from disk and each group resumes
+    at its committed offset, so messages are delivered at least once
+    across restarts. Consumption itself works like InMemoryQueuePlugin:
+    unread messages are also held in memory and handed to consumers
+    without being read back from disk.
+
+    Without ``fsync``, records reach disk through the page cache: they
+    survive a crash of the process, not of the machine. Delayed messages
+    are persisted when they become due, and the dead letter queue is not
+    persisted.
+
+    Example:
+        >>> queue = SegmentLogQueuePlugin("/var/lib/antifraud/queue")
+        >>> queue.connect()
+        >>> queue.publish("listings.raw", {"listing_id": "123"})
+    """
+
+    def __init__(
+        self,
+        data_dir: Union[str, Path],
+        segment_bytes: int = 16 * 1024 * 1024,
+        commit_interval: int = 1000,
+        fsync: bool = False,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            data_dir: Directory holding one subdirectory per topic
+            segment_bytes: Size of each segment file; bounds the size of a message
+            commit_interval: Settled deliveries per topic between offset commits
+            fsync: Flush segments to disk on every publish
+
+        Raises:
+            ValueError: If segment_bytes or commit_interval is too small
+        """
+        if segment_bytes < 4096:
+            raise ValueError(f"segment_bytes must be at least 4096, got {segment_bytes}")
+        if commit_interval < 1:
+            raise ValueError(f"commit_interval must be positive, got {commit_interval}")
+
+        super().__init__()
+        self.data_dir = Path(data_dir)
+        self.segment_bytes = segment_bytes
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self._stores: Dict[str, _TopicStore] = {}
+
+    def connect(self) -> None:
+        """Restore topics and consumer offsets from disk"""
+        if self._connected:
+            logger.warning("Already connected")
+            return
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._topics = {}
+            self._stores = {}
+            self._pending_acks = _PendingAcks()
+            for directory in sorted(path for path in self.data_dir.iterdir() if path.is_dir()):
+                self._restore(directory)
+
+        messages = sum(len(log.entries) for log in self._topics.values())
+        logger.info(f"Restored {len(self._topics)} topics with {messages} unconsumed messages from {self.data_dir}")
+        super().connect()
+
+    def disconnect(self) -> None:
+        """Stop workers, commit offsets and close segments"""
+        if not self._connected:
+            return
+
+        super().disconnect()
+        self.flush()
+        with self._lock:
+            for topic, store in self._stores.items():
+                with self._topics[topic].lock:
+                    store.close()
+            self._stores = {}
+
+    def flush(self) -> None:
+        """Commit consumer offsets, delete consumed segments and write dirty pages to disk"""
+        with self._lock:
+            topics = [(topic, self._topics[topic]) for topic in self._stores if topic in self._topics]
+        for topic, log in topics:
+            with log.lock:
+                store = self._stores.get(topic)
+                if store is None or log.deleted:
+                    continue
+                self._commit(log, store)
+                for segment in store.segments:
+                    segment.flush()
+
+    def _directory(self, topic: str) -> Path:
+        return self.data_dir / quote(topic, safe="")
+
+    def _restore(self, directory: Path) -> None:
+        """Rebuild a topic's log from its segments and offsets (caller holds the registry lock)"""
+        topic = unquote(directory.name)
+        offsets_path = directory / OFFSETS_FILE
+        offsets = json.loads(offsets_path.read_text()) if offsets_path.exists() else {}
+        store = _TopicStore(directory, offsets.get("floor", 0))
+
+        envelopes: List[Dict[str, Any]] = []
+        paths = sorted(directory.glob(f"*{SEGMENT_SUFFIX}"), key=lambda path: int(path.stem))
+        for path in paths:
+            segment = _Segment(path, int(path.stem), self.segment_bytes)
+            if store.segments and segment.base != store.segments[-1].end:
+                logger.error(f"Segment {path} does not follow offset {store.segments[-1].end}, ignoring the rest")
+                segment.close()
+                break
+            envelopes.extend(segment.recover())
+            store.segments.append(segment)
+
+        tail = store.segments[-1].end if store.segments else store.floor
+        first = store.segments[0].base if store.segments else store.floor
+        groups: Dict[str, int] = offsets.get("groups", {})
+        low = min(groups.values()) if groups else store.floor
+        low = min(max(low, store.floor, first), tail)
+
+        log = self._new_log(topic)
+        log.base = low
+        log.extend(envelopes[low - first :])
+        for name, committed in groups.items():
+            log.groups[name] = _ConsumerGroup(name, min(max(committed, low), tail), log.lock)
+
+        self._topics[topic] = log
+        self._stores[topic] = store
+
+    def _store(self, topic: str, log: _TopicLog, envelopes: List[Dict[str, Any]]) -> None:
+        """Append messages to the topic's segments (caller holds the topic lock)"""
+        for index, envelope in enumerate(envelopes):
+            envelope["offset"] = log.tail + index
+        records = [_encode(envelope).encode() for envelope in envelopes]
+
+        # Reject oversized messages before anything is written
+        capacity = self.segment_bytes - RECORD_HEADER.size
+        for record in records:
+            if len(record) > capacity:
+                raise ValueError(f"Message of {len(record)} bytes exceeds the segment capacity of {capacity} bytes")
+
+        store = self._stores.get(topic)
+        if store is None:
+            directory = self._directory(topic)
+            directory.mkdir(parents=True, exist_ok=True)
+            store = self._stores[topic] = _TopicStore(directory, log.tail)
+
+        touched = []
+        written = 0
+        while written < len(records):
+            active = store.segments[-1] if store.segments else None
+            count = active.append(records[written:]) if active is not None else 0
+            if count == 0:
+                base = active.end if active is not None else log.tail
+                active = _Segment(store.directory / f"{base:020d}{SEGMENT_SUFFIX}", base, self.segment_bytes)
+                store.segments.append(active)
+                continue
+            written += count
+            touched.append(active)
+
+        if self.fsync:
+            for segment in touched:
+                segment.flush()
+
+    def _take(self, log: _TopicLog, group: _ConsumerGroup, limit: int) -> List[Dict[str, Any]]:
+        batch = super()._take(log, group, limit)
+        store = self._stores.get(batch[0]["topic"]) if batch else None
+        if store is not None:
+            outstanding = store.outstanding.setdefault(group.name, set())
+            heap = store.heaps.setdefault(group.name, [])
+            for envelope in batch:
+                if envelope["offset"] not in outstanding:
+                    outstanding.add(envelope["offset"])
+                    heapq.heappush(heap, envelope["offset"])
+        return batch
+
+    def _settled(self, group: str, envelope: Dict[str, Any]) -> None:
+        topic = envelope["topic"]
+        log = self._topics.get(topic)
+        if log is None:
+            return
+        with log.lock:
+            store = self._stores.get(topic)
+            if store is None or log.deleted:
+                return
+            store.outstanding.get(group, set()).discard(envelope["offset"])
+            store.unsaved += 1
+            if store.unsaved >= self.commit_interval:
+                self._commit(log, store)
+
+    def _commit(self, log: _TopicLog, store: _TopicStore) -> None:
+        """Save committed offsets and delete segments no group needs (caller holds the topic lock)"""
+        groups = {name: store.committed(group) for name, group in log.groups.items()}
+        path = store.directory / OFFSETS_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"floor": store.floor, "groups": groups}))
+        os.replace(tmp, path)
+        store.unsaved = 0
+
+        # Without groups, messages are kept until the first consumer arrives
+        low = max(min(groups.values()), store.floor) if groups else store.floor
+        while len(store.segments) > 1 and store.segments[0].end <= low:
+            segment = store.segments.pop(0)
+            segment.close()
+            segment.path.unlink()
+            logger.debug(f"Deleted consumed segment {segment.path}")
+
+    def _purge(self, topic: str, log: _TopicLog) -> int:
+        count = super()._purge(topic, log)
+        store = self._stores.get(topic)
+        if store is not None:
+            store.floor = log.tail
+            store.outstanding.clear()
+            store.heaps.clear()
+            for segment in store.segments:
+                segment.close()
+                segment.path.unlink()
+            store.segments = []
+            self._commit(log, store)
+        return count
+
+    def delete_topic(self, topic: str) -> None:
+        """Delete a topic with its messages, consumer groups and files"""
+        # Held throughout so a publisher cannot recreate the topic before its files are gone
+        with self._lock:
+            super().delete_topic(topic)
+            store = self._stores.pop(topic, None)
+            if store is not None:
+                store.close()
+            shutil.rmtree(self._directory(topic), ignore_errors=True)
+
+    def create_topic(self, topic: str, capacity: Optional[TopicCapacity] = None, **kwargs: Any) -> None:
+        """Create a new topic"""
+        super().create_topic(topic, capacity=capacity, **kwargs)
+        self._directory(topic).mkdir(parents=True, exist_ok=True)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get queue statistics, including segment usage"""
+        stats = super().get_statistics()
+        with self._lock:
+            segments = [segment for store in self._stores.values() for segment in store.segments]
+        stats["segments"] = len(segments)
+        stats["segment_bytes_used"] = sum(segment.position for segment in segments)
+        return stats
+
+    def health_check(self) -> Dict[str, Any]:
+        """Perform health check"""
+        health = super().health_check()
+        health["details"]["data_dir"] = str(self.data_dir)
+        return health
+
+    def get_committed_offsets(self, topic: str) -> Dict[str, int]:
+        """
+        Get the offsets consumer groups would resume at after a restart.
+
+        Args:
+            topic: Topic name
+
+        Returns:
+            Consumer group -> offset below which every message is settled
+        """
+        log = self._topics.get(topic)
+        if log is None:
+            return {}
+        with log.lock:
+            store: Optional[_TopicStore] = self._stores.get(topic)
+            if store is None:
+                return {name: group.cursor for name, group in log.groups.items()}
+            return {name: store.committed(group) for name, group in log.groups.items()}
@@ -0,0 +1,145 @@
+"""
+Timer Wheel
+
+Hashed timing wheel used by the in-memory queue to deliver delayed
+messages. Scheduling and expiry are O(1) per timer regardless of how many
+timers are pending; delays are rounded up to the tick resolution.
+"""
+
+import logging
+import math
+import threading
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TimerWheel:
+    """
+    Hashed timing wheel running callbacks after a delay.
+
+    Time is divided into ticks of ``tick_ms``; a timer due at tick ``t`` is
+    stored in slot ``t % wheel_size``. A single background thread advances
+    the wheel and fires due timers. Timers further away than one revolution
+    share slots with nearer ones and are skipped until their tick comes.
+
+    Example:
+        >>> wheel = TimerWheel(tick_ms=10)
+        >>> wheel.schedule(250, lambda: print("fired"))
+        >>> wheel.stop()
+    """
+
+    def __init__(self, tick_ms: float = 10.0, wheel_size: int = 512):
+        """
+        Initialize timer wheel.
+
+        Args:
+            tick_ms: Timer resolution in milliseconds
+            wheel_size: Number of slots (one revolution covers tick_ms * wheel_size)
+        """
+        if tick_ms <= 0:
+            raise ValueError(f"tick_ms must be positive, got {tick_ms}")
+        if wheel_size < 1:
+            raise ValueError(f"wheel_size must be positive, got {wheel_size}")
+
+        self.tick_ms = tick_ms
+        self.wheel_size = wheel_size
+
+        # Each slot holds [due_tick, callback] entries
+        self._slots: List[List[list]] = [[] for _ in range(wheel_size)]
+        self._origin = time.monotonic()
+        self._tick = 0
+        self._pending = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def _now_tick(self) -> int:
+        return int((time.monotonic() - self._origin) * 1000 / self.tick_ms)
+
+    def schedule(self, delay_ms: float, callback: Callable[[], None]) -> None:
+        """
+        Run ``callback`` after ``delay_ms`` milliseconds.
+
+        Args:
+            delay_ms: Delay in milliseconds (rounded up to a whole tick)
+            callback: Function called from the wheel thread
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Timer wheel is stopped")
+
+            due_tick = self._now_tick() + max(1, math.ceil(delay_ms / self.tick_ms))
+            # The wheel may lag behind the clock; never schedule into a slot already passed
+            due_tick = max(due_tick, self._tick + 1)
+            self._slots[due_tick % self.wheel_size].append([due_tick, callback])
+            self._pending += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="timer-wheel")
+                self._thread.start()
+            self._condition.notify()
+
+    def _expire(self, now_tick: int) -> List[Callable[[], None]]:
+        """Advance the wheel to ``now_tick`` and collect due callbacks"""
+        due: List[Callable[[], None]] = []
+        # Visiting every slot once covers any gap longer than a revolution
+        steps = min(now_tick - self._tick, self.wheel_size)
+        for offset in range(1, steps + 1):
+            slot = self._slots[(self._tick + offset) % self.wheel_size]
+            if not slot:
+                continue
+            remaining = []
+            for entry in slot:
+                if entry[0] <= now_tick:
+                    due.append(entry[1])
+                else:
+                    remaining.append(entry)
+            slot[:] = remaining
+        self._tick = max(self._tick, now_tick)
+        self._pending -= len(due)
+        return due
+
+    def _run(self) -> None:
+        """Wheel thread: sleep until the next tick and fire due timers"""
+        while True:
+            with self._condition:
+                while self._pending == 0 and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                due = self._expire(self._now_tick())
+                if not due:
+                    self._condition.wait(timeout=self.tick_ms / 1000)
+
+            for callback in due:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Timer callback failed: {e}")
+
+    def __len__(self) -> int:
+        """Number of pending timers"""
+        with self._condition:
+            return self._pending
+
+    def stop(self) -> int:
+        """
+        Stop the wheel thread, dropping pending timers.
+
+        Returns:
+            Number of timers dropped
+        """
+        with self._condition:
+            self._stopped = True
+            dropped = self._pending
+            self._slots = [[] for _ in range(self.wheel_size)]
+            self._pending = 0
+            self._condition.notify_all()
+            thread = self._thread
+            self._thread = None
+
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        return dropped
@@ -0,0 +1,102 @@
+"""
+Replay a captured event log through live and candidate detection plugins.
+
+Compares candidate plugin versions (e.g. before a hot reload) against the
+live ones on recorded traffic: per-plugin latency distributions, plugin
+score deltas and fraud score / risk level changes.
+
+Capture events with ``core.fraud.replay.EventLogRecorder`` subscribed to
+``listings.processed``.
+
+Usage:
+    python scripts/replay_plugins.py events.jsonl --plugins-dir plugins \\
+        --candidate candidates/price-anomaly/plugin.yaml
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.fraud.aggregation import load_aggregator  # noqa: E402
+from core.fraud.replay import load_event_log, replay  # noqa: E402
+from core.plugin_manager import PluginManager  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("event_log", type=Path, help="JSON Lines event log")
+    parser.add_argument("--plugins-dir", type=Path, default=Path("plugins"), help="Live detection plugins")
+    parser.add_argument(
+        "--candidate",
+        type=Path,
+        action="append",
+        required=True,
+        help="Manifest of a candidate plugin version (repeatable); compared with the live plugin of the same ID",
+    )
+    parser.add_argument("--aggregation", type=Path, help="Aggregation config used in production")
+    parser.add_argument("--limit", type=int, help="Replay at most this many listings")
+    parser.add_argument("--json", type=Path, help="Also write the full report as JSON")
+    return parser.parse_args()
+
+
+def load_detection_plugins(manager: PluginManager, **kwargs) -> dict:
+    """Load plugins into a manager and return detection plugins by ID"""
+    _, failed = manager.load_plugins(**kwargs)
+    for path, error in failed:
+        print(f"⚠️  Failed to load {path}: {error}")
+    return {plugin.plugin_id: plugin for plugin in manager.get_detection_plugins(enabled_only=False)}
+
+
+def main() -> int:
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    live = load_detection_plugins(PluginManager(), plugins_dir=args.plugins_dir)
+    # Candidates share IDs with live plugins, so they get a manager of their own
+    candidates = load_detection_plugins(PluginManager(), manifest_paths=args.candidate)
+    unknown = sorted(set(candidates) - set(live))
+    if not candidates or unknown:
+        print(f"❌ Candidates must be detection plugins replacing live ones (unknown: {unknown})")
+        return 1
+
+    listings = load_event_log(args.event_log, limit=args.limit)
+    if not listings:
+        print(f"❌ No listings in {args.event_log}")
+        return 1
+
+    aggregator = load_aggregator(args.aggregation) if args.aggregation else None
+    report = asyncio.run(replay(listings, list(live.values()), candidates, aggregator=aggregator))
+
+    print(f"📼 Replayed {len(listings)} listings through {len(live)} live plugins\n")
+    for plugin_id, stats in report.items():
+        live_ms, shadow_ms = stats["latency_ms"]["live"], stats["latency_ms"]["shadow"]
+        print(f"🔌 {plugin_id} → {stats['candidate_version']}  ({stats['sampled']} listings, {stats['errors']} errors)")
+        print(f"   {'latency ms':<12} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+        for name, summary in (("live", live_ms), ("candidate", shadow_ms)):
+            print(
+                f"   {name:<12} {summary['p50']:>9.3f} {summary['p95']:>9.3f} "
+                f"{summary['p99']:>9.3f} {summary['max']:>9.3f}"
+            )
+        delta, overall = stats["score_delta"], stats["overall_delta"]
+        print(
+            f"   score delta: mean {delta['mean']:+.4f}, mean |Δ| {stats['mean_abs_score_delta']:.4f}, "
+            f"range [{delta['min']:+.4f}, {delta['max']:+.4f}]"
+        )
+        print(
+            f"   fraud score delta: mean {overall['mean']:+.2f}, range [{overall['min']:+.2f}, {overall['max']:+.2f}], "
+            f"risk level changes: {stats['risk_level_changes']}\n"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"✅ Wrote report to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Integration tests for AsyncProcessingOrchestrator.
+
+Tests the asyncio pipeline flow including:
+- Awaiting async plugins and offloading sync plugins
+- Inline fraud scoring of processed listings
+- Bounded in-flight concurrency
+- End-to-end consumption from the in-memory queue
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult, RiskSignal
+from core.interfaces.processing_plugin import ProcessingPlugin
+from core.models.events import Topics
+from core.models.plugin import PluginMetadata
+from core.pipeline.async_orchestrator import AsyncProcessingOrchestrator
+from core.plugin_manager import PluginManager
+from core.queue.in_memory_queue import InMemoryQueuePlugin
+from tests.integration.test_orchestrator import _raw_event
+
+pytestmark = [pytest.mark.integration, pytest.mark.messaging, pytest.mark.plugins]
+
+
+class SyncPlugin(ProcessingPlugin):
+    """Blocking processing plugin recording the thread it ran on"""
+
+    def __init__(self, name: str, priority: int):
+        self.name = name
+        self.priority = priority
+        self.threads = []
+
+    def get_metadata(self):
+        return {"name": self.name, "type": "processing"}
+
+    def process(self, listing):
+        self.threads.append(threading.current_thread().name)
+        listing = dict(listing)
+        listing.setdefault("order", []).append(self.name)
+        return listing
+
+    def get_priority(self):
+        return self.priority
+
+
+class AsyncPlugin(SyncPlugin):
+    """Non-blocking processing plugin tracking concurrent calls"""
+
+    def __init__(self, name: str, priority: int, delay: float = 0.0):
+        super().__init__(name, priority)
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    def process(self, listing):
+        raise AssertionError("process_async() should be used")
+
+    async def process_async(self, listing):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        listing = dict(listing)
+        listing.setdefault("order", []).append(self.name)
+        return listing
+
+
+class PriceDetectionPlugin(DetectionPlugin):
+    """Detection plugin flagging every listing with a fixed score"""
+
+    def __init__(self, score: float):
+        self.score = score
+
+    def get_metadata(self):
+        return {"id": "price-check", "name": "Price Check", "version": "1.0.0", "description": "test"}
+
+    async def analyze(self, listing):
+        signal = RiskSignal(signal_type="price_anomaly", score=self.score, confidence=0.9, reason="test")
+        return DetectionResult(
+            plugin_id="price-check", signals=[signal], overall_score=self.score, processing_time_ms=1
+        )
+
+    def get_weight(self):
+        return 1.0
+
+
+@pytest.fixture
+def queue():
+    """Create an in-memory queue for testing"""
+    q = InMemoryQueuePlugin()
+    q.connect()
+    q.create_topic(Topics.RAW_LISTINGS)
+    q.create_topic(Topics.PROCESSED_LISTINGS)
+    q.create_topic(Topics.PROCESSING_FAILED)
+    yield q
+    q.disconnect()
+
+
+@pytest.fixture
+def plugin_manager():
+    """Create a plugin manager for testing"""
+    return PluginManager()
+
+
+def _register(manager: PluginManager, plugin_id: str, instance: ProcessingPlugin) -> None:
+    manager._instances[plugin_id] = instance
+    manager.register(PluginMetadata(id=plugin_id, name=plugin_id, version="1.0.0", type="processing", enabled=True))
+
+
+class TestAsyncPipeline:
+    """Test plugin execution on the event loop"""
+
+    def test_invalid_max_in_flight(self, plugin_manager, queue):
+        """Test max_in_flight must be positive"""
+        with pytest.raises(ValueError):
+            AsyncProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, max_in_flight=0)
+
+    async def test_async_and_sync_plugins(self, plugin_manager, queue):
+        """Test async plugins are awaited and sync plugins run in the executor"""
+        sync_plugin = SyncPlugin("sync", 1)
+        async_plugin = AsyncPlugin("async", 2)
+        _register(plugin_manager, "sync", sync_plugin)
+        _register(plugin_manager, "async", async_plugin)
+
+        orch = AsyncProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+        processed = await orch.process_message(_raw_event({"id": 1}).to_dict())
+
+        assert processed is not None
+        assert processed.listing_data["order"] == ["sync", "async"]
+        assert processed.processing_stages == ["sync", "async"]
+        assert sync_plugin.threads and sync_plugin.threads[0] != threading.current_thread().name
+        assert orch.get_statistics()["events_processed"] == 1
+
+    async def test_fraud_scoring_inline(self, plugin_manager, queue):
+        """Test processed events carry the fraud score"""
+        _register(plugin_manager, "sync", SyncPlugin("sync", 1))
+        risk = RiskScoringOrchestrator([PriceDetectionPlugin(0.8)])
+
+        orch = AsyncProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, risk_orchestrator=risk)
+        processed = await orch.process_message(_raw_event({"id": 1}).to_dict())
+
+        assert processed.fraud_score == pytest.approx(80.0)
+        assert processed.fraud_signals == ["price_anomaly"]
+        assert processed.risk_level == "fraud"
+        assert orch.get_statistics()["events_scored"] == 1
+
+    async def test_copy_on_write_views_scored_as_dicts(self, plugin_manager, queue):
+        """Test detection plugins receive a plain dict when plugins got views"""
+        received = []
+
+        class RecordingDetectionPlugin(PriceDetectionPlugin):
+            async def analyze(self, listing):
+                received.append(listing)
+                return await super().analyze(listing)
+
+        _register(plugin_manager, "sync", SyncPlugin("sync", 1))
+        risk = RiskScoringOrchestrator([RecordingDetectionPlugin(0.8)])
+
+        orch = AsyncProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, risk_orchestrator=risk, copy_on_write=True
+        )
+        processed = await orch.process_message(_raw_event({"id": 1}).to_dict())
+
+        assert type(received[0]) is dict
+        assert received[0]["order"] == ["sync"]
+        assert processed.listing_data == {"id": 1, "order": ["sync"]}
+
+    async def test_parallel_stage_gathered(self, plugin_manager, queue):
+        """Test independent async plugins of a stage run concurrently"""
+
+        class FieldPlugin(AsyncPlugin):
+            def __init__(self, name, priority, field):
+                super().__init__(name, priority, delay=0.1)
+                self.field = field
+
+            def get_reads(self):
+                return []
+
+            def get_writes(self):
+                return [self.field]
+
+            async def process_async(self, listing):
+                await asyncio.sleep(self.delay)
+                return {**listing, self.field: self.name}
+
+        _register(plugin_manager, "a", FieldPlugin("a", 1, "geo"))
+        _register(plugin_manager, "b", FieldPlugin("b", 2, "price"))
+
+        orch = AsyncProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, enable_parallel=True)
+        start = time.time()
+        processed = await orch.process_message(_raw_event({"id": 1}).to_dict())
+
+        assert time.time() - start < 0.19
+        assert processed.listing_data["geo"] == "a"
+        assert processed.listing_data["price"] == "b"
+
+    async def test_async_plugin_cancelled_after_budget(self, plugin_manager, queue):
+        """Test process_async() calls exceeding the budget are cancelled and skipped later"""
+        slow = AsyncPlugin("slow", 1, delay=1.0)
+        _register(plugin_manager, "slow", slow)
+        _register(plugin_manager, "sync", SyncPlugin("sync", 2))
+
+        orch = AsyncProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, plugin_timeout_ms=50, breaker_failure_threshold=1
+        )
+        start = time.time()
+        first = await orch.process_message(_raw_event({"id": 1}).to_dict())
+        second = await orch.process_message(_raw_event({"id": 2}).to_dict())
+
+        assert time.time() - start < 0.5
+        assert first.processing_stages == ["sync"]
+        assert second.processing_stages == ["sync"]
+        assert slow.active == 0  # Cancelled, not left running
+        assert orch.get_statistics()["plugins_skipped"] == 1
+
+    async def test_invalid_message_handled(self, plugin_manager, queue):
+        """Test unparseable events are routed to failure handling"""
+        orch = AsyncProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+        assert await orch.process_message({"invalid": "format"}) is None
+
+
+class TestAsyncConsumption:
+    """Test queue consumption through the event loop"""
+
+    def test_end_to_end_with_bounded_in_flight(self, plugin_manager, queue):
+        """Test events flow through the queue with at most max_in_flight in progress"""
+        plugin = AsyncPlugin("slow", 1, delay=0.05)
+        _register(plugin_manager, "slow", plugin)
+
+        published = []
+        queue.subscribe(Topics.PROCESSED_LISTINGS, published.append)
+
+        orch = AsyncProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, max_in_flight=2)
+        orch.start()
+        try:
+            for i in range(6):
+                queue.publish(Topics.RAW_LISTINGS, _raw_event({"id": i}).to_dict())
+
+            deadline = time.time() + 5
+            while len(published) < 6 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            orch.stop()
+
+        assert len(published) == 6
+        assert plugin.max_active <= 2
+        assert not orch.is_running()
+
+    def test_acknowledged_after_processing(self, plugin_manager, queue):
+        """Test raw events stay unacknowledged until processing finished"""
+        plugin = AsyncPlugin("slow", 1, delay=0.3)
+        _register(plugin_manager, "slow", plugin)
+
+        orch = AsyncProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, max_in_flight=2)
+        orch.start()
+        try:
+            queue.publish(Topics.RAW_LISTINGS, _raw_event({"id": 1}).to_dict())
+
+            deadline = time.time() + 5
+            while plugin.active == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            assert plugin.active == 1
+            assert queue.get_statistics()["pending_acks"] == 1
+
+            while queue.get_statistics()["pending_acks"] and time.time() < deadline:
+                time.sleep(0.01)
+            assert orch.get_statistics()["events_processed"] == 1
+        finally:
+            orch.stop()
@@ -8,8 +8,8 @@ Tests the full pipeline flow including:
 - Statistics tracking
 """
 
+import threading
 import time
-from datetime import datetime, timezone
 
 import pytest
 
@@ -22,7 +22,9 @@ from core.models.events import (
     Topics,
 )
 from core.models.plugin import PluginMetadata
+from core.pipeline.listing_view import ListingView
 from core.pipeline.orchestrator import ProcessingOrchestrator
+from core.pipeline.retry import RetryPolicy
 from core.plugin_manager import PluginManager
 from core.queue.in_memory_queue import InMemoryQueuePlugin
 
@@ -395,6 +397,108 @@ class TestRetryLogic:
             orchestrator.stop()
 
 
+class TestDelayedRetry:
+    """Test failed events are retried with backoff on the retry lane"""
+
+    def _event(self, retry_count=0):
+        return RawListingEvent(
+            metadata=EventMetadata(
+                event_type=EventType.RAW_LISTING,
+                source_plugin_id="test-source",
+                source_platform="test-platform",
+                retry_count=retry_count,
+            ),
+            raw_data={"listing_id": "retry-001"},
+        )
+
+    def test_failure_scheduled_with_backoff(self, plugin_manager, queue):
+        """Test a failed event is delayed on the retry lane instead of requeued"""
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager,
+            queue=queue,
+            retry_policy=RetryPolicy(base_delay_ms=400, multiplier=2.0, jitter=0.0),
+        )
+
+        orchestrator._handle_processing_failure(self._event(retry_count=1).to_dict(), "Dependency down")
+
+        # Second retry waits 800ms
+        time.sleep(0.3)
+        assert queue.get_queue_size(Topics.RAW_LISTINGS) == 0
+        assert queue.get_queue_size(Topics.RETRY_LISTINGS) == 0
+        assert queue.get_statistics()["delayed_messages"] == 1
+
+        time.sleep(0.7)
+        assert queue.get_queue_size(Topics.RETRY_LISTINGS) == 1
+        retried = queue.get(Topics.RETRY_LISTINGS, timeout=0)["payload"]
+        assert retried["metadata"]["retry_count"] == 2
+        assert retried["metadata"]["status"] == EventStatus.RETRY
+        assert orchestrator.get_statistics()["events_retried"] == 1
+
+    def test_retry_lane_processes_event(self, plugin_manager, queue, monkeypatch):
+        """Test a retried event is consumed from the retry lane and completes"""
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager,
+            queue=queue,
+            retry_policy=RetryPolicy(base_delay_ms=50, jitter=0.0),
+        )
+        execute = orchestrator._execute_pipeline
+        attempts = []
+
+        def fail_once(event):
+            attempts.append(event.metadata.retry_count)
+            if len(attempts) == 1:
+                raise RuntimeError("Dependency down")
+            return execute(event)
+
+        monkeypatch.setattr(orchestrator, "_execute_pipeline", fail_once)
+        processed = []
+        queue.subscribe(Topics.PROCESSED_LISTINGS, lambda msg: processed.append(msg))
+
+        try:
+            orchestrator.start()
+            queue.publish(Topics.RAW_LISTINGS, self._event().to_dict())
+            time.sleep(0.6)
+        finally:
+            orchestrator.stop()
+
+        assert attempts == [0, 1]
+        assert len(processed) == 1
+
+    def test_retries_yield_to_ingest(self, plugin_manager, queue):
+        """Test due retries wait while raw events are queued, up to the deferral limit"""
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, retry_max_defer_ms=150)
+        orchestrator._running = True
+
+        start = time.time()
+        orchestrator._yield_to_ingest()
+        assert time.time() - start < 0.05
+
+        queue.publish(Topics.RAW_LISTINGS, self._event().to_dict())
+        start = time.time()
+        orchestrator._yield_to_ingest()
+        assert time.time() - start >= 0.15
+
+    def test_retries_resume_when_ingest_drains(self, plugin_manager, queue):
+        """Test a deferred retry is woken by the input consumer instead of waiting out the limit"""
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, retry_max_defer_ms=5000)
+        orchestrator._running = True
+        queue.publish(Topics.RAW_LISTINGS, self._event().to_dict())
+
+        def consume() -> None:
+            time.sleep(0.05)
+            queue.acknowledge(queue.get(Topics.RAW_LISTINGS, timeout=0)["message_id"])
+            orchestrator._notify_ingest()
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        start = time.time()
+        orchestrator._yield_to_ingest()
+        elapsed = time.time() - start
+        consumer.join()
+
+        assert 0.05 <= elapsed < 1.0
+
+
 class TestPluginExecution:
     """Test plugin execution order and coordination"""
 
@@ -472,6 +576,677 @@ class TestPluginExecution:
         assert isinstance(plugins, list)
 
 
+class CountingProcessingPlugin(ProcessingPlugin):
+    """Processing plugin that counts how often the orchestrator inspects it"""
+
+    def __init__(self, name: str, priority: int):
+        self.name = name
+        self.priority = priority
+        self.priority_calls = 0
+        self.metadata_calls = 0
+
+    def get_metadata(self):
+        self.metadata_calls += 1
+        return {"name": self.name, "type": "processing"}
+
+    def process(self, listing):
+        listing = dict(listing)
+        listing.setdefault("order", []).append(self.name)
+        return listing
+
+    def get_priority(self):
+        self.priority_calls += 1
+        return self.priority
+
+
+def _register_processing_plugin(manager: PluginManager, plugin_id: str, instance: ProcessingPlugin) -> None:
+    manager._instances[plugin_id] = instance
+    manager.register(PluginMetadata(id=plugin_id, name=plugin_id, version="1.0.0", type="processing", enabled=True))
+
+
+def _raw_event(raw_data):
+    return RawListingEvent(
+        metadata=EventMetadata(
+            event_type=EventType.RAW_LISTING,
+            source_plugin_id="test-source",
+            source_platform="test-platform",
+        ),
+        raw_data=raw_data,
+    )
+
+
+class TestPluginChainCaching:
+    """Test compiled plugin chain reuse and invalidation"""
+
+    def test_chain_compiled_once_and_sorted(self, plugin_manager, queue):
+        """Test plugins are sorted once, not on every event"""
+        late = CountingProcessingPlugin("late", priority=20)
+        early = CountingProcessingPlugin("early", priority=5)
+        _register_processing_plugin(plugin_manager, "plugin-late", late)
+        _register_processing_plugin(plugin_manager, "plugin-early", early)
+
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+
+        for i in range(5):
+            result = orchestrator._execute_pipeline(_raw_event({"id": i}))
+            assert result["listing_data"]["order"] == ["early", "late"]
+            assert result["plugins"] == ["early", "late"]
+
+        assert early.priority_calls == 1
+        assert late.priority_calls == 1
+        assert early.metadata_calls == 1
+
+    def test_chain_recompiled_on_plugin_change(self, plugin_manager, queue):
+        """Test disabling, enabling and removing plugins swaps the chain"""
+        first = CountingProcessingPlugin("first", priority=1)
+        second = CountingProcessingPlugin("second", priority=2)
+        _register_processing_plugin(plugin_manager, "plugin-first", first)
+        _register_processing_plugin(plugin_manager, "plugin-second", second)
+
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+        chain = orchestrator._get_plugin_chain()
+        assert chain.names == ("first", "second")
+        assert orchestrator._get_plugin_chain() is chain
+
+        plugin_manager.disable("plugin-first")
+        assert orchestrator._get_plugin_chain().names == ("second",)
+
+        plugin_manager.enable("plugin-first")
+        assert orchestrator._get_plugin_chain().names == ("first", "second")
+
+        plugin_manager.remove("plugin-second")
+        assert orchestrator._get_plugin_chain().names == ("first",)
+
+    def test_chain_is_immutable(self, plugin_manager, queue):
+        """Test callers cannot mutate the shared chain"""
+        _register_processing_plugin(plugin_manager, "plugin-a", CountingProcessingPlugin("a", priority=1))
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+
+        plugins = orchestrator._get_processing_plugins()
+        plugins.clear()
+
+        assert len(orchestrator._get_plugin_chain()) == 1
+
+
+class VectorizedProcessingPlugin(CountingProcessingPlugin):
+    """Processing plugin with a batch hook that can be told to fail"""
+
+    def __init__(self, name: str, priority: int, fail_on=None):
+        super().__init__(name, priority)
+        self.fail_on = fail_on
+        self.batch_calls = 0
+        self.single_calls = 0
+
+    def process(self, listing):
+        self.single_calls += 1
+        if listing.get("id") == self.fail_on:
+            raise ValueError("bad listing")
+        return super().process(listing)
+
+    def process_batch(self, listings):
+        self.batch_calls += 1
+        if any(listing.get("id") == self.fail_on for listing in listings):
+            raise ValueError("bad listing in batch")
+        return [dict(listing, batched=True) for listing in listings]
+
+
+class TestBatchMode:
+    """Test batch consumption mode"""
+
+    def test_invalid_batch_size(self, plugin_manager, queue):
+        """Test batch_size must be positive"""
+        with pytest.raises(ValueError):
+            ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, batch_size=0)
+
+    def test_vectorized_plugin_called_once_per_batch(self, plugin_manager, queue):
+        """Test plugins with process_batch see the whole batch"""
+        plugin = VectorizedProcessingPlugin("vector", priority=1)
+        _register_processing_plugin(plugin_manager, "plugin-vector", plugin)
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, batch_size=10)
+
+        results = orchestrator._execute_pipeline_batch([_raw_event({"id": i}) for i in range(4)])
+
+        assert plugin.batch_calls == 1
+        assert plugin.single_calls == 0
+        assert [r["listing_data"]["batched"] for r in results] == [True] * 4
+        assert all(r["plugins"] == ["vector"] for r in results)
+        assert orchestrator.get_statistics()["plugins_executed"] == 4
+
+    def test_batch_failure_isolated_per_listing(self, plugin_manager, queue):
+        """Test a failing listing does not fail the rest of the batch"""
+        plugin = VectorizedProcessingPlugin("vector", priority=1, fail_on=2)
+        _register_processing_plugin(plugin_manager, "plugin-vector", plugin)
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, batch_size=10)
+
+        results = orchestrator._execute_pipeline_batch([_raw_event({"id": i}) for i in range(4)])
+
+        assert plugin.batch_calls == 1
+        assert plugin.single_calls == 4
+        assert results[2]["plugins"] == []
+        assert results[2]["listing_data"] == {"id": 2}
+        assert [r["plugins"] for i, r in enumerate(results) if i != 2] == [["vector"]] * 3
+
+    def test_non_vectorized_plugin_processed_per_listing(self, plugin_manager, queue):
+        """Test plugins without a batch hook still run once per listing"""
+        plugin = CountingProcessingPlugin("single", priority=1)
+        _register_processing_plugin(plugin_manager, "plugin-single", plugin)
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, batch_size=10)
+
+        results = orchestrator._execute_pipeline_batch([_raw_event({"id": i}) for i in range(3)])
+
+        assert [r["listing_data"]["order"] for r in results] == [["single"]] * 3
+
+    def test_batch_consumption_end_to_end(self, plugin_manager, queue):
+        """Test batches are consumed, processed and bulk published"""
+        _register_processing_plugin(plugin_manager, "plugin-vector", VectorizedProcessingPlugin("vector", 1))
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, batch_size=8, batch_timeout_ms=20
+        )
+
+        processed = []
+        queue.subscribe(Topics.PROCESSED_LISTINGS, lambda msg: processed.append(msg))
+
+        try:
+            orchestrator.start()
+            queue.publish_batch(Topics.RAW_LISTINGS, [_raw_event({"id": i}).to_dict() for i in range(10)])
+
+            deadline = time.time() + 2.0
+            while len(processed) < 10 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            orchestrator.stop()
+
+        assert sorted(msg["listing_data"]["id"] for msg in processed) == list(range(10))
+        assert all(msg["plugins_applied"] == ["vector"] for msg in processed)
+
+        stats = orchestrator.get_statistics()
+        assert stats["events_processed"] == 10
+        assert stats["avg_processing_time_ms"] > 0
+
+    def test_bulk_publish_failure_retries_each_event(self, plugin_manager, queue, monkeypatch):
+        """Test a failed bulk publish sends every event through retry handling"""
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, batch_size=4)
+        retried = []
+        monkeypatch.setattr(orchestrator, "_handle_processing_failure", lambda msg, err: retried.append(msg))
+
+        def failing_publish_batch(topic, messages, **kwargs):
+            raise ConnectionError("queue down")
+
+        monkeypatch.setattr(queue, "publish_batch", failing_publish_batch)
+
+        messages = [_raw_event({"id": i}).to_dict() for i in range(3)]
+        orchestrator._process_raw_batch(messages)
+
+        assert retried == messages
+        assert orchestrator.get_statistics()["events_processed"] == 0
+
+
+class FieldProcessingPlugin(CountingProcessingPlugin):
+    """Processing plugin with declared field access that sleeps while working"""
+
+    def __init__(self, name, priority, reads=None, writes=None, delay=0.0, fail=False):
+        super().__init__(name, priority)
+        self.reads = reads
+        self.writes = writes
+        self.delay = delay
+        self.fail = fail
+
+    def get_reads(self):
+        return self.reads
+
+    def get_writes(self):
+        return self.writes
+
+    def process(self, listing):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("plugin failure")
+        listing = dict(listing)
+        for field in self.writes or []:
+            listing[field] = f"{self.name}:{listing.get('price')}"
+        listing["scratch"] = self.name  # Undeclared write, must not leak in parallel mode
+        return listing
+
+
+class TestParallelExecution:
+    """Test DAG-based concurrent plugin execution"""
+
+    def test_stages_from_declared_fields(self, plugin_manager, queue):
+        """Test independent plugins share a stage and dependents follow"""
+        _register_processing_plugin(
+            plugin_manager, "plugin-geo", FieldProcessingPlugin("geo", 1, reads=["address"], writes=["geo"])
+        )
+        _register_processing_plugin(
+            plugin_manager, "plugin-norm", FieldProcessingPlugin("norm", 2, reads=["price"], writes=["price_norm"])
+        )
+        _register_processing_plugin(
+            plugin_manager, "plugin-score", FieldProcessingPlugin("score", 3, reads=["geo", "price_norm"], writes=[])
+        )
+        _register_processing_plugin(plugin_manager, "plugin-legacy", CountingProcessingPlugin("legacy", 4))
+
+        chain = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)._get_plugin_chain()
+
+        assert [[chain.names[i] for i in stage] for stage in chain.stages] == [
+            ["geo", "norm"],
+            ["score"],
+            ["legacy"],
+        ]
+
+    def test_manifest_capabilities_declare_fields(self, plugin_manager, queue):
+        """Test reads:/writes: capabilities are used when the plugin declares nothing"""
+        for plugin_id, name, caps in [
+            ("plugin-a", "a", ["reads:price", "writes:price_norm"]),
+            ("plugin-b", "b", ["reads:address", "writes:geo", "parallel_safe"]),
+        ]:
+            plugin_manager._instances[plugin_id] = CountingProcessingPlugin(name, priority=1)
+            plugin_manager.register(
+                PluginMetadata(
+                    id=plugin_id, name=name, version="1.0.0", type="processing", enabled=True, capabilities=caps
+                )
+            )
+
+        chain = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)._get_plugin_chain()
+
+        assert len(chain.stages) == 1
+        assert chain.writes[0] == frozenset({"price_norm"})
+
+    def test_writes_only_manifest_reads_every_field(self, plugin_manager, queue):
+        """Test a manifest declaring only writes is not parallelized with writers"""
+        for plugin_id, name, priority, caps in [
+            ("plugin-norm", "norm", 1, ["reads:price", "writes:price_norm"]),
+            ("plugin-tag", "tag", 2, ["writes:tags"]),
+        ]:
+            plugin_manager._instances[plugin_id] = CountingProcessingPlugin(name, priority=priority)
+            plugin_manager.register(
+                PluginMetadata(
+                    id=plugin_id, name=name, version="1.0.0", type="processing", enabled=True, capabilities=caps
+                )
+            )
+
+        chain = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)._get_plugin_chain()
+
+        assert chain.reads[1] is None
+        assert [[chain.names[i] for i in stage] for stage in chain.stages] == [["norm"], ["tag"]]
+
+    def test_parallel_stage_runs_concurrently_and_merges(self, plugin_manager, queue):
+        """Test independent plugins overlap and only declared writes are merged"""
+        _register_processing_plugin(
+            plugin_manager, "plugin-geo", FieldProcessingPlugin("geo", 1, reads=["address"], writes=["geo"], delay=0.2)
+        )
+        _register_processing_plugin(
+            plugin_manager,
+            "plugin-norm",
+            FieldProcessingPlugin("norm", 2, reads=["price"], writes=["price_norm"], delay=0.2),
+        )
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, enable_parallel=True)
+
+        try:
+            start = time.time()
+            result = orchestrator._execute_pipeline(_raw_event({"price": 100, "address": "Moscow"}))
+            elapsed = time.time() - start
+        finally:
+            orchestrator.stop()
+
+        assert elapsed < 0.35
+        assert result["listing_data"] == {"price": 100, "address": "Moscow", "geo": "geo:100", "price_norm": "norm:100"}
+        assert result["plugins"] == ["geo", "norm"]
+        assert set(result["timings"]) == {"geo", "norm"}
+        assert all(duration >= 150 for duration in result["timings"].values())
+
+        stats = orchestrator.get_statistics()
+        assert stats["plugins_executed"] == 2
+        assert set(stats["plugin_time_ms"]) == {"geo", "norm"}
+
+    def test_parallel_stage_failure_skips_plugin(self, plugin_manager, queue):
+        """Test a failing plugin in a parallel stage does not drop the others"""
+        _register_processing_plugin(
+            plugin_manager, "plugin-geo", FieldProcessingPlugin("geo", 1, reads=[], writes=["geo"], fail=True)
+        )
+        _register_processing_plugin(
+            plugin_manager, "plugin-norm", FieldProcessingPlugin("norm", 2, reads=["price"], writes=["price_norm"])
+        )
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, enable_parallel=True)
+
+        result = orchestrator._execute_pipeline(_raw_event({"price": 1}))
+
+        assert result["plugins"] == ["norm"]
+        assert result["listing_data"] == {"price": 1, "price_norm": "norm:1"}
+
+    def test_sequential_mode_ignores_stages(self, plugin_manager, queue):
+        """Test the default mode still runs plugins one after another"""
+        _register_processing_plugin(
+            plugin_manager, "plugin-geo", FieldProcessingPlugin("geo", 1, reads=[], writes=["geo"])
+        )
+        _register_processing_plugin(
+            plugin_manager, "plugin-norm", FieldProcessingPlugin("norm", 2, reads=["price"], writes=["price_norm"])
+        )
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+
+        result = orchestrator._execute_pipeline(_raw_event({"price": 1}))
+
+        assert result["plugins"] == ["geo", "norm"]
+        assert result["listing_data"]["scratch"] == "norm"
+        assert orchestrator._executor is None
+
+
+class InPlaceProcessingPlugin(CountingProcessingPlugin):
+    """Processing plugin writing into the listing it receives"""
+
+    def __init__(self, name, priority, field, value):
+        super().__init__(name, priority)
+        self.field = field
+        self.value = value
+        self.received = []
+
+    def process(self, listing):
+        self.received.append(listing)
+        listing[self.field] = self.value
+        return listing
+
+
+class TestCopyOnWrite:
+    """Test listings flow through the chain as copy-on-write views when enabled"""
+
+    def test_raw_data_not_modified(self, plugin_manager, queue):
+        """Test plugins writing in place never touch the raw event"""
+        first = InPlaceProcessingPlugin("first", 1, "price", 200)
+        _register_processing_plugin(plugin_manager, "first", first)
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, copy_on_write=True)
+        event = _raw_event({"price": 100, "html": "<html/>"})
+
+        result = orchestrator._execute_pipeline(event)
+
+        assert isinstance(first.received[0], ListingView)
+        assert event.raw_data == {"price": 100, "html": "<html/>"}
+        assert result["listing_data"]["price"] == 200
+
+    def test_processed_event_materialized(self, plugin_manager, queue):
+        """Test the published listing is a plain dict with every stage applied"""
+        _register_processing_plugin(plugin_manager, "first", InPlaceProcessingPlugin("first", 1, "a", 1))
+        _register_processing_plugin(plugin_manager, "second", InPlaceProcessingPlugin("second", 2, "b", 2))
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, copy_on_write=True)
+        published = []
+        queue.publish = lambda topic, message, **kwargs: published.append(message)
+
+        orchestrator._process_raw_listing(_raw_event({"price": 100}).to_dict())
+
+        assert published[0]["listing_data"] == {"price": 100, "a": 1, "b": 2}
+        assert published[0]["stage_diffs"] is None
+
+    def test_stage_diffs_recorded(self, plugin_manager, queue):
+        """Test each stage's changes are attached when requested"""
+        _register_processing_plugin(plugin_manager, "first", InPlaceProcessingPlugin("first", 1, "a", 1))
+        _register_processing_plugin(plugin_manager, "second", InPlaceProcessingPlugin("second", 2, "price", 5))
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, copy_on_write=True, record_stage_diffs=True
+        )
+
+        result = orchestrator._execute_pipeline(_raw_event({"price": 100}))
+
+        assert result["stage_diffs"] == [
+            {"stage": "first", "set": {"a": 1}, "deleted": []},
+            {"stage": "second", "set": {"price": 5}, "deleted": []},
+        ]
+
+    def test_stage_diffs_in_batch_mode(self, plugin_manager, queue):
+        """Test batch execution records diffs per listing"""
+        _register_processing_plugin(plugin_manager, "first", InPlaceProcessingPlugin("first", 1, "a", 1))
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, batch_size=2, copy_on_write=True, record_stage_diffs=True
+        )
+
+        results = orchestrator._execute_pipeline_batch([_raw_event({"id": 1}), _raw_event({"id": 2})])
+
+        assert [r["stage_diffs"] for r in results] == [[{"stage": "first", "set": {"a": 1}, "deleted": []}]] * 2
+
+    def test_plain_dicts_by_default(self, plugin_manager, queue):
+        """Test plugins receive plain dicts unless copy-on-write is enabled"""
+        first = InPlaceProcessingPlugin("first", 1, "price", 200)
+        _register_processing_plugin(plugin_manager, "first", first)
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+
+        orchestrator._execute_pipeline(_raw_event({"price": 100}))
+
+        assert type(first.received[0]) is dict
+
+
+class FailingProcessingPlugin(CountingProcessingPlugin):
+    """Processing plugin that always raises"""
+
+    def process(self, listing):
+        raise RuntimeError("boom")
+
+
+class TestLatencyMetrics:
+    """Test per-plugin latency histograms, error counters and profiling"""
+
+    def test_plugin_and_event_latency_recorded(self, plugin_manager, queue):
+        """Test every plugin run and event lands in its histogram"""
+        _register_processing_plugin(plugin_manager, "first", CountingProcessingPlugin("first", 1))
+        _register_processing_plugin(plugin_manager, "broken", FailingProcessingPlugin("broken", 2))
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+
+        for i in range(3):
+            orchestrator._process_raw_listing(_raw_event({"seq": i}).to_dict())
+
+        latency = orchestrator.get_statistics()["latency"]
+        assert latency["event"]["count"] == 3
+        assert latency["plugins"]["first"]["count"] == 3
+        assert set(latency["plugins"]["first"]) >= {"p50", "p95", "p99"}
+        assert "broken" not in latency["plugins"]
+        assert latency["plugin_errors"] == {"broken": 3}
+
+    def test_parallel_stage_latency_recorded(self, plugin_manager, queue):
+        """Test DAG stages with several plugins get their own histogram"""
+        _register_processing_plugin(plugin_manager, "geo", FieldProcessingPlugin("geo", 1, reads=[], writes=["geo"]))
+        _register_processing_plugin(
+            plugin_manager, "price", FieldProcessingPlugin("price", 2, reads=[], writes=["price"])
+        )
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, enable_parallel=True)
+
+        orchestrator._process_raw_listing(_raw_event({"seq": 0}).to_dict())
+        orchestrator.stop()
+
+        assert orchestrator.get_statistics()["latency"]["stages"]["geo+price"]["count"] == 1
+
+    def test_slowest_events_profiled(self, plugin_manager, queue):
+        """Test profiling keeps stacks of the slowest events when enabled"""
+        _register_processing_plugin(plugin_manager, "first", CountingProcessingPlugin("first", 1))
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, profile_slowest=2)
+
+        for i in range(4):
+            orchestrator._process_raw_listing(_raw_event({"seq": i}).to_dict())
+
+        slowest = orchestrator.get_statistics()["slowest_events"]
+        assert len(slowest) == 2
+        assert "_execute_pipeline" in slowest[0]["profile"]
+
+    def test_profiling_disabled_by_default(self, orchestrator):
+        """Test no profiles are collected unless requested"""
+        assert "slowest_events" not in orchestrator.get_statistics()
+
+
+class HangingProcessingPlugin(FieldProcessingPlugin):
+    """Processing plugin declaring a time budget it does not keep"""
+
+    def __init__(self, name, priority, delay, timeout_ms):
+        super().__init__(name, priority, reads=[], writes=[name], delay=delay)
+        self.timeout_ms = timeout_ms
+
+    def get_timeout_ms(self):
+        return self.timeout_ms
+
+
+class TestCircuitBreakers:
+    """Test per-plugin time budgets and circuit breakers"""
+
+    def test_plugin_budget_enforced(self, plugin_manager, queue):
+        """Test a plugin exceeding its budget is abandoned and the listing continues"""
+        _register_processing_plugin(plugin_manager, "slow", HangingProcessingPlugin("slow", 1, 0.5, 50))
+        _register_processing_plugin(plugin_manager, "next", CountingProcessingPlugin("next", 2))
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue)
+
+        start = time.time()
+        result = orchestrator._execute_pipeline(_raw_event({"price": 1}))
+
+        assert time.time() - start < 0.3
+        assert result["plugins"] == ["next"]
+        assert "slow" not in result["listing_data"]
+        assert orchestrator.get_statistics()["latency"]["plugin_errors"] == {"slow": 1}
+
+    def test_default_budget(self, plugin_manager, queue):
+        """Test the orchestrator budget applies to plugins without their own"""
+        _register_processing_plugin(plugin_manager, "slow", FieldProcessingPlugin("slow", 1, delay=0.5))
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, plugin_timeout_ms=50)
+
+        start = time.time()
+        result = orchestrator._execute_pipeline(_raw_event({"price": 1}))
+
+        assert time.time() - start < 0.3
+        assert result["plugins"] == []
+
+    def test_breaker_skips_failing_plugin(self, plugin_manager, queue, caplog):
+        """Test a plugin is skipped after consecutive failures, logging one stack trace"""
+        broken = FailingProcessingPlugin("broken", 1)
+        _register_processing_plugin(plugin_manager, "broken", broken)
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, breaker_failure_threshold=3)
+
+        for i in range(6):
+            orchestrator._execute_pipeline(_raw_event({"seq": i}))
+
+        stats = orchestrator.get_statistics()
+        assert stats["latency"]["plugin_errors"] == {"broken": 3}
+        assert stats["plugins_skipped"] == 3
+        assert sum(1 for record in caplog.records if record.exc_info and "broken" in record.getMessage()) == 2
+
+    def test_breaker_probes_and_recovers(self, plugin_manager, queue):
+        """Test a half-open breaker closes after a successful probe"""
+        flaky = FieldProcessingPlugin("flaky", 1, fail=True)
+        _register_processing_plugin(plugin_manager, "flaky", flaky)
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, breaker_failure_threshold=1, breaker_reset_timeout_s=0.1
+        )
+
+        orchestrator._execute_pipeline(_raw_event({"seq": 1}))
+        assert orchestrator._execute_pipeline(_raw_event({"seq": 2}))["plugins"] == []
+
+        flaky.fail = False
+        time.sleep(0.15)
+
+        assert orchestrator._execute_pipeline(_raw_event({"seq": 3}))["plugins"] == ["flaky"]
+        assert orchestrator._breakers["flaky"].get_status()["state"] == "closed"
+
+    def test_health_degraded_while_breaker_open(self, orchestrator, plugin_manager):
+        """Test open breakers are reported and degrade health"""
+        _register_processing_plugin(plugin_manager, "broken", FailingProcessingPlugin("broken", 1))
+        orchestrator.breaker_failure_threshold = 1
+        orchestrator.start()
+
+        orchestrator._execute_pipeline(_raw_event({"seq": 1}))
+        health = orchestrator.health_check()
+
+        assert health["status"] == "degraded"
+        assert health["circuit_breakers"]["broken"]["state"] == "open"
+        assert health["circuit_breakers"]["broken"]["times_opened"] == 1
+
+    def test_parallel_stage_budget(self, plugin_manager, queue):
+        """Test a slow member of a parallel stage does not hold up the stage"""
+        _register_processing_plugin(plugin_manager, "slow", HangingProcessingPlugin("slow", 1, 0.5, 50))
+        _register_processing_plugin(plugin_manager, "fast", FieldProcessingPlugin("fast", 2, reads=[], writes=["fast"]))
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, enable_parallel=True)
+
+        start = time.time()
+        result = orchestrator._execute_pipeline(_raw_event({"price": 1}))
+
+        assert time.time() - start < 0.3
+        assert result["plugins"] == ["fast"]
+
+    def test_batch_mode_skips_open_plugin(self, plugin_manager, queue):
+        """Test the breaker opens within a batch and skips the remaining listings"""
+        broken = FailingProcessingPlugin("broken", 1)
+        _register_processing_plugin(plugin_manager, "broken", broken)
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, batch_size=5, breaker_failure_threshold=2
+        )
+
+        orchestrator._execute_pipeline_batch([_raw_event({"seq": i}) for i in range(5)])
+
+        stats = orchestrator.get_statistics()
+        assert stats["latency"]["plugin_errors"] == {"broken": 2}
+        assert stats["plugins_skipped"] == 3
+
+    def test_batch_mode_failures_use_breaker_and_metrics(self, plugin_manager, queue):
+        """Test failed process_batch calls count as plugin errors and half-open batches only probe"""
+        plugin = VectorizedProcessingPlugin("vector", priority=1, fail_on=0)
+        _register_processing_plugin(plugin_manager, "vector", plugin)
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager,
+            queue=queue,
+            batch_size=3,
+            breaker_failure_threshold=1,
+            breaker_reset_timeout_s=0.1,
+        )
+
+        orchestrator._execute_pipeline_batch([_raw_event({"id": i}) for i in range(3)])
+        time.sleep(0.15)
+        orchestrator._execute_pipeline_batch([_raw_event({"id": i}) for i in range(3)])
+
+        assert plugin.batch_calls == 2
+        assert plugin.single_calls == 0
+        stats = orchestrator.get_statistics()
+        assert stats["latency"]["plugin_errors"] == {"vector": 2}
+        assert stats["plugins_skipped"] == 6
+
+
+class TestBackpressure:
+    """Test consumption pauses while the downstream topic is saturated"""
+
+    def test_consumption_pauses_and_resumes(self, plugin_manager, queue):
+        """Test processing stops at the lag threshold and resumes once it drains"""
+        orchestrator = ProcessingOrchestrator(
+            plugin_manager=plugin_manager, queue=queue, max_downstream_lag=3, resume_downstream_lag=1
+        )
+        orchestrator._backpressure.check_interval = 0.0
+        orchestrator._backpressure.poll_interval = 0.01
+        orchestrator.start()
+
+        try:
+            for i in range(6):
+                queue.publish(Topics.RAW_LISTINGS, _raw_event({"seq": i}).to_dict())
+
+            time.sleep(0.5)
+            assert orchestrator.get_statistics()["events_processed"] == 3
+            health = orchestrator.health_check()
+            assert health["backpressure"]["throttled"]
+            assert health["backpressure"]["lag"] == 3
+
+            # Downstream consumer catches up
+            queue.purge_queue(Topics.PROCESSED_LISTINGS)
+            time.sleep(0.5)
+            assert orchestrator.get_statistics()["events_processed"] == 6
+            assert orchestrator.health_check()["backpressure"]["throttle_count"] >= 1
+        finally:
+            orchestrator.stop()
+
+    def test_stop_releases_paused_consumer(self, plugin_manager, queue):
+        """Test stop() does not hang while consumption is paused"""
+        orchestrator = ProcessingOrchestrator(plugin_manager=plugin_manager, queue=queue, max_downstream_lag=1)
+        orchestrator._backpressure.check_interval = 0.0
+        orchestrator.start()
+        queue.publish(Topics.PROCESSED_LISTINGS, {"pending": True})
+        queue.publish(Topics.RAW_LISTINGS, _raw_event({"seq": 0}).to_dict())
+        time.sleep(0.3)
+
+        start = time.time()
+        orchestrator.stop()
+
+        assert time.time() - start < 2.0
+
+    def test_no_backpressure_by_default(self, orchestrator):
+        """Test backpressure is disabled unless a lag threshold is set"""
+        assert "backpressure" not in orchestrator.health_check()
+
+
 class TestErrorHandling:
     """Test error handling scenarios"""
 
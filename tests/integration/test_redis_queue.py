@@ -10,15 +10,40 @@ Tests the Redis-based queue implementation including:
 - Error handling
 """
 
+import multiprocessing
+import os
+import threading
 import time
 
 import pytest
 
+from core.pipeline.backpressure import BackpressureController
 from core.queue.redis_queue import RedisQueuePlugin
 
 pytestmark = [pytest.mark.integration, pytest.mark.redis, pytest.mark.messaging]
 
 
+def _crash_in_second_batch(test_config, topic):
+    """Worker process acknowledging its first batch and dying while handling the second"""
+    queue = RedisQueuePlugin(
+        host=test_config["redis_host"],
+        port=test_config["redis_port"],
+        db=test_config["redis_db"],
+        consumer_group="test-group",
+        consumer_name="test-consumer",
+    )
+    queue.connect()
+    batches = []
+
+    def handle(batch):
+        batches.append(batch)
+        if len(batches) == 2:
+            os._exit(1)
+
+    queue.subscribe_batch(topic, handle, batch_size=2)
+    time.sleep(10.0)
+
+
 @pytest.fixture
 def redis_queue(test_config):
     """Create a RedisQueuePlugin instance for testing."""
@@ -351,6 +376,89 @@ class TestRedisQueueAcknowledgment:
             # May fail with invalid ID, but method should exist
             pass
 
+    def test_get_and_acknowledge(self, clean_redis_queue):
+        """Test get() takes one entry and acknowledge() clears it from the pending list."""
+        topic = "test.ack.get"
+
+        clean_redis_queue.create_topic(topic)
+        clean_redis_queue.publish(topic, {"seq": 0})
+        clean_redis_queue.publish(topic, {"seq": 1})
+
+        envelope = clean_redis_queue.get(topic, timeout=1.0)
+        assert envelope["topic"] == topic
+        assert envelope["payload"] == {"seq": 0}
+
+        pending = clean_redis_queue._client.xpending(topic, clean_redis_queue.consumer_group)
+        assert pending["pending"] == 1
+
+        clean_redis_queue.acknowledge(envelope["message_id"])
+        pending = clean_redis_queue._client.xpending(topic, clean_redis_queue.consumer_group)
+        assert pending["pending"] == 0
+
+        assert clean_redis_queue.get(topic, timeout=0)["payload"] == {"seq": 1}
+
+    def test_get_times_out(self, clean_redis_queue):
+        """Test get() returns None when nothing arrives in time."""
+        topic = "test.ack.get_timeout"
+
+        start = time.time()
+        assert clean_redis_queue.get(topic, timeout=0.1) is None
+        assert time.time() - start >= 0.09
+
+    def test_subscribed_messages_leave_pending_list(self, clean_redis_queue):
+        """Test messages processed by a subscriber are acknowledged on their stream."""
+        topic = "test.ack.subscribe"
+        received = []
+
+        for i in range(3):
+            clean_redis_queue.publish(topic, {"seq": i})
+
+        clean_redis_queue.subscribe(topic, received.append)
+        time.sleep(0.5)
+
+        assert [msg["seq"] for msg in received] == [0, 1, 2]
+        pending = clean_redis_queue._client.xpending(topic, clean_redis_queue.consumer_group)
+        assert pending["pending"] == 0
+        assert clean_redis_queue.get_lag(topic) == 0
+
+    def test_batch_subscriber_acknowledges_batches(self, clean_redis_queue):
+        """Test batches delivered by subscribe_batch are acknowledged on their stream."""
+        topic = "test.ack.subscribe_batch"
+        batches = []
+
+        for i in range(5):
+            clean_redis_queue.publish(topic, {"seq": i})
+
+        clean_redis_queue.subscribe_batch(topic, batches.append, batch_size=2)
+        time.sleep(0.5)
+
+        assert [msg["seq"] for batch in batches for msg in batch] == [0, 1, 2, 3, 4]
+        pending = clean_redis_queue._client.xpending(topic, clean_redis_queue.consumer_group)
+        assert pending["pending"] == 0
+
+    def test_backpressure_resumes_when_subscriber_drains(self, clean_redis_queue):
+        """Test lag-based backpressure releases once a subscriber acknowledges the backlog."""
+        topic = "test.ack.backpressure"
+        for i in range(5):
+            clean_redis_queue.publish(topic, {"seq": i})
+
+        controller = BackpressureController(clean_redis_queue, topic, high_watermark=3, poll_interval=0.02)
+        resumed = threading.Event()
+
+        def acquire():
+            controller.acquire()
+            resumed.set()
+
+        threading.Thread(target=acquire, daemon=True).start()
+        try:
+            time.sleep(0.1)
+            assert controller.is_throttled()
+
+            clean_redis_queue.subscribe(topic, lambda msg: None)
+            assert resumed.wait(timeout=3.0)
+        finally:
+            controller.release()
+
     def test_reject_message(self, clean_redis_queue):
         """Test rejecting a message."""
         topic = "test.reject.basic"
@@ -532,3 +640,82 @@ class TestRedisQueueIntegration:
 
         # Messages should arrive in order (Redis Streams guarantee this)
         assert len(received) >= 10
+
+    def test_pending_messages_replayed_after_restart(self, clean_redis_queue, test_config):
+        """Test a consumer restarted under the same name replays unacknowledged messages."""
+        topic = "test.integration.replay"
+        clean_redis_queue.create_topic(topic)
+        clean_redis_queue._client.xgroup_create(topic, "test-group", id="0", mkstream=True)
+
+        for i in range(3):
+            clean_redis_queue.publish(topic, {"seq": i})
+
+        # Simulate a crashed consumer: messages delivered but never acknowledged
+        clean_redis_queue._client.xreadgroup("test-group", "test-consumer", {topic: ">"}, count=10)
+
+        restarted = RedisQueuePlugin(
+            host=test_config["redis_host"],
+            port=test_config["redis_port"],
+            db=test_config["redis_db"],
+            consumer_group="test-group",
+            consumer_name="test-consumer",
+        )
+        restarted.connect()
+        received = []
+        try:
+            restarted.subscribe(topic, lambda msg: received.append(msg))
+            time.sleep(0.5)
+        finally:
+            restarted.disconnect()
+
+        assert [msg["seq"] for msg in received] == [0, 1, 2]
+
+    def test_worker_killed_mid_batch_replays_only_unacknowledged(self, clean_redis_queue, test_config):
+        """Test a worker killed mid-batch leaves only that batch pending for its successor."""
+        topic = "test.integration.replay_batch"
+        for i in range(6):
+            clean_redis_queue.publish(topic, {"seq": i})
+
+        worker = multiprocessing.Process(target=_crash_in_second_batch, args=(test_config, topic))
+        worker.start()
+        worker.join(timeout=10.0)
+        assert worker.exitcode == 1
+
+        pending = clean_redis_queue._client.xpending_range(
+            topic, "test-group", min="-", max="+", count=10, consumername="test-consumer"
+        )
+        assert len(pending) == 2
+
+        restarted = RedisQueuePlugin(
+            host=test_config["redis_host"],
+            port=test_config["redis_port"],
+            db=test_config["redis_db"],
+            consumer_group="test-group",
+            consumer_name="test-consumer",
+        )
+        restarted.connect()
+        received = []
+        try:
+            restarted.subscribe(topic, lambda msg: received.append(msg))
+            time.sleep(0.5)
+        finally:
+            restarted.disconnect()
+
+        assert [msg["seq"] for msg in received] == [2, 3, 4, 5]
+        assert clean_redis_queue._client.xpending(topic, "test-group")["pending"] == 0
+
+    def test_delayed_messages_moved_when_due(self, clean_redis_queue):
+        """Test delayed messages wait in the delay set until they are due."""
+        topic = "test.integration.delayed"
+        clean_redis_queue.delay_poll_ms = 20
+
+        clean_redis_queue.publish_delayed(topic, {"seq": 1}, delay_ms=300)
+        clean_redis_queue.publish_delayed(topic, {"seq": 1}, delay_ms=300)
+
+        time.sleep(0.1)
+        assert clean_redis_queue.get_queue_size(topic) == 0
+        assert clean_redis_queue._client.zcard(f"{topic}:delayed") == 2
+
+        time.sleep(0.5)
+        assert clean_redis_queue.get_queue_size(topic) == 2
+        assert clean_redis_queue._client.zcard(f"{topic}:delayed") == 0
@@ -0,0 +1,52 @@
+"""Integration tests for the Redis tier of DetectionResultCache."""
+
+import pytest
+import redis
+
+from core.fraud.result_cache import DetectionResultCache
+from core.interfaces.detection_plugin import DetectionResult, RiskSignal
+
+pytestmark = [pytest.mark.integration, pytest.mark.redis]
+
+
+@pytest.fixture
+def sync_redis(redis_clean, test_config):
+    """Synchronous Redis client on a clean database."""
+    client = redis.Redis.from_url(test_config["redis_url"])
+    yield client
+    client.close()
+
+
+def test_results_shared_between_caches(sync_redis):
+    """Test a result cached by one worker is served to another from Redis."""
+    result = DetectionResult(
+        plugin_id="plugin1",
+        signals=[RiskSignal(signal_type="price_anomaly", score=0.9, confidence=0.8, reason="Too cheap")],
+        overall_score=0.9,
+        processing_time_ms=12.0,
+    )
+    writer = DetectionResultCache(redis_client=sync_redis, redis_ttl_s=60)
+    reader = DetectionResultCache(redis_client=sync_redis, redis_ttl_s=60)
+
+    writer.put("plugin1:1.0.0:0.5", "abc", result)
+    cached = reader.get("plugin1:1.0.0:0.5", "abc")
+
+    assert cached == result
+    assert reader.get_statistics()["redis_hits"] == 1
+    assert 0 < sync_redis.ttl("fraud:result:plugin1:1.0.0:0.5:abc") <= 60
+
+    # Promoted to the in-process tier
+    reader.get("plugin1:1.0.0:0.5", "abc")
+    assert reader.get_statistics()["hits"] == 1
+
+
+def test_new_plugin_version_misses(sync_redis):
+    """Test entries of another plugin version are not served."""
+    cache = DetectionResultCache(redis_client=sync_redis)
+    cache.put(
+        "plugin1:1.0.0:0.5",
+        "abc",
+        DetectionResult(plugin_id="plugin1", signals=[], overall_score=0.1, processing_time_ms=1.0),
+    )
+
+    assert DetectionResultCache(redis_client=sync_redis).get("plugin1:1.1.0:0.5", "abc") is None
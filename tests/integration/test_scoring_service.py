@@ -0,0 +1,296 @@
+"""
+Integration tests for FraudScoringService.
+
+Tests the queue-driven scoring stage including:
+- Micro-batch scoring of processed listings
+- Fraud events for high scores
+- Bulk write-back of scores to the database
+- End-to-end consumption from the in-memory queue
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database.base import Base
+from core.database.models import ListingModel
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult, RiskSignal
+from core.models.events import (
+    EventMetadata,
+    EventType,
+    FraudDetectedEvent,
+    ProcessedListingEvent,
+    ProcessingFailedEvent,
+    Topics,
+)
+from core.pipeline.scoring_service import FraudScoringService
+from core.queue.in_memory_queue import InMemoryQueuePlugin
+
+pytestmark = [pytest.mark.integration, pytest.mark.messaging]
+
+
+class PriceDetectionPlugin(DetectionPlugin):
+    """Detection plugin scoring listings by price, counting batch calls"""
+
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.delay = delay
+
+    def get_metadata(self):
+        return {"id": "price-check", "name": "Price Check", "version": "1.0.0"}
+
+    async def analyze(self, listing):
+        return self._score(listing)
+
+    async def analyze_batch(self, listings):
+        self.batches.append(len(listings))
+        await asyncio.sleep(self.delay)
+        return [self._score(listing) for listing in listings]
+
+    def _score(self, listing):
+        score = min(listing["price"] / 1_000_000, 1.0)
+        signal = RiskSignal(signal_type="price_anomaly", score=score, confidence=0.9, reason="test")
+        return DetectionResult(plugin_id="price-check", signals=[signal], overall_score=score, processing_time_ms=1)
+
+    def get_weight(self):
+        return 1.0
+
+
+def _processed_event(listing_id: str, price: float) -> ProcessedListingEvent:
+    return ProcessedListingEvent(
+        metadata=EventMetadata(
+            event_type=EventType.PROCESSED_LISTING,
+            source_plugin_id="test-source",
+            source_platform="test-platform",
+            trace_id=f"trace-{listing_id}",
+        ),
+        listing_data={"listing_id": listing_id, "price": price, "source": {"url": f"https://example.com/{listing_id}"}},
+        fraud_score=0.0,
+    )
+
+
+@pytest.fixture
+def queue():
+    """Create an in-memory queue for testing"""
+    q = InMemoryQueuePlugin()
+    q.connect()
+    for topic in (Topics.PROCESSED_LISTINGS, Topics.FRAUD_DETECTED, Topics.PROCESSING_FAILED):
+        q.create_topic(topic)
+    yield q
+    q.disconnect()
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory database with one listing per test listing ID"""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    session = factory()
+    for i in range(10):
+        session.add(
+            ListingModel(
+                listing_id=f"listing-{i}",
+                source_plugin_id="test-source",
+                source_platform="test-platform",
+                type="sale",
+                property_type="apartment",
+                price_amount=100_000 * i,
+                price_currency="EUR",
+            )
+        )
+    session.commit()
+    session.close()
+
+    yield factory
+    Base.metadata.drop_all(bind=engine)
+
+
+def _stored_scores(session_factory):
+    session = session_factory()
+    try:
+        return {model.listing_id: model.fraud_score for model in session.query(ListingModel).all()}
+    finally:
+        session.close()
+
+
+class TestScoringBatches:
+    """Test scoring of micro-batches on the event loop"""
+
+    def test_invalid_arguments(self, queue):
+        """Test sizes and thresholds are validated"""
+        orch = RiskScoringOrchestrator(detection_plugins=[])
+        with pytest.raises(ValueError):
+            FraudScoringService(orch, queue, batch_size=0)
+        with pytest.raises(ValueError):
+            FraudScoringService(orch, queue, max_in_flight=0)
+        with pytest.raises(ValueError):
+            FraudScoringService(orch, queue, alert_threshold=150.0)
+
+    async def test_batch_scored_alerted_and_persisted(self, queue, session_factory):
+        """Test one batch gives one plugin call, fraud events for high scores and stored scores"""
+        plugin = PriceDetectionPlugin()
+        service = FraudScoringService(
+            RiskScoringOrchestrator(detection_plugins=[plugin]), queue, session_factory=session_factory
+        )
+        alerts = []
+        queue.subscribe_batch(Topics.FRAUD_DETECTED, alerts.extend)
+
+        records = await service.process_batch(
+            [_processed_event(f"listing-{i}", 100_000 * i).to_dict() for i in range(10)]
+        )
+
+        assert plugin.batches == [10]
+        assert [record.risk_level for record in records].count("fraud") == 3
+        assert _stored_scores(session_factory) == {f"listing-{i}": pytest.approx(10.0 * i) for i in range(10)}
+
+        deadline = time.time() + 2
+        while len(alerts) < 3 and time.time() < deadline:
+            time.sleep(0.02)
+        events = sorted((FraudDetectedEvent.from_dict(alert) for alert in alerts), key=lambda e: e.listing_id)
+        assert [event.listing_id for event in events] == ["listing-7", "listing-8", "listing-9"]
+        assert events[0].listing_url == "https://example.com/listing-7"
+        assert events[0].detected_by == ["price-check"]
+        assert events[0].fraud_signals == ["price_anomaly"]
+        assert events[0].metadata.trace_id == "trace-listing-7"
+
+        stats = service.get_statistics()
+        assert stats["events_processed"] == 10
+        assert stats["fraud_events_published"] == 3
+        assert stats["scores_persisted"] == 10
+        assert stats["latency"]["event"]["count"] == 10
+        assert set(stats["latency"]["stages"]) == {"score", "publish"}
+
+    async def test_alert_threshold(self, queue):
+        """Test the alert threshold can include suspicious listings"""
+        service = FraudScoringService(
+            RiskScoringOrchestrator(detection_plugins=[PriceDetectionPlugin()]),
+            queue,
+            alert_threshold=RiskScoringOrchestrator.SUSPICIOUS_THRESHOLD,
+        )
+
+        await service.process_batch([_processed_event(f"listing-{i}", 100_000 * i).to_dict() for i in range(10)])
+
+        assert service.get_statistics()["fraud_events_published"] == 7
+
+    async def test_invalid_events_reported(self, queue):
+        """Test unparseable events go to the failed topic and the rest is scored"""
+        service = FraudScoringService(RiskScoringOrchestrator(detection_plugins=[PriceDetectionPlugin()]), queue)
+        failed = []
+        queue.subscribe(Topics.PROCESSING_FAILED, failed.append)
+
+        records = await service.process_batch([{"invalid": "format"}, _processed_event("listing-1", 100_000).to_dict()])
+
+        assert [record.listing_id for record in records] == ["listing-1"]
+        deadline = time.time() + 2
+        while not failed and time.time() < deadline:
+            time.sleep(0.02)
+        assert ProcessingFailedEvent.from_dict(failed[0]).failed_stage == "fraud_scoring"
+        assert service.get_statistics()["events_failed"] == 1
+
+    async def test_persist_failure_does_not_fail_events(self, queue):
+        """Test database errors are counted without dropping scores"""
+
+        def broken_session():
+            raise ConnectionError("database down")
+
+        service = FraudScoringService(
+            RiskScoringOrchestrator(detection_plugins=[PriceDetectionPlugin()]), queue, session_factory=broken_session
+        )
+
+        records = await service.process_batch([_processed_event("listing-9", 900_000).to_dict()])
+
+        assert records[0].risk_level == "fraud"
+        stats = service.get_statistics()
+        assert stats["events_processed"] == 1
+        assert stats["persist_failures"] == 1
+
+    async def test_listings_without_id_not_persisted(self, queue, session_factory):
+        """Test scores of listings without an ID are not written under a placeholder ID"""
+        event = _processed_event("listing-9", 900_000)
+        del event.listing_data["listing_id"]
+        seen = []
+
+        def session():
+            created = session_factory()
+            seen.append(created)
+            return created
+
+        service = FraudScoringService(
+            RiskScoringOrchestrator(detection_plugins=[PriceDetectionPlugin()]), queue, session_factory=session
+        )
+
+        records = await service.process_batch([event.to_dict()])
+
+        assert records[0].risk_level == "fraud"
+        assert seen == []
+        assert service.get_statistics()["scores_persisted"] == 0
+
+
+class TestScoringConsumption:
+    """Test queue consumption through the event loop"""
+
+    def test_end_to_end_micro_batches(self, queue, session_factory):
+        """Test processed events are consumed in batches and scores written back"""
+        plugin = PriceDetectionPlugin()
+        service = FraudScoringService(
+            RiskScoringOrchestrator(detection_plugins=[plugin]),
+            queue,
+            session_factory=session_factory,
+            batch_size=4,
+            batch_timeout_ms=100,
+            max_in_flight=2,
+        )
+        alerts = []
+        queue.subscribe(Topics.FRAUD_DETECTED, alerts.append)
+
+        service.start()
+        try:
+            queue.publish_batch(
+                Topics.PROCESSED_LISTINGS,
+                [_processed_event(f"listing-{i}", 100_000 * i).to_dict() for i in range(10)],
+            )
+
+            deadline = time.time() + 5
+            while service.get_statistics()["events_processed"] < 10 and time.time() < deadline:
+                time.sleep(0.05)
+            while len(alerts) < 3 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            service.stop()
+
+        assert sum(plugin.batches) == 10
+        assert max(plugin.batches) <= 4
+        assert len(alerts) == 3
+        assert _stored_scores(session_factory)["listing-9"] == pytest.approx(90.0)
+        assert not service.is_running()
+
+    def test_acknowledged_after_scoring(self, queue):
+        """Test a batch stays unacknowledged until it is scored"""
+        plugin = PriceDetectionPlugin(delay=0.3)
+        service = FraudScoringService(RiskScoringOrchestrator(detection_plugins=[plugin]), queue, batch_timeout_ms=10)
+
+        service.start()
+        try:
+            queue.publish(Topics.PROCESSED_LISTINGS, _processed_event("listing-1", 100_000).to_dict())
+
+            deadline = time.time() + 5
+            while not plugin.batches and time.time() < deadline:
+                time.sleep(0.01)
+            assert queue.get_statistics()["pending_acks"] == 1
+
+            while queue.get_statistics()["pending_acks"] and time.time() < deadline:
+                time.sleep(0.01)
+            assert service.get_statistics()["events_processed"] == 1
+        finally:
+            service.stop()
@@ -0,0 +1,192 @@
+"""
+Integration tests for ProcessingSupervisor.
+
+Tests the multi-process worker mode including:
+- Shard routing of raw events
+- Statistics merged across worker processes
+- Restart of crashed workers
+"""
+
+import os
+import time
+
+import pytest
+
+from core.interfaces.processing_plugin import ProcessingPlugin
+from core.models.events import Topics
+from core.models.plugin import PluginMetadata
+from core.pipeline.orchestrator import ProcessingOrchestrator
+from core.pipeline.supervisor import (
+    ProcessingSupervisor,
+    merge_statistics,
+    publish_sharded,
+    shard_for,
+    shard_topic,
+)
+from core.plugin_manager import PluginManager
+from core.queue.in_memory_queue import InMemoryQueuePlugin
+from tests.integration.test_orchestrator import _raw_event
+
+pytestmark = [pytest.mark.integration, pytest.mark.messaging, pytest.mark.plugins]
+
+
+class CrashOncePlugin(ProcessingPlugin):
+    """Processing plugin killing its process the first time it runs"""
+
+    def __init__(self, marker: str):
+        self.marker = marker
+
+    def get_metadata(self):
+        return {"name": "crash-once", "type": "processing"}
+
+    def process(self, listing):
+        if not os.path.exists(self.marker):
+            open(self.marker, "w").close()
+            os._exit(1)
+        return listing
+
+    def get_priority(self):
+        return 1
+
+
+class PreloadedWorker:
+    """Worker factory feeding each worker's in-memory queue with events"""
+
+    def __init__(self, events_per_worker: int, crash_marker: str = None):
+        self.events_per_worker = events_per_worker
+        self.crash_marker = crash_marker
+
+    def __call__(self, index, num_workers):
+        manager = PluginManager()
+        if self.crash_marker and index == 0:
+            manager._instances["crash-once"] = CrashOncePlugin(self.crash_marker)
+            manager.register(
+                PluginMetadata(id="crash-once", name="crash-once", version="1.0.0", type="processing", enabled=True)
+            )
+
+        queue = InMemoryQueuePlugin()
+        queue.connect()
+        topic = shard_topic(Topics.RAW_LISTINGS, index)
+        queue.create_topic(topic)
+        for i in range(self.events_per_worker):
+            queue.publish(topic, _raw_event({"worker": index, "seq": i}).to_dict())
+
+        return ProcessingOrchestrator(plugin_manager=manager, queue=queue, input_topic=topic)
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+class TestSharding:
+    """Test shard routing helpers"""
+
+    def test_shard_is_stable_and_in_range(self):
+        """Test the same listing always maps to the same shard"""
+        message = _raw_event({"id": 1}).to_dict()
+        message["external_id"] = "listing-42"
+
+        shards = {shard_for(message, 4) for _ in range(5)}
+        assert len(shards) == 1
+        assert 0 <= shards.pop() < 4
+
+    def test_shard_by_source_platform(self):
+        """Test sharding by platform groups events of one platform"""
+        first = _raw_event({"id": 1}).to_dict()
+        second = _raw_event({"id": 2}).to_dict()
+
+        assert shard_for(first, 8, key="source_platform") == shard_for(second, 8, key="source_platform")
+
+    def test_events_spread_across_shards(self):
+        """Test distinct listings spread across shards"""
+        shards = {shard_for(_raw_event({"id": i}).to_dict(), 4) for i in range(100)}
+        assert shards == {0, 1, 2, 3}
+
+    def test_invalid_arguments(self):
+        """Test invalid shard count and key are rejected"""
+        message = _raw_event({"id": 1}).to_dict()
+        with pytest.raises(ValueError):
+            shard_for(message, 0)
+        with pytest.raises(ValueError):
+            shard_for(message, 2, key="price")
+
+    def test_publish_sharded(self):
+        """Test events are published to their shard topic"""
+        queue = InMemoryQueuePlugin()
+        queue.connect()
+        message = _raw_event({"id": 1}).to_dict()
+
+        publish_sharded(queue, message, 3)
+
+        assert queue.get_queue_size(shard_topic(Topics.RAW_LISTINGS, shard_for(message, 3))) == 1
+
+
+class TestMergeStatistics:
+    """Test merging of worker statistics"""
+
+    def test_counters_and_timings_summed(self):
+        """Test counters and plugin timings are summed and the average recomputed"""
+        merged = merge_statistics(
+            [
+                {"events_processed": 2, "total_processing_time_ms": 10.0, "plugin_time_ms": {"a": 1.0}},
+                {"events_processed": 3, "total_processing_time_ms": 40.0, "plugin_time_ms": {"a": 2.0, "b": 1.0}},
+            ]
+        )
+
+        assert merged["events_processed"] == 5
+        assert merged["avg_processing_time_ms"] == pytest.approx(10.0)
+        assert merged["plugin_time_ms"] == {"a": 3.0, "b": 1.0}
+
+    def test_empty(self):
+        """Test merging no workers"""
+        merged = merge_statistics([])
+        assert merged["events_processed"] == 0
+        assert merged["avg_processing_time_ms"] == 0.0
+
+
+class TestProcessingSupervisor:
+    """Test worker process supervision"""
+
+    def test_invalid_num_workers(self):
+        """Test num_workers must be positive"""
+        with pytest.raises(ValueError):
+            ProcessingSupervisor(PreloadedWorker(1), num_workers=-1)
+
+    def test_statistics_merged_across_workers(self):
+        """Test every worker processes its shard and statistics are merged"""
+        supervisor = ProcessingSupervisor(PreloadedWorker(5), num_workers=3, stats_interval=0.1, monitor_interval=0.1)
+        supervisor.start()
+        try:
+            assert _wait_for(lambda: supervisor.get_statistics()["events_processed"] == 15)
+            stats = supervisor.get_statistics()
+            assert stats["workers_alive"] == 3
+            assert set(stats["per_worker"]) == {0, 1, 2}
+            assert supervisor.health_check()["status"] == "healthy"
+        finally:
+            supervisor.stop()
+
+        assert not supervisor.is_running()
+
+    def test_crashed_worker_restarted(self, tmp_path):
+        """Test a worker that dies is restarted"""
+        marker = str(tmp_path / "crashed")
+        supervisor = ProcessingSupervisor(
+            PreloadedWorker(2, crash_marker=marker),
+            num_workers=2,
+            stats_interval=0.1,
+            monitor_interval=0.1,
+            restart_delay=0.0,
+        )
+        supervisor.start()
+        try:
+            assert _wait_for(lambda: supervisor.get_statistics()["restarts"] == 1)
+            assert _wait_for(lambda: supervisor.get_statistics()["workers_alive"] == 2)
+            # The restarted worker rebuilds its in-memory queue and processes it again
+            assert _wait_for(lambda: supervisor.get_statistics()["events_processed"] == 4)
+        finally:
+            supervisor.stop()
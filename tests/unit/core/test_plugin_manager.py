@@ -31,3 +31,36 @@ def test_register_and_enable_plugin():
 
     assert pm.remove(meta.id) is True
     assert pm.get(meta.id) is None
+
+
+def test_epoch_bumps_on_plugin_changes():
+    pm = PluginManager()
+    meta = PluginMetadata(id="plugin-processing-epoch", name="Epoch", version="1.0.0", type="processing")
+
+    epochs = [pm.epoch]
+    pm.register(meta)
+    epochs.append(pm.epoch)
+    pm.enable(meta.id)
+    epochs.append(pm.epoch)
+    pm.disable(meta.id)
+    epochs.append(pm.epoch)
+    pm.set_weight(meta.id, 0.5)
+    epochs.append(pm.epoch)
+    pm.remove(meta.id)
+    epochs.append(pm.epoch)
+
+    assert epochs == sorted(set(epochs))
+
+
+def test_epoch_unchanged_by_reads_and_unknown_plugins():
+    pm = PluginManager()
+    pm.register(PluginMetadata(id="plugin-processing-epoch", name="Epoch", version="1.0.0", type="processing"))
+    epoch = pm.epoch
+
+    pm.list()
+    pm.get_by_type("processing")
+    pm.get_instance("plugin-processing-epoch")
+    assert pm.enable("missing") is False
+    assert pm.remove("missing") is False
+
+    assert pm.epoch == epoch
@@ -0,0 +1,104 @@
+"""Tests for lag-based backpressure between pipeline stages"""
+
+import threading
+import time
+
+import pytest
+
+from core.pipeline.backpressure import BackpressureController
+from core.queue import InMemoryQueuePlugin
+
+pytestmark = [pytest.mark.unit, pytest.mark.messaging]
+
+TOPIC = "listings.processed"
+
+
+@pytest.fixture
+def queue():
+    q = InMemoryQueuePlugin()
+    q.connect()
+    q.create_topic(TOPIC)
+    yield q
+    q.disconnect()
+
+
+def _fill(queue, count):
+    for i in range(count):
+        queue.publish(TOPIC, {"seq": i})
+
+
+class TestBackpressureController:
+    """Tests for BackpressureController"""
+
+    def test_invalid_watermarks(self, queue):
+        """Test watermarks are validated"""
+        with pytest.raises(ValueError):
+            BackpressureController(queue, TOPIC, high_watermark=0)
+        with pytest.raises(ValueError):
+            BackpressureController(queue, TOPIC, high_watermark=10, low_watermark=10)
+
+    def test_default_lag_is_queue_size(self, queue):
+        """Test get_lag falls back to get_queue_size"""
+        _fill(queue, 3)
+        assert queue.get_lag(TOPIC) == 3
+
+    def test_acquire_passes_below_high_watermark(self, queue):
+        """Test no throttling while lag is below the high watermark"""
+        _fill(queue, 4)
+        controller = BackpressureController(queue, TOPIC, high_watermark=5)
+
+        controller.acquire()
+
+        status = controller.get_status()
+        assert status["lag"] == 4
+        assert status["throttle_count"] == 0
+        assert not status["throttled"]
+
+    def test_acquire_blocks_until_low_watermark(self, queue):
+        """Test consumption pauses at the high watermark and resumes at the low one"""
+        _fill(queue, 10)
+        controller = BackpressureController(queue, TOPIC, high_watermark=10, low_watermark=2, poll_interval=0.01)
+
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (controller.acquire(), done.set()))
+        thread.start()
+
+        time.sleep(0.1)
+        assert not done.is_set()
+        assert controller.is_throttled()
+
+        # Drain downstream to the low watermark
+        for _ in range(8):
+            queue.acknowledge(queue.get(TOPIC, timeout=0)["message_id"])
+
+        assert done.wait(1.0)
+        thread.join()
+        status = controller.get_status()
+        assert status["throttle_count"] == 1
+        assert status["throttle_time_ms"] > 0
+        assert not status["throttled"]
+
+    def test_release_unblocks(self, queue):
+        """Test release() wakes blocked consumers on shutdown"""
+        _fill(queue, 5)
+        controller = BackpressureController(queue, TOPIC, high_watermark=5, poll_interval=0.01)
+
+        done = threading.Event()
+        thread = threading.Thread(target=lambda: (controller.acquire(), done.set()))
+        thread.start()
+        time.sleep(0.05)
+
+        controller.release()
+
+        assert done.wait(1.0)
+        thread.join()
+
+    def test_lag_cached_between_checks(self, queue):
+        """Test lag is not queried more often than check_interval"""
+        controller = BackpressureController(queue, TOPIC, high_watermark=5, check_interval=60.0)
+        controller.acquire()
+
+        _fill(queue, 10)
+        controller.acquire()  # Within check_interval: no new measurement, no blocking
+
+        assert controller.get_status()["lag"] == 0
@@ -0,0 +1,91 @@
+"""Unit tests for the processing plugin circuit breaker."""
+
+import time
+
+import pytest
+
+from core.pipeline.circuit_breaker import BreakerState, CircuitBreaker, PluginTimeoutError
+
+pytestmark = [pytest.mark.unit, pytest.mark.plugins]
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker"""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the breaker opens at the threshold and rejects calls"""
+        breaker = CircuitBreaker("geo", failure_threshold=3, reset_timeout_s=60)
+
+        assert breaker.record_failure() is True  # First failure of a streak
+        assert breaker.record_failure() is False
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.record_failure() is True  # Opened
+
+        assert breaker.state is BreakerState.OPEN
+        assert not breaker.allow()
+        status = breaker.get_status()
+        assert status["rejected"] == 1
+        assert status["times_opened"] == 1
+        assert 0 < status["retry_in_s"] <= 60
+
+    def test_success_resets_streak(self):
+        """Test failures must be consecutive to open the breaker"""
+        breaker = CircuitBreaker("geo", failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.allow()
+
+    def test_half_open_probe_limit(self):
+        """Test only a limited number of probes pass once the cool-down is over"""
+        breaker = CircuitBreaker("geo", failure_threshold=1, reset_timeout_s=0.05, half_open_max_calls=1)
+        breaker.record_failure()
+
+        time.sleep(0.06)
+
+        assert breaker.state is BreakerState.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+    def test_probe_success_closes(self):
+        """Test a successful probe closes the breaker"""
+        breaker = CircuitBreaker("geo", failure_threshold=1, reset_timeout_s=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+
+        assert breaker.allow()
+        breaker.record_success()
+
+        assert breaker.state is BreakerState.CLOSED
+        assert breaker.allow()
+
+    def test_probe_failure_reopens(self):
+        """Test a failed probe opens the breaker for another cool-down"""
+        breaker = CircuitBreaker("geo", failure_threshold=3, reset_timeout_s=0.05)
+        for _ in range(3):
+            breaker.record_failure()
+        time.sleep(0.06)
+
+        assert breaker.allow()
+        assert breaker.record_failure() is True
+
+        assert breaker.state is BreakerState.OPEN
+        assert breaker.get_status()["times_opened"] == 2
+
+    def test_invalid_arguments(self):
+        """Test arguments are validated"""
+        with pytest.raises(ValueError):
+            CircuitBreaker("geo", failure_threshold=0)
+        with pytest.raises(ValueError):
+            CircuitBreaker("geo", half_open_max_calls=0)
+
+    def test_timeout_error(self):
+        """Test timeout errors describe the exceeded budget"""
+        error = PluginTimeoutError("geo", 250)
+
+        assert isinstance(error, TimeoutError)
+        assert error.plugin_name == "geo"
+        assert "250ms" in str(error)
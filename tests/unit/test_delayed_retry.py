@@ -0,0 +1,121 @@
+"""Unit tests for retry backoff and the timer wheel used for delayed delivery."""
+
+import threading
+import time
+
+import pytest
+
+from core.pipeline.retry import RetryPolicy, retry_topic
+from core.queue.timer_wheel import TimerWheel
+
+pytestmark = [pytest.mark.unit, pytest.mark.messaging]
+
+
+class TestRetryPolicy:
+    """Tests for RetryPolicy"""
+
+    def test_exponential_backoff(self):
+        """Test delays grow exponentially up to the cap"""
+        policy = RetryPolicy(base_delay_ms=100, max_delay_ms=1000, multiplier=2.0, jitter=0.0)
+
+        assert [policy.delay_ms(attempt) for attempt in range(1, 7)] == [100, 200, 400, 800, 1000, 1000]
+
+    def test_large_attempts_capped(self):
+        """Test huge attempt numbers do not overflow"""
+        policy = RetryPolicy(base_delay_ms=100, max_delay_ms=5000, jitter=0.0)
+        assert policy.delay_ms(10_000) == 5000
+
+    def test_jitter_bounds(self):
+        """Test jitter only removes up to the configured share of the delay"""
+        policy = RetryPolicy(base_delay_ms=1000, max_delay_ms=1000, jitter=0.5)
+        delays = {policy.delay_ms(1) for _ in range(200)}
+
+        assert all(500 <= delay <= 1000 for delay in delays)
+        assert len(delays) > 1
+
+    def test_invalid_arguments(self):
+        """Test arguments are validated"""
+        with pytest.raises(ValueError):
+            RetryPolicy(base_delay_ms=-1)
+        with pytest.raises(ValueError):
+            RetryPolicy(base_delay_ms=100, max_delay_ms=10)
+        with pytest.raises(ValueError):
+            RetryPolicy(multiplier=0.5)
+        with pytest.raises(ValueError):
+            RetryPolicy(jitter=1.5)
+
+    def test_retry_topic(self):
+        """Test the retry lane is derived from the input topic"""
+        assert retry_topic("listings.raw") == "listings.raw.retry"
+        assert retry_topic("listings.raw.3") == "listings.raw.3.retry"
+
+
+class TestTimerWheel:
+    """Tests for TimerWheel"""
+
+    def test_fires_in_due_order(self):
+        """Test timers fire after their delay, earliest first"""
+        wheel = TimerWheel(tick_ms=5)
+        fired = []
+        done = threading.Event()
+
+        def record(name):
+            fired.append((name, time.monotonic()))
+            if len(fired) == 3:
+                done.set()
+
+        start = time.monotonic()
+        wheel.schedule(300, lambda: record("late"))
+        wheel.schedule(20, lambda: record("early"))
+        wheel.schedule(150, lambda: record("middle"))
+
+        try:
+            assert done.wait(timeout=2.0)
+        finally:
+            wheel.stop()
+
+        assert [name for name, _ in fired] == ["early", "middle", "late"]
+        assert fired[-1][1] - start >= 0.3
+
+    def test_delay_longer_than_revolution(self):
+        """Test timers beyond one revolution skip earlier passes over their slot"""
+        wheel = TimerWheel(tick_ms=5, wheel_size=4)
+        done = threading.Event()
+
+        start = time.monotonic()
+        wheel.schedule(100, done.set)
+
+        try:
+            assert done.wait(timeout=2.0)
+        finally:
+            wheel.stop()
+        assert time.monotonic() - start >= 0.1
+
+    def test_callback_errors_do_not_stop_wheel(self):
+        """Test a failing callback does not prevent later timers"""
+        wheel = TimerWheel(tick_ms=5)
+        done = threading.Event()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        wheel.schedule(5, fail)
+        wheel.schedule(20, done.set)
+
+        try:
+            assert done.wait(timeout=2.0)
+        finally:
+            wheel.stop()
+
+    def test_stop_drops_pending(self):
+        """Test stopping drops pending timers and rejects new ones"""
+        wheel = TimerWheel(tick_ms=5)
+        fired = []
+        wheel.schedule(10_000, lambda: fired.append(True))
+
+        assert len(wheel) == 1
+        assert wheel.stop() == 1
+        assert len(wheel) == 0
+        with pytest.raises(RuntimeError):
+            wheel.schedule(10, lambda: None)
+        assert fired == []
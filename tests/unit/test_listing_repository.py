@@ -318,3 +318,29 @@ def test_create_listing_with_media(repository, sample_listing):
     assert len(result.media.images) == 2
     assert result.media.images[0].url == "https://example.com/img1.jpg"
     assert result.media.images[0].caption == "Living room"
+
+
+def test_bulk_update_fraud_scores(repository, sample_listing):
+    """Test fraud scores of many listings are set in one call."""
+    repository.create(sample_listing)
+    second = sample_listing.model_copy(update={"listing_id": "test-listing-2"})
+    repository.create(second)
+
+    updated = repository.bulk_update_fraud_scores({"test-listing-1": 12.5, "test-listing-2": 80.0, "missing": 50.0})
+
+    assert updated == 2
+    assert repository.get_by_id("test-listing-1").fraud_score == 12.5
+    assert repository.get_by_id("test-listing-2").fraud_score == 80.0
+    assert repository.bulk_update_fraud_scores({}) == 0
+
+
+def test_iter_labelled(repository, sample_listing):
+    """Test only listings with a fraud label are yielded, with the label."""
+    for i, label in enumerate([True, False, None]):
+        repository.create(sample_listing.model_copy(update={"listing_id": f"labelled-{i}"}))
+        if label is not None:
+            repository.update(f"labelled-{i}", extra_metadata={"fraud_label": label, "reviewer": "qa"})
+
+    result = [(listing.listing_id, label) for listing, label in repository.iter_labelled(batch_size=1)]
+
+    assert result == [("labelled-0", True), ("labelled-1", False)]
@@ -0,0 +1,112 @@
+"""Unit tests for the copy-on-write listing view."""
+
+import pytest
+
+from core.pipeline.listing_view import ListingView, as_view, diff, materialize
+
+pytestmark = [pytest.mark.unit]
+
+
+@pytest.fixture
+def base():
+    return {"price": 100, "html": "<html>" * 1000, "images": ["a.jpg", "b.jpg"]}
+
+
+class TestListingView:
+    """Tests for ListingView"""
+
+    def test_reads_fall_through_to_base(self, base):
+        """Test unchanged fields are read from the base"""
+        view = ListingView(base)
+
+        assert view["price"] == 100
+        assert view["images"] is base["images"]
+        assert len(view) == 3
+        assert set(view) == {"price", "html", "images"}
+        assert view == base
+
+    def test_writes_do_not_touch_base(self, base):
+        """Test sets and deletes only go to the overlay"""
+        view = ListingView(base)
+        view["price"] = 200
+        view["currency"] = "EUR"
+        del view["html"]
+
+        assert base["price"] == 100
+        assert "html" in base
+        assert view["price"] == 200
+        assert "html" not in view
+        assert view.get("html") is None
+        assert len(view) == 3
+        assert list(view) == ["price", "images", "currency"]
+
+    def test_delete_missing_field(self, base):
+        """Test deleting an absent field raises KeyError"""
+        view = ListingView(base)
+        with pytest.raises(KeyError):
+            del view["missing"]
+        with pytest.raises(KeyError):
+            view["missing"]
+
+    def test_copy_is_independent(self, base):
+        """Test copies share the base but not the overlay"""
+        view = ListingView(base)
+        view["price"] = 200
+
+        copy = view.copy()
+        copy["price"] = 300
+        copy.pop("images")
+
+        assert view["price"] == 200
+        assert "images" in view
+        assert copy.base is view.base
+
+    def test_changes(self, base):
+        """Test the overlay is reported as changes relative to the base"""
+        view = ListingView(base)
+        view["price"] = 200
+        view["images"] = base["images"]  # Same object: not a change
+        del view["html"]
+
+        assert view.changes() == {"set": {"price": 200}, "deleted": ["html"]}
+
+    def test_materialize(self, base):
+        """Test materialization builds a plain dict once"""
+        view = ListingView(base)
+        view["price"] = 200
+        del view["html"]
+
+        listing = view.materialize()
+
+        assert type(listing) is dict
+        assert listing == {"price": 200, "images": ["a.jpg", "b.jpg"]}
+        assert listing is not base
+
+    def test_helpers(self, base):
+        """Test as_view and materialize accept views and plain dicts"""
+        view = as_view(base)
+        assert as_view(view) is view
+        assert materialize(base) == base
+        assert materialize(view) == base
+
+
+class TestDiff:
+    """Tests for per-stage diffs"""
+
+    def test_diff_between_views(self, base):
+        """Test diffs of views sharing a base compare overlays only"""
+        before = ListingView(base)
+        before["price"] = 200
+        after = before.copy()
+        after["geo"] = (1.0, 2.0)
+        del after["html"]
+
+        assert diff(before, after) == {"set": {"geo": (1.0, 2.0)}, "deleted": ["html"]}
+
+    def test_diff_with_rebuilt_dict(self, base):
+        """Test diffs fall back to comparing fields when a plugin returns a new dict"""
+        before = ListingView(base)
+        after = {**base, "price": 150}
+        del after["images"]
+
+        assert diff(before, after) == {"set": {"price": 150}, "deleted": ["images"]}
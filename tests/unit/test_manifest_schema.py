@@ -255,6 +255,17 @@ class TestOptionalFields:
         with pytest.raises(ValidationError):
             validate(instance=valid_minimal_manifest, schema=schema)
 
+    def test_field_access_capabilities(self, schema, valid_minimal_manifest):
+        """reads:/writes: capabilities declare processed listing fields."""
+        valid_minimal_manifest["capabilities"] = ["parallel_safe", "reads:price", "writes:price_per_sqm"]
+        validate(instance=valid_minimal_manifest, schema=schema)
+
+    def test_invalid_field_access_capability(self, schema, valid_minimal_manifest):
+        """Field access capabilities must name a single field."""
+        valid_minimal_manifest["capabilities"] = ["reads:"]
+        with pytest.raises(ValidationError):
+            validate(instance=valid_minimal_manifest, schema=schema)
+
     def test_resources_field(self, schema, valid_minimal_manifest):
         """Resources field should pass with valid limits."""
         valid_minimal_manifest["resources"] = {
@@ -288,6 +299,17 @@ class TestOptionalFields:
         with pytest.raises(ValidationError):
             validate(instance=valid_minimal_manifest, schema=schema)
 
+    def test_execution_field(self, schema, valid_minimal_manifest):
+        """Execution mode should pass with a known mode."""
+        valid_minimal_manifest["execution"] = {"mode": "process"}
+        validate(instance=valid_minimal_manifest, schema=schema)
+
+    def test_execution_invalid_mode(self, schema, valid_minimal_manifest):
+        """Unknown execution mode should fail."""
+        valid_minimal_manifest["execution"] = {"mode": "gpu"}
+        with pytest.raises(ValidationError):
+            validate(instance=valid_minimal_manifest, schema=schema)
+
 
 class TestComplexManifests:
     """Test complex real-world manifests."""
@@ -0,0 +1,179 @@
+"""Unit tests for pipeline latency histograms, profiler and metrics endpoint."""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.api.main import app
+from core.pipeline.metrics import LatencyHistogram, PipelineMetrics, SlowEventProfiler, registry
+
+pytestmark = [pytest.mark.unit]
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram"""
+
+    def test_empty(self):
+        """Test percentiles of an empty histogram"""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+        assert histogram.snapshot()["count"] == 0
+
+    def test_percentiles_within_relative_error(self):
+        """Test percentiles of a uniform distribution stay within bucket precision"""
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(float(value))
+
+        for quantile, expected in ((50, 500), (95, 950), (99, 990)):
+            assert histogram.percentile(quantile) == pytest.approx(expected, rel=0.05)
+        assert histogram.snapshot()["mean"] == pytest.approx(500.5)
+        assert histogram.max == 1000.0
+
+    def test_fixed_memory(self):
+        """Test bucket storage does not grow with recorded values"""
+        histogram = LatencyHistogram()
+        buckets = len(histogram._counts)
+        for value in range(10000):
+            histogram.record(value * 0.37)
+        assert len(histogram._counts) == buckets
+
+    def test_out_of_range_values_clamped(self):
+        """Test values outside the range are recorded, not dropped"""
+        histogram = LatencyHistogram(min_value=1.0, max_value=100.0)
+        histogram.record(0.0)
+        histogram.record(10_000.0)
+
+        assert histogram.count == 2
+        assert histogram.percentile(100) == 10_000.0
+
+    def test_record_count_and_merge(self):
+        """Test weighted records and merging"""
+        first = LatencyHistogram()
+        second = LatencyHistogram()
+        first.record(1.0, count=3)
+        second.record(100.0)
+
+        first.merge(second)
+
+        assert first.count == 4
+        assert first.percentile(50) == pytest.approx(1.0, rel=0.05)
+        assert first.percentile(100) == pytest.approx(100.0, rel=0.05)
+
+    def test_merge_rejects_different_layout(self):
+        """Test merging incompatible histograms fails"""
+        with pytest.raises(ValueError):
+            LatencyHistogram().merge(LatencyHistogram(sub_buckets=8))
+
+
+class TestSlowEventProfiler:
+    """Tests for SlowEventProfiler"""
+
+    def test_keeps_slowest_events(self):
+        """Test only the slowest N profiles are kept, slowest first"""
+        profiler = SlowEventProfiler(top_n=2)
+        for event_id, delay in (("fast", 0.0), ("slow", 0.2), ("medium", 0.1)):
+            assert profiler.run(event_id, lambda d: time.sleep(d) or d, delay) == delay
+
+        slowest = profiler.get_slowest()
+        assert [record["event_id"] for record in slowest] == ["slow", "medium"]
+        assert "sleep" in slowest[0]["profile"]
+
+    def test_exceptions_propagate(self):
+        """Test failures of the profiled function are re-raised"""
+        profiler = SlowEventProfiler(top_n=1)
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            profiler.run("event", fail)
+
+    def test_concurrent_events(self):
+        """Test an event running while another is profiled runs unprofiled"""
+        profiler = SlowEventProfiler(top_n=5)
+        started = threading.Event()
+        release = threading.Event()
+        results = {}
+
+        def slow():
+            started.set()
+            release.wait(5)
+            return "first"
+
+        def first():
+            results["first"] = profiler.run("first", slow)
+
+        thread = threading.Thread(target=first)
+        thread.start()
+        assert started.wait(5)
+
+        second = threading.Thread(target=lambda: results.setdefault("second", profiler.run("second", lambda: "second")))
+        second.start()
+        second.join(5)
+        release.set()
+        thread.join(5)
+
+        assert results == {"first": "first", "second": "second"}
+        assert [record["event_id"] for record in profiler.get_slowest()] == ["first"]
+
+    def test_profiler_errors_do_not_reach_event(self, monkeypatch):
+        """Test failures while recording a profile are swallowed"""
+        profiler = SlowEventProfiler(top_n=1)
+
+        def broken(*args):
+            raise TypeError("Cannot create or construct a pstats.Stats object")
+
+        monkeypatch.setattr(profiler, "_consider", broken)
+
+        assert profiler.run("event", lambda: 42) == 42
+        assert profiler.get_slowest() == []
+
+    def test_invalid_arguments(self):
+        """Test arguments are validated"""
+        with pytest.raises(ValueError):
+            SlowEventProfiler(top_n=0)
+        with pytest.raises(ValueError):
+            SlowEventProfiler(sample_rate=0.0)
+
+
+class TestPrometheusExport:
+    """Tests for Prometheus text rendering and the /metrics endpoint"""
+
+    def test_render(self):
+        """Test summaries and error counters are rendered"""
+        metrics = PipelineMetrics()
+        metrics.record_event(12.0)
+        metrics.record_plugin("geo", 5.0)
+        metrics.record_stage("geo+price", 6.0)
+        metrics.record_plugin_error("geo")
+
+        text = metrics.render_prometheus({"pipeline": "test"})
+
+        assert "# TYPE pipeline_plugin_latency_ms summary" in text
+        assert 'pipeline_plugin_latency_ms_count{pipeline="test",plugin="geo"} 1' in text
+        assert 'pipeline_stage_latency_ms{pipeline="test",stage="geo+price",quantile="0.99"}' in text
+        assert 'pipeline_plugin_errors_total{pipeline="test",plugin="geo"} 1' in text
+
+    def test_metrics_endpoint(self):
+        """Test registered pipelines are exposed once per metric family"""
+        first = PipelineMetrics()
+        first.record_plugin("geo", 1.0)
+        second = PipelineMetrics()
+        second.record_plugin("geo", 2.0)
+        registry.register("first", first)
+        registry.register("second", second)
+
+        try:
+            response = TestClient(app).get("/metrics")
+        finally:
+            registry.unregister("first")
+            registry.unregister("second")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert response.text.count("# TYPE pipeline_plugin_latency_ms summary") == 1
+        assert 'pipeline="first",plugin="geo"' in response.text
+        assert 'pipeline="second",plugin="geo"' in response.text
@@ -0,0 +1,249 @@
+"""Unit tests for thread- and process-mode detection plugins."""
+
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from core.fraud.detection_plugin_wrapper import DetectionPluginWrapper
+from core.fraud.plugin_executor import PluginExecutor
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult, RiskSignal
+from core.pipeline.listing_view import ListingView
+from core.plugin_manager import PluginManager
+
+pytestmark = pytest.mark.unit
+
+
+class WhereDetectionPlugin(DetectionPlugin):
+    """Detection plugin reporting the process and thread it ran in."""
+
+    def __init__(self, plugin_id: str = "where", mode: str = "inline", sleep_s: float = 0.0):
+        self.plugin_id = plugin_id
+        self.mode = mode
+        self.sleep_s = sleep_s
+        self.calls = 0
+
+    def get_metadata(self):
+        return {"id": self.plugin_id, "name": self.plugin_id, "version": "1.0.0"}
+
+    async def analyze(self, listing):
+        self.calls += 1
+        if listing.get("crash"):
+            os._exit(1)
+        if self.sleep_s:
+            time.sleep(self.sleep_s)  # Blocking, as CPU-bound work would be
+        signal = RiskSignal(
+            signal_type="where",
+            score=min(listing["price"] / 1_000_000, 1.0),
+            confidence=0.9,
+            reason="test",
+            metadata={"pid": os.getpid(), "thread": threading.get_ident(), "keys": sorted(listing)},
+        )
+        return DetectionResult(
+            plugin_id=self.plugin_id, signals=[signal], overall_score=signal.score, processing_time_ms=1.0
+        )
+
+    def get_weight(self):
+        return 0.5
+
+    def get_execution_mode(self):
+        return self.mode
+
+
+class WhereBatchDetectionPlugin(WhereDetectionPlugin):
+    """Vectorized variant reporting the process its batches ran in."""
+
+    async def analyze_batch(self, listings):
+        return [await self.analyze(listing) for listing in listings]
+
+
+def signal_metadata(score):
+    return score.plugin_results[0].signals[0].metadata
+
+
+@pytest.fixture
+def executor():
+    executor = PluginExecutor(max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+class TestExecutionModes:
+    """Tests for running plugins inline, in threads and in processes"""
+
+    async def test_inline_runs_on_event_loop(self):
+        """Test inline plugins are awaited directly and need no executor"""
+        orch = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin()])
+
+        score = await orch.run({"listing_id": "a", "price": 500_000})
+
+        assert signal_metadata(score)["thread"] == threading.get_ident()
+        assert orch.executor is None
+
+    async def test_thread_mode_keeps_loop_responsive(self, executor):
+        """Test blocking thread-mode plugins do not stall other coroutines"""
+        plugin = WhereDetectionPlugin(mode="thread", sleep_s=0.2)
+        orch = RiskScoringOrchestrator(detection_plugins=[plugin], executor=executor)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        score = await orch.run({"listing_id": "a", "price": 500_000})
+        task.cancel()
+
+        assert signal_metadata(score)["thread"] != threading.get_ident()
+        assert score.overall_score == pytest.approx(50.0)
+        assert ticks >= 5
+
+    async def test_process_mode_matches_inline(self, executor):
+        """Test process-mode plugins run in workers and score like inline ones"""
+        listing = {"listing_id": "a", "price": 800_000}
+        inline = await RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin()]).run(listing)
+        orch = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin(mode="process")], executor=executor)
+
+        score = await orch.run(listing)
+
+        assert signal_metadata(score)["pid"] != os.getpid()
+        assert score.overall_score == inline.overall_score
+        assert score.risk_level == inline.risk_level
+        assert executor.get_statistics()["process_pools"] == ["where"]
+
+    async def test_process_mode_plugin_loaded_once_per_worker(self, executor):
+        """Test workers keep their plugin instance between calls"""
+        plugin = WhereDetectionPlugin(mode="process")
+        orch = RiskScoringOrchestrator(detection_plugins=[plugin], executor=executor)
+
+        await orch.run_batch([{"listing_id": str(i), "price": 100_000} for i in range(20)])
+
+        assert plugin.calls == 0  # The parent's instance is never called
+        assert executor.get_statistics()["pools_started"] == 1
+
+    async def test_process_mode_sends_plain_listing(self, executor):
+        """Test copy-on-write views are sent as their merged fields"""
+        view = ListingView({"listing_id": "a", "price": 100_000, "stale": True})
+        view["price"] = 900_000
+        del view["stale"]
+        orch = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin(mode="process")], executor=executor)
+
+        score = await orch.run(view)
+
+        assert signal_metadata(score)["keys"] == ["listing_id", "price"]
+        assert score.overall_score == pytest.approx(90.0)
+
+    async def test_batch_hook_runs_in_worker(self, executor):
+        """Test analyze_batch() of process-mode plugins is one worker call"""
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[WhereBatchDetectionPlugin(mode="process")],
+            executor=executor,
+        )
+
+        batch = await orch.run_batch([{"listing_id": str(i), "price": 100_000 * i} for i in range(5)])
+
+        assert {signal_metadata(score)["pid"] for score in batch.scores} != {os.getpid()}
+        assert batch.overall_scores == pytest.approx([0.0, 10.0, 20.0, 30.0, 40.0])
+        assert executor.get_statistics()["process_calls"] == 1
+
+    async def test_dead_worker_skips_plugin_and_restarts_pool(self, executor):
+        """Test a crashed worker skips the plugin for the listing only"""
+        orch = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin(mode="process")], executor=executor)
+
+        crashed = await orch.run({"listing_id": "a", "price": 500_000, "crash": True})
+        recovered = await orch.run({"listing_id": "b", "price": 500_000})
+
+        assert crashed.plugin_results == []
+        assert recovered.overall_score == pytest.approx(50.0)
+        stats = executor.get_statistics()
+        assert stats["broken_pools"] == 1
+        assert stats["pools_started"] == 2
+
+    async def test_unknown_mode_runs_inline(self):
+        """Test unknown execution modes fall back to inline"""
+        orch = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin(mode="gpu")])
+
+        score = await orch.run({"listing_id": "a", "price": 500_000})
+
+        assert signal_metadata(score)["thread"] == threading.get_ident()
+
+    async def test_unregister_stops_pool(self, executor):
+        """Test pools of plugins that are gone are shut down"""
+        orch = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin(mode="process")], executor=executor)
+        assert executor.get_statistics()["process_pools"] == ["where"]
+
+        orch.unregister_plugin("where")
+
+        assert executor.get_statistics()["process_pools"] == []
+
+    def test_shutdown_only_stops_own_executor(self, executor):
+        """Test shutdown() leaves a caller's executor running"""
+        owned = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin(mode="thread")])
+        shared = RiskScoringOrchestrator(detection_plugins=[WhereDetectionPlugin(mode="thread")], executor=executor)
+        assert owned.executor is not None
+
+        owned.shutdown()
+        shared.shutdown()
+
+        assert owned.executor is None
+        assert shared.executor is executor
+
+    def test_invalid_pool_sizes(self):
+        """Test pool sizes are validated"""
+        with pytest.raises(ValueError):
+            PluginExecutor(max_threads=0)
+        with pytest.raises(ValueError):
+            PluginExecutor(max_workers=0)
+
+
+class TestManifestExecutionMode:
+    """Tests for execution modes declared in plugin manifests"""
+
+    @pytest.fixture
+    def manifest(self, tmp_path: Path):
+        def write(execution=None):
+            data = {
+                "id": "plugin-detection-where",
+                "name": "Where",
+                "version": "1.0.0",
+                "type": "detection",
+                "api_version": "1.0",
+                "description": "Test plugin",
+            }
+            if execution is not None:
+                data["execution"] = execution
+            path = tmp_path / "plugin.yaml"
+            path.write_text(yaml.safe_dump(data))
+            return path
+
+        return write
+
+    def test_manifest_mode_overrides_plugin(self, manifest):
+        """Test execution.mode from the manifest wins over get_execution_mode()"""
+        manager = PluginManager()
+        metadata = manager.register_from_manifest(manifest({"mode": "process"}))
+        manager._instances[metadata.id] = WhereDetectionPlugin(mode="thread")
+
+        (plugin,) = manager.get_detection_plugins()
+
+        assert metadata.execution_mode == "process"
+        assert isinstance(plugin, DetectionPluginWrapper)
+        assert plugin.get_execution_mode() == "process"
+
+    def test_plugin_mode_without_manifest_mode(self, manifest):
+        """Test plugins keep their own mode when the manifest declares none"""
+        manager = PluginManager()
+        metadata = manager.register_from_manifest(manifest())
+        manager._instances[metadata.id] = WhereDetectionPlugin(mode="thread")
+
+        (plugin,) = manager.get_detection_plugins()
+
+        assert metadata.execution_mode is None
+        assert plugin.get_execution_mode() == "thread"
@@ -0,0 +1,207 @@
+"""Performance benchmarks for the in-memory and segment log queues."""
+
+import threading
+import time
+from statistics import median
+from typing import Any, Dict, List
+
+import numpy as np
+import pytest
+
+from core.queue import InMemoryQueuePlugin, SegmentLogQueuePlugin
+
+pytestmark = [pytest.mark.unit, pytest.mark.messaging, pytest.mark.benchmark, pytest.mark.slow]
+
+
+@pytest.fixture
+def queue():
+    plugin = InMemoryQueuePlugin()
+    plugin.connect()
+    yield plugin
+    plugin.disconnect()
+
+
+def test_benchmark_publish_to_callback_latency(queue: InMemoryQueuePlugin) -> None:
+    """Benchmark time from publish() to callback under background load."""
+    num_messages = 500
+    idle_topics = 20
+    latencies_ms: List[float] = []
+    done = threading.Event()
+
+    def callback(message: Dict[str, Any]) -> None:
+        latencies_ms.append((time.perf_counter() - message["sent"]) * 1000)
+        if len(latencies_ms) == num_messages:
+            done.set()
+
+    # Idle subscriptions used to wake up every 100ms each
+    for i in range(idle_topics):
+        queue.subscribe(f"bench.idle.{i}", lambda message: None)
+
+    # Background traffic on other topics
+    stop = threading.Event()
+
+    def background() -> None:
+        while not stop.is_set():
+            queue.publish_batch("bench.background", [{"data": i} for i in range(10)])
+            time.sleep(0.001)
+
+    queue.subscribe("bench.background", lambda message: None)
+    load = threading.Thread(target=background, daemon=True)
+    load.start()
+
+    queue.subscribe("bench.latency", callback)
+    try:
+        for _ in range(num_messages):
+            queue.publish("bench.latency", {"sent": time.perf_counter()})
+            time.sleep(0.0005)
+        assert done.wait(timeout=10.0)
+    finally:
+        stop.set()
+        load.join(timeout=1.0)
+
+    p50, p99 = np.percentile(latencies_ms, [50, 99])
+    print(f"\n=== Publish-to-callback latency ({num_messages} messages, {idle_topics} idle subscriptions) ===")
+    print(f"p50: {p50:.3f}ms, p99: {p99:.3f}ms, max: {max(latencies_ms):.3f}ms")
+
+    assert median(latencies_ms) < 1.0
+    assert p99 < 20.0
+
+
+def test_benchmark_blocking_get_latency(queue: InMemoryQueuePlugin) -> None:
+    """Benchmark time from publish() to a blocked get() returning."""
+    num_messages = 300
+    latencies_ms: List[float] = []
+
+    def consumer() -> None:
+        for _ in range(num_messages):
+            envelope = queue.get("bench.get", timeout=5.0)
+            latencies_ms.append((time.perf_counter() - envelope["payload"]["sent"]) * 1000)
+            queue.acknowledge(envelope["message_id"])
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    for _ in range(num_messages):
+        queue.publish("bench.get", {"sent": time.perf_counter()})
+        time.sleep(0.0005)
+    thread.join(timeout=10.0)
+
+    p50, p99 = np.percentile(latencies_ms, [50, 99])
+    print(f"\n=== Publish-to-get latency ({num_messages} messages) ===")
+    print(f"p50: {p50:.3f}ms, p99: {p99:.3f}ms")
+
+    assert len(latencies_ms) == num_messages
+    assert p50 < 1.0
+
+
+def test_benchmark_worker_pool_throughput(queue: InMemoryQueuePlugin) -> None:
+    """Benchmark one topic drained by one worker vs a pool, with callbacks blocking on I/O."""
+    num_messages = 200
+
+    def drain(group: str, workers: int) -> float:
+        received: List[int] = []
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def callback(message: Dict[str, Any]) -> None:
+            time.sleep(0.002)  # Simulated I/O, releases the GIL
+            with lock:
+                received.append(message["seq"])
+                if len(received) == num_messages:
+                    done.set()
+
+        start = time.perf_counter()
+        queue.subscribe("bench.pool", callback, consumer_group=group, workers=workers)
+        assert done.wait(timeout=10.0)
+        assert sorted(received) == list(range(num_messages))
+        return (time.perf_counter() - start) * 1000
+
+    queue.create_consumer_group("bench.pool", "single")
+    queue.create_consumer_group("bench.pool", "pool")
+    queue.publish_batch("bench.pool", [{"seq": i} for i in range(num_messages)])
+    single_ms = drain("single", 1)
+    pool_ms = drain("pool", 8)
+
+    print(f"\n=== Worker pool ({num_messages} messages x 2ms I/O, same stored messages per group) ===")
+    print(f"1 worker:  {single_ms:.2f}ms")
+    print(f"8 workers: {pool_ms:.2f}ms")
+
+    assert pool_ms < single_ms / 3
+
+
+def test_benchmark_producer_consumer_contention(queue: InMemoryQueuePlugin) -> None:
+    """Benchmark throughput as producer/consumer pairs are added, each pair on its own topic."""
+    per_producer = 2000
+
+    def run(pairs: int) -> float:
+        def produce(topic: str) -> None:
+            for i in range(per_producer):
+                queue.publish(topic, {"seq": i})
+
+        def consume(topic: str) -> None:
+            for _ in range(per_producer):
+                envelope = queue.get(topic, timeout=5.0)
+                queue.acknowledge(envelope["message_id"])
+
+        topics = [f"bench.contention.{pairs}.{i}" for i in range(pairs)]
+        threads = [threading.Thread(target=consume, args=(topic,)) for topic in topics]
+        threads += [threading.Thread(target=produce, args=(topic,)) for topic in topics]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        assert all(queue.get_queue_size(topic) == 0 for topic in topics)
+        return pairs * per_producer / elapsed
+
+    results = {pairs: run(pairs) for pairs in (1, 2, 4, 8)}
+
+    print(f"\n=== Producer/consumer contention ({per_producer} messages per producer) ===")
+    for pairs, throughput in results.items():
+        print(f"{pairs} pairs: {throughput:>10,.0f} msg/s ({throughput / results[1]:.2f}x)")
+
+    stats = queue.get_statistics()
+    assert stats["messages_acked"] == sum(results) * per_producer
+    assert stats["pending_acks"] == 0
+    # Pairs on separate topics share no lock, so adding them must not collapse throughput
+    assert results[8] > results[1] * 0.5
+
+
+def test_benchmark_segment_log_throughput(tmp_path) -> None:
+    """Benchmark durable publish throughput, recovery from disk and consumption."""
+    num_messages = 200_000
+    batch_size = 1000
+    messages = [{"listing_id": str(i), "price": i} for i in range(batch_size)]
+
+    queue = SegmentLogQueuePlugin(tmp_path / "queue")
+    queue.connect()
+    start = time.perf_counter()
+    for _ in range(num_messages // batch_size):
+        queue.publish_batch("bench.segments", messages)
+    publish_rate = num_messages / (time.perf_counter() - start)
+    segments = queue.get_statistics()["segments"]
+    queue.disconnect()
+
+    queue = SegmentLogQueuePlugin(tmp_path / "queue")
+    start = time.perf_counter()
+    queue.connect()
+    recovery_rate = num_messages / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(num_messages):
+        queue.acknowledge(queue.get("bench.segments", timeout=0)["message_id"])
+    consume_rate = num_messages / (time.perf_counter() - start)
+    queue.flush()
+    remaining = queue.get_statistics()["segments"]
+    queue.disconnect()
+
+    print(f"\n=== Segment log ({num_messages} messages, batches of {batch_size}, {segments} segments) ===")
+    print(f"publish_batch:     {publish_rate:>10,.0f} msg/s")
+    print(f"recovery:          {recovery_rate:>10,.0f} msg/s")
+    print(f"get + acknowledge: {consume_rate:>10,.0f} msg/s")
+
+    # Rates are printed only; consumed segments are deleted, except the active one
+    assert segments > 1
+    assert remaining == 1
@@ -0,0 +1,282 @@
+"""Tests for bounded topics and the bounded dead letter queue of the in-memory queue"""
+
+import json
+import time
+from threading import Thread
+from typing import Any, List
+
+import pytest
+
+from core.queue import InMemoryQueuePlugin
+from core.queue.capacity import OverflowPolicy, QueueFullError, SpillFile, TopicCapacity, approximate_size
+
+pytestmark = [pytest.mark.unit, pytest.mark.messaging]
+
+
+class TestTopicCapacity:
+    """Tests for TopicCapacity and its helpers"""
+
+    def test_invalid_limits(self):
+        """Test limits are validated"""
+        with pytest.raises(ValueError):
+            TopicCapacity(max_messages=0)
+        with pytest.raises(ValueError):
+            TopicCapacity(max_bytes=-1)
+        with pytest.raises(ValueError):
+            TopicCapacity(block_timeout=-1.0)
+        with pytest.raises(ValueError):
+            TopicCapacity(overflow="drop_newest")
+
+    def test_fits(self):
+        """Test both limits apply"""
+        capacity = TopicCapacity(max_messages=10, max_bytes=1000, overflow="spill")
+        assert capacity.overflow is OverflowPolicy.SPILL
+        assert capacity.fits(10, 1000)
+        assert not capacity.fits(11, 10)
+        assert not capacity.fits(1, 1001)
+
+    def test_approximate_size_grows_with_content(self):
+        """Test nested containers and strings are counted"""
+        small = {"listing_id": "1", "images": []}
+        large = {"listing_id": "1", "images": ["x" * 1000, "y" * 1000]}
+        assert approximate_size(large) > approximate_size(small) + 2000
+
+    def test_spill_file(self, tmp_path):
+        """Test messages are read back in order, ahead of the head and after truncation"""
+        spill = SpillFile(tmp_path / "topic.spill")
+        spill.append([{"seq": 0}, {"seq": 1}, {"seq": 2}])
+        assert len(spill) == 3
+        assert spill.read(2) == {"seq": 2}
+        assert spill.popleft() == {"seq": 0}
+        spill.discard(2)
+        assert len(spill) == 0
+        assert spill.path.stat().st_size == 0
+
+        spill.append([{"seq": 3}])
+        assert spill.popleft() == {"seq": 3}
+        spill.close()
+        assert not spill.path.exists()
+
+
+class TestInMemoryQueueCapacity:
+    """Tests for overflow policies of bounded topics"""
+
+    @pytest.fixture
+    def queue(self, tmp_path):
+        plugin = InMemoryQueuePlugin(spill_dir=tmp_path / "spill")
+        plugin.connect()
+        yield plugin
+        plugin.disconnect()
+
+    def _drain(self, queue, topic: str, group: str = None) -> List[Any]:
+        received = []
+        while True:
+            envelope = queue.get(topic, timeout=0, consumer_group=group)
+            if envelope is None:
+                return received
+            queue.acknowledge(envelope["message_id"])
+            received.append(envelope["payload"]["seq"])
+
+    def test_unbounded_by_default(self, queue):
+        """Test topics without capacity accept everything and report estimated memory"""
+        queue.publish_batch("test.unbounded", [{"seq": i} for i in range(200)])
+
+        stats = queue.get_statistics()
+        assert stats["memory_messages"] == 200
+        assert stats["memory_bytes"] > 0
+        assert stats["memory_bytes_by_topic"]["test.unbounded"] == stats["memory_bytes"]
+
+    def test_block_times_out(self, queue):
+        """Test a publisher to a full topic gives up after block_timeout"""
+        queue.create_topic("test.block", capacity=TopicCapacity(max_messages=2, block_timeout=0.05))
+        queue.create_consumer_group("test.block", "default")
+        queue.publish_batch("test.block", [{"seq": 0}, {"seq": 1}])
+
+        start = time.monotonic()
+        with pytest.raises(QueueFullError):
+            queue.publish("test.block", {"seq": 2})
+        assert time.monotonic() - start >= 0.05
+        assert queue.get_queue_size("test.block") == 2
+
+    def test_block_resumes_when_consumed(self, queue):
+        """Test a blocked publisher continues once a consumer receives a message"""
+        queue.create_topic("test.block_resume", capacity=TopicCapacity(max_messages=2))
+        queue.create_consumer_group("test.block_resume", "default")
+        queue.publish_batch("test.block_resume", [{"seq": 0}, {"seq": 1}])
+
+        publisher = Thread(target=queue.publish, args=("test.block_resume", {"seq": 2}))
+        publisher.start()
+        time.sleep(0.05)
+        assert publisher.is_alive()
+
+        queue.get("test.block_resume", timeout=0)
+        publisher.join(timeout=1.0)
+        assert not publisher.is_alive()
+        assert self._drain(queue, "test.block_resume") == [1, 2]
+
+    def test_delayed_messages_respect_block_capacity(self, queue):
+        """Test due delayed messages wait for room in a full BLOCK topic"""
+        queue.create_topic("test.block_delayed", capacity=TopicCapacity(max_messages=2))
+        queue.create_consumer_group("test.block_delayed", "default")
+        queue.publish_batch("test.block_delayed", [{"seq": 0}, {"seq": 1}])
+        queue.publish_delayed("test.block_delayed", {"seq": 2}, delay_ms=10)
+
+        time.sleep(0.1)
+        assert queue.get_queue_size("test.block_delayed") == 2
+
+        queue.acknowledge(queue.get("test.block_delayed", timeout=0)["message_id"])
+        deadline = time.monotonic() + 2.0
+        while queue.get_queue_size("test.block_delayed") < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert self._drain(queue, "test.block_delayed") == [1, 2]
+
+    def test_blocked_publisher_released_by_disconnect(self, queue):
+        """Test disconnecting fails blocked publishers instead of hanging them"""
+        queue.create_topic("test.block_disconnect", capacity=TopicCapacity(max_messages=1))
+        queue.publish("test.block_disconnect", {"seq": 0})
+        errors: List[Exception] = []
+
+        def publish() -> None:
+            try:
+                queue.publish("test.block_disconnect", {"seq": 1})
+            except ConnectionError as e:
+                errors.append(e)
+
+        publisher = Thread(target=publish)
+        publisher.start()
+        time.sleep(0.05)
+        queue.disconnect()
+        publisher.join(timeout=1.0)
+
+        assert not publisher.is_alive()
+        assert len(errors) == 1
+
+    def test_drop_oldest(self, queue):
+        """Test the oldest messages are evicted, even if not yet received"""
+        queue.create_topic("test.drop", capacity=TopicCapacity(max_messages=3, overflow="drop_oldest"))
+        queue.create_consumer_group("test.drop", "default")
+        queue.publish_batch("test.drop", [{"seq": i} for i in range(5)])
+
+        assert queue.get_queue_size("test.drop") == 3
+        assert self._drain(queue, "test.drop") == [2, 3, 4]
+        assert queue.get_statistics()["messages_dropped"] == 2
+
+    def test_drop_oldest_by_bytes(self, queue):
+        """Test the byte limit evicts large messages"""
+        message = {"seq": 0, "data": "x" * 1000}
+        limit = approximate_size({"payload": message}) * 3
+        queue.create_topic("test.drop_bytes", capacity=TopicCapacity(max_bytes=limit, overflow="drop_oldest"))
+        for i in range(10):
+            queue.publish("test.drop_bytes", {**message, "seq": i})
+
+        stats = queue.get_statistics()
+        assert 0 < stats["memory_bytes"] <= limit
+        assert stats["messages_dropped"] == 10 - stats["memory_messages"]
+        assert self._drain(queue, "test.drop_bytes")[-1] == 9
+
+    def test_oversized_message_accepted_into_empty_topic(self, queue):
+        """Test a message larger than the byte limit does not block forever"""
+        queue.create_topic("test.oversized", capacity=TopicCapacity(max_bytes=100, block_timeout=0))
+        queue.publish("test.oversized", {"seq": 0, "data": "x" * 1000})
+        with pytest.raises(QueueFullError):
+            queue.publish("test.oversized", {"seq": 1})
+
+    def test_spill(self, queue, tmp_path):
+        """Test overflow goes to disk and comes back in order"""
+        queue.create_topic("test.spill", capacity=TopicCapacity(max_messages=3, overflow="spill"))
+        queue.create_consumer_group("test.spill", "default")
+        queue.publish_batch("test.spill", [{"seq": i} for i in range(10)])
+
+        stats = queue.get_statistics()
+        assert stats["memory_messages"] == 3
+        assert stats["spilled_messages"] == 7
+        assert stats["messages_spilled"] == 7
+        assert queue.get_queue_size("test.spill") == 10
+        assert len(list((tmp_path / "spill").iterdir())) == 1
+
+        assert self._drain(queue, "test.spill") == list(range(10))
+        assert queue.get_statistics()["spilled_messages"] == 0
+
+    def test_spill_with_groups_at_different_positions(self, queue):
+        """Test a fast group reads spilled messages while a slow group holds memory"""
+        queue.create_topic("test.spill_groups", capacity=TopicCapacity(max_messages=2, overflow="spill"))
+        queue.create_consumer_group("test.spill_groups", "fast")
+        queue.create_consumer_group("test.spill_groups", "slow")
+        queue.publish_batch("test.spill_groups", [{"seq": i} for i in range(6)])
+
+        assert self._drain(queue, "test.spill_groups", "fast") == list(range(6))
+        assert queue.get_statistics()["memory_messages"] == 2
+
+        queue.publish("test.spill_groups", {"seq": 6})
+        assert self._drain(queue, "test.spill_groups", "slow") == list(range(7))
+        assert self._drain(queue, "test.spill_groups", "fast") == [6]
+
+    def test_purge_and_delete_clear_spill(self, queue, tmp_path):
+        """Test purging empties the spill file and deleting removes it"""
+        queue.create_topic("test.spill_purge", capacity=TopicCapacity(max_messages=1, overflow="spill"))
+        queue.publish_batch("test.spill_purge", [{"seq": i} for i in range(5)])
+
+        assert queue.purge_queue("test.spill_purge") == 5
+        assert queue.get_statistics()["spilled_messages"] == 0
+
+        queue.delete_topic("test.spill_purge")
+        assert list((tmp_path / "spill").iterdir()) == []
+
+    def test_default_capacity_applies_to_new_topics(self):
+        """Test the queue-wide capacity is used for topics created on publish"""
+        queue = InMemoryQueuePlugin(capacity=TopicCapacity(max_messages=2, overflow="drop_oldest"))
+        queue.connect()
+        queue.publish_batch("test.default_capacity", [{"seq": i} for i in range(4)])
+
+        assert queue.get_queue_size("test.default_capacity") == 2
+        queue.disconnect()
+
+    def test_delayed_message_does_not_block_timer(self, queue):
+        """Test a delayed message due for a full topic does not hold up other timers"""
+        queue.create_topic("test.delayed_full", capacity=TopicCapacity(max_messages=1))
+        queue.publish("test.delayed_full", {"seq": 0})
+        queue.publish_delayed("test.delayed_full", {"seq": 1}, delay_ms=10)
+        queue.publish_delayed("test.delayed_other", {"seq": 0}, delay_ms=50)
+
+        deadline = time.monotonic() + 2.0
+        while queue.get_queue_size("test.delayed_other") < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert queue.get_queue_size("test.delayed_other") == 1
+        assert queue.get_queue_size("test.delayed_full") == 1
+
+
+class TestBoundedDeadLetterQueue:
+    """Tests for the dead letter queue limit"""
+
+    def _dead_letter(self, queue, count: int) -> None:
+        queue.publish_batch("test.dlq", [{"seq": i} for i in range(count)])
+        for _ in range(count):
+            queue.reject(queue.get("test.dlq", timeout=0)["message_id"], requeue=False)
+
+    def test_invalid_limit(self):
+        """Test the limit is validated"""
+        with pytest.raises(ValueError):
+            InMemoryQueuePlugin(max_dead_letter=0)
+
+    def test_oldest_dropped_without_file(self):
+        """Test the newest dead letters are kept"""
+        queue = InMemoryQueuePlugin(max_dead_letter=3)
+        queue.connect()
+        self._dead_letter(queue, 5)
+
+        assert [m["payload"]["seq"] for m in queue.get_dead_letter_messages()] == [2, 3, 4]
+        assert queue.get_statistics()["dead_letters_dropped"] == 2
+        queue.disconnect()
+
+    def test_oldest_spilled_to_file(self, tmp_path):
+        """Test dead letters moved out of memory are appended to the file"""
+        path = tmp_path / "dead_letters.jsonl"
+        queue = InMemoryQueuePlugin(max_dead_letter=2, dead_letter_file=path)
+        queue.connect()
+        self._dead_letter(queue, 5)
+        queue.disconnect()
+
+        spilled = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [m["payload"]["seq"] for m in spilled] == [0, 1, 2]
+        assert [m["payload"]["seq"] for m in queue.get_dead_letter_messages()] == [3, 4]
+        assert queue.get_statistics()["dead_letters_spilled"] == 3
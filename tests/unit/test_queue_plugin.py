@@ -1,7 +1,7 @@
 """Tests for queue plugin implementations"""
 
 import time
-from threading import Event
+from threading import Event, Lock, Thread, current_thread
 from typing import Any, Dict, List
 
 import pytest
@@ -15,16 +15,21 @@ class TestInMemoryQueuePlugin:
     """Tests for InMemoryQueuePlugin"""
 
     @pytest.fixture
-    def queue(self):
+    def make_queue(self):
+        """Factory for unconnected queue instances"""
+        return InMemoryQueuePlugin
+
+    @pytest.fixture
+    def queue(self, make_queue):
         """Create queue instance"""
-        plugin = InMemoryQueuePlugin()
+        plugin = make_queue()
         plugin.connect()
         yield plugin
         plugin.disconnect()
 
-    def test_connect_disconnect(self):
+    def test_connect_disconnect(self, make_queue):
         """Test connection lifecycle"""
-        plugin = InMemoryQueuePlugin()
+        plugin = make_queue()
 
         assert not plugin.is_connected()
 
@@ -312,6 +317,84 @@ class TestInMemoryQueuePlugin:
 
         queue.unsubscribe(sub_id)
 
+    def test_publish_batch(self, queue):
+        """Test bulk publishing keeps order and returns one ID per message"""
+        topic = "test.publish_batch"
+        queue.create_topic(topic)
+
+        message_ids = queue.publish_batch(topic, [{"seq": i} for i in range(5)])
+
+        assert len(message_ids) == 5
+        assert len(set(message_ids)) == 5
+        assert queue.get_queue_size(topic) == 5
+        assert queue.get_statistics()["messages_published"] == 5
+
+    def test_publish_delayed(self, queue):
+        """Test delayed messages only become visible once due"""
+        topic = "test.publish_delayed"
+        queue.create_topic(topic)
+
+        queue.publish_delayed(topic, {"seq": 2}, delay_ms=200)
+        queue.publish_delayed(topic, {"seq": 1}, delay_ms=50)
+
+        assert queue.get_queue_size(topic) == 0
+        assert queue.get_statistics()["delayed_messages"] == 2
+
+        time.sleep(0.12)
+        assert queue.get_queue_size(topic) == 1
+
+        time.sleep(0.2)
+        assert queue.get_queue_size(topic) == 2
+        assert [queue.get(topic, timeout=0)["payload"]["seq"] for _ in range(2)] == [1, 2]
+        assert queue.get_statistics()["delayed_messages"] == 0
+
+    def test_publish_delayed_without_delay(self, queue):
+        """Test a non-positive delay publishes immediately"""
+        queue.publish_delayed("test.no_delay", {"seq": 1}, delay_ms=0)
+        assert queue.get_queue_size("test.no_delay") == 1
+
+    def test_subscribe_batch(self, queue):
+        """Test batch subscription delivers messages in bounded batches"""
+        topic = "test.subscribe_batch"
+        queue.create_topic(topic)
+        queue.publish_batch(topic, [{"seq": i} for i in range(25)])
+
+        batches: List[List[Dict[str, Any]]] = []
+        done = Event()
+
+        def callback(messages: List[Dict[str, Any]]) -> None:
+            batches.append(messages)
+            if sum(len(b) for b in batches) == 25:
+                done.set()
+
+        sub_id = queue.subscribe_batch(topic, callback, batch_size=10, max_wait_ms=10)
+
+        assert done.wait(timeout=2.0)
+        assert all(len(b) <= 10 for b in batches)
+        assert [m["seq"] for b in batches for m in b] == list(range(25))
+
+        stats = queue.get_statistics()
+        assert stats["messages_consumed"] == 25
+        assert stats["pending_acks"] == 0
+
+        queue.unsubscribe(sub_id)
+
+    def test_subscribe_batch_error_moves_batch_to_dead_letter(self, queue):
+        """Test a failing batch callback rejects every message in the batch"""
+        topic = "test.batch_error"
+        queue.create_topic(topic)
+        queue.publish_batch(topic, [{"seq": i} for i in range(3)])
+
+        def failing_callback(messages: List[Dict[str, Any]]) -> None:
+            raise ValueError("Test error")
+
+        sub_id = queue.subscribe_batch(topic, failing_callback, batch_size=3, max_wait_ms=10)
+        time.sleep(0.3)
+
+        assert len(queue.get_dead_letter_messages()) == 3
+
+        queue.unsubscribe(sub_id)
+
     def test_error_in_callback(self, queue):
         """Test that errors in callbacks are handled gracefully"""
         topic = "test.error"
@@ -331,3 +414,224 @@ class TestInMemoryQueuePlugin:
         assert health["status"] == "healthy"
 
         queue.unsubscribe(sub_id)
+
+    def test_get_returns_next_message(self, queue):
+        """Test blocking get takes messages in order and holds them for acknowledgment"""
+        topic = "test.get"
+        queue.publish_batch(topic, [{"seq": i} for i in range(2)])
+
+        envelope = queue.get(topic, timeout=1.0)
+
+        assert envelope["payload"] == {"seq": 0}
+        assert queue.get_queue_size(topic) == 1
+        assert queue.get_statistics()["pending_acks"] == 1
+
+        queue.acknowledge(envelope["message_id"])
+        assert queue.get_statistics()["pending_acks"] == 0
+
+    def test_get_waits_for_publish(self, queue):
+        """Test a blocked get is woken by a publisher"""
+        topic = "test.get_wait"
+        received: List[Dict[str, Any]] = []
+
+        thread = Thread(target=lambda: received.append(queue.get(topic, timeout=2.0)))
+        thread.start()
+        time.sleep(0.05)
+        queue.publish(topic, {"data": "late"})
+        thread.join(timeout=2.0)
+
+        assert received[0]["payload"] == {"data": "late"}
+
+    def test_get_timeout(self, queue):
+        """Test get returns None when nothing arrives in time"""
+        start = time.perf_counter()
+        assert queue.get("test.get_empty", timeout=0.05) is None
+        assert time.perf_counter() - start >= 0.05
+
+    def test_get_rejected_message_is_redelivered(self, queue):
+        """Test a message rejected with requeue is returned by the next get"""
+        topic = "test.get_reject"
+        queue.publish(topic, {"data": "retry"})
+
+        envelope = queue.get(topic, timeout=1.0)
+        queue.reject(envelope["message_id"], requeue=True)
+
+        assert queue.get(topic, timeout=1.0)["message_id"] == envelope["message_id"]
+
+    def test_disconnect_wakes_blocked_get(self, make_queue):
+        """Test disconnecting releases consumers blocked in get"""
+        plugin = make_queue()
+        plugin.connect()
+        received: List[Any] = []
+
+        thread = Thread(target=lambda: received.append(plugin.get("test.get_disconnect")))
+        thread.start()
+        time.sleep(0.05)
+        plugin.disconnect()
+        thread.join(timeout=1.0)
+
+        assert not thread.is_alive()
+        assert received == [None]
+
+    def test_idle_subscription_stops_promptly(self, queue):
+        """Test unsubscribing wakes an idle worker instead of waiting out a poll"""
+        sub_id = queue.subscribe("test.idle", lambda message: None)
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        queue.unsubscribe(sub_id)
+
+        assert time.perf_counter() - start < 0.05
+
+    def test_subscribe_delivers_without_polling_delay(self, queue):
+        """Test a message published to an idle topic reaches the callback immediately"""
+        topic = "test.wakeup"
+        delivered = Event()
+        sub_id = queue.subscribe(topic, lambda message: delivered.set())
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        queue.publish(topic, {"data": "now"})
+
+        assert delivered.wait(timeout=1.0)
+        assert time.perf_counter() - start < 0.05
+
+        queue.unsubscribe(sub_id)
+
+    def _collect(self, queue, topic, count, **kwargs):
+        """Subscribe and return (received payloads, event set after ``count`` messages)"""
+        received: List[Dict[str, Any]] = []
+        done = Event()
+
+        def callback(message: Dict[str, Any]) -> None:
+            received.append(message)
+            if len(received) == count:
+                done.set()
+
+        return received, done, queue.subscribe(topic, callback, **kwargs)
+
+    def test_consumer_groups_fan_out(self, queue):
+        """Test every consumer group receives every message"""
+        topic = "test.fan_out"
+        audit, audit_done, _ = self._collect(queue, topic, 20, consumer_group="audit")
+        scoring, scoring_done, _ = self._collect(queue, topic, 20, consumer_group="scoring")
+
+        queue.publish_batch(topic, [{"seq": i} for i in range(20)])
+
+        assert audit_done.wait(timeout=2.0) and scoring_done.wait(timeout=2.0)
+        assert [m["seq"] for m in audit] == [m["seq"] for m in scoring] == list(range(20))
+        assert queue.get_statistics()["messages_consumed"] == 40
+
+    def test_consumer_group_competing_workers(self, queue):
+        """Test workers and subscriptions of one group share its messages"""
+        topic = "test.competing"
+        received: List[int] = []
+        threads = set()
+        done = Event()
+
+        def callback(message: Dict[str, Any]) -> None:
+            threads.add(current_thread().name)
+            time.sleep(0.002)
+            received.append(message["seq"])
+            if len(received) == 40:
+                done.set()
+
+        queue.subscribe(topic, callback, consumer_group="scoring", workers=3)
+        queue.subscribe(topic, callback, consumer_group="scoring")
+        queue.publish_batch(topic, [{"seq": i} for i in range(40)])
+
+        assert done.wait(timeout=2.0)
+        time.sleep(0.05)
+        assert sorted(received) == list(range(40))
+        assert len(threads) > 1
+
+        groups = queue.get_consumer_groups(topic)
+        assert groups == {"scoring": {"lag": 0, "subscriptions": 2, "workers": 4}}
+
+    def test_messages_stored_once(self, queue):
+        """Test groups read the same stored message, which is dropped once all have read it"""
+        topic = "test.stored_once"
+        queue.create_consumer_group(topic, "a")
+        queue.create_consumer_group(topic, "b")
+        queue.publish_batch(topic, [{"seq": i} for i in range(3)])
+
+        first = queue.get(topic, timeout=0, consumer_group="a")
+        assert first is queue.get(topic, timeout=0, consumer_group="b")
+        assert queue.get_statistics()["pending_acks"] == 2
+
+        for _ in range(2):
+            queue.get(topic, timeout=0, consumer_group="a")
+        assert queue.get_queue_size(topic) == 2
+        assert queue.get_consumer_groups(topic)["a"]["lag"] == 0
+
+        for _ in range(2):
+            queue.get(topic, timeout=0, consumer_group="b")
+        assert queue.get_queue_size(topic) == 0
+        assert len(queue._topics[topic].entries) == 0
+
+    def test_rejected_message_redelivered_to_its_group(self, queue):
+        """Test a requeued message goes back to the rejecting group only"""
+        topic = "test.group_reject"
+        queue.create_consumer_group(topic, "a")
+        queue.create_consumer_group(topic, "b")
+        queue.publish(topic, {"data": "retry"})
+
+        envelope = queue.get(topic, timeout=0, consumer_group="a")
+        queue.reject(envelope["message_id"], requeue=True)
+
+        assert queue.get(topic, timeout=0, consumer_group="a")["message_id"] == envelope["message_id"]
+        assert queue.get(topic, timeout=0, consumer_group="b")["message_id"] == envelope["message_id"]
+        assert queue.get(topic, timeout=0, consumer_group="b") is None
+
+    def test_late_consumer_group_starts_at_oldest_message(self, queue):
+        """Test a new group receives the messages other groups have not all read"""
+        topic = "test.late_group"
+        queue.publish_batch(topic, [{"seq": i} for i in range(3)])
+        queue.get(topic, timeout=0)
+
+        assert queue.get(topic, timeout=0, consumer_group="late")["payload"] == {"seq": 1}
+
+    def test_invalid_workers(self, queue):
+        """Test worker pools need at least one thread"""
+        with pytest.raises(ValueError):
+            queue.subscribe("test.workers", lambda message: None, workers=0)
+
+    def test_concurrent_producers_and_consumers(self, queue):
+        """Test every message is consumed and acknowledged exactly once under contention"""
+        topics = [f"test.mpmc.{i}" for i in range(4)]
+        per_producer = 250
+        received: List[int] = []
+        lock = Lock()
+        done = Event()
+
+        def callback(message: Dict[str, Any]) -> None:
+            with lock:
+                received.append(message["seq"])
+                if len(received) == len(topics) * 2 * per_producer:
+                    done.set()
+
+        for topic in topics:
+            queue.subscribe(topic, callback, workers=2)
+
+        def produce(topic: str, offset: int) -> None:
+            for i in range(per_producer):
+                queue.publish(topic, {"seq": offset + i})
+
+        producers = [
+            Thread(target=produce, args=(topic, (2 * index + copy) * per_producer))
+            for index, topic in enumerate(topics)
+            for copy in range(2)
+        ]
+        for thread in producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+
+        assert done.wait(timeout=5.0)
+        assert sorted(received) == list(range(len(topics) * 2 * per_producer))
+
+        time.sleep(0.05)
+        stats = queue.get_statistics()
+        assert stats["messages_published"] == stats["messages_consumed"] == stats["messages_acked"] == len(received)
+        assert stats["pending_acks"] == 0
+        assert stats["active_subscriptions"] == len(topics)
@@ -0,0 +1,206 @@
+"""Unit tests for the content-addressed detection result cache."""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from core.fraud.result_cache import DetectionResultCache, plugin_key
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult
+from core.models.plugin import PluginMetadata
+from core.plugin_manager import PluginManager
+
+pytestmark = pytest.mark.unit
+
+
+def make_result(plugin_id: str = "plugin1", score: float = 0.5) -> DetectionResult:
+    return DetectionResult(plugin_id=plugin_id, signals=[], overall_score=score, processing_time_ms=1.0)
+
+
+class CountingDetectionPlugin(DetectionPlugin):
+    """Detection plugin counting analyze() calls."""
+
+    def __init__(self, plugin_id: str, version: str = "1.0.0", weight: float = 0.5):
+        self.plugin_id = plugin_id
+        self.version = version
+        self.weight = weight
+        self.calls = 0
+
+    def get_metadata(self):
+        return {"id": self.plugin_id, "name": self.plugin_id, "version": self.version}
+
+    async def analyze(self, listing):
+        self.calls += 1
+        return make_result(self.plugin_id, min(listing["price"] / 1_000_000, 1.0))
+
+    def get_weight(self):
+        return self.weight
+
+
+class TestFingerprint:
+    """Tests for listing fingerprints"""
+
+    def test_stable_across_key_order_and_volatile_fields(self):
+        """Test unchanged re-scrapes get the same fingerprint"""
+        cache = DetectionResultCache()
+        first = {"listing_id": "a", "price": {"amount": 100, "currency": "EUR"}, "scraped_at": "2024-01-01"}
+        rescraped = {"scraped_at": "2024-02-01", "price": {"currency": "EUR", "amount": 100}, "listing_id": "a"}
+
+        assert cache.fingerprint(first) == cache.fingerprint(rescraped)
+
+    def test_content_change_changes_fingerprint(self):
+        """Test changed fraud-relevant content gets a new fingerprint"""
+        cache = DetectionResultCache()
+
+        assert cache.fingerprint({"listing_id": "a", "price": 100}) != cache.fingerprint(
+            {"listing_id": "a", "price": 90}
+        )
+
+    def test_custom_fields(self):
+        """Test only configured fields are hashed"""
+        cache = DetectionResultCache(fingerprint_fields=["price"])
+
+        assert cache.fingerprint({"listing_id": "a", "price": 100}) == cache.fingerprint(
+            {"listing_id": "b", "price": 100}
+        )
+
+    def test_plugin_key_includes_version_and_weight(self):
+        """Test plugin keys change with version and weight"""
+        keys = {plugin_key("p", "1.0.0", 0.5), plugin_key("p", "1.1.0", 0.5), plugin_key("p", "1.0.0", 0.8)}
+        assert len(keys) == 3
+
+
+class TestDetectionResultCache:
+    """Tests for the in-process tier"""
+
+    def test_put_and_get(self):
+        """Test cached results are returned and counted"""
+        cache = DetectionResultCache()
+        result = make_result()
+
+        assert cache.get("plugin1:1.0.0:0.5", "abc") is None
+        cache.put("plugin1:1.0.0:0.5", "abc", result)
+
+        assert cache.get("plugin1:1.0.0:0.5", "abc") is result
+        stats = cache.get_statistics()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted at capacity"""
+        cache = DetectionResultCache(max_entries=2)
+        cache.put("p", "a", make_result())
+        cache.put("p", "b", make_result())
+        cache.get("p", "a")
+        cache.put("p", "c", make_result())
+
+        assert len(cache) == 2
+        assert cache.get("p", "b") is None
+        assert cache.get("p", "a") is not None
+        assert cache.get_statistics()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        """Test entries expire after their TTL"""
+        cache = DetectionResultCache(ttl_s=0.05)
+        cache.put("p", "a", make_result())
+
+        time.sleep(0.1)
+
+        assert cache.get("p", "a") is None
+        assert len(cache) == 0
+
+    def test_invalidate(self):
+        """Test invalidate drops all in-process entries"""
+        cache = DetectionResultCache()
+        cache.put("p", "a", make_result())
+        cache.put("p", "b", make_result())
+
+        assert cache.invalidate() == 2
+        assert cache.get("p", "a") is None
+
+    def test_redis_errors_are_misses(self):
+        """Test a failing Redis tier degrades to the in-process tier"""
+        client = MagicMock()
+        client.get.side_effect = ConnectionError("down")
+        client.setex.side_effect = ConnectionError("down")
+        cache = DetectionResultCache(redis_client=client)
+
+        assert cache.get("p", "a") is None
+        cache.put("p", "a", make_result())
+
+        assert cache.get("p", "a") is not None
+        assert cache.get_statistics()["redis_errors"] == 2
+
+    def test_invalid_arguments(self):
+        """Test capacity and TTLs are validated"""
+        with pytest.raises(ValueError):
+            DetectionResultCache(max_entries=0)
+        with pytest.raises(ValueError):
+            DetectionResultCache(ttl_s=0)
+
+
+class TestOrchestratorCaching:
+    """Tests for result caching in RiskScoringOrchestrator"""
+
+    @pytest.fixture
+    def listing(self):
+        return {"listing_id": "listing-1", "price": 800_000, "scraped_at": "2024-01-01"}
+
+    async def test_unchanged_listing_reuses_results(self, listing):
+        """Test a re-scraped unchanged listing is not analyzed again"""
+        plugin = CountingDetectionPlugin("plugin1")
+        orch = RiskScoringOrchestrator(detection_plugins=[plugin], result_cache=DetectionResultCache())
+
+        first = await orch.run(listing)
+        second = await orch.run({**listing, "scraped_at": "2024-02-01"})
+
+        assert plugin.calls == 1
+        assert first.metadata["cached_plugins"] == []
+        assert second.metadata["cached_plugins"] == ["plugin1"]
+        assert second.overall_score == first.overall_score
+
+    async def test_changed_listing_is_rescored(self, listing):
+        """Test changed content misses the cache"""
+        plugin = CountingDetectionPlugin("plugin1")
+        orch = RiskScoringOrchestrator(detection_plugins=[plugin], result_cache=DetectionResultCache())
+
+        await orch.run(listing)
+        result = await orch.run({**listing, "price": 100_000})
+
+        assert plugin.calls == 2
+        assert result.overall_score == pytest.approx(10.0)
+
+    async def test_plugin_changes_invalidate(self, listing):
+        """Test new plugin versions and weights from the manager miss the cache"""
+        manager = PluginManager()
+        manager.register(PluginMetadata(id="plugin1", name="plugin1", version="1.0.0", type="detection", enabled=True))
+        plugin = CountingDetectionPlugin("plugin1")
+        manager._instances["plugin1"] = plugin
+        orch = RiskScoringOrchestrator(plugin_manager=manager, result_cache=DetectionResultCache())
+
+        await orch.run(listing)
+        await orch.run(listing)
+        assert plugin.calls == 1
+
+        manager.set_weight("plugin1", 0.9)
+        await orch.run(listing)
+        assert plugin.calls == 2
+
+        plugin.version = "1.1.0"
+        orch.refresh()
+        await orch.run(listing)
+        assert plugin.calls == 3
+
+    async def test_batch_uses_cache(self, listing):
+        """Test run_batch serves cached results and only analyzes misses"""
+        plugin = CountingDetectionPlugin("plugin1")
+        orch = RiskScoringOrchestrator(detection_plugins=[plugin], result_cache=DetectionResultCache())
+        await orch.run(listing)
+
+        batch = await orch.run_batch([listing, {"listing_id": "listing-2", "price": 200_000}])
+
+        assert plugin.calls == 2
+        assert [score.metadata["cached_plugins"] for score in batch.scores] == [["plugin1"], []]
+        assert orch.get_statistics()["result_cache"]["hits"] == 1
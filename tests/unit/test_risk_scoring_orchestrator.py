@@ -1,18 +1,23 @@
 """Unit tests for RiskScoringOrchestrator."""
 
+import random
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from core.fraud.detection_plugin_wrapper import DetectionPluginWrapper
 from core.fraud.risk_scoring_orchestrator import (
     FraudScore,
     RiskScoringOrchestrator,
+    ScoreRecord,
 )
 from core.interfaces.detection_plugin import (
     DetectionPlugin,
     DetectionResult,
     RiskSignal,
 )
+from core.models.plugin import PluginMetadata
+from core.plugin_manager import PluginManager
 
 pytestmark = pytest.mark.unit
 
@@ -112,6 +117,65 @@ class TestRiskScoringOrchestrator:
         result = orchestrator.unregister_plugin("non-existent")
         assert result is False
 
+    def test_weight_index_follows_registration(self, orchestrator):
+        """Test the weight index is rebuilt on register/unregister."""
+        orchestrator.register_plugin(MockDetectionPlugin("plugin1", weight=0.2))
+        orchestrator.register_plugin(MockDetectionPlugin("plugin2", weight=0.6))
+
+        results = [
+            DetectionResult(plugin_id="plugin1", signals=[], overall_score=1.0, processing_time_ms=1.0),
+            DetectionResult(plugin_id="plugin2", signals=[], overall_score=0.0, processing_time_ms=1.0),
+        ]
+        score, _ = orchestrator._compute_weighted_score(results)
+        assert score == pytest.approx(25.0)
+
+        orchestrator.unregister_plugin("plugin2")
+        score, _ = orchestrator._compute_weighted_score(results)
+        assert score == pytest.approx(100.0)
+
+    def test_weight_changes_need_refresh(self, orchestrator):
+        """Test weights are read once and picked up again by refresh()."""
+        plugin = MockDetectionPlugin("plugin1", weight=0.5)
+        orchestrator.register_plugin(plugin)
+        orchestrator.register_plugin(MockDetectionPlugin("plugin2", weight=0.5))
+        results = [
+            DetectionResult(plugin_id="plugin1", signals=[], overall_score=1.0, processing_time_ms=1.0),
+            DetectionResult(plugin_id="plugin2", signals=[], overall_score=0.0, processing_time_ms=1.0),
+        ]
+
+        plugin.weight = 1.5
+        assert orchestrator._compute_weighted_score(results)[0] == pytest.approx(50.0)
+
+        orchestrator.refresh()
+        assert orchestrator._compute_weighted_score(results)[0] == pytest.approx(75.0)
+
+    @pytest.mark.asyncio
+    async def test_reloads_plugins_from_manager(self, sample_listing):
+        """Test plugins are reloaded when the plugin manager changes."""
+        manager = PluginManager()
+        for plugin_id, score in (("plugin-a", 1.0), ("plugin-b", 0.0)):
+            manager.register(
+                PluginMetadata(id=plugin_id, name=plugin_id, version="1.0.0", type="detection", enabled=True)
+            )
+            manager._instances[plugin_id] = MockDetectionPlugin(plugin_id, weight=0.5, score=score)
+
+        orch = RiskScoringOrchestrator(plugin_manager=manager)
+        assert len(orch.detection_plugins) == 2
+        assert (await orch.run(sample_listing)).overall_score == pytest.approx(50.0)
+
+        manager.set_weight("plugin-a", 1.0)
+        assert (await orch.run(sample_listing)).overall_score == pytest.approx(100.0 * 1.0 / 1.5)
+
+        manager.disable("plugin-b")
+        result = await orch.run(sample_listing)
+        assert result.overall_score == pytest.approx(100.0)
+        assert orch.get_statistics()["plugin_ids"] == ["plugin-a"]
+
+    def test_plugins_and_manager_exclusive(self):
+        """Test explicit plugins cannot be combined with a plugin manager they would ignore."""
+        with pytest.raises(ValueError):
+            RiskScoringOrchestrator(detection_plugins=[MockDetectionPlugin("plugin-a")], plugin_manager=PluginManager())
+
     @pytest.mark.asyncio
     async def test_run_with_no_plugins(self, orchestrator, sample_listing):
         """Test running with no registered plugins."""
@@ -345,5 +409,383 @@ class TestRiskScoringOrchestrator:
         assert result.processing_time_ms < 1000.0  # Should be fast
 
 
+class VectorizedDetectionPlugin(MockDetectionPlugin):
+    """Mock plugin scoring a whole batch in one call."""
+
+    def __init__(self, plugin_id: str, weight: float = 0.5):
+        super().__init__(plugin_id, weight=weight)
+        self.batch_calls = 0
+
+    def _score(self, listing):
+        return DetectionResult(
+            plugin_id=self.plugin_id,
+            signals=[],
+            overall_score=min(listing["price"] / 1_000_000, 1.0),
+            processing_time_ms=1.0,
+        )
+
+    async def analyze(self, listing):
+        return self._score(listing)
+
+    async def analyze_batch(self, listings):
+        self.batch_calls += 1
+        return [self._score(listing) for listing in listings]
+
+
+class ConcurrencyTrackingPlugin(MockDetectionPlugin):
+    """Mock plugin recording how many analyze() calls overlap."""
+
+    def __init__(self, plugin_id: str):
+        super().__init__(plugin_id, score=0.2)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def analyze(self, listing):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().analyze(listing)
+        finally:
+            self.in_flight -= 1
+
+
+class TestRunBatch:
+    """Test suite for RiskScoringOrchestrator.run_batch."""
+
+    @pytest.fixture
+    def listings(self):
+        return [{"listing_id": f"listing-{i}", "price": i * 100_000} for i in range(10)]
+
+    async def test_batch_matches_single_runs(self, listings):
+        """Test batch scores equal scoring listings one by one."""
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[VectorizedDetectionPlugin("vectorized"), MockDetectionPlugin("per-listing", score=0.4)]
+        )
+
+        batch = await orch.run_batch(listings)
+
+        assert len(batch) == 10
+        assert batch.listing_ids == [listing["listing_id"] for listing in listings]
+        for listing, score in zip(listings, batch.scores):
+            single = await orch.run(listing)
+            assert score.overall_score == pytest.approx(single.overall_score)
+            assert score.risk_level == single.risk_level
+        assert batch.overall_scores == [score.overall_score for score in batch.scores]
+        assert batch.plugin_scores["per-listing"] == [0.4] * 10
+        assert batch.plugin_scores["vectorized"][5] == pytest.approx(0.5)
+
+    async def test_batch_hook_called_once(self, listings):
+        """Test vectorized plugins get the whole batch, also when wrapped."""
+        plugin = VectorizedDetectionPlugin("vectorized")
+        wrapped = DetectionPluginWrapper(plugin, "vectorized", weight_override=0.9)
+        orch = RiskScoringOrchestrator(detection_plugins=[wrapped])
+
+        await orch.run_batch(listings)
+
+        assert plugin.batch_calls == 1
+
+    async def test_fallback_concurrency_bounded(self, listings):
+        """Test per-listing fallback respects max_concurrency."""
+        plugin = ConcurrencyTrackingPlugin("tracked")
+        orch = RiskScoringOrchestrator(detection_plugins=[plugin])
+
+        batch = await orch.run_batch(listings, max_concurrency=3)
+
+        assert len(batch) == 10
+        assert plugin.max_in_flight == 3
+
+    async def test_failing_batch_plugin_skipped(self, listings):
+        """Test a failing batch plugin is skipped for the whole batch."""
+        broken = VectorizedDetectionPlugin("broken")
+        broken.analyze_batch = AsyncMock(return_value=[])  # Wrong number of results
+        orch = RiskScoringOrchestrator(detection_plugins=[broken, MockDetectionPlugin("ok", score=0.8)])
+
+        batch = await orch.run_batch(listings)
+
+        assert batch.plugin_scores["broken"] == [None] * 10
+        assert batch.overall_scores == [pytest.approx(80.0)] * 10
+        assert all(score.metadata["plugins_executed"] == 1 for score in batch.scores)
+
+    async def test_empty_batch(self):
+        """Test an empty batch returns empty columns."""
+        orch = RiskScoringOrchestrator(detection_plugins=[MockDetectionPlugin("plugin1")])
+
+        batch = await orch.run_batch([])
+
+        assert len(batch) == 0
+        assert batch.overall_scores == []
+
+    async def test_invalid_concurrency(self, listings):
+        """Test max_concurrency must be positive."""
+        with pytest.raises(ValueError):
+            await RiskScoringOrchestrator().run_batch(listings, max_concurrency=0)
+
+
+class SlowDetectionPlugin(MockDetectionPlugin):
+    """Mock plugin taking a configurable time per listing."""
+
+    def __init__(self, plugin_id: str, delay_s: float, timeout_ms: float = None, weight: float = 0.5):
+        signal = RiskSignal(signal_type="slow", score=0.9, confidence=1.0, reason="Slow signal")
+        super().__init__(plugin_id, weight=weight, score=0.9, signals=[signal])
+        self.delay_s = delay_s
+        self.timeout_ms = timeout_ms
+
+    async def analyze(self, listing):
+        await asyncio.sleep(self.delay_s)
+        return DetectionResult(
+            plugin_id=self.plugin_id, signals=self.signals, overall_score=self.score, processing_time_ms=1.0
+        )
+
+    def get_timeout_ms(self):
+        return self.timeout_ms
+
+
+class TestDeadlines:
+    """Test suite for plugin deadlines and the scoring SLA."""
+
+    @pytest.fixture
+    def fast_plugin(self):
+        signal = RiskSignal(signal_type="fast", score=0.2, confidence=1.0, reason="Fast signal")
+        return MockDetectionPlugin("fast", weight=0.75, score=0.2, signals=[signal])
+
+    async def test_plugin_deadline_from_hook(self, fast_plugin):
+        """Test a plugin exceeding its own deadline is skipped."""
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[fast_plugin, SlowDetectionPlugin("slow", delay_s=1.0, timeout_ms=30, weight=0.25)]
+        )
+
+        result = await orch.run({"listing_id": "test-1"})
+
+        assert result.metadata["skipped_plugins"] == ["slow"]
+        assert result.overall_score == pytest.approx(20.0)
+        assert result.confidence == pytest.approx(0.75)
+        assert result.processing_time_ms < 500
+
+    async def test_default_plugin_deadline(self, fast_plugin):
+        """Test the orchestrator default applies to plugins without their own deadline."""
+        slow = SlowDetectionPlugin("slow", delay_s=1.0, weight=0.25)
+        orch = RiskScoringOrchestrator(detection_plugins=[fast_plugin, slow], plugin_timeout_ms=50)
+
+        result = await orch.run({"listing_id": "test-1"})
+
+        assert result.metadata["skipped_plugins"] == ["slow"]
+
+    async def test_scoring_sla(self, fast_plugin):
+        """Test the listing is scored with whatever arrived when the SLA expires."""
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[fast_plugin, SlowDetectionPlugin("slow", delay_s=1.0, weight=0.25)],
+            scoring_sla_ms=100,
+        )
+
+        result = await orch.run({"listing_id": "test-1"})
+
+        assert result.metadata["skipped_plugins"] == ["slow"]
+        assert result.metadata["plugins_executed"] == 1
+        assert result.confidence == pytest.approx(0.75)
+        assert result.processing_time_ms < 500
+
+    async def test_nothing_skipped_within_deadlines(self, fast_plugin):
+        """Test results are complete when every plugin is on time."""
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[fast_plugin, SlowDetectionPlugin("slow", delay_s=0.01)],
+            plugin_timeout_ms=1000,
+            scoring_sla_ms=1000,
+        )
+
+        result = await orch.run({"listing_id": "test-1"})
+
+        assert result.metadata["skipped_plugins"] == []
+        assert result.metadata["plugins_executed"] == 2
+        assert result.confidence == pytest.approx(1.0)
+
+    async def test_batch_deadlines(self, fast_plugin):
+        """Test deadlines apply per listing in run_batch."""
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[fast_plugin, SlowDetectionPlugin("slow", delay_s=1.0, timeout_ms=30, weight=0.25)]
+        )
+
+        batch = await orch.run_batch([{"listing_id": f"listing-{i}"} for i in range(5)])
+
+        assert batch.plugin_scores["slow"] == [None] * 5
+        assert all(score.metadata["skipped_plugins"] == ["slow"] for score in batch.scores)
+        assert batch.confidences == [pytest.approx(0.75)] * 5
+
+    async def test_plugin_timeout_error_is_not_a_deadline_skip(self, fast_plugin):
+        """Test a TimeoutError raised by the plugin itself counts as a plugin error, not a missed deadline."""
+
+        class UpstreamTimeoutPlugin(SlowDetectionPlugin):
+            async def analyze(self, listing):
+                raise TimeoutError("upstream API timed out")
+
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[fast_plugin, UpstreamTimeoutPlugin("upstream", delay_s=0.0, timeout_ms=1000)]
+        )
+
+        result = await orch.run({"listing_id": "test-1"})
+        batch = await orch.run_batch([{"listing_id": f"listing-{i}"} for i in range(3)])
+
+        assert result.metadata["skipped_plugins"] == []
+        assert result.metadata["plugins_executed"] == 1
+        assert result.confidence == pytest.approx(1.0)
+        assert all(score.metadata["skipped_plugins"] == [] for score in batch.scores)
+        assert batch.confidences == [pytest.approx(1.0)] * 3
+
+    def test_invalid_deadlines(self):
+        """Test deadlines must be positive."""
+        with pytest.raises(ValueError):
+            RiskScoringOrchestrator(plugin_timeout_ms=0)
+        with pytest.raises(ValueError):
+            RiskScoringOrchestrator(scoring_sla_ms=-1)
+
+
+class TieredDetectionPlugin(MockDetectionPlugin):
+    """Mock plugin with a cost tier, scoring listings by a per-plugin key."""
+
+    def __init__(self, plugin_id: str, tier: int, weight: float = 0.5, score: float = 0.5):
+        super().__init__(plugin_id, weight=weight, score=score)
+        self.tier = tier
+        self.analyzed = []
+
+    async def analyze(self, listing):
+        self.analyzed.append(listing["listing_id"])
+        return DetectionResult(
+            plugin_id=self.plugin_id,
+            signals=[],
+            overall_score=listing.get(self.plugin_id, self.score),
+            processing_time_ms=1.0,
+        )
+
+    def get_cost_tier(self):
+        return self.tier
+
+
+class TestCascade:
+    """Test suite for the early-exit scoring cascade."""
+
+    @pytest.fixture
+    def cheap(self):
+        return TieredDetectionPlugin("cheap", tier=0, weight=0.8)
+
+    @pytest.fixture
+    def expensive(self):
+        return TieredDetectionPlugin("expensive", tier=2, weight=0.2, score=1.0)
+
+    @pytest.mark.parametrize("cheap_score,risk_level", [(0.0, "safe"), (1.0, "fraud")])
+    async def test_settled_listing_skips_expensive_tier(self, cheap, expensive, cheap_score, risk_level):
+        """Test expensive tiers are skipped when the risk level is settled."""
+        orch = RiskScoringOrchestrator(detection_plugins=[expensive, cheap], cascade=True)
+
+        result = await orch.run({"listing_id": "test-1", "cheap": cheap_score})
+
+        assert expensive.analyzed == []
+        assert result.metadata["cascade_skipped"] == ["expensive"]
+        assert result.risk_level == risk_level
+
+    async def test_borderline_listing_runs_all_tiers(self, cheap, expensive):
+        """Test all tiers run while the score can still cross a threshold."""
+        orch = RiskScoringOrchestrator(detection_plugins=[cheap, expensive], cascade=True)
+
+        result = await orch.run({"listing_id": "test-1", "cheap": 0.3})
+
+        assert expensive.analyzed == ["test-1"]
+        assert result.metadata["cascade_skipped"] == []
+        assert result.overall_score == pytest.approx(44.0)
+
+    async def test_tiers_ignored_without_cascade(self, cheap, expensive):
+        """Test every plugin runs when cascade mode is off."""
+        orch = RiskScoringOrchestrator(detection_plugins=[cheap, expensive])
+
+        await orch.run({"listing_id": "test-1", "cheap": 0.0})
+
+        assert expensive.analyzed == ["test-1"]
+
+    async def test_risk_levels_unchanged(self):
+        """Test cascade mode never changes a risk level."""
+        rng = random.Random(42)
+        for _ in range(200):
+            plugins = [
+                TieredDetectionPlugin(f"plugin-{i}", tier=rng.randint(0, 2), weight=rng.uniform(0.05, 1.0))
+                for i in range(rng.randint(2, 6))
+            ]
+            listing = {"listing_id": "test-1", **{p.plugin_id: rng.choice([0.0, 0.1, 0.5, 0.9, 1.0]) for p in plugins}}
+
+            full = await RiskScoringOrchestrator(detection_plugins=plugins).run(listing)
+            cascaded = await RiskScoringOrchestrator(detection_plugins=plugins, cascade=True).run(listing)
+
+            assert cascaded.risk_level == full.risk_level
+
+    async def test_batch_only_sends_undecided_listings(self, cheap):
+        """Test later tiers in run_batch only receive listings still undecided."""
+        expensive = VectorizedDetectionPlugin("expensive", weight=0.2)
+        expensive.get_cost_tier = lambda: 1
+        orch = RiskScoringOrchestrator(detection_plugins=[cheap, expensive], cascade=True)
+        listings = [
+            {"listing_id": "clean", "cheap": 0.0, "price": 0},
+            {"listing_id": "borderline", "cheap": 0.5, "price": 500_000},
+            {"listing_id": "fraud", "cheap": 1.0, "price": 1_000_000},
+        ]
+
+        batch = await orch.run_batch(listings)
+
+        assert expensive.batch_calls == 1
+        assert batch.plugin_scores["expensive"] == [None, 0.5, None]
+        assert batch.risk_levels == ["safe", "suspicious", "fraud"]
+        assert [score.metadata["cascade_skipped"] for score in batch.scores] == [["expensive"], [], ["expensive"]]
+
+
+class TestCompactScores:
+    """Test suite for the compact ScoreRecord path."""
+
+    @pytest.fixture
+    def orch(self):
+        signal = RiskSignal(signal_type="price_anomaly", score=0.9, confidence=0.9, reason="Too cheap")
+        weak = RiskSignal(signal_type="weak", score=0.5, confidence=0.2, reason="Weak")
+        return RiskScoringOrchestrator(
+            detection_plugins=[
+                MockDetectionPlugin("plugin1", weight=0.6, score=0.9, signals=[signal, weak]),
+                MockDetectionPlugin("plugin2", weight=0.4, score=0.2),
+            ]
+        )
+
+    async def test_run_compact_matches_run(self, orch):
+        """Test the compact record carries the same values as the FraudScore."""
+        listing = {"listing_id": "test-1"}
+
+        record = await orch.run_compact(listing)
+        score = await orch.run(listing)
+
+        assert isinstance(record, ScoreRecord)
+        assert record.overall_score == score.overall_score
+        assert record.confidence == score.confidence
+        assert record.risk_level == score.risk_level
+        assert [s.signal_type for s in record.signals] == ["price_anomaly"]
+        assert record.metadata == score.metadata
+
+    async def test_fraud_score_is_valid(self, orch):
+        """Test FraudScores built without validation pass validation."""
+        score = (await orch.run_compact({"listing_id": "test-1"})).to_fraud_score()
+
+        validated = FraudScore.model_validate(score.model_dump())
+
+        assert validated.model_dump() == score.model_dump()
+        assert validated.metadata["high_confidence_signals"] == 1
+
+    def test_record_is_slotted(self):
+        """Test records carry no per-instance dict."""
+        record = ScoreRecord("test-1", 0.0, 0.0, "safe", (), (), 0.0)
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.overall_score = 50.0
+
+    async def test_batch_builds_scores_lazily(self, orch):
+        """Test batch FraudScore models are only built on access."""
+        batch = await orch.run_batch([{"listing_id": f"listing-{i}"} for i in range(3)])
+
+        assert batch._scores is None
+        assert [score.listing_id for score in batch.scores] == batch.listing_ids
+        assert batch.scores is batch.scores
+
+
 # Import asyncio for async tests
 import asyncio
@@ -0,0 +1,304 @@
+"""Unit tests for pluggable score aggregation and its calibration."""
+
+import json
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database.base import Base
+from core.database.repository import ListingRepository
+from core.fraud.aggregation import (
+    LogisticStackingAggregator,
+    MaxAggregator,
+    NoisyOrAggregator,
+    WeightedMeanAggregator,
+    create_aggregator,
+    evaluate_aggregator,
+    fit_logistic_stacking,
+    load_aggregator,
+)
+from core.fraud.calibration import calibrate, collect_training_data
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult, RiskSignal
+from core.models.udm import Listing, Location, Price, SourceInfo
+
+pytestmark = pytest.mark.unit
+
+PLUGIN_IDS = ["a", "b", "c"]
+WEIGHTS = [0.5, 0.25, 0.25]
+
+
+class FieldDetectionPlugin(DetectionPlugin):
+    """Detection plugin reporting a listing field as its score."""
+
+    def __init__(self, plugin_id: str, weight: float = 0.5, tier: int = 0):
+        self.plugin_id = plugin_id
+        self.weight = weight
+        self.tier = tier
+        self.calls = 0
+
+    def get_metadata(self):
+        return {"id": self.plugin_id, "name": self.plugin_id, "version": "1.0.0"}
+
+    async def analyze(self, listing):
+        self.calls += 1
+        score = listing.get("scores", {}).get(self.plugin_id, 0.0)
+        signal = RiskSignal(signal_type=self.plugin_id, score=score, confidence=0.8, reason="test")
+        return DetectionResult(plugin_id=self.plugin_id, signals=[signal], overall_score=score, processing_time_ms=1.0)
+
+    def get_weight(self):
+        return self.weight
+
+    def get_cost_tier(self):
+        return self.tier
+
+
+class TestAggregators:
+    """Tests for the aggregation methods on score matrices"""
+
+    scores = np.array([[0.8, 0.4, 0.0], [0.2, 0.2, 0.2], [0.0, 0.0, 0.0]])
+    present = np.array([[True, True, False], [True, True, True], [False, False, False]])
+
+    def aggregate(self, aggregator):
+        overall, confidence = aggregator.aggregate(
+            PLUGIN_IDS, WEIGHTS, self.scores, np.full(self.scores.shape, 0.6), self.present
+        )
+        return overall, confidence
+
+    def test_weighted_mean_matches_default_formula(self):
+        """Test the weighted mean ignores missing plugins like the orchestrator"""
+        overall, confidence = self.aggregate(WeightedMeanAggregator())
+
+        assert overall == pytest.approx([(0.5 * 0.8 + 0.25 * 0.4) / 0.75 * 100, 20.0, 0.0])
+        assert confidence == pytest.approx([0.6, 0.6, 0.0])
+
+    def test_noisy_or_accumulates_evidence(self):
+        """Test moderate signals add up instead of averaging out"""
+        overall, _ = self.aggregate(NoisyOrAggregator(strengths={"a": 1.0, "b": 1.0, "c": 1.0}))
+
+        assert overall == pytest.approx([(1 - 0.2 * 0.6) * 100, (1 - 0.8**3) * 100, 0.0])
+
+    def test_noisy_or_defaults_strength_to_weight(self):
+        """Test plugins without a strength use their weight"""
+        overall, _ = self.aggregate(NoisyOrAggregator(leak=0.1))
+
+        assert overall[0] == pytest.approx((1 - 0.9 * (1 - 0.5 * 0.8) * (1 - 0.25 * 0.4)) * 100)
+
+    def test_max(self):
+        """Test the highest reporting score wins"""
+        overall, _ = self.aggregate(MaxAggregator())
+
+        assert overall == pytest.approx([80.0, 20.0, 0.0])
+
+    def test_logistic_stacking(self):
+        """Test logistic stacking applies its coefficients by plugin ID"""
+        aggregator = LogisticStackingAggregator({"a": 4.0, "b": 2.0, "unknown": 9.0}, intercept=-3.0)
+
+        overall, _ = self.aggregate(aggregator)
+
+        expected = 100 / (1 + np.exp(-(-3.0 + 4.0 * 0.8 + 2.0 * 0.4)))
+        assert overall[0] == pytest.approx(expected)
+        assert overall[2] == 0.0  # Nothing reported
+        assert aggregator.monotone
+        assert not LogisticStackingAggregator({"a": -1.0}).monotone
+
+    def test_zero_weight_plugins_ignored(self):
+        """Test plugins with weight 0 count as not reporting"""
+        overall, _ = MaxAggregator().aggregate(["a", "b"], [0.0, 1.0], [[0.9, 0.1]], [[0.5, 0.5]], [[True, True]])
+
+        assert overall == pytest.approx([10.0])
+
+    def test_config_round_trip(self, tmp_path):
+        """Test aggregators are recreated from their JSON config"""
+        aggregator = NoisyOrAggregator(leak=0.05, strengths={"a": 0.9})
+        path = tmp_path / "aggregation.json"
+        path.write_text(json.dumps(aggregator.to_dict()))
+
+        loaded = load_aggregator(path)
+
+        assert isinstance(loaded, NoisyOrAggregator)
+        assert loaded.get_params() == aggregator.get_params()
+
+    def test_invalid_configs(self):
+        """Test unknown methods and bad parameters are rejected"""
+        with pytest.raises(ValueError):
+            create_aggregator({"method": "median"})
+        with pytest.raises(ValueError):
+            create_aggregator({"method": "max", "leak": 0.1})
+        with pytest.raises(ValueError):
+            NoisyOrAggregator(leak=1.0)
+
+
+class TestFitting:
+    """Tests for fitting and evaluating aggregation parameters"""
+
+    @pytest.fixture
+    def data(self):
+        """Plugin 'a' separates the classes, plugin 'b' is noise"""
+        rng = np.random.default_rng(1)
+        labels = rng.random(400) < 0.3
+        scores = np.column_stack(
+            [np.clip(np.where(labels, 0.8, 0.2) + rng.normal(0, 0.15, 400), 0, 1), rng.random(400)]
+        )
+        return scores, np.ones_like(scores, dtype=bool), labels
+
+    def test_fit_learns_informative_plugin(self, data):
+        """Test the informative plugin gets the larger coefficient"""
+        scores, present, labels = data
+
+        aggregator = fit_logistic_stacking(["a", "b"], scores, present, labels)
+
+        assert aggregator.coefficients["a"] > 5.0
+        assert abs(aggregator.coefficients["b"]) < 1.0
+        metrics = evaluate_aggregator(aggregator, ["a", "b"], [0.5, 0.5], scores, present, labels, threshold=50.0)
+        assert metrics["auc"] > 0.95
+        assert metrics["accuracy"] > 0.9
+
+    def test_fit_beats_weighted_mean_on_log_loss(self, data):
+        """Test calibrated probabilities beat the uncalibrated weighted mean"""
+        scores, present, labels = data
+        fitted = fit_logistic_stacking(["a", "b"], scores, present, labels)
+
+        def log_loss(aggregator):
+            return evaluate_aggregator(aggregator, ["a", "b"], [0.5, 0.5], scores, present, labels)["log_loss"]
+
+        assert log_loss(fitted) < log_loss(WeightedMeanAggregator())
+
+    def test_fit_requires_both_classes(self):
+        """Test single-class labels are rejected"""
+        with pytest.raises(ValueError):
+            fit_logistic_stacking(["a"], [[0.1], [0.9]], [[True], [True]], [False, False])
+
+
+class TestOrchestratorAggregation:
+    """Tests for scoring with an aggregator"""
+
+    def listings(self):
+        return [
+            {"listing_id": "clean", "scores": {"a": 0.1, "b": 0.1}},
+            {"listing_id": "two-weak", "scores": {"a": 0.6, "b": 0.6}},
+            {"listing_id": "one-strong", "scores": {"a": 0.95, "b": 0.0}},
+        ]
+
+    async def test_run_and_run_batch_agree(self):
+        """Test the vectorized batch path scores like one run() per listing"""
+        aggregator = NoisyOrAggregator(strengths={"a": 1.0, "b": 1.0})
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[FieldDetectionPlugin("a"), FieldDetectionPlugin("b")], aggregator=aggregator
+        )
+
+        single = [await orch.run_compact(listing) for listing in self.listings()]
+        batch = await orch.run_batch(self.listings())
+
+        assert batch.overall_scores == pytest.approx([record.overall_score for record in single])
+        assert batch.overall_scores == pytest.approx([19.0, 84.0, 95.0])
+        assert batch.risk_levels == ["safe", "fraud", "fraud"]
+        assert batch.confidences == pytest.approx([0.8, 0.8, 0.8])
+        assert orch.get_statistics()["aggregation"] == "noisy_or"
+
+    async def test_weighted_mean_aggregator_matches_default(self):
+        """Test the vectorized weighted mean reproduces the default scores"""
+        plugins = [FieldDetectionPlugin("a", 0.7), FieldDetectionPlugin("b", 0.3)]
+        default = await RiskScoringOrchestrator(detection_plugins=plugins).run_batch(self.listings())
+        vectorized = await RiskScoringOrchestrator(
+            detection_plugins=plugins, aggregator=WeightedMeanAggregator()
+        ).run_batch(self.listings())
+
+        assert vectorized.overall_scores == pytest.approx(default.overall_scores)
+        assert vectorized.confidences == pytest.approx(default.confidences)
+
+    async def test_cascade_stops_with_monotone_aggregator(self):
+        """Test the cascade uses the aggregator's bounds to skip later tiers"""
+        cheap, expensive = FieldDetectionPlugin("a", tier=0), FieldDetectionPlugin("b", tier=1)
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[cheap, expensive],
+            cascade=True,
+            aggregator=NoisyOrAggregator(strengths={"a": 1.0, "b": 1.0}),
+        )
+
+        record = await orch.run_compact({"listing_id": "x", "scores": {"a": 0.9, "b": 0.0}})
+
+        assert record.risk_level == "fraud"
+        assert record.cascade_skipped == ("b",)
+        assert expensive.calls == 0
+
+    async def test_cascade_runs_all_tiers_with_non_monotone_aggregator(self):
+        """Test no tier is skipped when more evidence could lower the score"""
+        expensive = FieldDetectionPlugin("b", tier=1)
+        orch = RiskScoringOrchestrator(
+            detection_plugins=[FieldDetectionPlugin("a", tier=0), expensive],
+            cascade=True,
+            aggregator=LogisticStackingAggregator({"a": 10.0, "b": -10.0}),
+        )
+
+        await orch.run_batch([{"listing_id": "x", "scores": {"a": 1.0, "b": 1.0}}])
+
+        assert expensive.calls == 1
+
+
+class TestCalibration:
+    """Tests for calibrating on labelled listings from the database"""
+
+    @pytest.fixture
+    def session(self):
+        engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(bind=engine)
+        session = sessionmaker(bind=engine)()
+        yield session
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+    def store_labelled(self, session, count=60):
+        """Store listings whose price tells fraud apart, labelled in extra_metadata"""
+        repository = ListingRepository(session)
+        for i in range(count):
+            fraud = i % 3 == 0
+            repository.create(
+                Listing(
+                    listing_id=f"listing-{i}",
+                    source=SourceInfo(plugin_id="test", platform="test"),
+                    type="sale",
+                    property_type="apartment",
+                    location=Location(city="Moscow"),
+                    price=Price(amount=1000 + (100 if fraud else 900) + i, currency="RUB"),
+                )
+            )
+            if i < count - 1:  # One unlabelled listing
+                repository.update(f"listing-{i}", extra_metadata={"fraud_label": fraud})
+        return repository
+
+    async def test_calibrate_from_listings_table(self, session, tmp_path):
+        """Test labelled listings are scored, fitted and evaluated"""
+        repository = self.store_labelled(session)
+
+        class CheapPricePlugin(FieldDetectionPlugin):
+            async def analyze(self, listing):
+                score = 1.0 if float(listing["price"]["amount"]) < 1500 else 0.0
+                signal = RiskSignal(signal_type="price", score=score, confidence=0.9, reason="test")
+                return DetectionResult(
+                    plugin_id=self.plugin_id, signals=[signal], overall_score=score, processing_time_ms=1.0
+                )
+
+        labelled = [(listing.model_dump(mode="json"), label) for listing, label in repository.iter_labelled()]
+        orch = RiskScoringOrchestrator(detection_plugins=[CheapPricePlugin("price"), FieldDetectionPlugin("noise")])
+
+        data = await collect_training_data(orch, labelled, batch_size=16)
+        aggregator, report = calibrate(data, holdout=0.25)
+
+        assert len(data) == 59
+        assert data.plugin_ids == ["price", "noise"]
+        assert int(data.labels.sum()) == 20
+        assert isinstance(aggregator, LogisticStackingAggregator)
+        assert aggregator.coefficients["price"] > 1.0
+        assert set(report) == {"weighted_mean", "noisy_or", "max", "logistic"}
+        assert report["logistic"]["auc"] == pytest.approx(1.0)
+        assert report["logistic"]["log_loss"] < report["weighted_mean"]["log_loss"]
+
+    async def test_cascade_rejected(self):
+        """Test calibration refuses orchestrators that skip plugins"""
+        orch = RiskScoringOrchestrator(detection_plugins=[FieldDetectionPlugin("a")], cascade=True)
+
+        with pytest.raises(ValueError):
+            await collect_training_data(orch, [({"listing_id": "x"}, True)])
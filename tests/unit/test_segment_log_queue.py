@@ -0,0 +1,245 @@
+"""Tests for the durable segment log queue"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from core.queue import SegmentLogQueuePlugin
+from core.queue.capacity import QueueFullError, TopicCapacity
+from core.queue.segment_log_queue import RECORD_HEADER, SEGMENT_SUFFIX
+from tests.unit import test_queue_plugin
+
+pytestmark = [pytest.mark.unit, pytest.mark.messaging]
+
+
+class TestSegmentLogQueueContract(test_queue_plugin.TestInMemoryQueuePlugin):
+    """Runs the InMemoryQueuePlugin tests against SegmentLogQueuePlugin"""
+
+    @pytest.fixture
+    def make_queue(self, tmp_path):
+        return lambda: SegmentLogQueuePlugin(tmp_path / "queue", segment_bytes=64 * 1024)
+
+
+class TestSegmentLogQueueDurability:
+    """Tests for persistence across restarts"""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path) -> Path:
+        return tmp_path / "queue"
+
+    def _open(self, data_dir: Path, **kwargs) -> SegmentLogQueuePlugin:
+        plugin = SegmentLogQueuePlugin(data_dir, **kwargs)
+        plugin.connect()
+        return plugin
+
+    def _segments(self, data_dir: Path, topic: str):
+        return sorted((data_dir / topic).glob(f"*{SEGMENT_SUFFIX}"))
+
+    def test_invalid_arguments(self, data_dir):
+        """Test constructor validation"""
+        with pytest.raises(ValueError):
+            SegmentLogQueuePlugin(data_dir, segment_bytes=100)
+        with pytest.raises(ValueError):
+            SegmentLogQueuePlugin(data_dir, commit_interval=0)
+
+    def test_messages_survive_restart(self, data_dir):
+        """Test unconsumed messages are restored in order"""
+        queue = self._open(data_dir)
+        queue.publish("test.restart", {"seq": 0})
+        queue.publish_batch("test.restart", [{"seq": i} for i in range(1, 5)])
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        assert queue.get_queue_size("test.restart") == 5
+        received = [queue.get("test.restart", timeout=0) for _ in range(5)]
+        assert [envelope["payload"]["seq"] for envelope in received] == list(range(5))
+        assert [envelope["offset"] for envelope in received] == list(range(5))
+        queue.disconnect()
+
+    def test_acknowledged_messages_not_redelivered(self, data_dir):
+        """Test a group resumes after its acknowledged messages"""
+        queue = self._open(data_dir)
+        queue.publish_batch("test.resume", [{"seq": i} for i in range(4)])
+        for _ in range(2):
+            queue.acknowledge(queue.get("test.resume", timeout=0)["message_id"])
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        assert queue.get_committed_offsets("test.resume") == {"default": 2}
+        assert queue.get("test.resume", timeout=0)["payload"] == {"seq": 2}
+        queue.disconnect()
+
+    def test_unacknowledged_messages_redelivered(self, data_dir):
+        """Test messages delivered but not acknowledged before a restart are delivered again"""
+        queue = self._open(data_dir)
+        queue.publish_batch("test.unacked", [{"seq": i} for i in range(3)])
+        first = queue.get("test.unacked", timeout=0)
+        second = queue.get("test.unacked", timeout=0)
+        queue.acknowledge(second["message_id"])
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        received = [queue.get("test.unacked", timeout=0) for _ in range(3)]
+        assert received[0]["message_id"] == first["message_id"]
+        assert [envelope["payload"]["seq"] for envelope in received] == [0, 1, 2]
+        queue.disconnect()
+
+    def test_dead_lettered_messages_are_settled(self, data_dir):
+        """Test rejected messages moved to the dead letter queue are not redelivered"""
+        queue = self._open(data_dir)
+        queue.publish("test.dead", {"seq": 0})
+        queue.reject(queue.get("test.dead", timeout=0)["message_id"], requeue=False)
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        assert queue.get_queue_size("test.dead") == 0
+        queue.disconnect()
+
+    def test_consumer_group_offsets_persisted(self, data_dir):
+        """Test each consumer group resumes at its own offset"""
+        queue = self._open(data_dir)
+        queue.create_consumer_group("test.groups", "fast")
+        queue.create_consumer_group("test.groups", "slow")
+        queue.publish_batch("test.groups", [{"seq": i} for i in range(5)])
+        for _ in range(4):
+            queue.acknowledge(queue.get("test.groups", timeout=0, consumer_group="fast")["message_id"])
+        queue.acknowledge(queue.get("test.groups", timeout=0, consumer_group="slow")["message_id"])
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        assert queue.get_committed_offsets("test.groups") == {"fast": 4, "slow": 1}
+        assert queue.get("test.groups", timeout=0, consumer_group="fast")["payload"] == {"seq": 4}
+        assert queue.get("test.groups", timeout=0, consumer_group="slow")["payload"] == {"seq": 1}
+        queue.disconnect()
+
+    def test_segments_roll_and_compact(self, data_dir):
+        """Test full segments are replaced and deleted once consumed"""
+        queue = self._open(data_dir, segment_bytes=4096, commit_interval=10)
+        queue.publish_batch("test.roll", [{"seq": i, "data": "x" * 100} for i in range(100)])
+        assert len(self._segments(data_dir, "test.roll")) > 1
+
+        for _ in range(100):
+            queue.acknowledge(queue.get("test.roll", timeout=0)["message_id"])
+        queue.flush()
+
+        segments = self._segments(data_dir, "test.roll")
+        assert len(segments) == 1
+        assert queue.get_statistics()["segments"] == 1
+        queue.disconnect()
+
+        # Offsets continue after the deleted segments
+        queue = self._open(data_dir, segment_bytes=4096)
+        assert queue.get_queue_size("test.roll") == 0
+        queue.publish("test.roll", {"seq": 100})
+        assert queue.get("test.roll", timeout=0)["offset"] == 100
+        queue.disconnect()
+
+    def test_topic_without_consumers_is_retained(self, data_dir):
+        """Test segments are kept until a consumer group has read them"""
+        queue = self._open(data_dir, segment_bytes=4096)
+        queue.publish_batch("test.retained", [{"data": "x" * 100} for _ in range(100)])
+        queue.flush()
+        count = len(self._segments(data_dir, "test.retained"))
+        queue.disconnect()
+
+        queue = self._open(data_dir, segment_bytes=4096)
+        assert len(self._segments(data_dir, "test.retained")) == count
+        assert queue.get_queue_size("test.retained") == 100
+        queue.disconnect()
+
+    def test_torn_record_is_discarded(self, data_dir):
+        """Test recovery stops at a partially written record"""
+        queue = self._open(data_dir)
+        queue.publish_batch("test.torn", [{"seq": i} for i in range(3)])
+        queue.disconnect()
+
+        # Corrupt the payload of the last record
+        path = self._segments(data_dir, "test.torn")[0]
+        data = bytearray(path.read_bytes())
+        position = 0
+        for _ in range(2):
+            length, _ = RECORD_HEADER.unpack_from(data, position)
+            position += RECORD_HEADER.size + length
+        data[position + RECORD_HEADER.size] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        queue = self._open(data_dir)
+        assert queue.get_queue_size("test.torn") == 2
+        queue.publish("test.torn", {"seq": "new"})
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        received = [queue.get("test.torn", timeout=0)["payload"] for _ in range(3)]
+        assert received == [{"seq": 0}, {"seq": 1}, {"seq": "new"}]
+        queue.disconnect()
+
+    def test_purge_removes_segments(self, data_dir):
+        """Test purged messages do not come back after a restart"""
+        queue = self._open(data_dir)
+        queue.publish_batch("test.purge", [{"seq": i} for i in range(3)])
+        assert queue.purge_queue("test.purge") == 3
+        assert self._segments(data_dir, "test.purge") == []
+        queue.publish("test.purge", {"seq": 3})
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        envelope = queue.get("test.purge", timeout=0)
+        assert envelope["payload"] == {"seq": 3}
+        assert envelope["offset"] == 3
+        assert queue.get("test.purge", timeout=0) is None
+        queue.disconnect()
+
+    def test_delete_topic_removes_files(self, data_dir):
+        """Test deleting a topic deletes its directory"""
+        queue = self._open(data_dir)
+        queue.publish("test.delete", {"seq": 0})
+        queue.delete_topic("test.delete")
+        assert not (data_dir / "test.delete").exists()
+        queue.disconnect()
+
+        queue = self._open(data_dir)
+        assert "test.delete" not in queue.list_topics()
+        queue.disconnect()
+
+    def test_topic_names_are_escaped(self, data_dir):
+        """Test topic names are mapped to safe directory names and back"""
+        queue = self._open(data_dir)
+        queue.publish("tenant/a:listings", {"seq": 0})
+        queue.disconnect()
+
+        assert [path.name for path in data_dir.iterdir()] == ["tenant%2Fa%3Alistings"]
+        queue = self._open(data_dir)
+        assert queue.list_topics() == ["tenant/a:listings"]
+        queue.disconnect()
+
+    def test_topic_capacity_forwarded(self, data_dir):
+        """Test capacity limits given to create_topic apply to the topic"""
+        queue = self._open(data_dir)
+        queue.create_topic("test.capacity", capacity=TopicCapacity(max_messages=1, block_timeout=0))
+        queue.create_consumer_group("test.capacity", "default")
+        queue.publish("test.capacity", {"seq": 0})
+
+        with pytest.raises(QueueFullError):
+            queue.publish("test.capacity", {"seq": 1})
+        assert (data_dir / "test.capacity").is_dir()
+        queue.disconnect()
+
+    def test_oversized_message_rejected(self, data_dir):
+        """Test a message larger than a segment is rejected without being stored"""
+        queue = self._open(data_dir, segment_bytes=4096)
+        with pytest.raises(ValueError):
+            queue.publish_batch("test.oversized", [{"seq": 0}, {"data": "x" * 5000}])
+        assert queue.get_queue_size("test.oversized") == 0
+        queue.disconnect()
+
+    def test_offsets_file_is_written_atomically(self, data_dir):
+        """Test commits leave a complete offsets file and no temporary file"""
+        queue = self._open(data_dir, commit_interval=1)
+        queue.publish("test.commit", {"seq": 0})
+        queue.acknowledge(queue.get("test.commit", timeout=0)["message_id"])
+
+        directory = data_dir / "test.commit"
+        assert json.loads((directory / "offsets.json").read_text()) == {"floor": 0, "groups": {"default": 1}}
+        assert not (directory / "offsets.tmp").exists()
+        queue.disconnect()
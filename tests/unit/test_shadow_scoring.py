@@ -0,0 +1,267 @@
+"""Unit tests for shadow scoring and offline replay of detection plugins."""
+
+import asyncio
+import time
+
+import pytest
+
+from core.fraud.replay import EventLogRecorder, load_event_log, replay
+from core.fraud.risk_scoring_orchestrator import RiskScoringOrchestrator
+from core.fraud.shadow import ShadowDeployment, summarize
+from core.interfaces.detection_plugin import DetectionPlugin, DetectionResult, RiskSignal
+from core.models.events import EventMetadata, EventType, ProcessedListingEvent
+
+pytestmark = pytest.mark.unit
+
+
+class PricePlugin(DetectionPlugin):
+    """Detection plugin scoring price per million, scaled by a factor."""
+
+    def __init__(self, version="1.0.0", factor=1.0, sleep_s=0.0, fail=False, plugin_id="price"):
+        self.plugin_id = plugin_id
+        self.version = version
+        self.factor = factor
+        self.sleep_s = sleep_s
+        self.fail = fail
+        self.calls = 0
+        self.batches = []
+
+    def get_metadata(self):
+        return {"id": self.plugin_id, "name": "Price", "version": self.version}
+
+    async def analyze(self, listing):
+        self.calls += 1
+        if self.sleep_s:
+            await asyncio.sleep(self.sleep_s)
+        if self.fail:
+            raise RuntimeError("model not loaded")
+        score = min(listing["price"] / 1_000_000 * self.factor, 1.0)
+        signal = RiskSignal(signal_type="price", score=score, confidence=0.9, reason="test")
+        return DetectionResult(plugin_id=self.plugin_id, signals=[signal], overall_score=score, processing_time_ms=2.0)
+
+    def get_weight(self):
+        return 0.5
+
+
+class BatchPricePlugin(PricePlugin):
+    """Variant with a vectorized batch hook."""
+
+    async def analyze_batch(self, listings):
+        self.batches.append(len(listings))
+        return [await self.analyze(listing) for listing in listings]
+
+
+class ConstantPlugin(PricePlugin):
+    """Detection plugin always reporting the same score."""
+
+    def __init__(self, score=0.5):
+        super().__init__(plugin_id="constant")
+        self.score = score
+
+    async def analyze(self, listing):
+        return DetectionResult(plugin_id="constant", signals=[], overall_score=self.score, processing_time_ms=1.0)
+
+
+def listing(i, price):
+    return {"listing_id": f"listing-{i}", "price": price}
+
+
+class TestShadowDeployment:
+    """Tests for candidates shadowing live plugins"""
+
+    async def test_candidate_excluded_from_score(self):
+        """Test the candidate is recorded but does not change the score"""
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin(), ConstantPlugin(0.5)])
+        deployment = orch.add_shadow(PricePlugin(version="2.0.0", factor=2.0))
+
+        record = await orch.run_compact(listing(1, 400_000))
+        await orch.drain_shadows()
+
+        assert record.overall_score == pytest.approx(45.0)
+        (comparison,) = deployment.comparisons()
+        assert comparison.live_score == pytest.approx(0.4)
+        assert comparison.shadow_score == pytest.approx(0.8)
+        assert comparison.score_delta == pytest.approx(0.4)
+        assert comparison.live_overall == pytest.approx(45.0)
+        assert comparison.shadow_overall == pytest.approx(65.0)
+        assert comparison.overall_delta == pytest.approx(20.0)
+        assert (comparison.live_risk_level, comparison.shadow_risk_level) == ("suspicious", "suspicious")
+
+    async def test_candidate_runs_after_live_score(self):
+        """Test a slow candidate does not delay scoring"""
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin()])
+        deployment = orch.add_shadow(PricePlugin(version="2.0.0", sleep_s=0.3))
+
+        start = time.perf_counter()
+        await orch.run_compact(listing(1, 100_000))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.2
+        assert deployment.sampled == 0
+        await orch.drain_shadows()
+        assert deployment.sampled == 1
+
+    async def test_sampling_is_deterministic(self):
+        """Test the same listings are shadowed every time at about the sample rate"""
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin()])
+        deployment = orch.add_shadow(PricePlugin(version="2.0.0"), sample_rate=0.25)
+        listings = [listing(i, 100_000) for i in range(400)]
+
+        await orch.run_batch(listings)
+        await orch.drain_shadows()
+        first = [c.listing_id for c in deployment.comparisons()]
+        await orch.run_batch(listings)
+        await orch.drain_shadows()
+
+        assert 60 < len(first) < 140
+        assert [c.listing_id for c in deployment.comparisons()][len(first) :] == first
+        assert first == [item["listing_id"] for item in listings if deployment.samples(item["listing_id"])]
+
+    async def test_batch_uses_candidate_batch_hook(self):
+        """Test shadow runs of a batch are one analyze_batch() call"""
+        candidate = BatchPricePlugin(version="2.0.0")
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin()])
+        deployment = orch.add_shadow(candidate)
+
+        batch = await orch.run_batch([listing(i, 100_000 * i) for i in range(5)])
+        await orch.drain_shadows()
+
+        assert candidate.batches == [5]
+        assert [c.listing_id for c in deployment.comparisons()] == batch.listing_ids
+        assert all(c.score_delta == pytest.approx(0.0) for c in deployment.comparisons())
+
+    async def test_candidate_failure_recorded(self):
+        """Test candidate errors are counted without affecting scores"""
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin()])
+        deployment = orch.add_shadow(PricePlugin(version="2.0.0", fail=True))
+
+        record = await orch.run_compact(listing(1, 500_000))
+        await orch.drain_shadows()
+
+        assert record.overall_score == pytest.approx(50.0)
+        (comparison,) = deployment.comparisons()
+        assert comparison.error == "model not loaded"
+        assert comparison.shadow_overall is None
+        assert deployment.get_statistics()["errors"] == 1
+
+    async def test_candidate_for_new_plugin_id(self):
+        """Test a differently named candidate is compared with the given live plugin"""
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin(), ConstantPlugin(0.0)])
+        deployment = orch.add_shadow(PricePlugin(plugin_id="price-v2", factor=0.5), plugin_id="price")
+
+        await orch.run_compact(listing(1, 800_000))
+        await orch.drain_shadows()
+
+        (comparison,) = deployment.comparisons()
+        assert comparison.shadow_overall == pytest.approx(20.0)
+        assert comparison.shadow_risk_level == "safe"
+        assert comparison.live_risk_level == "suspicious"
+        assert deployment.get_statistics()["risk_level_changes"] == 1
+
+    async def test_statistics_and_removal(self):
+        """Test shadow statistics are reported until the shadow is removed"""
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin()])
+        orch.add_shadow(PricePlugin(version="2.0.0", factor=1.1))
+
+        await orch.run_batch([listing(i, 100_000 * i) for i in range(1, 6)])
+        await orch.drain_shadows()
+
+        stats = orch.get_statistics()["shadows"]["price"]
+        assert stats["candidate_version"] == "2.0.0"
+        assert stats["sampled"] == 5
+        assert stats["latency_ms"]["shadow"]["p50"] == pytest.approx(2.0)
+        assert stats["score_delta"]["max"] == pytest.approx(0.05)
+        assert orch.remove_shadow("price").sampled == 5
+        assert orch.get_statistics()["shadows"] == {}
+        assert orch.remove_shadow("price") is None
+
+    async def test_pending_runs_capped(self):
+        """Test a hanging candidate drops samples instead of piling up shadow runs"""
+        candidate = PricePlugin(version="2.0.0", sleep_s=0.2)
+        orch = RiskScoringOrchestrator(detection_plugins=[PricePlugin()])
+        orch.add_shadow(candidate, max_in_flight=2)
+
+        for i in range(5):
+            await orch.run_compact(listing(i, 100_000))
+
+        assert len(orch._shadow_tasks) == 2
+        await orch.drain_shadows()
+
+        assert candidate.calls == 2
+        stats = orch.get_statistics()["shadows"]["price"]
+        assert stats["sampled"] == 2
+        assert stats["dropped"] == 3
+        assert stats["in_flight"] == 0
+
+    def test_invalid_sample_rate(self):
+        """Test sample rates outside (0, 1] and empty in-flight windows are rejected"""
+        with pytest.raises(ValueError):
+            ShadowDeployment(PricePlugin(), "price", sample_rate=0.0)
+        with pytest.raises(ValueError):
+            RiskScoringOrchestrator(detection_plugins=[]).add_shadow(PricePlugin(), sample_rate=1.5)
+        with pytest.raises(ValueError):
+            ShadowDeployment(PricePlugin(), "price", max_in_flight=0)
+
+    def test_summarize(self):
+        """Test distribution summaries"""
+        summary = summarize([1.0, 2.0, 3.0, 4.0])
+
+        assert summary["count"] == 4
+        assert summary["mean"] == pytest.approx(2.5)
+        assert summary["p50"] == pytest.approx(2.5)
+        assert summary["max"] == 4.0
+        assert summarize([])["count"] == 0
+
+
+class TestReplay:
+    """Tests for replaying captured event logs"""
+
+    def write_log(self, path):
+        recorder = EventLogRecorder(path)
+        for i in range(1, 11):
+            event = ProcessedListingEvent(
+                metadata=EventMetadata(
+                    event_type=EventType.PROCESSED_LISTING, source_plugin_id="test", source_platform="test"
+                ),
+                listing_data=listing(i, 100_000 * i),
+                fraud_score=0.0,
+            )
+            recorder(event.to_dict())
+        with open(path, "a") as f:
+            f.write("not json\n\n")
+        recorder(listing(11, 50_000))  # Bare listing
+        return recorder
+
+    def test_event_log_round_trip(self, tmp_path):
+        """Test recorded events are read back as listings, skipping bad lines"""
+        path = tmp_path / "events.jsonl"
+        recorder = self.write_log(path)
+
+        listings = load_event_log(path)
+
+        assert recorder.recorded == 11
+        assert [item["listing_id"] for item in listings] == [f"listing-{i}" for i in range(1, 12)]
+        assert len(load_event_log(path, limit=3)) == 3
+
+    async def test_replay_reports_latency_and_drift(self, tmp_path):
+        """Test both versions see every listing and drift is reported"""
+        path = tmp_path / "events.jsonl"
+        self.write_log(path)
+        live, candidate = PricePlugin(sleep_s=0.002), PricePlugin(version="2.0.0", factor=2.0, sleep_s=0.01)
+
+        report = await replay(load_event_log(path), [live, ConstantPlugin(0.0)], {"price": candidate})
+
+        stats = report["price"]
+        assert live.calls == candidate.calls == 11
+        assert stats["sampled"] == 11
+        assert stats["latency_ms"]["live"]["p50"] >= 2.0
+        assert stats["latency_ms"]["shadow"]["p50"] >= 10.0
+        assert stats["latency_ms"]["shadow"]["p50"] > stats["latency_ms"]["live"]["p50"]
+        assert stats["score_delta"]["min"] >= 0.0
+        assert stats["overall_delta"]["max"] == pytest.approx(25.0)
+        assert stats["risk_level_changes"] > 0
+
+    async def test_replay_rejects_unknown_candidate(self):
+        """Test candidates must replace a live plugin"""
+        with pytest.raises(ValueError):
+            await replay([listing(1, 1)], [PricePlugin()], {"unknown": PricePlugin()})
@@ -0,0 +1,60 @@
+"""Tests for sharded statistics counters"""
+
+import threading
+
+import pytest
+
+from core.queue.counters import ShardedCounters
+
+pytestmark = pytest.mark.unit
+
+
+class TestShardedCounters:
+    """Tests for ShardedCounters"""
+
+    def test_add_and_snapshot(self):
+        """Test counters start at zero and sum increments"""
+        counters = ShardedCounters(["published", "errors"])
+
+        counters.add("published")
+        counters.add("published", 4)
+        counters.add("errors", -1)
+
+        assert counters.snapshot() == {"published": 5, "errors": -1}
+        assert counters["published"] == 5
+
+    def test_concurrent_increments_are_not_lost(self):
+        """Test increments from many threads all count"""
+        counters = ShardedCounters(["count"])
+
+        def work():
+            for _ in range(10_000):
+                counters.add("count")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counters["count"] == 80_000
+
+    def test_shards_of_exited_threads_are_folded(self):
+        """Test exited threads' counts survive once their shards are retired"""
+        counters = ShardedCounters(["count"])
+
+        for _ in range(5):
+            thread = threading.Thread(target=lambda: counters.add("count", 2))
+            thread.start()
+            thread.join()
+        counters.add("count")
+
+        assert counters["count"] == 11
+        assert len(counters._shards) == 1
+
+    def test_unknown_counter(self):
+        """Test only counters named at construction exist"""
+        counters = ShardedCounters(["count"])
+
+        with pytest.raises(KeyError):
+            counters.add("other")